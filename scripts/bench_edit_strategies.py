@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark the fuzzy matching in superqode.agent.edit_strategies.
+
+Generates a source-like file (20k lines by default) and times
+``replace_with_strategies`` for edits that hit different strategies: an
+exact block, a re-indented block, a block with a changed middle line and
+unique anchors, the same with anchors repeated throughout the file, and an
+``old_string`` that matches nothing. Also times ``_levenshtein`` against the
+textbook dynamic-programming distance on line-sized strings.
+
+Usage:
+    python scripts/bench_edit_strategies.py --lines 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from superqode.agent.edit_strategies import _levenshtein, replace_with_strategies
+
+
+def _timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def _source(lines: int, rng: random.Random) -> list[str]:
+    out = []
+    for i in range(lines):
+        kind = i % 10
+        if kind == 0:
+            out.append(f"def function_{i}(arg_{i % 97}):")
+        elif kind in (4, 9):
+            out.append("")
+        elif kind == 8:
+            out.append("    return result")
+        else:
+            out.append(f"    value_{rng.randrange(lines)} = compute({i}, {rng.random():.6f})")
+    return out
+
+
+def _dp_levenshtein(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def _cases(lines: list[str]) -> dict[str, str]:
+    at = len(lines) - 20  # function_<n> at the end of the file
+    block = lines[at : at + 9]
+    changed = list(block)
+    changed[3] = changed[3].replace("compute", "compute_v2")
+    anchored = lines[at - 2 : at + 9]  # "    return result" ... "    return result"
+    anchored = [*anchored[:5], "    value = compute(0, 0.5)", *anchored[6:]]
+    return {
+        "exact": "\n".join(block),
+        "reindented": "\n".join("  " + line for line in block),
+        "near miss": "\n".join(changed),
+        "repeated anchors": "\n".join(anchored),
+        "not found": "\n".join(["def missing():", "    pass", "    return None"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    lines = _source(args.lines, rng)
+    content = "\n".join(lines)
+    print(f"--- {args.lines} lines ({len(content) / 1e6:.1f} MB)")
+    for name, old in _cases(lines).items():
+
+        def run(old=old) -> str:
+            try:
+                return "replaced %d" % replace_with_strategies(content, old, "NEW")[1]
+            except ValueError as exc:
+                return str(exc).split(".")[0]
+
+        outcome = run()
+        elapsed = _timed(run, args.repeat)
+        print(f"{name:<18} {elapsed * 1000:10.1f} ms   {outcome}")
+
+    pairs = [(rng.choice(lines), rng.choice(lines)) for _ in range(500)]
+    dp = _timed(lambda: [_dp_levenshtein(a, b) for a, b in pairs], 1)
+    fast = _timed(lambda: [_levenshtein(a, b) for a, b in pairs], 1)
+    assert [_dp_levenshtein(a, b) for a, b in pairs] == [_levenshtein(a, b) for a, b in pairs]
+    print(f"levenshtein x500   dp {dp * 1000:8.1f} ms   edit_strategies {fast * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
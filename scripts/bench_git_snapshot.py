@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark GitSnapshotManager snapshot and restore against file count.
+
+Builds a throwaway git repository per file count and compares the batched
+``hash-object --stdin-paths`` / ``cat-file --batch`` paths of
+``superqode.workspace.git_snapshot.GitSnapshotManager`` with the legacy
+one-process-per-file hashing, then shows repeat snapshots served from the
+stat cache.
+
+Usage:
+    python scripts/bench_git_snapshot.py --files 100 1000 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from superqode.workspace.git_snapshot import GitSnapshotManager
+
+
+async def _timed(label: str, coro):
+    start = time.perf_counter()
+    result = await coro
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def _make_repo(root: Path, count: int, file_bytes: int) -> None:
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    body = "x" * file_bytes
+    for i in range(count):
+        path = root / f"pkg{i % 50}" / f"mod{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {i}\n{body}\n")
+        # Settled files, as between agent turns (see stat_cache.RACY_WINDOW_NS)
+        os.utime(path, (time.time() - 60, time.time() - 60))
+    subprocess.run(["git", "-C", str(root), "add", "-A"], check=True)
+
+
+async def _legacy_snapshot(manager: GitSnapshotManager) -> int:
+    result = await manager._run_git("ls-files", "-z")
+    files = [Path(f) for f in result.stdout.split("\0") if f]
+    hashes = [await manager._get_file_hash(f) for f in files]
+    return sum(1 for h in hashes if h)
+
+
+async def _bench(count: int, file_bytes: int) -> None:
+    root = Path(tempfile.mkdtemp(prefix="superqode-snapshot-bench-"))
+    try:
+        _make_repo(root, count, file_bytes)
+        manager = GitSnapshotManager(root)
+        print(f"--- {count} files")
+        await _timed("legacy per-file hashing", _legacy_snapshot(manager))
+        snapshot_id = await _timed("batched create_snapshot", manager.create_snapshot("bench"))
+        await _timed("stat-cached create_snapshot", manager.create_snapshot("again"))
+        (root / "pkg0" / "mod0.py").write_text("edited\n")
+        await _timed("stat-cached, one file edited", manager.create_snapshot("edit"))
+        for path in list(root.glob("pkg0/*.py")):
+            path.write_text("changed\n")
+        await _timed("batched restore_snapshot", manager.restore_snapshot(snapshot_id))
+        await manager.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--file-bytes", type=int, default=2000)
+    args = parser.parse_args()
+
+    for count in args.files:
+        asyncio.run(_bench(count, args.file_bytes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark LSP request throughput against the fake language server.
+
+Sends ``test/echo`` requests through ``superqode.lsp.transport.LSPConnection``
+one at a time and pipelined (all in flight at once), to a
+``FakeLanguageServer`` (``tests/fixtures/fake_lsp_server.py``) running in-process over a socket
+pair and as a subprocess over stdio.
+
+Usage:
+    python scripts/bench_lsp_transport.py --requests 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from superqode.lsp.transport import LSPConnection
+
+# The scripted server lives with the test fixtures
+FIXTURES = Path(__file__).resolve().parents[1] / "tests" / "fixtures"
+sys.path.insert(0, str(FIXTURES))
+
+from fake_lsp_server import FakeLanguageServer, connect_in_process  # noqa: E402
+
+PARAMS = {"textDocument": {"uri": "file:///bench.py"}, "position": {"line": 10, "character": 4}}
+
+
+async def _timed(connection: LSPConnection, count: int, pipelined: bool) -> float:
+    start = time.perf_counter()
+    if pipelined:
+        await asyncio.gather(*(connection.request("test/echo", PARAMS) for _ in range(count)))
+    else:
+        for _ in range(count):
+            await connection.request("test/echo", PARAMS)
+    return time.perf_counter() - start
+
+
+async def _report(label: str, connection: LSPConnection, count: int) -> None:
+    for mode, pipelined in (("sequential", False), ("pipelined", True)):
+        elapsed = await _timed(connection, count, pipelined)
+        print(f"{label:<12} {mode:<11} {count / elapsed:10.0f} req/s")
+
+
+async def _bench(count: int) -> None:
+    print(f"--- {count} test/echo requests")
+    reader, writer, task = await connect_in_process(FakeLanguageServer())
+    connection = LSPConnection(reader, writer, name="in-process").start()
+    await _report("in-process", connection, count)
+    await connection.notify("exit")
+    await task
+    await connection.close()
+
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(FIXTURES / "fake_lsp_server.py"),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    connection = LSPConnection(process.stdout, process.stdin, name="subprocess").start()
+    await _report("subprocess", connection, count)
+    await connection.notify("exit")
+    await process.wait()
+    await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(_bench(args.requests))
+
+
+if __name__ == "__main__":
+    main()
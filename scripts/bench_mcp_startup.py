@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark MCP startup and call timeouts against slow stdio servers.
+
+Connects ``MCPClientManager`` to several copies of the scripted stdio server
+in ``tests/fixtures/fake_mcp_server.py``, each sleeping before it answers, one
+at a time (as ``connect_all`` used to) and then concurrently, with one
+server slower than its startup deadline left to finish in the background.
+Then times a tool call that outlives its timeout.
+
+Usage:
+    python scripts/bench_mcp_startup.py --servers 4 --delay 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from superqode.mcp import MCPClientManager, MCPServerConfig, MCPStdioConfig
+
+FAKE_SERVER = Path(__file__).parents[1] / "tests" / "fixtures" / "fake_mcp_server.py"
+
+
+def _server(server_id: str, delay: float, startup_timeout: float) -> MCPServerConfig:
+    return MCPServerConfig(
+        id=server_id,
+        name=server_id,
+        config=MCPStdioConfig(
+            command=sys.executable, args=[str(FAKE_SERVER), "--startup-delay", str(delay)]
+        ),
+        startup_timeout=startup_timeout,
+    )
+
+
+async def _timed(servers: int, delay: float, sequential: bool) -> tuple:
+    async with MCPClientManager() as manager:
+        for n in range(servers):
+            manager.add_server(_server(f"fast{n}", delay, 60))
+        manager.add_server(_server("slow", delay * 10, delay * 4))
+        start = time.perf_counter()
+        if sequential:
+            results = {}
+            for server_id in manager.get_server_configs():
+                results[server_id] = await manager.connect(server_id, deadline=60)
+        else:
+            results = await manager.connect_all()
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(results.values()), len(results)
+
+
+async def _bench(servers: int, delay: float) -> None:
+    print(f"--- {servers} servers sleeping {delay:g}s, one sleeping {delay * 10:g}s")
+    for label, sequential in (("sequential", True), ("concurrent", False)):
+        elapsed, connected, total = await _timed(servers, delay, sequential)
+        print(f"{label:<11} {elapsed:8.2f} s to return   {connected}/{total} connected")
+
+    async with MCPClientManager() as manager:
+        manager.add_server(_server("fake", 0, 60))
+        await manager.connect("fake")
+        start = time.perf_counter()
+        result = await manager.execute_tool("fake", "sleep", {"seconds": 60}, timeout=0.5)
+        elapsed = time.perf_counter() - start
+        print(f"call timeout {elapsed:8.2f} s   {result.error_message}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(_bench(args.servers, args.delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark the SQLite/FTS5 local memory store against the JSON file it replaced.
+
+Writes synthetic memories to a legacy ``agent-*.json`` file, times the first
+open of ``LocalAgentMemoryProvider`` (which imports them), then times search
+and remember on the store against the old behaviour: load the JSON file and
+substring-scan every record per search, rewrite the whole file per remember.
+
+Usage:
+    python scripts/bench_memory_store.py --memories 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from superqode.memory import LocalAgentMemoryProvider, MemoryRecord
+
+WORDS = "deploy release test lint docs cache build pnpm migrate schema api auth".split()
+WORDS += [f"term{n}" for n in range(2000)]
+QUERIES = ["deploy release", "pnpm lint", "term42 cache", "schema migrate api"]
+
+
+def _timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def _json_search(path: Path, query: str, limit: int = 8) -> list:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    terms = query.lower().split()
+    results = []
+    for item in data["records"]:
+        record = MemoryRecord.from_dict(item)
+        haystack = " ".join([record.content, record.kind, " ".join(record.tags)]).lower()
+        hits = sum(1 for term in terms if term in haystack)
+        if hits:
+            results.append((hits / len(terms), record.updated_at, record))
+    results.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    return results[:limit]
+
+
+def _json_remember(path: Path, content: str) -> None:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["records"].append(MemoryRecord(id="x", content=content).to_dict())
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--memories", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    records = [
+        MemoryRecord(
+            id=f"{n:012x}",
+            content=" ".join(rng.choice(WORDS) for _ in range(20)),
+            tags=(rng.choice(WORDS),),
+            updated_at=f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}T00:00:00",
+        ).to_dict()
+        for n in range(args.memories)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / "agent-bench.json"
+        legacy.write_text(json.dumps({"version": 1, "records": records}, indent=2) + "\n")
+        size = legacy.stat().st_size / 1e6
+        print(f"--- {args.memories} memories ({size:.1f} MB of JSON)")
+
+        start = time.perf_counter()
+        provider = LocalAgentMemoryProvider(project_root=tmp, path=legacy)
+        provider.status()
+        print(f"import           {time.perf_counter() - start:9.2f} s")
+
+        for query in QUERIES:
+            old = _timed(lambda: _json_search(legacy, query), args.repeat)
+            new = _timed(lambda: provider.search(query), args.repeat)
+            print(f"search {query!r:<22} json {old * 1000:9.1f} ms   sqlite {new * 1000:7.2f} ms")
+
+        old = _timed(lambda: _json_remember(legacy, "Use pnpm, not npm"), args.repeat)
+        new = _timed(lambda: provider.remember("Use pnpm, not npm"), args.repeat)
+        print(f"remember         json {old * 1000:9.1f} ms   sqlite {new * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
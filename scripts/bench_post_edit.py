@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark post-edit verification: one checker process per edit vs PostEditVerifier.
+
+Writes Python files into a temporary project and measures edits per second
+when every edit is verified, in two shapes: a multi-file patch (all files
+verified by one tool call) and a run of single-file edits. "per-edit" spawns
+one checker per file, as ``verify_edit`` used to (``ruff check FILE`` when
+ruff is on PATH, else ``python -m py_compile FILE``); "verifier" goes through
+``verify_edits``. Run with and without ruff on PATH to compare both checkers.
+
+Usage:
+    python scripts/bench_post_edit.py --files 30 --edits 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from superqode.tools.base import ToolResult
+from superqode.tools.post_edit import get_post_edit_verifier, verify_edits
+
+
+def _per_edit(path: Path, cwd: Path) -> None:
+    if shutil.which("ruff"):
+        args = ["ruff", "check", path.name, "--output-format", "concise", "--quiet"]
+    else:
+        args = ["python", "-m", "py_compile", path.name]
+    subprocess.run(args, cwd=cwd, capture_output=True, timeout=12)
+
+
+def _edit(path: Path, n: int) -> None:
+    path.write_text(f"import os\n\n\ndef f{n}(x):\n    return x + {n}\n", encoding="utf-8")
+
+
+async def _verifier_rate(files: list[Path], cwd: Path, edits: int, batch: bool) -> float:
+    ctx = SimpleNamespace(working_directory=cwd)
+    start = time.perf_counter()
+    if batch:
+        for path in files:
+            _edit(path, 0)
+        await verify_edits(ToolResult(success=True, output=""), files, ctx)
+        count = len(files)
+    else:
+        for n in range(edits):
+            path = files[n % len(files)]
+            _edit(path, n + 1)
+            await verify_edits(ToolResult(success=True, output=""), [path], ctx)
+        count = edits
+    return count / (time.perf_counter() - start)
+
+
+def _per_edit_rate(files: list[Path], cwd: Path, edits: int, batch: bool) -> float:
+    start = time.perf_counter()
+    count = len(files) if batch else edits
+    for n in range(count):
+        path = files[n % len(files)]
+        _edit(path, n + 1)
+        _per_edit(path, cwd)
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=30)
+    parser.add_argument("--edits", type=int, default=60)
+    args = parser.parse_args()
+
+    checker = "ruff" if shutil.which("ruff") else "syntax-only (python)"
+    print(f"--- checker: {checker}")
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = Path(tmp)
+        files = [cwd / f"module_{i}.py" for i in range(args.files)]
+        for batch, label in ((True, f"{args.files}-file patch"), (False, "single edits")):
+            old = _per_edit_rate(files, cwd, args.edits, batch)
+            get_post_edit_verifier().clear()
+            new = asyncio.run(_verifier_rate(files, cwd, args.edits, batch))
+            print(f"{label:<16} per-edit {old:8.1f} edits/s   verifier {new:8.1f} edits/s")
+        stats = get_post_edit_verifier().counters
+        print(f"verifier batches {stats['batches']}, files checked {stats['checked']}")
+
+
+if __name__ == "__main__":
+    main()
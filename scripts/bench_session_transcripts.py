@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark indexed reads of agent session transcripts.
+
+Writes a synthetic JSONL transcript (200 MB by default) and compares a
+full-scan tail read, the legacy parse-everything rewind and the offset-index
+paths of ``superqode.agent.session_manager.SessionStore``.
+
+Usage:
+    python scripts/bench_session_transcripts.py --size-mb 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+
+from superqode.agent.session_manager import SessionMessage, SessionStore
+
+
+def _timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def _write_transcript(path: Path, size_bytes: int, body_bytes: int) -> int:
+    written = count = 0
+    body = "x" * body_bytes
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size_bytes:
+            role = "user" if count % 2 == 0 else "assistant"
+            line = json.dumps({"role": role, "content": f"{count} {body}"}) + "\n"
+            f.write(line)
+            written += len(line)
+            count += 1
+    return count
+
+
+def _legacy_tail(path: Path, limit: int) -> list:
+    messages: deque = deque(maxlen=limit)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                messages.append(SessionMessage(**json.loads(line)))
+    return list(messages)
+
+
+def _legacy_user_positions(path: Path) -> list:
+    positions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for idx, line in enumerate(f):
+            if line.strip() and json.loads(line).get("role") == "user":
+                positions.append(idx)
+    return positions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--body-bytes", type=int, default=2000)
+    parser.add_argument("--tail", type=int, default=50)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="superqode-session-bench-"))
+    try:
+        store = SessionStore(str(root))
+        store.create_session("bench")
+        path = root / "bench.jsonl"
+        count = _timed(
+            f"write {args.size_mb} MB transcript",
+            lambda: _write_transcript(path, args.size_mb * 1024 * 1024, args.body_bytes),
+        )
+        print(f"{'messages':<40} {count:10d}")
+
+        _timed(f"legacy tail read (limit={args.tail})", lambda: _legacy_tail(path, args.tail))
+        _timed("legacy rewind scan (user positions)", lambda: _legacy_user_positions(path))
+        _timed("index build (first sync)", lambda: store._index("bench").sync())
+        _timed(
+            f"indexed tail read (limit={args.tail})",
+            lambda: store.get_messages("bench", limit=args.tail),
+        )
+        _timed("indexed random access (middle)", lambda: store.get_message("bench", count // 2))
+        _timed(
+            "append one message",
+            lambda: store.append_message("bench", SessionMessage(role="user", content="more")),
+        )
+        users = (count + 2) // 2
+        _timed(
+            "indexed rewind (last user message)",
+            lambda: store.truncate_to_user_message("bench", users),
+        )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Benchmark short BashTool commands per second with and without the shell pool.
+
+Runs the same short commands through ``BashTool`` in buffered mode, first
+spawning a shell per call and then through the persistent workers of
+``superqode.tools.shell_pool``.
+
+Usage:
+    python scripts/bench_shell_pool.py --commands 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from superqode.tools.base import ToolContext
+from superqode.tools.shell_pool import get_shell_pool
+from superqode.tools.shell_tools import BashTool
+
+COMMANDS = ["true", "echo hello", "pwd", "ls >/dev/null", "printf '%s\\n' a b c | wc -l"]
+
+
+async def _timed(tool: BashTool, ctx: ToolContext, count: int) -> float:
+    # One warm-up call so the pooled run does not count the first worker start
+    await tool.execute({"command": "true"}, ctx)
+    start = time.perf_counter()
+    for i in range(count):
+        result = await tool.execute({"command": COMMANDS[i % len(COMMANDS)]}, ctx)
+        assert result.success, result.error
+    return time.perf_counter() - start
+
+
+async def _bench(count: int) -> None:
+    with tempfile.TemporaryDirectory(prefix="superqode-shell-bench-") as scratch:
+        ctx = ToolContext(session_id="bench", working_directory=Path(scratch))
+        print(f"--- {count} short commands")
+        baseline = 0.0
+        for label, pooled in (("spawn per command", False), ("persistent worker pool", True)):
+            elapsed = await _timed(BashTool(use_worker_pool=pooled), ctx, count)
+            rate = count / elapsed
+            baseline = baseline or rate
+            print(f"{label:<24} {rate:10.0f} cmd/s  ({rate / baseline:4.1f}x)")
+        await get_shell_pool().aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(_bench(args.commands))
+
+
+if __name__ == "__main__":
+    main()
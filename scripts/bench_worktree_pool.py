@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Benchmark GitWorktreeManager checkout latency with and without the pool.
+
+Builds a throwaway repository (plus a gitignored ``node_modules``), then times
+``create_qe_worktree`` for cold checkouts (``pool_size=0``) and for worktrees
+taken over from a warmed pool of
+``superqode.workspace.worktree.GitWorktreeManager``.
+
+Usage:
+    python scripts/bench_worktree_pool.py --files 5000 --rounds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from superqode.workspace.worktree import GitWorktreeManager
+
+
+def _make_repo(root: Path, count: int, deps: int) -> None:
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    for i in range(count):
+        path = root / f"pkg{i % 50}" / f"mod{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {i}\n" + "x = 1\n" * 40)
+    (root / ".gitignore").write_text("node_modules/\n")
+    for i in range(deps):
+        path = root / "node_modules" / f"dep{i % 100}" / f"file{i}.js"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("module.exports = {};\n" * 20)
+    env = dict(os.environ, GIT_AUTHOR_NAME="b", GIT_AUTHOR_EMAIL="b@b", GIT_COMMITTER_NAME="b")
+    env["GIT_COMMITTER_EMAIL"] = "b@b"
+    subprocess.run(["git", "-C", str(root), "add", "-A"], check=True)
+    subprocess.run(["git", "-C", str(root), "commit", "-qm", "bench"], check=True, env=env)
+
+
+async def _round(manager: GitWorktreeManager, label: str, rounds: int) -> None:
+    timings = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        info = await manager.create_qe_worktree(f"{label}-{i}", copy_uncommitted=False)
+        timings.append((time.perf_counter() - start) * 1000)
+        await manager.remove_worktree(info, force=True)
+    best = min(timings)
+    print(f"{label:<34} {best:10.1f} ms (best of {rounds})")
+
+
+async def _bench(files: int, deps: int, rounds: int) -> None:
+    scratch = Path(tempfile.mkdtemp(prefix="superqode-worktree-bench-"))
+    os.environ["SUPERQODE_HOME"] = str(scratch / "state")
+    try:
+        repo = scratch / "repo"
+        _make_repo(repo, files, deps)
+        print(f"--- {files} tracked files, {deps} dependency files")
+        await _round(GitWorktreeManager(repo, pool_size=0), "cold checkout (no pool)", rounds)
+        pooled = GitWorktreeManager(repo, pool_size=1)
+        start = time.perf_counter()
+        await pooled.warm_pool()
+        print(
+            f"{'warm_pool (one entry, seeded)':<34} {(time.perf_counter() - start) * 1000:10.1f} ms"
+        )
+        await _round(pooled, "pooled checkout", rounds)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--deps", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    for count in args.files:
+        asyncio.run(_bench(count, args.deps, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ from __future__ import annotations
 import re
 import shlex
 from enum import Enum
+from functools import lru_cache
 
 
 class CommandSafety(str, Enum):
@@ -315,12 +316,14 @@ def _classify_segment(segment: str) -> CommandSafety:
     return CommandSafety.WRITE
 
 
+@lru_cache(maxsize=1024)
 def classify_command(command: str) -> CommandSafety:
     """Classify a (possibly compound) shell command by its riskiest segment.
 
     The command is canonicalised first to defeat obfuscation, and dynamic
     constructs (pipe-to-shell, eval, command substitution, base64-decode) prevent
-    a SAFE verdict.
+    a SAFE verdict. Verdicts are cached: a permission check classifies the same
+    command more than once, and agents repeat commands within a turn.
     """
     if not command or not command.strip():
         return CommandSafety.SAFE
@@ -3,37 +3,150 @@ Edit Strategies - Fallback matching for edit operations.
 
 When exact string match fails, these strategies are tried in order to find
 a suitable match (e.g., whitespace differences, indentation, line trimming).
+
+The strategies share one split of the content (``_prepare``), with line
+offsets for slicing out blocks and an index from each stripped line to where
+it occurs, so anchored strategies only visit lines that can start a match.
+Block anchor similarity uses a bit-parallel edit distance and stops scoring
+a candidate once it can no longer win.
 """
 
 from __future__ import annotations
 
-from typing import Generator, Tuple
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from typing import Generator, Iterator, Optional, Tuple
 import re
 
 # Similarity thresholds for block anchor fallback matching
 SINGLE_CANDIDATE_SIMILARITY_THRESHOLD = 0.0
 MULTIPLE_CANDIDATES_SIMILARITY_THRESHOLD = 0.3
 
+# Slack for float comparisons when pruning block anchor candidates
+_SIMILARITY_EPSILON = 1e-9
+
 
-def _levenshtein(a: str, b: str) -> int:
-    """Levenshtein distance between two strings."""
-    if not a or not b:
-        return max(len(a), len(b))
-    # Build matrix
-    matrix = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
-    for i in range(len(a) + 1):
-        matrix[i][0] = i
-    for j in range(len(b) + 1):
-        matrix[0][j] = j
-    for i in range(1, len(a) + 1):
-        for j in range(1, len(b) + 1):
-            cost = 0 if a[i - 1] == b[j - 1] else 1
-            matrix[i][j] = min(
-                matrix[i - 1][j] + 1,
-                matrix[i][j - 1] + 1,
-                matrix[i - 1][j - 1] + cost,
-            )
-    return matrix[len(a)][len(b)]
+class _Lines:
+    """Line data for one file, shared by every replacer.
+
+    Line offsets are prefix sums, so any run of lines is one slice of the
+    content. Stripped and normalized forms, and the index from a stripped
+    line to where it occurs, are built on first use.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.lines = content.split("\n")
+        self.offsets = list(accumulate((len(line) + 1 for line in self.lines), initial=0))
+        self._stripped: Optional[list[str]] = None
+        self._normalized: Optional[list[str]] = None
+        self._indexes: dict[str, dict[str, list[int]]] = {}
+
+    def block(self, start: int, count: int) -> str:
+        """``"\\n".join(lines[start:start + count])`` as a slice of the content."""
+        if count <= 0:
+            return ""
+        return self.content[self.offsets[start] : self.offsets[start + count] - 1]
+
+    @property
+    def stripped(self) -> list[str]:
+        if self._stripped is None:
+            self._stripped = [line.strip() for line in self.lines]
+        return self._stripped
+
+    @property
+    def normalized(self) -> list[str]:
+        if self._normalized is None:
+            self._normalized = [_normalize_whitespace(line) for line in self.lines]
+        return self._normalized
+
+    def positions(self, form: str, key: str) -> list[int]:
+        """Ascending indexes of lines whose ``form`` ("stripped"/"lstripped"/"raw") is ``key``."""
+        index = self._indexes.get(form)
+        if index is None:
+            if form == "stripped":
+                keys = self.stripped
+            elif form == "lstripped":
+                keys = [line.lstrip() for line in self.lines]
+            else:
+                keys = self.lines
+            index = {}
+            for i, line in enumerate(keys):
+                index.setdefault(line, []).append(i)
+            self._indexes[form] = index
+        return index.get(key, [])
+
+    def anchors(self, first: str, last: str) -> Iterator[Tuple[int, int]]:
+        """(start, end) line pairs that strip to ``first`` and ``last``.
+
+        Each start pairs with the nearest end at least two lines below it.
+        """
+        ends = self.positions("stripped", last)
+        for i in self.positions("stripped", first):
+            k = bisect_left(ends, i + 2)
+            if k < len(ends):
+                yield (i, ends[k])
+
+
+@lru_cache(maxsize=4)
+def _prepare(content: str) -> _Lines:
+    return _Lines(content)
+
+
+def _normalize_whitespace(s: str) -> str:
+    return re.sub(r"\s+", " ", s).strip()
+
+
+@lru_cache(maxsize=256)
+def _match_vectors(pattern: str) -> dict[str, int]:
+    """Bit vector per character: bit ``i`` is set where ``pattern[i]`` is that character."""
+    vectors: dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        vectors[char] = vectors.get(char, 0) | (1 << i)
+    return vectors
+
+
+def _levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Levenshtein distance between two strings.
+
+    Uses Myers' bit-parallel algorithm: ``a`` becomes a set of bit vectors,
+    cached so a string compared many times should be passed as ``a``, and
+    ``b`` is scanned once. With ``max_distance``, returns ``max_distance + 1``
+    as soon as the distance is known to exceed it.
+    """
+    if a == b:
+        return 0
+    over = max_distance + 1 if max_distance is not None else len(a) + len(b) + 1
+    if abs(len(b) - len(a)) >= over:
+        return over
+    if not a:
+        return len(b)
+
+    peq = _match_vectors(a)
+    mask = (1 << len(a)) - 1
+    high = 1 << (len(a) - 1)
+    pv, mv, score = mask, 0, len(a)
+    # Each remaining character of b lowers the distance by at most one, so
+    # stop once the score exceeds what they could bring back under the cap
+    cutoff = len(b) + over - 1
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        if score >= cutoff:
+            return over
+        cutoff -= 1
+        ph = (ph << 1) | 1
+        mv = ph & xv & mask
+        pv = ((mh << 1) | ~(xv | ph)) & mask
+    return score
 
 
 def _simple_replacer(content: str, find: str) -> Generator[str, None, None]:
@@ -44,131 +157,157 @@ def _simple_replacer(content: str, find: str) -> Generator[str, None, None]:
 
 def _line_trimmed_replacer(content: str, find: str) -> Generator[str, None, None]:
     """Match when each line matches after trimming whitespace."""
-    original_lines = content.split("\n")
+    prepared = _prepare(content)
     search_lines = find.split("\n")
     if search_lines and search_lines[-1] == "":
         search_lines.pop()
-    for i in range(len(original_lines) - len(search_lines) + 1):
-        matches = True
-        for j in range(len(search_lines)):
-            if original_lines[i + j].strip() != search_lines[j].strip():
-                matches = False
-                break
-        if matches:
-            match_start = sum(len(original_lines[k]) + 1 for k in range(i))
-            match_end = match_start
-            for k in range(len(search_lines)):
-                match_end += len(original_lines[i + k])
-                if k < len(search_lines) - 1:
-                    match_end += 1
-            yield content[match_start:match_end]
+    count = len(search_lines)
+    if not count:
+        for _ in range(len(prepared.lines) + 1):
+            yield ""
+        return
+    search = [line.strip() for line in search_lines]
+    stripped = prepared.stripped
+    for i in prepared.positions("stripped", search[0]):
+        if i + count > len(stripped):
+            break
+        if stripped[i : i + count] == search:
+            yield prepared.block(i, count)
+
+
+def _anchor_similarity(
+    stripped: list[str],
+    search: list[str],
+    start: int,
+    end: int,
+    target: Optional[float] = None,
+) -> Optional[list[float]]:
+    """Per-line similarity of the lines between two anchors and ``search``.
+
+    With ``target``, returns None once the average similarity can no longer
+    reach it, bounding each line's edit distance by what is still affordable.
+    """
+    pairs = min(len(search) - 1, end - start) - 1
+    need = target * pairs - _SIMILARITY_EPSILON if target is not None else None
+    terms: list[float] = []
+    total = 0.0
+    for j in range(1, pairs + 1):
+        orig = stripped[start + j]
+        line = search[j]
+        max_len = max(len(orig), len(line))
+        if max_len == 0:
+            continue
+        max_distance = None
+        if need is not None:
+            # Later lines can add at most 1 each
+            slack = 1 + total + (pairs - j) - need
+            if slack < 0:
+                return None
+            if slack < 1:
+                max_distance = int(max_len * slack)
+        dist = _levenshtein(line, orig, max_distance)
+        if max_distance is not None and dist > max_distance:
+            return None
+        term = 1 - dist / max_len
+        terms.append(term)
+        total += term
+    return terms
 
 
 def _block_anchor_replacer(content: str, find: str) -> Generator[str, None, None]:
     """Match by first/last line anchors with Levenshtein similarity for middle lines."""
-    original_lines = content.split("\n")
+    prepared = _prepare(content)
     search_lines = find.split("\n")
     if len(search_lines) < 3:
         return
     if search_lines and search_lines[-1] == "":
         search_lines.pop()
-    first_line_search = search_lines[0].strip()
-    last_line_search = search_lines[-1].strip()
-    search_block_size = len(search_lines)
-    candidates = []
-    for i in range(len(original_lines)):
-        if original_lines[i].strip() != first_line_search:
-            continue
-        for j in range(i + 2, len(original_lines)):
-            if original_lines[j].strip() == last_line_search:
-                candidates.append((i, j))
-                break
+    search = [line.strip() for line in search_lines]
+    search_block_size = len(search)
+    stripped = prepared.stripped
+    candidates = list(prepared.anchors(search[0], search[-1]))
     if not candidates:
         return
     if len(candidates) == 1:
         start_line, end_line = candidates[0]
         actual_block_size = end_line - start_line + 1
         lines_to_check = min(search_block_size - 2, actual_block_size - 2)
-        similarity = 0.0
-        if lines_to_check > 0:
-            for j in range(1, min(search_block_size - 1, actual_block_size - 1)):
-                orig = original_lines[start_line + j].strip()
-                search = search_lines[j].strip()
-                max_len = max(len(orig), len(search))
-                if max_len == 0:
-                    continue
-                dist = _levenshtein(orig, search)
-                similarity += (1 - dist / max_len) / lines_to_check
+        if SINGLE_CANDIDATE_SIMILARITY_THRESHOLD <= 0:
+            # Similarity is never negative, so any single candidate passes
+            similarity = SINGLE_CANDIDATE_SIMILARITY_THRESHOLD
+        elif lines_to_check > 0:
+            terms = _anchor_similarity(stripped, search, start_line, end_line) or []
+            similarity = sum(term / lines_to_check for term in terms)
         else:
             similarity = 1.0
         if similarity >= SINGLE_CANDIDATE_SIMILARITY_THRESHOLD:
-            match_start = sum(len(original_lines[k]) + 1 for k in range(start_line))
-            match_end = match_start
-            for k in range(start_line, end_line + 1):
-                match_end += len(original_lines[k])
-                if k < end_line:
-                    match_end += 1
-            yield content[match_start:match_end]
+            yield prepared.block(start_line, actual_block_size)
         return
+
+    # Score the likeliest candidates first so the rest can be cut off early;
+    # ties still go to the earliest candidate in the file
+    def identical_lines(index: int) -> int:
+        start_line, end_line = candidates[index]
+        pairs = min(search_block_size - 1, end_line - start_line) - 1
+        return sum(stripped[start_line + j] == search[j] for j in range(1, pairs + 1))
+
     best_match = None
+    best_index = len(candidates)
     max_similarity = -1.0
-    for start_line, end_line in candidates:
+    for index in sorted(range(len(candidates)), key=identical_lines, reverse=True):
+        start_line, end_line = candidates[index]
         actual_block_size = end_line - start_line + 1
         lines_to_check = min(search_block_size - 2, actual_block_size - 2)
-        similarity = 0.0
         if lines_to_check > 0:
-            for j in range(1, min(search_block_size - 1, actual_block_size - 1)):
-                orig = original_lines[start_line + j].strip()
-                search = search_lines[j].strip()
-                max_len = max(len(orig), len(search))
-                if max_len == 0:
-                    continue
-                dist = _levenshtein(orig, search)
-                similarity += 1 - dist / max_len
+            # Skip candidates that cannot reach the best so far or the threshold
+            target = max(max_similarity, MULTIPLE_CANDIDATES_SIMILARITY_THRESHOLD)
+            terms = _anchor_similarity(stripped, search, start_line, end_line, target)
+            if terms is None:
+                continue
+            similarity = 0.0
+            for term in terms:
+                similarity += term
             similarity /= lines_to_check
         else:
             similarity = 1.0
-        if similarity > max_similarity:
+        if similarity > max_similarity or (similarity == max_similarity and index < best_index):
             max_similarity = similarity
             best_match = (start_line, end_line)
+            best_index = index
     if max_similarity >= MULTIPLE_CANDIDATES_SIMILARITY_THRESHOLD and best_match:
         start_line, end_line = best_match
-        match_start = sum(len(original_lines[k]) + 1 for k in range(start_line))
-        match_end = match_start
-        for k in range(start_line, end_line + 1):
-            match_end += len(original_lines[k])
-            if k < end_line:
-                match_end += 1
-        yield content[match_start:match_end]
+        yield prepared.block(start_line, end_line - start_line + 1)
 
 
 def _whitespace_normalized_replacer(content: str, find: str) -> Generator[str, None, None]:
     """Normalize all whitespace to single spaces for matching."""
-
-    def normalize(s: str) -> str:
-        return re.sub(r"\s+", " ", s).strip()
-
-    normalized_find = normalize(find)
-    lines = content.split("\n")
-    for i, line in enumerate(lines):
-        if normalize(line) == normalized_find:
-            yield line
+    prepared = _prepare(content)
+    normalized_find = _normalize_whitespace(find)
+    lines = prepared.lines
+    for i, normalized in enumerate(prepared.normalized):
+        if normalized == normalized_find:
+            yield lines[i]
         else:
-            if normalized_find in normalize(line):
+            if normalized_find in normalized:
                 words = find.strip().split()
                 if words:
                     pattern = re.escape(words[0])
                     for w in words[1:]:
                         pattern += r"\s+" + re.escape(w)
-                    m = re.search(pattern, line)
+                    m = re.search(pattern, lines[i])
                     if m:
                         yield m.group(0)
     find_lines = find.split("\n")
     if len(find_lines) > 1:
-        for i in range(len(lines) - len(find_lines) + 1):
-            block = "\n".join(lines[i : i + len(find_lines)])
-            if normalize(block) == normalized_find:
-                yield block
+        # A block normalizes to its non-blank lines' normalized forms joined
+        # by spaces, so a block starting on a non-blank line must start the find
+        normalized = prepared.normalized
+        count = len(find_lines)
+        for i in range(len(lines) - count + 1):
+            if normalized[i] and not normalized_find.startswith(normalized[i]):
+                continue
+            if " ".join(filter(None, normalized[i : i + count])) == normalized_find:
+                yield prepared.block(i, count)
 
 
 def _indentation_flexible_replacer(content: str, find: str) -> Generator[str, None, None]:
@@ -184,11 +323,15 @@ def _indentation_flexible_replacer(content: str, find: str) -> Generator[str, No
         )
         return "\n".join(line if not line.strip() else line[min_indent:] for line in lines)
 
+    prepared = _prepare(content)
     normalized_find = remove_indentation(find)
-    content_lines = content.split("\n")
-    find_lines = find.split("\n")
-    for i in range(len(content_lines) - len(find_lines) + 1):
-        block = "\n".join(content_lines[i : i + len(find_lines)])
+    count = len(find.split("\n"))
+    # Removing indentation keeps each line's text after its indent
+    first = normalized_find.split("\n", 1)[0].lstrip()
+    for i in prepared.positions("lstripped", first):
+        if i + count > len(prepared.lines):
+            break
+        block = prepared.block(i, count)
         if remove_indentation(block) == normalized_find:
             yield block
 
@@ -216,10 +359,18 @@ def _escape_normalized_replacer(content: str, find: str) -> Generator[str, None,
     unescaped = unescape(find)
     if unescaped in content:
         yield unescaped
-    lines = content.split("\n")
-    find_lines = unescape(find).split("\n")
-    for i in range(len(lines) - len(find_lines) + 1):
-        block = "\n".join(lines[i : i + len(find_lines)])
+    prepared = _prepare(content)
+    count = len(unescaped.split("\n"))
+    # Blocks without a backslash unescape to themselves
+    escaped = [i for i, line in enumerate(prepared.lines) if "\\" in line]
+    first = unescaped.split("\n", 1)[0]
+    starts = set(prepared.positions("raw", first))
+    for i in escaped:
+        starts.update(range(max(0, i - count + 1), i + 1))
+    for i in sorted(starts):
+        if i + count > len(prepared.lines):
+            break
+        block = prepared.block(i, count)
         if unescape(block) == unescaped:
             yield block
 
@@ -231,12 +382,11 @@ def _trimmed_boundary_replacer(content: str, find: str) -> Generator[str, None,
         return
     if trimmed in content:
         yield trimmed
-    lines = content.split("\n")
-    find_lines = find.split("\n")
-    for i in range(len(lines) - len(find_lines) + 1):
-        block = "\n".join(lines[i : i + len(find_lines)])
-        if block.strip() == trimmed:
-            yield block
+    prepared = _prepare(content)
+    count = len(find.split("\n"))
+    for i in range(len(prepared.lines) - count + 1):
+        if prepared.block(i, count).strip() == trimmed:
+            yield prepared.block(i, count)
 
 
 def _context_aware_replacer(content: str, find: str) -> Generator[str, None, None]:
@@ -246,30 +396,22 @@ def _context_aware_replacer(content: str, find: str) -> Generator[str, None, Non
         return
     if find_lines and find_lines[-1] == "":
         find_lines.pop()
-    first_line = find_lines[0].strip()
-    last_line = find_lines[-1].strip()
-    content_lines = content.split("\n")
-    for i in range(len(content_lines)):
-        if content_lines[i].strip() != first_line:
-            continue
-        for j in range(i + 2, len(content_lines)):
-            if content_lines[j].strip() == last_line:
-                block_lines = content_lines[i : j + 1]
-                block = "\n".join(block_lines)
-                if len(block_lines) == len(find_lines):
-                    matching = 0
-                    total = 0
-                    for k in range(1, len(block_lines) - 1):
-                        bl = block_lines[k].strip()
-                        fl = find_lines[k].strip()
-                        if bl or fl:
-                            total += 1
-                            if bl == fl:
-                                matching += 1
-                    if total == 0 or matching / total >= 0.5:
-                        yield block
-                        return
-                break
+    prepared = _prepare(content)
+    stripped = prepared.stripped
+    for i, j in prepared.anchors(find_lines[0].strip(), find_lines[-1].strip()):
+        if j - i + 1 == len(find_lines):
+            matching = 0
+            total = 0
+            for k in range(1, len(find_lines) - 1):
+                bl = stripped[i + k]
+                fl = find_lines[k].strip()
+                if bl or fl:
+                    total += 1
+                    if bl == fl:
+                        matching += 1
+            if total == 0 or matching / total >= 0.5:
+                yield prepared.block(i, j - i + 1)
+                return
 
 
 def _multi_occurrence_replacer(content: str, find: str) -> Generator[str, None, None]:
@@ -2213,6 +2213,9 @@ class AgentLoop:
                     cost_currency if response.cost_currency is None else response.cost_currency
                 )
             self.run_active = False
+            if self._session_manager:
+                # One metadata/graph checkpoint per turn instead of per message.
+                self._session_manager.flush()
             await self.hooks.fire(STOP, self._lifecycle_context(), response)
             # Opt-in automatic memory extraction, off the hot path.
             try:
@@ -2752,6 +2755,8 @@ class AgentLoop:
                 yield chunk
         finally:
             self.run_active = False
+            if self._session_manager:
+                self._session_manager.flush()
 
     async def _run_streaming_loop(
         self,
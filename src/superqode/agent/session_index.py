@@ -0,0 +1,227 @@
+"""
+Byte-offset sidecar index for JSONL session transcripts.
+
+``<id>.idx`` holds one fixed-size record per non-empty transcript line:
+byte offset, line length, role code and the running count of user messages.
+Fixed-size records make message K a single seek, let tail reads skip the
+prefix of the transcript entirely, and let a rewind truncate both files at a
+known offset instead of re-parsing and rewriting the log.
+
+The index is advisory. :meth:`TranscriptIndex.sync` compares it against the
+transcript and catches up on lines appended without it (older versions,
+other processes) or rebuilds it when the transcript shrank or was replaced.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+# offset (u64), length (u32), role code (u8), user ordinal (u32)
+_RECORD = struct.Struct("<QIBI")
+
+ROLE_CODES = {"user": 1, "assistant": 2, "tool": 3, "system": 4}
+OTHER_ROLE = 0
+#: Role code for lines that are not valid JSON objects; readers skip them.
+INVALID_ROLE = 255
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """Location and shape of one transcript line."""
+
+    offset: int
+    length: int
+    role: int
+    user_ordinal: int
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+    @property
+    def is_user(self) -> bool:
+        return self.role == ROLE_CODES["user"]
+
+    @property
+    def is_valid(self) -> bool:
+        return self.role != INVALID_ROLE
+
+
+def role_code(role: object) -> int:
+    """Map a message role to its index code."""
+    return ROLE_CODES.get(role, OTHER_ROLE) if isinstance(role, str) else OTHER_ROLE
+
+
+def _line_role(line: bytes) -> int:
+    try:
+        data = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return INVALID_ROLE
+    if not isinstance(data, dict):
+        return INVALID_ROLE
+    return role_code(data.get("role"))
+
+
+class TranscriptIndex:
+    """Sidecar offset index for one JSONL transcript."""
+
+    record_size = _RECORD.size
+
+    def __init__(self, transcript: Path):
+        self.transcript = Path(transcript)
+        self.path = self.transcript.with_suffix(".idx")
+        # (entry count, covered transcript bytes, last user ordinal) after a
+        # successful sync or append; None means "unknown, sync before use".
+        self._state: Optional[Tuple[int, int, int]] = None
+
+    def __len__(self) -> int:
+        return self.sync()
+
+    def _index_bytes(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _read_state(self) -> Tuple[int, int, int]:
+        count = self._index_bytes() // self.record_size
+        if count == 0:
+            return 0, 0, 0
+        last = self._read(count - 1, count)[0]
+        return count, last.end, last.user_ordinal
+
+    def _read(self, start: int, stop: int) -> List[IndexEntry]:
+        if stop <= start:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(start * self.record_size)
+            data = f.read((stop - start) * self.record_size)
+        usable = len(data) - len(data) % self.record_size
+        return [IndexEntry(*fields) for fields in _RECORD.iter_unpack(data[:usable])]
+
+    def _write(self, records: Iterable[Tuple[int, int, int, int]], *, start: int) -> None:
+        payload = b"".join(_RECORD.pack(*record) for record in records)
+        mode = "r+b" if self.path.exists() else "wb"
+        with open(self.path, mode) as f:
+            f.seek(start * self.record_size)
+            f.write(payload)
+            f.truncate()
+
+    def _scan(self, offset: int, count: int, ordinal: int) -> Tuple[int, int, int]:
+        """Index transcript lines from ``offset``; returns the new state."""
+        records: List[Tuple[int, int, int, int]] = []
+        with open(self.transcript, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A partially written trailing line is indexed once complete.
+                    break
+                start, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                role = _line_role(line)
+                if role == ROLE_CODES["user"]:
+                    ordinal += 1
+                records.append((start, len(line), role, ordinal))
+        self._write(records, start=count)
+        return count + len(records), offset, ordinal
+
+    def sync(self) -> int:
+        """Bring the index in line with the transcript; returns the entry count."""
+        try:
+            size = self.transcript.stat().st_size
+        except FileNotFoundError:
+            self.clear()
+            return 0
+        state = self._state
+        if state is None or self._index_bytes() != state[0] * self.record_size:
+            state = self._read_state()
+        count, covered, ordinal = state
+        if covered > size or (covered and not self._ends_line(covered)):
+            # The transcript was truncated or replaced underneath the index.
+            count, covered, ordinal = 0, 0, 0
+        if covered < size:
+            count, covered, ordinal = self._scan(covered, count, ordinal)
+        self._state = (count, covered, ordinal)
+        return count
+
+    def _ends_line(self, offset: int) -> bool:
+        with open(self.transcript, "rb") as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+
+    def append(self, offset: int, lines: List[Tuple[bytes, str]]) -> None:
+        """Record ``lines`` just written to the transcript at ``offset``.
+
+        Only extends an index known to end exactly at ``offset``; otherwise the
+        index is left for the next :meth:`sync` to catch up.
+        """
+        if self._state is None:
+            self._state = self._read_state()
+        count, covered, ordinal = self._state
+        if covered != offset:
+            self._state = None
+            return
+        records: List[Tuple[int, int, int, int]] = []
+        for line, role in lines:
+            code = role_code(role)
+            if code == ROLE_CODES["user"]:
+                ordinal += 1
+            records.append((offset, len(line), code, ordinal))
+            offset += len(line)
+        with open(self.path, "ab") as f:
+            f.write(b"".join(_RECORD.pack(*record) for record in records))
+        self._state = (count + len(records), offset, ordinal)
+
+    def entry(self, k: int) -> Optional[IndexEntry]:
+        """Return entry ``k`` (negative counts from the end) in O(1)."""
+        count = self.sync()
+        if k < 0:
+            k += count
+        if not 0 <= k < count:
+            return None
+        return self._read(k, k + 1)[0]
+
+    def entries(self, start: int, stop: int) -> List[IndexEntry]:
+        """Return entries ``start`` up to ``stop`` (clamped to the index)."""
+        count = self.sync()
+        return self._read(max(0, start), min(stop, count))
+
+    def find_user(self, occurrence: int) -> Optional[int]:
+        """Return the entry number of the Nth (1-based) user message."""
+        count = self.sync()
+        if occurrence < 1 or count == 0 or self._state[2] < occurrence:
+            return None
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._read(mid, mid + 1)[0].user_ordinal < occurrence:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def truncate(self, k: int) -> int:
+        """Drop entries from ``k`` on and cut the transcript to match.
+
+        Returns the transcript length after the cut.
+        """
+        count = self.sync()
+        if k >= count:
+            return self._state[1]
+        k = max(0, k)
+        offset = self._read(k, k + 1)[0].offset
+        ordinal = self._read(k - 1, k)[0].user_ordinal if k else 0
+        os.truncate(self.transcript, offset)
+        os.truncate(self.path, k * self.record_size)
+        self._state = (k, offset, ordinal)
+        return offset
+
+    def clear(self) -> None:
+        self._state = None
+        self.path.unlink(missing_ok=True)
@@ -2,18 +2,42 @@
 JSONL Session Storage for Agent Conversations.
 
 Stores conversation history in JSONL format for fast appends
-and easy resumption of previous sessions.
+and easy resumption of previous sessions. A sidecar offset index
+(:mod:`superqode.agent.session_index`) is maintained on append so tail reads,
+random access and rewinds do not re-parse the whole transcript, and a
+:class:`~superqode.session.catalog.SessionCatalog` is fed as messages are
+written so listing and full-text search never open individual files.
+
+The transcript is the source of truth for per-message counters: appending a
+message is a single write to ``<id>.jsonl``. ``message_count`` and
+``updated_at`` are derived from the log (counting lines past the checkpoint
+recorded in ``<id>.meta.json``), so the metadata file and the switchboard graph
+are only rewritten on session-level transitions such as create, rebind, fork,
+rewind and :meth:`SessionStore.flush`.
 """
 
 from __future__ import annotations
 
 import json
 import os
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..session.catalog import CatalogMessage, CatalogSession, SessionCatalog
+from .session_index import IndexEntry, TranscriptIndex
+
+#: Append flush policies accepted by :class:`SessionStore`.
+#: ``"line"`` hands every message to the OS as soon as it is appended;
+#: ``"buffered"`` holds encoded lines in memory until :meth:`SessionStore.flush`,
+#: a read of the same session, or ``flush_every`` pending messages.
+FLUSH_POLICIES = ("line", "buffered")
+
+_COUNT_CHUNK_BYTES = 1024 * 1024
+
+#: ``store`` key for this module's rows in the shared session catalog.
+CATALOG_STORE = "agent"
 
 
 @dataclass
@@ -49,16 +73,170 @@ class SessionMessage:
 
 
 class SessionStore:
-    """JSONL-based session storage."""
+    """JSONL-based session storage.
+
+    Args:
+        base_dir: Directory holding ``<id>.jsonl`` transcripts and metadata.
+        flush_policy: ``"line"`` (default) or ``"buffered"``; see
+            :data:`FLUSH_POLICIES`.
+        fsync: ``os.fsync`` the transcript whenever appended lines are written.
+        flush_every: In buffered mode, write pending lines once this many
+            messages are queued for a session.
+        catalog: Keep ``catalog.sqlite3`` up to date for listing and search.
+    """
 
-    def __init__(self, base_dir: str = ".superqode/sessions"):
+    def __init__(
+        self,
+        base_dir: str = ".superqode/sessions",
+        *,
+        flush_policy: str = "line",
+        fsync: bool = False,
+        flush_every: int = 64,
+        catalog: bool = True,
+    ):
+        if flush_policy not in FLUSH_POLICIES:
+            raise ValueError(
+                f"Unknown flush policy {flush_policy!r}; expected one of {FLUSH_POLICIES}"
+            )
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_policy = flush_policy
+        self.fsync = fsync
+        self.flush_every = max(1, flush_every)
+        # session_id -> (encoded line, message) not yet written (buffered policy only)
+        self._pending: Dict[str, List[Tuple[bytes, SessionMessage]]] = {}
+        self._indexes: Dict[str, TranscriptIndex] = {}
+        # session_id -> (log bytes, message count) last observed by this store
+        self._log_counts: Dict[str, Tuple[int, int]] = {}
+        # session_id -> preview of the newest message, awaiting a graph update
+        self._graph_dirty: Dict[str, str] = {}
+        self._use_catalog = catalog
+        self._catalog_instance: Optional[SessionCatalog] = None
 
     def _session_path(self, session_id: str) -> Path:
         """Get path for session file."""
         return self.base_dir / f"{session_id}.jsonl"
 
+    def _meta_path(self, session_id: str) -> Path:
+        return self.base_dir / f"{session_id}.meta.json"
+
+    def _index(self, session_id: str) -> TranscriptIndex:
+        index = self._indexes.get(session_id)
+        if index is None:
+            index = self._indexes[session_id] = TranscriptIndex(self._session_path(session_id))
+        return index
+
+    def _catalog(self) -> Optional[SessionCatalog]:
+        """Open the directory's session catalog, reindexing it on first creation."""
+        if not self._use_catalog:
+            return None
+        if self._catalog_instance is None:
+            self._catalog_instance = SessionCatalog.for_storage(self.base_dir)
+            if self._catalog_instance.created:
+                self.reindex()
+        return self._catalog_instance
+
+    def _project_root(self) -> str:
+        base = self.base_dir.resolve()
+        if base.name == "sessions" and base.parent.name == ".superqode":
+            return str(base.parent.parent)
+        return ""
+
+    def _catalog_record(self, metadata: SessionMetadata) -> CatalogSession:
+        return CatalogSession(
+            store=CATALOG_STORE,
+            session_id=metadata.session_id,
+            title=metadata.title,
+            agents=[metadata.harness_id] if metadata.harness_id else [],
+            provider=metadata.provider,
+            model=metadata.model,
+            project_path=self._project_root(),
+            parent_session_id=metadata.parent_session_id,
+            created_at=metadata.created_at,
+            updated_at=metadata.updated_at,
+            message_count=metadata.message_count,
+            metadata=_metadata_dict(metadata),
+        )
+
+    def _write_lines(self, session_id: str, lines: List[Tuple[bytes, SessionMessage]]) -> None:
+        """Append encoded lines to the transcript with one write and index them."""
+        with open(self._session_path(session_id), "ab") as f:
+            offset = f.tell()
+            f.write(b"".join(line for line, _ in lines))
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        index = self._index(session_id)
+        index.append(offset, [(line, message.role) for line, message in lines])
+        catalog = self._catalog()
+        if catalog is not None:
+            first = index.sync() - len(lines)
+            catalog.add_messages(
+                CATALOG_STORE,
+                session_id,
+                [
+                    CatalogMessage(first + i, message.role, message.content, message.timestamp)
+                    for i, (_, message) in enumerate(lines)
+                ],
+            )
+
+    def _flush_log(self, session_id: str) -> None:
+        """Write any buffered lines for ``session_id``."""
+        lines = self._pending.pop(session_id, None)
+        if lines:
+            self._write_lines(session_id, lines)
+
+    def _log_stats(self, session_id: str, checkpoint: Tuple[int, int] = (0, 0)) -> Tuple[int, int]:
+        """Return ``(log bytes, message count)`` for the written transcript.
+
+        Counting resumes from the newest known checkpoint that still fits in
+        the file, so only bytes appended since then are scanned.
+        """
+        path = self._session_path(session_id)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            self._log_counts.pop(session_id, None)
+            return 0, 0
+
+        offset, count = 0, 0
+        for candidate in (self._log_counts.get(session_id), checkpoint):
+            if candidate and offset < candidate[0] <= size:
+                offset, count = candidate
+        if offset < size:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                while chunk := f.read(_COUNT_CHUNK_BYTES):
+                    count += chunk.count(b"\n")
+        self._log_counts[session_id] = (size, count)
+        return size, count
+
+    def _derive_counters(
+        self, session_id: str, metadata: SessionMetadata, checkpoint: Tuple[int, int]
+    ) -> SessionMetadata:
+        """Fill ``message_count``/``updated_at`` from the transcript."""
+        _, count = self._log_stats(session_id, checkpoint)
+        metadata.message_count = count + len(self._pending.get(session_id, ()))
+        try:
+            mtime = self._session_path(session_id).stat().st_mtime
+        except FileNotFoundError:
+            return metadata
+        log_updated = datetime.fromtimestamp(mtime).isoformat()
+        if log_updated > metadata.updated_at:
+            metadata.updated_at = log_updated
+        return metadata
+
+    def _read_metadata(self, meta_path: Path) -> Optional[SessionMetadata]:
+        try:
+            data = json.loads(meta_path.read_text())
+            # Legacy metadata has no checkpoint; its log is counted from the start.
+            log_bytes = int(data.pop("log_bytes", 0) or 0)
+            metadata = SessionMetadata(**data)
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None
+        checkpoint = (log_bytes, metadata.message_count if log_bytes else 0)
+        return self._derive_counters(metadata.session_id, metadata, checkpoint)
+
     def create_session(
         self,
         session_id: str,
@@ -105,29 +283,21 @@ class SessionStore:
         return metadata
 
     def _save_metadata(self, metadata: SessionMetadata):
-        """Save session metadata."""
-        meta_path = self.base_dir / f"{metadata.session_id}.meta.json"
+        """Save session metadata.
+
+        ``message_count`` is checkpointed together with the transcript size it
+        was counted at, so later readers only scan lines appended since.
+        """
+        self._flush_log(metadata.session_id)
+        log_bytes, message_count = self._log_stats(metadata.session_id)
+        metadata.message_count = message_count
+        meta_path = self._meta_path(metadata.session_id)
         meta_path.write_text(
-            json.dumps(
-                {
-                    "session_id": metadata.session_id,
-                    "created_at": metadata.created_at,
-                    "updated_at": metadata.updated_at,
-                    "provider": metadata.provider,
-                    "model": metadata.model,
-                    "message_count": metadata.message_count,
-                    "total_tokens": metadata.total_tokens,
-                    "parent_session_id": metadata.parent_session_id,
-                    "title": metadata.title,
-                    "harness_id": metadata.harness_id,
-                    "harness_source": metadata.harness_source,
-                    "harness_digest": metadata.harness_digest,
-                    "tool_contract_version": metadata.tool_contract_version,
-                    "harness_transitions": list(metadata.harness_transitions),
-                },
-                indent=2,
-            )
+            json.dumps({**_metadata_dict(metadata), "log_bytes": log_bytes}, indent=2)
         )
+        catalog = self._catalog()
+        if catalog is not None:
+            catalog.upsert_session(self._catalog_record(metadata))
 
     def _record_graph(self, metadata: SessionMetadata, **updates: Any) -> None:
         """Best-effort update of the durable switchboard graph."""
@@ -154,14 +324,10 @@ class SessionStore:
 
     def get_metadata(self, session_id: str) -> Optional[SessionMetadata]:
         """Get session metadata."""
-        meta_path = self.base_dir / f"{session_id}.meta.json"
+        meta_path = self._meta_path(session_id)
         if not meta_path.exists():
             return None
-        try:
-            data = json.loads(meta_path.read_text())
-            return SessionMetadata(**data)
-        except (json.JSONDecodeError, KeyError, TypeError):
-            return None
+        return self._read_metadata(meta_path)
 
     def update_execution_binding(
         self,
@@ -217,22 +383,42 @@ class SessionStore:
         return metadata
 
     def append_message(self, session_id: str, message: SessionMessage):
-        """Append a message to session."""
-        path = self._session_path(session_id)
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(message.__dict__, ensure_ascii=False) + "\n")
+        """Append a message to session.
 
-        # Update metadata
-        metadata = self.get_metadata(session_id)
-        if metadata:
-            metadata.updated_at = datetime.now().isoformat()
-            metadata.message_count += 1
-            self._save_metadata(metadata)
-            self._record_graph(
-                metadata,
-                last_result_preview=(message.content or "")[:240],
-                status="idle",
-            )
+        This is a single transcript append; metadata counters are derived from
+        the log and the graph preview is published by :meth:`flush`.
+        """
+        line = (json.dumps(message.__dict__, ensure_ascii=False) + "\n").encode("utf-8")
+        if self.flush_policy == "buffered":
+            pending = self._pending.setdefault(session_id, [])
+            pending.append((line, message))
+            if len(pending) >= self.flush_every:
+                self._flush_log(session_id)
+        else:
+            self._write_lines(session_id, [(line, message)])
+        self._graph_dirty[session_id] = (message.content or "")[:240]
+
+    def flush(self, session_id: Optional[str] = None) -> None:
+        """Write buffered messages and publish session-level state.
+
+        Checkpoints ``<id>.meta.json`` and records the newest message preview
+        in the switchboard graph for every session appended to since the last
+        flush. Pass ``session_id`` to limit the flush to one session.
+        """
+        targets = [session_id] if session_id else list(set(self._pending) | set(self._graph_dirty))
+        for sid in targets:
+            self._flush_log(sid)
+            preview = self._graph_dirty.pop(sid, None)
+            if preview is None:
+                continue
+            metadata = self.get_metadata(sid)
+            if metadata:
+                self._save_metadata(metadata)
+                self._record_graph(metadata, last_result_preview=preview, status="idle")
+
+    def close(self) -> None:
+        """Flush every session; the store stays usable afterwards."""
+        self.flush()
 
     def append_tool_result(
         self,
@@ -256,39 +442,27 @@ class SessionStore:
         shorter history, so resending the edited message continues cleanly from
         that point. Returns the number of stored messages removed.
         """
+        self._flush_log(session_id)
         path = self._session_path(session_id)
         if occurrence < 1 or not path.exists():
             return 0
 
-        raw_lines: List[str] = []
-        user_line_indices: List[int] = []
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                idx = len(raw_lines)
-                raw_lines.append(line.rstrip("\n"))
-                try:
-                    if json.loads(line).get("role") == "user":
-                        user_line_indices.append(idx)
-                except json.JSONDecodeError:
-                    continue
-
-        if occurrence > len(user_line_indices):
+        index = self._index(session_id)
+        cut = index.find_user(occurrence)
+        if cut is None:
             return 0
-
-        cut = user_line_indices[occurrence - 1]
-        removed = len(raw_lines) - cut
+        removed = index.sync() - cut
         if removed <= 0:
             return 0
+        log_bytes = index.truncate(cut)
 
-        with open(path, "w", encoding="utf-8") as f:
-            for line in raw_lines[:cut]:
-                f.write(line + "\n")
-
+        self._log_counts[session_id] = (log_bytes, cut)
+        self._graph_dirty.pop(session_id, None)
+        catalog = self._catalog()
+        if catalog is not None:
+            catalog.truncate_messages(CATALOG_STORE, session_id, cut)
         metadata = self.get_metadata(session_id)
         if metadata:
-            metadata.message_count = max(0, metadata.message_count - removed)
             metadata.updated_at = datetime.now().isoformat()
             self._save_metadata(metadata)
             self._record_graph(metadata)
@@ -296,15 +470,17 @@ class SessionStore:
 
     def get_messages(self, session_id: str, limit: Optional[int] = None) -> List[SessionMessage]:
         """Get all messages from session."""
+        self._flush_log(session_id)
         path = self._session_path(session_id)
         if not path.exists():
             return []
 
         if limit is not None and limit <= 0:
             return []
+        if limit:
+            return self._read_entries(path, self._tail_entries(session_id, limit))
 
-        messages: list[SessionMessage] | deque[SessionMessage]
-        messages = deque(maxlen=limit) if limit else []
+        messages: List[SessionMessage] = []
         with open(path, "r", encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
@@ -314,17 +490,71 @@ class SessionStore:
                         messages.append(SessionMessage(**data))
                     except json.JSONDecodeError:
                         continue
-        return list(messages)
+        return messages
+
+    def get_message(self, session_id: str, position: int) -> Optional[SessionMessage]:
+        """Return the stored message at ``position`` (negative counts from the end).
+
+        Positions count non-empty transcript lines and are resolved through
+        the offset index, so this is a single seek regardless of length.
+        """
+        self._flush_log(session_id)
+        path = self._session_path(session_id)
+        if not path.exists():
+            return None
+        entry = self._index(session_id).entry(position)
+        if entry is None or not entry.is_valid:
+            return None
+        messages = self._read_entries(path, [entry])
+        return messages[0] if messages else None
+
+    def _tail_entries(self, session_id: str, limit: int) -> List[IndexEntry]:
+        """Index entries of the last ``limit`` decodable messages."""
+        index = self._index(session_id)
+        stop = index.sync()
+        entries: List[IndexEntry] = []
+        while stop > 0 and len(entries) < limit:
+            start = max(0, stop - (limit - len(entries)))
+            entries[:0] = [entry for entry in index.entries(start, stop) if entry.is_valid]
+            stop = start
+        return entries[-limit:]
+
+    @staticmethod
+    def _read_entries(path: Path, entries: List[IndexEntry]) -> List[SessionMessage]:
+        messages: List[SessionMessage] = []
+        with open(path, "rb") as f:
+            for entry in entries:
+                f.seek(entry.offset)
+                try:
+                    data = json.loads(f.read(entry.length))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                messages.append(SessionMessage(**data))
+        return messages
 
     def list_sessions(self) -> List[SessionMetadata]:
-        """List all sessions."""
+        """List all sessions, newest first.
+
+        Served from the session catalog when it is available; falls back to
+        reading every ``*.meta.json`` otherwise.
+        """
+        catalog = self._catalog()
+        if catalog is not None:
+            sessions = [
+                metadata
+                for record in catalog.list_sessions(store=CATALOG_STORE)
+                if (metadata := _metadata_from_record(record)) is not None
+            ]
+            if sessions or not any(self.base_dir.glob("*.meta.json")):
+                return sessions
+        return self._list_sessions_from_files()
+
+    def _list_sessions_from_files(self) -> List[SessionMetadata]:
         sessions = []
         for meta_file in self.base_dir.glob("*.meta.json"):
-            try:
-                data = json.loads(meta_file.read_text())
-                sessions.append(SessionMetadata(**data))
-            except (json.JSONDecodeError, KeyError):
-                continue
+            metadata = self._read_metadata(meta_file)
+            if metadata is not None:
+                sessions.append(metadata)
 
         # Sort by updated_at descending
         sessions.sort(key=lambda s: s.updated_at, reverse=True)
@@ -333,7 +563,15 @@ class SessionStore:
     def delete_session(self, session_id: str):
         """Delete a session."""
         path = self._session_path(session_id)
-        meta_path = self.base_dir / f"{session_id}.meta.json"
+        meta_path = self._meta_path(session_id)
+        self._pending.pop(session_id, None)
+        self._log_counts.pop(session_id, None)
+        self._graph_dirty.pop(session_id, None)
+        self._indexes.pop(session_id, None)
+        TranscriptIndex(path).clear()
+        catalog = self._catalog()
+        if catalog is not None:
+            catalog.delete_session(CATALOG_STORE, session_id)
 
         if path.exists():
             path.unlink()
@@ -346,8 +584,64 @@ class SessionStore:
         except Exception:
             pass
 
+    def reindex(self) -> bool:
+        """Rebuild this directory's catalog rows from the files on disk.
+
+        Used the first time a catalog is created next to existing sessions and
+        by ``superqode sessions reindex`` after files were changed outside the
+        store. Returns False when the catalog could not be written.
+        """
+        catalog = self._catalog()
+        if catalog is None:
+            return False
+        for session_id in list(self._pending):
+            self._flush_log(session_id)
+        return catalog.replace_store(
+            CATALOG_STORE,
+            (
+                (self._catalog_record(metadata), self._catalog_messages(metadata.session_id))
+                for metadata in self._list_sessions_from_files()
+            ),
+        )
+
+    def _catalog_messages(self, session_id: str) -> Iterator[CatalogMessage]:
+        """Yield catalog rows for a transcript, numbered like the offset index."""
+        path = self._session_path(session_id)
+        if not path.exists():
+            return
+        position = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    yield CatalogMessage(
+                        position,
+                        str(data.get("role") or ""),
+                        str(data.get("content") or ""),
+                        str(data.get("timestamp") or ""),
+                    )
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+                position += 1
+
+    def search(self, query: str, limit: int = 20, **filters: Any) -> List[Any]:
+        """Full-text search this directory's sessions via the catalog.
+
+        ``filters`` are passed to :meth:`SessionCatalog.search` (``agent``,
+        ``model``, ``project``, ``since``, ``until``, ``include_tool_output``,
+        ``per_session``). Returns :class:`~superqode.session.catalog.CatalogHit`
+        objects, best first.
+        """
+        catalog = self._catalog()
+        if catalog is None:
+            return []
+        return catalog.search(query, store=CATALOG_STORE, limit=limit, **filters)
+
     def get_session_size(self, session_id: str) -> int:
         """Get session file size in bytes."""
+        self._flush_log(session_id)
         path = self._session_path(session_id)
         if path.exists():
             return path.stat().st_size
@@ -363,11 +657,9 @@ class SessionStore:
         Returns:
             The new session metadata
         """
+        self._flush_log(session_id)
         old_path = self._session_path(session_id)
-        old_meta_path = self.base_dir / f"{session_id}.meta.json"
-
         new_path = self._session_path(new_session_id)
-        new_meta_path = self.base_dir / f"{new_session_id}.meta.json"
 
         if not old_path.exists():
             raise FileNotFoundError(f"Session {session_id} not found")
@@ -375,6 +667,11 @@ class SessionStore:
         import shutil
 
         shutil.copy2(old_path, new_path)
+        old_index = self._index(session_id)
+        old_index.sync()
+        self._indexes.pop(new_session_id, None)
+        if old_index.path.exists():
+            shutil.copy2(old_index.path, self._index(new_session_id).path)
 
         # Load and update metadata
         metadata = self.get_metadata(session_id)
@@ -386,6 +683,9 @@ class SessionStore:
             metadata.parent_session_id = parent_session_id
             metadata.title = metadata.title or f"Fork of {parent_session_id}"
             self._save_metadata(metadata)
+            catalog = self._catalog()
+            if catalog is not None:
+                catalog.copy_messages(CATALOG_STORE, parent_session_id, new_session_id)
             self._record_graph(metadata, kind="fork")
             return metadata
         else:
@@ -393,6 +693,35 @@ class SessionStore:
             return self.create_session(new_session_id, parent_session_id=session_id)
 
 
+def _metadata_dict(metadata: SessionMetadata) -> Dict[str, Any]:
+    return {
+        "session_id": metadata.session_id,
+        "created_at": metadata.created_at,
+        "updated_at": metadata.updated_at,
+        "provider": metadata.provider,
+        "model": metadata.model,
+        "message_count": metadata.message_count,
+        "total_tokens": metadata.total_tokens,
+        "parent_session_id": metadata.parent_session_id,
+        "title": metadata.title,
+        "harness_id": metadata.harness_id,
+        "harness_source": metadata.harness_source,
+        "harness_digest": metadata.harness_digest,
+        "tool_contract_version": metadata.tool_contract_version,
+        "harness_transitions": list(metadata.harness_transitions),
+    }
+
+
+def _metadata_from_record(record: CatalogSession) -> Optional[SessionMetadata]:
+    try:
+        metadata = SessionMetadata(**record.metadata)
+    except TypeError:
+        return None
+    metadata.message_count = record.message_count
+    metadata.updated_at = max(metadata.updated_at, record.updated_at)
+    return metadata
+
+
 class SessionManager:
     """Manages agent sessions with JSONL storage."""
 
@@ -400,8 +729,11 @@ class SessionManager:
         self,
         storage_dir: str = ".superqode/sessions",
         max_sessions: int = 100,
+        *,
+        flush_policy: str = "line",
+        fsync: bool = False,
     ):
-        self.store = SessionStore(storage_dir)
+        self.store = SessionStore(storage_dir, flush_policy=flush_policy, fsync=fsync)
         self.max_sessions = max_sessions
         self._current_session_id: Optional[str] = None
 
@@ -475,6 +807,10 @@ class SessionManager:
             raise RuntimeError("No active session. Call start_session first.")
         self.store.append_tool_result(self._current_session_id, tool_name, result)
 
+    def flush(self) -> None:
+        """Persist buffered messages and session-level state for all sessions."""
+        self.store.flush()
+
     def get_messages(self, limit: Optional[int] = None) -> List[SessionMessage]:
         """Get messages from current session."""
         if not self._current_session_id:
@@ -709,6 +709,8 @@ COMMANDS = [
     ":sessions",
     ":sessions resume",
     ":sessions list",
+    ":sessions search",
+    ":sessions reindex",
     ":sessions tree",
     ":sessions graph",
     ":sessions switch",
@@ -6372,22 +6372,44 @@ class CommandImplMixin:
         if subcommand == "search":
             provider_name = "local"
             query_parts = rest
-            if len(rest) >= 2 and rest[0] in {"local", "specmem", "mem0", "cognee", "supermemory"}:
+            if len(rest) >= 2 and rest[0] in {
+                "local",
+                "specmem",
+                "mem0",
+                "cognee",
+                "supermemory",
+                "all",
+            }:
                 provider_name = rest[0]
                 query_parts = rest[1:]
             query = " ".join(query_parts).strip()
             if not query:
-                log.add_info("Usage: :memory search [local|specmem] <query>")
+                log.add_info("Usage: :memory search [local|specmem|all] <query>")
                 return
+            reports = []
             try:
-                results = create_memory_provider(provider_name, project_root=Path.cwd()).search(
-                    query
-                )
+                if provider_name == "all":
+                    from superqode.memory import federated_memory_search
+
+                    federated = federated_memory_search(query, project_root=Path.cwd())
+                    results, reports = list(federated.results), list(federated.providers)
+                else:
+                    results = create_memory_provider(provider_name, project_root=Path.cwd()).search(
+                        query
+                    )
             except Exception as exc:
                 log.add_error(f"Could not search memory: {exc}")
                 return
             t = Text()
             t.append("\n  Memory Search\n\n", style=f"bold {THEME['purple']}")
+            for report in reports:
+                t.append(f"  {report.provider:<12}", style=THEME["muted"])
+                t.append(
+                    f"{report.status:<8}{report.elapsed_ms:7.0f} ms  {report.result_count}\n",
+                    style=THEME["success"] if report.status == "ok" else THEME["dim"],
+                )
+            if reports:
+                t.append("\n")
             if not results:
                 t.append("  No memory matches.\n", style=THEME["muted"])
             for result in results:
@@ -3491,6 +3491,19 @@ class DialogsMixin:
         except Exception as exc:
             add("MCP", "warn", f"unavailable: {exc}", ":mcp doctor")
 
+        try:
+            from superqode.lsp.pool import current_lsp_pool
+
+            lsp_pool = current_lsp_pool()
+            if lsp_pool is None:
+                add("LSP", "ready", "no shared language servers started yet")
+            else:
+                stats = lsp_pool.stats()
+                dead = sum(1 for server in stats["servers"] if not server["alive"])
+                add("LSP", "warn" if dead else "ready", lsp_pool.summary(stats))
+        except Exception as exc:
+            add("LSP", "warn", f"unavailable: {exc}")
+
         try:
             from superqode.skills import load_skills
 
@@ -99,23 +99,45 @@ def memory_remember(text, kind, scope, tags):
 @click.option(
     "--provider",
     default="local",
-    help="Memory provider: local, specmem, mem0, cognee, or supermemory",
+    help="Memory provider: local, specmem, mem0, cognee, supermemory, or all (every enabled one)",
 )
 @click.option("--limit", default=8, show_default=True)
+@click.option(
+    "--timeout",
+    default=5.0,
+    show_default=True,
+    help="Seconds each provider may take with --provider all",
+)
 @click.option("--json", "json_output", is_flag=True, help="Emit JSON")
-def memory_search(query, provider, limit, json_output):
+def memory_search(query, provider, limit, timeout, json_output):
     """Search memory."""
-    from superqode.memory import create_memory_provider
+    from superqode.memory import create_memory_provider, federated_memory_search
 
-    try:
-        results = create_memory_provider(provider, project_root=Path.cwd()).search(
-            query, limit=limit
+    if provider == "all":
+        federated = federated_memory_search(
+            query, project_root=Path.cwd(), limit=limit, timeout=timeout
         )
-    except Exception as exc:
-        raise click.ClickException(str(exc)) from exc
-    if json_output:
-        click.echo(json.dumps([result.to_dict() for result in results], indent=2))
-        return
+        if json_output:
+            click.echo(json.dumps(federated.to_dict(), indent=2))
+            return
+        for report in federated.providers:
+            detail = f"  {report.error}" if report.error else ""
+            click.echo(
+                f"{report.provider:<12} {report.status:<8} {report.elapsed_ms:7.0f} ms  "
+                f"{report.result_count} results{detail}"
+            )
+        click.echo()
+        results = list(federated.results)
+    else:
+        try:
+            results = create_memory_provider(provider, project_root=Path.cwd()).search(
+                query, limit=limit
+            )
+        except Exception as exc:
+            raise click.ClickException(str(exc)) from exc
+        if json_output:
+            click.echo(json.dumps([result.to_dict() for result in results], indent=2))
+            return
     if not results:
         click.echo("No memory matches.")
         return
@@ -1,4 +1,4 @@
-"""SuperQode 'sessions' CLI: list/tree/graph/switch/handoff/fork stored sessions."""
+"""SuperQode 'sessions' CLI: list/search/tree/graph/switch/handoff/fork stored sessions."""
 
 import json
 import click
@@ -52,6 +52,75 @@ def sessions_list(limit, json_output):
         )
 
 
+@sessions.command("search")
+@click.argument("query")
+@click.option("--agent", default=None, help="Only sessions run by this agent/harness")
+@click.option("--model", default=None, help="Only sessions using this model")
+@click.option("--project", default=None, help="Only sessions for this project path")
+@click.option("--since", default=None, help="Only messages at or after this ISO date/time")
+@click.option("--until", default=None, help="Only messages at or before this ISO date/time")
+@click.option("--tools", "include_tools", is_flag=True, help="Also search tool output")
+@click.option("--limit", default=20, type=int, help="Maximum sessions to show")
+@click.option("--json", "json_output", is_flag=True, help="Emit JSON")
+def sessions_search(query, agent, model, project, since, until, include_tools, limit, json_output):
+    """Full-text search message content across stored sessions."""
+    from superqode.headless import search_sessions
+
+    hits = search_sessions(
+        query,
+        limit=limit,
+        agent=agent,
+        model=model,
+        project=project,
+        since=since,
+        until=until,
+        include_tool_output=include_tools,
+    )
+    if json_output:
+        click.echo(
+            json.dumps(
+                [
+                    {
+                        "session_id": hit.session.session_id,
+                        "title": hit.session.title,
+                        "model": hit.session.model,
+                        "updated_at": hit.session.updated_at,
+                        "score": hit.score,
+                        "role": hit.role,
+                        "position": hit.position,
+                        "timestamp": hit.timestamp,
+                        "snippet": hit.snippet,
+                    }
+                    for hit in hits
+                ]
+            )
+        )
+        return
+
+    if not hits:
+        click.echo("No matching sessions.")
+        return
+
+    for hit in hits:
+        snippet = " ".join(hit.snippet.split())
+        click.echo(
+            f"{hit.session.session_id}  {hit.session.model or '-'}  "
+            f"#{hit.position} {hit.role}: {snippet}"
+        )
+
+
+@sessions.command("reindex")
+def sessions_reindex():
+    """Rebuild the session search catalog from the stored session files."""
+    from superqode.headless import reindex_sessions
+
+    try:
+        count = reindex_sessions()
+    except Exception as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(f"Reindexed {count} sessions.")
+
+
 @sessions.command("tree")
 @click.option("--json", "json_output", is_flag=True, help="Emit JSON")
 def sessions_tree(json_output):
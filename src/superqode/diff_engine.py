@@ -0,0 +1,499 @@
+"""
+SuperQode Diff Engine - Line diffs with predictable cost.
+
+``difflib.SequenceMatcher`` is quadratic on large or heavily rewritten files
+and has no way to give up, which can stall the TUI. This engine:
+
+- interns lines to integer ids, so every comparison is an int compare;
+- strips the common prefix and suffix before doing any real work;
+- runs a histogram diff (as in git/jgit): split each region on the lines
+  unique to both sides (their longest common chain, as patience diff does),
+  else on the rarest shared line extended to a matching run, and recurse,
+  using Myers' O(ND) algorithm for small regions and where no rare anchor
+  exists;
+- enforces a :class:`DiffBudget`. Inputs over the size budget, or diffs that
+  run past the time or edit-cost budget, degrade to a coarse "replaced"
+  result: common prefix/suffix kept, everything between replaced.
+
+Every result, degraded or not, is a valid edit script, so patches generated
+from it still apply. :func:`diff_many` optionally diffs multi-file change sets
+in a process pool.
+
+Usage:
+    from superqode.diff_engine import diff_lines, unified_diff
+
+    result = diff_lines(old.splitlines(True), new.splitlines(True))
+    result.opcodes          # same shape as SequenceMatcher.get_opcodes()
+    "".join(unified_diff(old_lines, new_lines, "a/x.py", "b/x.py"))
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+Opcode = Tuple[str, int, int, int, int]
+
+# Lines occurring more often than this in the old side are never anchors.
+MAX_ANCHOR_OCCURRENCES = 64
+
+# Change sets smaller than this (total lines) are not worth a process pool.
+PARALLEL_MIN_LINES = 200_000
+
+# Regions this small go straight to Myers, which is cheap at this size and,
+# unlike anchoring, always finds a minimal diff.
+MYERS_REGION_LINES = 400
+
+
+@dataclass(frozen=True)
+class DiffBudget:
+    """Limits after which a diff degrades to a coarse "replaced" result."""
+
+    max_lines: int = 400_000  # old + new lines, after trimming prefix/suffix
+    max_seconds: float = 2.0
+    max_edit_cost: int = 1_000  # Myers D per unanchored region
+
+
+DEFAULT_BUDGET = DiffBudget()
+
+
+@dataclass
+class DiffResult:
+    """Outcome of diffing two line sequences."""
+
+    opcodes: List[Opcode]
+    algorithm: str  # "identical", "histogram" or "replaced"
+    degraded: bool = False
+    reason: str = ""
+    elapsed: float = 0.0
+    stats: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def additions(self) -> int:
+        return sum(j2 - j1 for tag, _, _, j1, j2 in self.opcodes if tag in ("insert", "replace"))
+
+    @property
+    def deletions(self) -> int:
+        return sum(i2 - i1 for tag, i1, i2, _, _ in self.opcodes if tag in ("delete", "replace"))
+
+    def summary(self) -> str:
+        """One-line description, used when a degraded diff is not rendered."""
+        text = f"+{self.additions} -{self.deletions} lines"
+        if self.degraded:
+            text += f" (file replaced: {self.reason})"
+        return text
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+# ============================================================================
+# CORE ALGORITHMS
+# ============================================================================
+
+
+def _intern(a: Sequence[str], b: Sequence[str]) -> Tuple[List[int], List[int]]:
+    ids: Dict[str, int] = {}
+    a_ids = [ids.setdefault(line, len(ids)) for line in a]
+    b_ids = [ids.setdefault(line, len(ids)) for line in b]
+    return a_ids, b_ids
+
+
+def _myers(
+    a: List[int],
+    b: List[int],
+    a0: int,
+    a1: int,
+    b0: int,
+    b1: int,
+    max_d: int,
+    deadline: float,
+) -> Optional[List[Tuple[int, int]]]:
+    """Matched ``(i, j)`` pairs of a shortest edit script, or None past ``max_d``."""
+    n, m = a1 - a0, b1 - b0
+    max_d = min(max_d, n + m)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace: List[List[int]] = []
+    for d in range(max_d + 1):
+        if d & 63 == 0 and time.monotonic() > deadline:
+            raise _BudgetExceeded("time")
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[a0 + x] == b[b0 + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, n, m, d, a0, b0)
+        trace.append(v[offset - d : offset + d + 1])
+    return None
+
+
+def _myers_backtrack(
+    trace: List[List[int]], x: int, y: int, depth: int, a0: int, b0: int
+) -> List[Tuple[int, int]]:
+    pairs: List[Tuple[int, int]] = []
+    for d in range(depth, 0, -1):
+        prev = trace[d - 1]  # V after step d-1, index k + (d - 1)
+        k = x - y
+        if k == -d or (k != d and prev[k - 1 + d - 1] < prev[k + 1 + d - 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = prev[prev_k + d - 1]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            pairs.append((a0 + x, b0 + y))
+        x, y = prev_x, prev_y
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        pairs.append((a0 + x, b0 + y))
+    pairs.reverse()
+    return pairs
+
+
+def _longest_increasing(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Longest chain of ``pairs`` (sorted by i) with increasing j (patience sorting)."""
+    tails: List[int] = []  # j of the smallest tail of each pile
+    tail_idx: List[int] = []
+    back: List[int] = [-1] * len(pairs)
+    for idx, (_, j) in enumerate(pairs):
+        pile = bisect_left(tails, j)
+        if pile == len(tails):
+            tails.append(j)
+            tail_idx.append(idx)
+        else:
+            tails[pile] = j
+            tail_idx[pile] = idx
+        back[idx] = tail_idx[pile - 1] if pile else -1
+    chain: List[Tuple[int, int]] = []
+    idx = tail_idx[-1] if tail_idx else -1
+    while idx >= 0:
+        chain.append(pairs[idx])
+        idx = back[idx]
+    chain.reverse()
+    return chain
+
+
+def _histogram(
+    a: List[int], b: List[int], budget: DiffBudget, deadline: float, stats: Dict[str, int]
+) -> List[Tuple[int, int, int]]:
+    """Matching blocks ``(i, j, size)`` of ``a`` and ``b``, unsorted.
+
+    Each region is split on anchors: all lines unique to both sides at once
+    (their longest common chain, as patience diff does), else the single
+    rarest shared line, else the region is handed to Myers.
+    """
+    blocks: List[Tuple[int, int, int]] = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        if time.monotonic() > deadline:
+            raise _BudgetExceeded("time")
+        a0, a1, b0, b1 = stack.pop()
+
+        # Common prefix and suffix of the region
+        start = a0
+        while a0 < a1 and b0 < b1 and a[a0] == b[b0]:
+            a0 += 1
+            b0 += 1
+        if a0 > start:
+            blocks.append((start, b0 - (a0 - start), a0 - start))
+        end = a1
+        while a0 < a1 and b0 < b1 and a[a1 - 1] == b[b1 - 1]:
+            a1 -= 1
+            b1 -= 1
+        if a1 < end:
+            blocks.append((a1, b1, end - a1))
+        if a0 == a1 or b0 == b1:
+            continue
+
+        if (a1 - a0) + (b1 - b0) <= MYERS_REGION_LINES:
+            stats["myers_regions"] = stats.get("myers_regions", 0) + 1
+            pairs = _myers(a, b, a0, a1, b0, b1, budget.max_edit_cost, deadline)
+            if pairs is None:
+                stats["replaced_regions"] = stats.get("replaced_regions", 0) + 1
+            else:
+                blocks.extend((i, j, 1) for i, j in pairs)
+            continue
+
+        # Occurrences of each line on both sides of the region
+        occurrences: Dict[int, List[int]] = {}
+        for i in range(a0, a1):
+            occurrences.setdefault(a[i], []).append(i)
+        b_counts: Dict[int, int] = {}
+        b_first: Dict[int, int] = {}
+        for j in range(b0, b1):
+            line = b[j]
+            if line in occurrences:
+                b_counts[line] = b_counts.get(line, 0) + 1
+                b_first.setdefault(line, j)
+
+        unique = sorted(
+            (occurrences[line][0], j)
+            for line, j in b_first.items()
+            if b_counts[line] == 1 and len(occurrences[line]) == 1
+        )
+        if unique:
+            anchors = _longest_increasing(unique)
+            stats["anchors"] = stats.get("anchors", 0) + len(anchors)
+            regions = []
+            pa, pb = a0, b0
+            for i, j in anchors:
+                blocks.append((i, j, 1))
+                regions.append((pa, i, pb, j))
+                pa, pb = i + 1, j + 1
+            regions.append((pa, a1, pb, b1))
+            stack.extend(reversed(regions))
+            continue
+
+        # Even a perfect alignment of the shared lines would cost more edits
+        # than the budget allows: treat the whole region as replaced
+        shared = sum(min(len(occurrences[line]), n) for line, n in b_counts.items())
+        if (a1 - a0) + (b1 - b0) - 2 * shared > budget.max_edit_cost:
+            stats["replaced_regions"] = stats.get("replaced_regions", 0) + 1
+            continue
+
+        # Rarest shared line (occurring at most MAX_ANCHOR_OCCURRENCES times)
+        best: Optional[Tuple[int, int, int]] = None
+        best_count = MAX_ANCHOR_OCCURRENCES + 1
+        j = b0
+        while j < b1:
+            positions = occurrences.get(b[j])
+            if positions is None or len(positions) > best_count:
+                j += 1
+                continue
+            next_j = j + 1
+            for i in positions:
+                # Extend the match around (i, j) as far as the region allows
+                si, sj = i, j
+                while si > a0 and sj > b0 and a[si - 1] == b[sj - 1]:
+                    si -= 1
+                    sj -= 1
+                ei, ej = i + 1, j + 1
+                while ei < a1 and ej < b1 and a[ei] == b[ej]:
+                    ei += 1
+                    ej += 1
+                count = len(positions)
+                if (
+                    best is None
+                    or count < best_count
+                    or (count == best_count and ei - si > best[2])
+                ):
+                    best = (si, sj, ei - si)
+                    best_count = count
+                next_j = max(next_j, ej)
+            j = next_j
+
+        if best is None:
+            # No usable anchor: fall back to Myers for this region
+            stats["myers_regions"] = stats.get("myers_regions", 0) + 1
+            pairs = _myers(a, b, a0, a1, b0, b1, budget.max_edit_cost, deadline)
+            if pairs is None:
+                stats["replaced_regions"] = stats.get("replaced_regions", 0) + 1
+                continue
+            blocks.extend((i, j, 1) for i, j in pairs)
+            continue
+
+        si, sj, size = best
+        blocks.append(best)
+        stack.append((si + size, a1, sj + size, b1))
+        stack.append((a0, si, b0, sj))
+    return blocks
+
+
+def _opcodes(blocks: List[Tuple[int, int, int]], n: int, m: int) -> List[Opcode]:
+    """SequenceMatcher-style opcodes from matching blocks."""
+    merged: List[List[int]] = []
+    for i, j, size in sorted(blocks):
+        if size <= 0:
+            continue
+        if merged and merged[-1][0] + merged[-1][2] == i and merged[-1][1] + merged[-1][2] == j:
+            merged[-1][2] += size
+        else:
+            merged.append([i, j, size])
+
+    ops: List[Opcode] = []
+    i = j = 0
+    for ai, bj, size in merged + [[n, m, 0]]:
+        if i < ai and j < bj:
+            ops.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            ops.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            ops.append(("insert", i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            ops.append(("equal", ai, i, bj, j))
+    return ops
+
+
+def _replaced(a: Sequence[str], b: Sequence[str]) -> List[Opcode]:
+    """Prefix/suffix-trimmed single replace: cheap, always valid."""
+    n, m = len(a), len(b)
+    prefix = 0
+    limit = min(n, m)
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[n - 1 - suffix] == b[m - 1 - suffix]:
+        suffix += 1
+    blocks = [(0, 0, prefix), (n - suffix, m - suffix, suffix)]
+    return _opcodes(blocks, n, m)
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+
+def diff_lines(
+    a: Sequence[str], b: Sequence[str], budget: Optional[DiffBudget] = None
+) -> DiffResult:
+    """Diff two line sequences within ``budget``."""
+    budget = budget or DEFAULT_BUDGET
+    started = time.monotonic()
+    if list(a) == list(b):
+        ops: List[Opcode] = [("equal", 0, len(a), 0, len(b))] if a else []
+        return DiffResult(ops, "identical")
+
+    if len(a) + len(b) > budget.max_lines:
+        ops = _replaced(a, b)
+        changed = sum(i2 - i1 + j2 - j1 for tag, i1, i2, j1, j2 in ops if tag != "equal")
+        if changed > budget.max_lines:
+            return DiffResult(ops, "replaced", True, "size budget", time.monotonic() - started)
+
+    stats: Dict[str, int] = {}
+    a_ids, b_ids = _intern(a, b)
+    try:
+        blocks = _histogram(a_ids, b_ids, budget, started + budget.max_seconds, stats)
+    except _BudgetExceeded as e:
+        return DiffResult(
+            _replaced(a, b), "replaced", True, f"{e} budget", time.monotonic() - started
+        )
+    result = DiffResult(
+        _opcodes(blocks, len(a), len(b)),
+        "histogram",
+        elapsed=time.monotonic() - started,
+        stats=stats,
+    )
+    if stats.get("replaced_regions"):
+        result.degraded = True
+        result.reason = "edit cost budget"
+    return result
+
+
+def grouped_opcodes(opcodes: List[Opcode], n: int = 3) -> Iterator[List[Opcode]]:
+    """Group opcodes into hunks with ``n`` lines of context (as difflib does)."""
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    nn = n + n
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > nn:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def unified_diff_from_opcodes(
+    a: Sequence[str],
+    b: Sequence[str],
+    opcodes: List[Opcode],
+    fromfile: str = "",
+    tofile: str = "",
+    n: int = 3,
+    lineterm: str = "\n",
+) -> Iterator[str]:
+    """Unified diff lines in ``difflib.unified_diff`` format from opcodes."""
+    started = False
+    for group in grouped_opcodes(opcodes, n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}{lineterm}"
+            yield f"+++ {tofile}{lineterm}"
+        first, last = group[0], group[-1]
+        old_range = _format_range(first[1], last[2])
+        new_range = _format_range(first[3], last[4])
+        yield f"@@ -{old_range} +{new_range} @@{lineterm}"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
+
+
+def unified_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    fromfile: str = "",
+    tofile: str = "",
+    n: int = 3,
+    lineterm: str = "\n",
+    budget: Optional[DiffBudget] = None,
+) -> Iterator[str]:
+    """Drop-in for ``difflib.unified_diff`` backed by :func:`diff_lines`."""
+    result = diff_lines(a, b, budget)
+    return unified_diff_from_opcodes(a, b, result.opcodes, fromfile, tofile, n, lineterm)
+
+
+def _diff_pair(args: Tuple[Sequence[str], Sequence[str], Optional[DiffBudget]]) -> DiffResult:
+    return diff_lines(*args)
+
+
+def diff_many(
+    pairs: Sequence[Tuple[Sequence[str], Sequence[str]]],
+    budget: Optional[DiffBudget] = None,
+    workers: Optional[int] = None,
+) -> List[DiffResult]:
+    """Diff several files, in a process pool when it is worth it.
+
+    ``workers`` > 1 enables the pool (``0`` means one per CPU); it is only
+    used for change sets of at least :data:`PARALLEL_MIN_LINES` total lines.
+    Each file gets its own ``budget``.
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    total = sum(len(a) + len(b) for a, b in pairs)
+    if not workers or workers < 2 or len(pairs) < 2 or total < PARALLEL_MIN_LINES:
+        return [diff_lines(a, b, budget) for a, b in pairs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(pairs))) as pool:
+        return list(pool.map(_diff_pair, [(list(a), list(b), budget) for a, b in pairs]))
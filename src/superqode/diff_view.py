@@ -12,7 +12,6 @@ A unique diff visualization with:
 
 from __future__ import annotations
 
-import difflib
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -25,6 +24,8 @@ from rich.table import Table
 from rich.text import Text
 from rich.box import ROUNDED, SIMPLE, MINIMAL
 
+from .diff_engine import DiffBudget, diff_lines, grouped_opcodes
+
 # Textual imports for widget-based diff view
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, ScrollableContainer
@@ -76,6 +77,7 @@ class FileDiff:
     deletions: int
     is_new: bool
     is_deleted: bool
+    summary: Optional[str] = None  # Set instead of hunks for oversized diffs
 
 
 # SuperQode gradient colors
@@ -93,6 +95,11 @@ DIFF_COLORS = {
 }
 
 # Icons for diff display
+# The diff view must stay responsive: past these limits a diff degrades to
+# "replaced", and a degraded diff this large is summarised, not drawn.
+DIFF_VIEW_BUDGET = DiffBudget(max_lines=200_000, max_seconds=0.5)
+MAX_RENDERED_DEGRADED_LINES = 5_000
+
 DIFF_ICONS = {
     "file": "📄",
     "new_file": "✨",
@@ -109,6 +116,10 @@ def compute_diff(old_content: str, new_content: str, path: str = "file") -> File
     """
     Compute the diff between two versions of content.
 
+    Uses :mod:`superqode.diff_engine` under :data:`DIFF_VIEW_BUDGET`. When the
+    budget is exhausted and the replaced region is too large to be worth
+    drawing, the diff carries only a summary line and no hunks.
+
     Args:
         old_content: Original content
         new_content: New content
@@ -124,96 +135,73 @@ def compute_diff(old_content: str, new_content: str, path: str = "file") -> File
     is_new = not old_content.strip()
     is_deleted = not new_content.strip()
 
-    # Get unified diff
-    differ = difflib.unified_diff(
-        old_lines, new_lines, fromfile=f"a/{path}", tofile=f"b/{path}", lineterm=""
-    )
+    result = diff_lines(old_lines, new_lines, DIFF_VIEW_BUDGET)
+    if result.degraded and result.additions + result.deletions > MAX_RENDERED_DEGRADED_LINES:
+        return FileDiff(
+            path=path,
+            old_content=old_content,
+            new_content=new_content,
+            hunks=[],
+            additions=result.additions,
+            deletions=result.deletions,
+            is_new=is_new,
+            is_deleted=is_deleted,
+            summary=result.summary(),
+        )
 
     hunks: List[DiffHunk] = []
-    current_hunk: Optional[DiffHunk] = None
-    additions = 0
-    deletions = 0
-
-    old_line_no = 0
-    new_line_no = 0
-
-    for line in differ:
-        if line.startswith("@@"):
-            # Parse hunk header: @@ -old_start,old_count +new_start,new_count @@
-            if current_hunk:
-                hunks.append(current_hunk)
-
-            parts = line.split()
-            old_info = parts[1][1:].split(",")
-            new_info = parts[2][1:].split(",")
-
-            old_start = int(old_info[0])
-            old_count = int(old_info[1]) if len(old_info) > 1 else 1
-            new_start = int(new_info[0])
-            new_count = int(new_info[1]) if len(new_info) > 1 else 1
-
-            current_hunk = DiffHunk(
-                old_start=old_start,
-                old_count=old_count,
-                new_start=new_start,
-                new_count=new_count,
-                lines=[],
-            )
-            old_line_no = old_start
-            new_line_no = new_start
-
-        elif line.startswith("---") or line.startswith("+++"):
-            continue
-
-        elif current_hunk is not None:
-            content = line[1:] if len(line) > 1 else ""
-
-            if line.startswith("+"):
-                current_hunk.lines.append(
-                    DiffLine(
-                        line_no_old=None,
-                        line_no_new=new_line_no,
-                        content=content.rstrip("\n"),
-                        change_type="+",
+    for group in grouped_opcodes(result.opcodes):
+        first, last = group[0], group[-1]
+        old_count = last[2] - first[1]
+        new_count = last[4] - first[3]
+        hunk = DiffHunk(
+            # Same numbering as a unified diff header: an empty side is
+            # reported at the line before it.
+            old_start=first[1] + 1 if old_count else first[1],
+            old_count=old_count,
+            new_start=first[3] + 1 if new_count else first[3],
+            new_count=new_count,
+            lines=[],
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for offset in range(i2 - i1):
+                    hunk.lines.append(
+                        DiffLine(
+                            line_no_old=i1 + offset + 1,
+                            line_no_new=j1 + offset + 1,
+                            content=old_lines[i1 + offset].rstrip("\n"),
+                            change_type=" ",
+                        )
                     )
-                )
-                new_line_no += 1
-                additions += 1
-
-            elif line.startswith("-"):
-                current_hunk.lines.append(
+                continue
+            for i in range(i1, i2):
+                hunk.lines.append(
                     DiffLine(
-                        line_no_old=old_line_no,
+                        line_no_old=i + 1,
                         line_no_new=None,
-                        content=content.rstrip("\n"),
+                        content=old_lines[i].rstrip("\n"),
                         change_type="-",
                     )
                 )
-                old_line_no += 1
-                deletions += 1
-
-            else:
-                current_hunk.lines.append(
+            for j in range(j1, j2):
+                hunk.lines.append(
                     DiffLine(
-                        line_no_old=old_line_no,
-                        line_no_new=new_line_no,
-                        content=content.rstrip("\n"),
-                        change_type=" ",
+                        line_no_old=None,
+                        line_no_new=j + 1,
+                        content=new_lines[j].rstrip("\n"),
+                        change_type="+",
                     )
                 )
-                old_line_no += 1
-                new_line_no += 1
-
-    if current_hunk:
-        hunks.append(current_hunk)
+        hunks.append(hunk)
 
     return FileDiff(
         path=path,
         old_content=old_content,
         new_content=new_content,
         hunks=hunks,
-        additions=additions,
-        deletions=deletions,
+        additions=result.additions,
+        deletions=result.deletions,
         is_new=is_new,
         is_deleted=is_deleted,
     )
@@ -248,7 +236,7 @@ def render_diff_unified(diff: FileDiff, console: Console, context_lines: int = 3
     render_diff_header(diff, console)
 
     if not diff.hunks:
-        console.print(Text("  no changes", style="dim"))
+        console.print(Text(f"  {diff.summary or 'no changes'}", style="dim"))
         return
 
     # Compute width for the line-number column from the largest line number across hunks.
@@ -291,7 +279,7 @@ def render_diff_split(diff: FileDiff, console: Console, width: int = 80) -> None
     render_diff_header(diff, console)
 
     if not diff.hunks:
-        console.print("  [dim]No changes[/dim]")
+        console.print(Text(f"  {diff.summary or 'No changes'}", style="dim"))
         return
 
     half_width = (width - 10) // 2
@@ -881,6 +869,9 @@ class UnifiedDiffWidget(Container):
         """Render unified diff content."""
         t = Text()
 
+        if self._diff.summary and not self._diff.hunks:
+            t.append(f" {self._diff.summary}\n", style="dim")
+
         for hunk in self._diff.hunks:
             # Hunk header
             t.append(
@@ -134,9 +134,20 @@ def _server_config_from_dict(server_id: str, data: dict[str, Any]) -> MCPServerC
         enabled=bool(data.get("enabled", not data.get("disabled", False))),
         auto_connect=bool(data.get("autoConnect", data.get("auto_connect", True))),
         config=transport_config,
+        startup_timeout=float(data.get("startupTimeout", data.get("startup_timeout", 30.0))),
+        call_timeout=_optional_float(data.get("callTimeout", data.get("call_timeout"))),
+        max_concurrent_calls=int(
+            data.get("maxConcurrentCalls", data.get("max_concurrent_calls", 4))
+        ),
+        result_cache_ttl=float(data.get("resultCacheTtl", data.get("result_cache_ttl", 0.0))),
+        result_cache_size=int(data.get("resultCacheSize", data.get("result_cache_size", 128))),
     )
 
 
+def _optional_float(value: Any) -> float | None:
+    return None if value is None else float(value)
+
+
 def _str_dict(value: Any) -> dict[str, str]:
     if not isinstance(value, dict):
         return {}
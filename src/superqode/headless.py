@@ -383,6 +383,24 @@ def list_sessions(
     return SessionManager(storage_dir=storage_dir).list_all_sessions()[:limit]
 
 
+def search_sessions(
+    query: str,
+    limit: int = 20,
+    storage_dir: str = ".superqode/sessions",
+    **filters: Any,
+) -> List[Any]:
+    """Full-text search stored sessions; returns ranked catalog hits."""
+    return SessionManager(storage_dir=storage_dir).store.search(query, limit=limit, **filters)
+
+
+def reindex_sessions(storage_dir: str = ".superqode/sessions") -> int:
+    """Rebuild the session catalog from disk; returns the number of sessions."""
+    store = SessionManager(storage_dir=storage_dir).store
+    if not store.reindex():
+        raise RuntimeError(f"Could not write the session catalog in {storage_dir}")
+    return len(store.list_sessions())
+
+
 def session_tree(storage_dir: str = ".superqode/sessions") -> List[Dict[str, Any]]:
     """Return sessions with parent/child relationships."""
     sessions = SessionManager(storage_dir=storage_dir).list_all_sessions()
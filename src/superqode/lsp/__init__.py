@@ -6,6 +6,7 @@ code intelligence, and IDE-like features.
 """
 
 from .client import (
+    LanguageServer,
     LSPClient,
     LSPConfig,
     Diagnostic,
@@ -14,13 +15,22 @@ from .client import (
     Position,
     Range,
 )
+from .pool import LSPServerPool, get_lsp_pool
+from .transport import LSPConnection, LSPConnectionClosed, LSPError, LSPTimeoutError
 
 __all__ = [
+    "LanguageServer",
     "LSPClient",
     "LSPConfig",
+    "LSPConnection",
+    "LSPConnectionClosed",
+    "LSPError",
+    "LSPServerPool",
+    "LSPTimeoutError",
     "Diagnostic",
     "DiagnosticSeverity",
     "Location",
     "Position",
     "Range",
+    "get_lsp_pool",
 ]
@@ -11,21 +11,27 @@ Features:
 - Hover information
 - Go to definition
 - Designed for SuperQode's agent workflow
+- asyncio transport with pipelined requests and cancellation (transport.py)
+- Incremental document sync and a diagnostics cache keyed by document version
+  and content hash
+- Servers shared between clients through a process-wide pool (pool.py)
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
 import os
-import subprocess
-import sys
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import IntEnum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
-import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .transport import LSPConnection, LSPError
+
+if TYPE_CHECKING:
+    from .pool import LSPServerPool
 
 
 class DiagnosticSeverity(IntEnum):
@@ -37,6 +43,14 @@ class DiagnosticSeverity(IntEnum):
     HINT = 4
 
 
+class TextDocumentSyncKind(IntEnum):
+    """How a server wants ``textDocument/didChange`` content."""
+
+    NONE = 0
+    FULL = 1
+    INCREMENTAL = 2
+
+
 @dataclass
 class Position:
     """Position in a text document."""
@@ -159,121 +173,222 @@ class LSPConfig:
     timeout: float = 10.0
 
 
-class LSPClient:
-    """
-    Language Server Protocol client.
+def content_hash(text: str) -> str:
+    """Hash of a document's text, used to key cached diagnostics."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
 
-    Manages connections to language servers and provides
-    code diagnostics and intelligence features.
 
-    Usage:
-        config = LSPConfig()
-        client = LSPClient(project_root, config)
+def _common_prefix(a: str, b: str) -> int:
+    # Binary search over slice comparisons: O(n log n) bytes compared in C
+    # rather than a Python loop per character.
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
 
-        # Start server for Python files
-        await client.start_server("python")
 
-        # Get diagnostics for a file
-        diagnostics = await client.get_diagnostics("src/main.py")
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
 
-        # Open a file for tracking
-        await client.open_file("src/main.py")
 
-        # Clean up
-        await client.shutdown()
+def _position(text: str, offset: int) -> Dict[str, int]:
+    """LSP position of ``offset``: zero-based line, UTF-16 code units into it."""
+    line_start = text.rfind("\n", 0, offset) + 1
+    character = len(text[line_start:offset].encode("utf-16-le", "surrogatepass")) // 2
+    return {"line": text.count("\n", 0, offset), "character": character}
+
+
+def incremental_change(old: str, new: str) -> Optional[Dict[str, Any]]:
     """
+    Smallest single ranged ``TextDocumentContentChangeEvent`` turning ``old``
+    into ``new``, or None when they are equal.
 
-    def __init__(
-        self,
-        project_root: Path,
-        config: Optional[LSPConfig] = None,
-    ):
-        self.project_root = Path(project_root).resolve()
-        self.config = config or LSPConfig()
+    The edit spans from the first to the last differing character, so a
+    one-line agent edit to a large file sends one line, not the file.
+    """
+    if old == new:
+        return None
+    prefix = _common_prefix(old, new)
+    if prefix and old[prefix - 1] == "\r":
+        prefix -= 1  # Never split a CRLF line break
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    end = len(old) - suffix
+    if suffix and end > 0 and old[end - 1] == "\r" and old[end] == "\n":
+        suffix -= 1
+        end += 1
+    return {
+        "range": {"start": _position(old, prefix), "end": _position(old, end)},
+        "text": new[prefix : len(new) - suffix],
+    }
 
-        # Server processes
-        self._processes: Dict[str, subprocess.Popen] = {}
-        self._request_id = 0
-        self._pending_requests: Dict[int, asyncio.Future] = {}
 
-        # Reader threads
-        self._readers: Dict[str, threading.Thread] = {}
-        self._running = False
+@dataclass
+class _OpenDocument:
+    """A document the server has open: what it was last sent, and as which version."""
 
-        # Diagnostics cache
-        self._diagnostics: Dict[str, List[Diagnostic]] = {}
+    language: str
+    uri: str
+    text: str
+    version: int = 1
+    content_hash: str = ""
+    # Recent version -> content hash, to place versioned publishDiagnostics
+    hashes: Dict[int, str] = field(default_factory=dict)
+    # Clients that have the document open; it is closed when the last one does
+    owners: Set[int] = field(default_factory=set)
 
-        # Callbacks
-        self._on_diagnostics: Optional[Callable[[str, List[Diagnostic]], None]] = None
+    def set_text(self, text: str, version: int) -> None:
+        self.text = text
+        self.version = version
+        self.content_hash = content_hash(text)
+        self.hashes[version] = self.content_hash
+        for old in [v for v in self.hashes if v <= version - 8]:
+            del self.hashes[old]
 
-        # Locks
-        self._lock = asyncio.Lock()
 
-    def _get_language(self, file_path: str) -> Optional[str]:
-        """Get language ID from file extension."""
-        ext = Path(file_path).suffix.lower()
-        return self.config.extensions.get(ext)
+DiagnosticsCallback = Callable[[str, List[Diagnostic]], None]
 
-    def _next_request_id(self) -> int:
-        """Get next request ID."""
-        self._request_id += 1
-        return self._request_id
 
-    async def start_server(self, language: str) -> bool:
-        """Start a language server."""
-        if language in self._processes:
-            return True  # Already running
+class LanguageServer:
+    """
+    One running language server: its connection, open documents and diagnostics.
 
-        cmd = self.config.servers.get(language)
-        if not cmd:
+    Owned by a single :class:`LSPClient`, or shared between clients through
+    :class:`~superqode.lsp.pool.LSPServerPool`. Documents live here rather
+    than on the client, so clients sharing a server never open a document
+    twice and see the same diagnostics cache.
+    """
+
+    def __init__(
+        self,
+        language: str,
+        project_root: Path,
+        command: Optional[List[str]] = None,
+        timeout: float = 10.0,
+    ):
+        self.language = language
+        self.project_root = Path(project_root)
+        self.command = list(command or [])
+        self.timeout = timeout
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.connection: Optional[LSPConnection] = None
+        self.capabilities: Dict[str, Any] = {}
+        self.sync_kind = TextDocumentSyncKind.FULL
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.started_at = 0.0
+        self.restarts = 0
+
+        # Open documents, by absolute path
+        self.documents: Dict[str, _OpenDocument] = {}
+
+        # Diagnostics: latest per path, and per path the (version, content
+        # hash, diagnostics) they were published for
+        self.diagnostics: Dict[str, List[Diagnostic]] = {}
+        self.diagnostic_cache: Dict[str, Tuple[int, str, List[Diagnostic]]] = {}
+        self._diagnostic_waiters: Dict[str, List[asyncio.Future]] = {}
+        self.listeners: List[DiagnosticsCallback] = []
+
+        self._restart_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def alive(self) -> bool:
+        if self.connection is None or self.connection.closed:
             return False
+        return self.process is None or self.process.returncode is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process is not None else None
 
+    async def start(self) -> bool:
+        """Start the server process and initialize it."""
+        if not self.command:
+            return False
         try:
-            # Start the language server process
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            # Start the language server process. stderr is discarded: nothing
+            # reads it, and a full pipe would stall the server.
+            self.process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
                 cwd=str(self.project_root),
             )
+        except (FileNotFoundError, OSError):
+            return False
 
-            self._processes[language] = process
-
-            # Start reader thread
-            self._running = True
-            reader = threading.Thread(
-                target=self._read_responses,
-                args=(language, process),
-                daemon=True,
-            )
-            reader.start()
-            self._readers[language] = reader
-
-            # Initialize the server
-            await self._initialize(language)
-
-            return True
-
-        except (FileNotFoundError, OSError) as e:
+        try:
+            await self.attach(self.process.stdout, self.process.stdin)
+        except LSPError:
+            await self.stop()
             return False
+        return True
+
+    async def attach(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Connect and initialize a server already running on streams."""
+        self.loop = asyncio.get_running_loop()
+        self.started_at = time.monotonic()
+        self.connection = LSPConnection(
+            reader,
+            writer,
+            name=self.language,
+            timeout=self.timeout,
+            on_notification=self._handle_notification,
+        ).start()
+        await self._initialize()
+
+    async def restart(self) -> bool:
+        """Replace a dead server process and re-open its documents."""
+        if self._restart_lock is None:
+            self._restart_lock = asyncio.Lock()
+        async with self._restart_lock:
+            if self.alive:
+                return True  # Another client restarted it first
+            documents = self.documents
+            await self.stop()
+            if not await self.start():
+                return False
+            self.restarts += 1
+            self.documents = documents
+            for path, document in documents.items():
+                await self.notify(
+                    "textDocument/didOpen",
+                    {
+                        "textDocument": {
+                            "uri": document.uri,
+                            "languageId": document.language,
+                            "version": document.version,
+                            "text": document.text,
+                        }
+                    },
+                )
+            return True
 
-    async def _initialize(self, language: str) -> None:
+    async def _initialize(self) -> None:
         """Initialize a language server."""
-        process = self._processes.get(language)
-        if not process:
-            return
-
-        # Send initialize request
-        result = await self._send_request(
-            language,
+        result = await self.request(
             "initialize",
             {
                 "processId": os.getpid(),
                 "rootUri": f"file://{self.project_root}",
                 "capabilities": {
                     "textDocument": {
-                        "publishDiagnostics": {"relatedInformation": True},
+                        "synchronization": {"dynamicRegistration": False},
+                        "publishDiagnostics": {
+                            "relatedInformation": True,
+                            "versionSupport": True,
+                        },
                         "completion": {"completionItem": {"snippetSupport": True}},
                         "hover": {},
                         "definition": {},
@@ -282,58 +397,43 @@ class LSPClient:
             },
         )
 
+        self.capabilities = (result or {}).get("capabilities", {})
+        self.sync_kind = self._negotiated_sync(self.capabilities)
+
         # Send initialized notification
-        await self._send_notification(language, "initialized", {})
+        await self.notify("initialized", {})
+
+    @staticmethod
+    def _negotiated_sync(capabilities: Dict[str, Any]) -> TextDocumentSyncKind:
+        """Sync kind from server capabilities (a kind, or options with ``change``)."""
+        sync = capabilities.get("textDocumentSync")
+        if isinstance(sync, dict):
+            sync = sync.get("change")
+        try:
+            return TextDocumentSyncKind(sync)
+        except ValueError:
+            # Unspecified: full content is what every server accepts
+            return TextDocumentSyncKind.FULL
+
+    async def request(self, method: str, params: Any) -> Any:
+        """Send a request; raises :class:`LSPError` if the server is not running."""
+        if self.connection is None or self.connection.closed:
+            raise LSPError(f"Language server not running: {self.language}")
+        return await self.connection.request(method, params)
+
+    async def notify(self, method: str, params: Any) -> None:
+        """Send a notification; dropped if the server is not running."""
+        if self.connection is None or self.connection.closed:
+            return
+        try:
+            await self.connection.notify(method, params)
+        except LSPError:
+            pass
 
-    def _read_responses(self, language: str, process: subprocess.Popen) -> None:
-        """Read responses from language server (runs in thread)."""
-        while self._running and process.poll() is None:
-            try:
-                # Read headers
-                headers = {}
-                while True:
-                    line = process.stdout.readline().decode("utf-8")
-                    if not line or line == "\r\n":
-                        break
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        headers[key.strip().lower()] = value.strip()
-
-                # Read content
-                content_length = int(headers.get("content-length", 0))
-                if content_length > 0:
-                    content = process.stdout.read(content_length).decode("utf-8")
-                    message = json.loads(content)
-                    self._handle_message(language, message)
-
-            except Exception:
-                break
-
-    def _handle_message(self, language: str, message: dict) -> None:
-        """Handle a message from language server."""
-        # Response to request
-        if "id" in message and "result" in message:
-            request_id = message["id"]
-            if request_id in self._pending_requests:
-                future = self._pending_requests.pop(request_id)
-                if not future.done():
-                    future.set_result(message.get("result"))
-
-        # Error response
-        elif "id" in message and "error" in message:
-            request_id = message["id"]
-            if request_id in self._pending_requests:
-                future = self._pending_requests.pop(request_id)
-                if not future.done():
-                    future.set_exception(Exception(message["error"].get("message", "LSP Error")))
-
-        # Notification
-        elif "method" in message:
-            method = message["method"]
-            params = message.get("params", {})
-
-            if method == "textDocument/publishDiagnostics":
-                self._handle_diagnostics(params)
+    def _handle_notification(self, method: str, params: Any) -> None:
+        """Handle a notification from the server (on the event loop)."""
+        if method == "textDocument/publishDiagnostics":
+            self._handle_diagnostics(params or {})
 
     def _handle_diagnostics(self, params: dict) -> None:
         """Handle diagnostics notification."""
@@ -348,49 +448,287 @@ class LSPClient:
         # Parse diagnostics
         diagnostics = [Diagnostic.from_dict(d) for d in params.get("diagnostics", [])]
 
-        self._diagnostics[file_path] = diagnostics
+        self.diagnostics[file_path] = diagnostics
+
+        # Cache against the content the diagnostics describe. Without a
+        # version the server is answering the latest content it was sent.
+        document = self.documents.get(file_path)
+        if document is not None:
+            version = params.get("version")
+            if version is None:
+                version = document.version
+            digest = document.hashes.get(version)
+            if digest is not None:
+                self.diagnostic_cache[file_path] = (version, digest, diagnostics)
+                if digest == document.content_hash:
+                    for waiter in self._diagnostic_waiters.pop(file_path, []):
+                        if not waiter.done():
+                            waiter.set_result(diagnostics)
+
+        for listener in list(self.listeners):
+            listener(file_path, diagnostics)
+
+    async def open_document(self, abs_path: Path, content: str, owner: int) -> None:
+        """Open a document for ``owner``, or sync it if the server has it open.
+
+        Unchanged content sends nothing; otherwise the version is bumped and,
+        with incremental sync, only the changed range is sent.
+        """
+        key = str(abs_path)
+        document = self.documents.get(key)
+        if document is None:
+            document = _OpenDocument(language=self.language, uri=f"file://{abs_path}", text=content)
+            document.set_text(content, 1)
+            document.owners.add(owner)
+            self.documents[key] = document
+            await self.notify(
+                "textDocument/didOpen",
+                {
+                    "textDocument": {
+                        "uri": document.uri,
+                        "languageId": self.language,
+                        "version": document.version,
+                        "text": content,
+                    }
+                },
+            )
+            return
+
+        document.owners.add(owner)
+        if document.text == content:
+            return
+
+        if self.sync_kind == TextDocumentSyncKind.INCREMENTAL:
+            changes = [incremental_change(document.text, content)]
+        else:
+            changes = [{"text": content}]
+        document.set_text(content, document.version + 1)
+
+        if self.sync_kind == TextDocumentSyncKind.NONE:
+            return
+        await self.notify(
+            "textDocument/didChange",
+            {
+                "textDocument": {
+                    "uri": document.uri,
+                    "version": document.version,
+                },
+                "contentChanges": changes,
+            },
+        )
+
+    async def close_document(self, abs_path: Path, owner: int) -> None:
+        """Drop ``owner``'s hold on a document; closed once nobody has it open."""
+        document = self.documents.get(str(abs_path))
+        if document is None:
+            return
+        document.owners.discard(owner)
+        if document.owners:
+            return
+        del self.documents[str(abs_path)]
+        await self.notify("textDocument/didClose", {"textDocument": {"uri": document.uri}})
+
+    async def close_documents(self, owner: int) -> None:
+        """Close everything ``owner`` has open."""
+        for path in [p for p, d in self.documents.items() if owner in d.owners]:
+            await self.close_document(Path(path), owner)
+
+    def cached_diagnostics(self, abs_path: str) -> Optional[List[Diagnostic]]:
+        """Diagnostics for the document's current content, or None if not published yet."""
+        document = self.documents.get(abs_path)
+        cached = self.diagnostic_cache.get(abs_path)
+        if document is None or cached is None or cached[1] != document.content_hash:
+            return None
+        return cached[2]
+
+    async def wait_for_diagnostics(self, abs_path: str, timeout: float) -> List[Diagnostic]:
+        """Diagnostics for the document's current content, waiting up to ``timeout``."""
+        cached = self.cached_diagnostics(abs_path)
+        if cached is not None:
+            return cached
+        if abs_path not in self.documents:
+            return self.diagnostics.get(abs_path, [])
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._diagnostic_waiters.setdefault(abs_path, []).append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return self.diagnostics.get(abs_path, [])
+        finally:
+            waiters = self._diagnostic_waiters.get(abs_path, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+
+    async def stop(self) -> None:
+        """Shut the server down, then make sure the process is gone."""
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            if not connection.closed:
+                try:
+                    await connection.request("shutdown", None, timeout=min(2.0, self.timeout))
+                    await connection.notify("exit", None)
+                except LSPError:
+                    pass
+            await connection.close()
+        self.documents = {}
+
+        process, self.process = self.process, None
+        if process is None or process.returncode is not None:
+            return
+        try:
+            await asyncio.wait_for(process.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    def kill_now(self) -> None:
+        """Kill the process without waiting (for interpreter exit)."""
+        if self.process is not None and self.process.returncode is None:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+
+
+class LSPClient:
+    """
+    Language Server Protocol client.
+
+    Manages connections to language servers and provides
+    code diagnostics and intelligence features.
+
+    Usage:
+        config = LSPConfig()
+        client = LSPClient(project_root, config)
+
+        # Start server for Python files
+        await client.start_server("python")
+
+        # Get diagnostics for a file
+        diagnostics = await client.get_diagnostics("src/main.py")
+
+        # Open a file for tracking
+        await client.open_file("src/main.py")
+
+        # Clean up
+        await client.shutdown()
+
+    Documents are tracked per server with their version. ``update_file`` sends
+    only the changed range when the server negotiated incremental sync, and
+    nothing at all when the content is unchanged. Diagnostics are cached
+    against (path, version, content hash), so ``wait_for_diagnostics`` on an
+    unchanged file answers without waiting for the server.
+
+    With a ``pool`` (see :func:`superqode.lsp.pool.get_lsp_pool`) servers are
+    leased from it instead of started per client, and ``shutdown`` hands them
+    back rather than stopping them.
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        config: Optional[LSPConfig] = None,
+        pool: Optional["LSPServerPool"] = None,
+    ):
+        self.project_root = Path(project_root).resolve()
+        self.config = config or LSPConfig()
+        self.pool = pool
+
+        # Running servers by language, and which of them are leased from the pool
+        self._servers: Dict[str, LanguageServer] = {}
+        self._leased: Set[str] = set()
+        self._owner = id(self)
+
+        # Callbacks
+        self._on_diagnostics: Optional[DiagnosticsCallback] = None
+
+        # Locks
+        self._lock = asyncio.Lock()
+
+    @property
+    def _processes(self) -> Dict[str, asyncio.subprocess.Process]:
+        return {lang: s.process for lang, s in self._servers.items() if s.process is not None}
+
+    @property
+    def _connections(self) -> Dict[str, LSPConnection]:
+        return {lang: s.connection for lang, s in self._servers.items() if s.connection}
+
+    def _get_language(self, file_path: str) -> Optional[str]:
+        """Get language ID from file extension."""
+        ext = Path(file_path).suffix.lower()
+        return self.config.extensions.get(ext)
+
+    async def start_server(self, language: str) -> bool:
+        """Start a language server (restarting it if it died)."""
+        server = self._servers.get(language)
+        if server is not None:
+            return server.alive or await server.restart()
+
+        cmd = self.config.servers.get(language)
+        if not cmd:
+            return False
+
+        if self.pool is not None:
+            server = await self.pool.acquire(language, self.project_root, cmd, self.config.timeout)
+            if server is None:
+                return False
+            self._leased.add(language)
+        else:
+            server = LanguageServer(language, self.project_root, cmd, self.config.timeout)
+            if not await server.start():
+                return False
+        self._register(language, server)
+        return True
+
+    async def attach_server(
+        self,
+        language: str,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Connect and initialize a language server already running on streams.
+
+        Used for in-process servers (e.g. a scripted server in tests).
+        """
+        server = LanguageServer(language, self.project_root, timeout=self.config.timeout)
+        await server.attach(reader, writer)
+        self._register(language, server)
+
+    def _register(self, language: str, server: LanguageServer) -> None:
+        server.listeners.append(self._dispatch_diagnostics)
+        self._servers[language] = server
 
+    def _dispatch_diagnostics(self, file_path: str, diagnostics: List[Diagnostic]) -> None:
         # Call callback if set
         if self._on_diagnostics:
             self._on_diagnostics(file_path, diagnostics)
 
+    async def _server_for(self, file_path: str) -> Optional[LanguageServer]:
+        """The running server for a file's language, started on first use."""
+        language = self._get_language(file_path)
+        if not language:
+            return None
+        if not await self.start_server(language):
+            return None
+        return self._servers.get(language)
+
     async def _send_request(
         self,
         language: str,
         method: str,
         params: dict,
     ) -> Any:
-        """Send a request to language server."""
-        process = self._processes.get(language)
-        if not process or process.poll() is not None:
-            raise Exception(f"Language server not running: {language}")
-
-        request_id = self._next_request_id()
-
-        message = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-            "params": params,
-        }
-
-        content = json.dumps(message)
-        header = f"Content-Length: {len(content)}\r\n\r\n"
+        """Send a request to language server.
 
-        # Create future for response
-        future = asyncio.get_event_loop().create_future()
-        self._pending_requests[request_id] = future
-
-        # Send request
-        process.stdin.write(header.encode() + content.encode())
-        process.stdin.flush()
-
-        # Wait for response
-        try:
-            return await asyncio.wait_for(future, timeout=self.config.timeout)
-        except asyncio.TimeoutError:
-            self._pending_requests.pop(request_id, None)
-            raise Exception(f"LSP request timeout: {method}")
+        Requests may be issued concurrently. Raises :class:`LSPError` on an
+        error response, a lost server or a timeout (after which the request is
+        cancelled on the server).
+        """
+        server = self._servers.get(language)
+        if server is None:
+            raise LSPError(f"Language server not running: {language}")
+        return await server.request(method, params)
 
     async def _send_notification(
         self,
@@ -399,127 +737,121 @@ class LSPClient:
         params: dict,
     ) -> None:
         """Send a notification to language server."""
-        process = self._processes.get(language)
-        if not process or process.poll() is not None:
-            return
-
-        message = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params,
-        }
-
-        content = json.dumps(message)
-        header = f"Content-Length: {len(content)}\r\n\r\n"
-
-        process.stdin.write(header.encode() + content.encode())
-        process.stdin.flush()
+        server = self._servers.get(language)
+        if server is not None:
+            await server.notify(method, params)
 
     async def open_file(self, file_path: str) -> None:
-        """Notify server that a file is opened."""
+        """Notify server that a file is opened (or changed, if already open)."""
         abs_path = self.project_root / file_path
-        language = self._get_language(file_path)
+        server = await self._server_for(file_path)
 
-        if not language:
-            return
-
-        if language not in self._processes:
-            await self.start_server(language)
-
-        if not abs_path.exists():
+        if server is None or not abs_path.exists():
             return
 
         content = abs_path.read_text(errors="replace")
-
-        await self._send_notification(
-            language,
-            "textDocument/didOpen",
-            {
-                "textDocument": {
-                    "uri": f"file://{abs_path}",
-                    "languageId": language,
-                    "version": 1,
-                    "text": content,
-                }
-            },
-        )
+        await server.open_document(abs_path, content, self._owner)
 
     async def close_file(self, file_path: str) -> None:
         """Notify server that a file is closed."""
         abs_path = self.project_root / file_path
-        language = self._get_language(file_path)
-
-        if not language or language not in self._processes:
-            return
+        server = self._servers.get(self._get_language(file_path) or "")
 
-        await self._send_notification(
-            language,
-            "textDocument/didClose",
-            {
-                "textDocument": {
-                    "uri": f"file://{abs_path}",
-                }
-            },
-        )
+        if server is not None:
+            await server.close_document(abs_path, self._owner)
 
     async def update_file(self, file_path: str, content: str) -> None:
-        """Notify server of file changes."""
+        """Notify server of file changes.
+
+        Opens the file if the server does not have it yet. Unchanged content
+        sends nothing; otherwise the version is bumped and, with incremental
+        sync, only the changed range is sent.
+        """
         abs_path = self.project_root / file_path
-        language = self._get_language(file_path)
+        server = self._servers.get(self._get_language(file_path) or "")
 
-        if not language or language not in self._processes:
+        if server is None:
             return
-
-        await self._send_notification(
-            language,
-            "textDocument/didChange",
-            {
-                "textDocument": {
-                    "uri": f"file://{abs_path}",
-                    "version": 2,  # Simplified versioning
-                },
-                "contentChanges": [{"text": content}],
-            },
-        )
+        if not server.alive and not await server.restart():
+            return
+        await server.open_document(abs_path, content, self._owner)
 
     async def get_diagnostics(self, file_path: str) -> List[Diagnostic]:
         """Get cached diagnostics for a file."""
         abs_path = str(self.project_root / file_path)
-        return self._diagnostics.get(abs_path, [])
+        for server in self._servers.values():
+            if abs_path in server.diagnostics:
+                return server.diagnostics[abs_path]
+        return []
+
+    def cached_diagnostics(self, file_path: str) -> Optional[List[Diagnostic]]:
+        """Diagnostics for the file's current content, or None if not published yet."""
+        server = self._servers.get(self._get_language(file_path) or "")
+        if server is None:
+            return None
+        return server.cached_diagnostics(str(self.project_root / file_path))
+
+    async def wait_for_diagnostics(
+        self,
+        file_path: str,
+        content: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Diagnostic]:
+        """
+        Sync a file (``content``, or what is on disk) and return diagnostics
+        for that content.
+
+        Answers immediately when the content is unchanged since diagnostics
+        were last published for it; otherwise waits up to ``timeout``
+        (default: the request timeout) and falls back to the latest known.
+        """
+        if content is None:
+            await self.open_file(file_path)
+        else:
+            await self.update_file(file_path, content)
+
+        server = self._servers.get(self._get_language(file_path) or "")
+        if server is None:
+            return []
+        return await server.wait_for_diagnostics(
+            str(self.project_root / file_path),
+            self.config.timeout if timeout is None else timeout,
+        )
 
     async def get_all_diagnostics(self) -> Dict[str, List[Diagnostic]]:
         """Get all cached diagnostics."""
-        return dict(self._diagnostics)
+        merged: Dict[str, List[Diagnostic]] = {}
+        for server in self._servers.values():
+            merged.update(server.diagnostics)
+        return merged
 
     def on_diagnostics(
         self,
-        callback: Callable[[str, List[Diagnostic]], None],
+        callback: DiagnosticsCallback,
     ) -> None:
         """Set callback for diagnostic updates."""
         self._on_diagnostics = callback
 
     async def shutdown(self) -> None:
-        """Shutdown all language servers."""
-        self._running = False
-
-        for language, process in self._processes.items():
-            try:
-                # Send shutdown request
-                await self._send_request(language, "shutdown", {})
-                await self._send_notification(language, "exit", {})
-            except Exception:
-                pass
-
-            # Terminate process
-            try:
-                process.terminate()
-                process.wait(timeout=5.0)
-            except Exception:
-                process.kill()
+        """Shutdown all language servers (or hand pooled ones back)."""
+        servers, self._servers = self._servers, {}
+        leased, self._leased = self._leased, set()
+        for language, server in servers.items():
+            if self._dispatch_diagnostics in server.listeners:
+                server.listeners.remove(self._dispatch_diagnostics)
+            if language in leased and self.pool is not None:
+                try:
+                    await server.close_documents(self._owner)
+                finally:
+                    await self.pool.release(server)
+            else:
+                await server.stop()
+
+    async def __aenter__(self) -> "LSPClient":
+        return self
 
-        self._processes.clear()
-        self._readers.clear()
-        self._diagnostics.clear()
+    async def __aexit__(self, *args) -> None:
+        await self.shutdown()
 
     def __enter__(self) -> "LSPClient":
         return self
@@ -536,9 +868,6 @@ async def get_file_diagnostics(
     client = LSPClient(project_root)
 
     try:
-        await client.open_file(file_path)
-        # Wait a bit for diagnostics
-        await asyncio.sleep(1.0)
-        return await client.get_diagnostics(file_path)
+        return await client.wait_for_diagnostics(file_path, timeout=1.0)
     finally:
         await client.shutdown()
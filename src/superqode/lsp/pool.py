@@ -0,0 +1,373 @@
+"""
+LSP Server Pool - language servers shared across clients.
+
+Every :class:`~superqode.lsp.client.LSPClient` used to start its own
+pyright/tsserver/gopls, so subagents, peer agents and QE runs in one process
+each paid the server's startup and memory. A pool keeps one
+:class:`~superqode.lsp.client.LanguageServer` per (language, workspace root,
+server command) and leases it to every client that asks:
+
+- Leases are reference counted; a server nobody holds is stopped after
+  ``idle_seconds``.
+- At most ``max_servers`` are pooled. When full, the least recently used idle
+  server makes room; if all are in use the caller gets a private server that
+  stops when released.
+- Past ``max_memory_mb`` of resident memory, idle servers are stopped,
+  least recently used first.
+- A server found dead when leased is restarted with its documents re-opened.
+
+:meth:`LSPServerPool.stats` and :meth:`LSPServerPool.report` expose the
+pool's state for doctor output.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .client import LanguageServer
+
+MAX_SERVERS_ENV = "SUPERQODE_LSP_MAX_SERVERS"
+MAX_MEMORY_ENV = "SUPERQODE_LSP_MAX_MEMORY_MB"
+IDLE_SECONDS_ENV = "SUPERQODE_LSP_IDLE_SECONDS"
+
+MAX_SERVERS = 6
+MAX_MEMORY_MB = 4096
+IDLE_SECONDS = 600.0
+
+ServerKey = Tuple[str, str, Tuple[str, ...]]
+
+
+def rss_bytes(pid: Optional[int]) -> Optional[int]:
+    """Resident memory of a process, or None when it cannot be measured."""
+    if pid is None:
+        return None
+    try:
+        import psutil
+
+        return int(psutil.Process(pid).memory_info().rss)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class _Entry:
+    server: LanguageServer
+    refs: int = 0
+    last_used: float = 0.0
+    reaper: Optional[asyncio.TimerHandle] = None
+
+    def cancel_reaper(self) -> None:
+        if self.reaper is not None:
+            self.reaper.cancel()
+            self.reaper = None
+
+
+class LSPServerPool:
+    """Shared :class:`LanguageServer` processes keyed by (language, root, command)."""
+
+    def __init__(
+        self,
+        max_servers: int = MAX_SERVERS,
+        max_memory_mb: Optional[float] = MAX_MEMORY_MB,
+        idle_seconds: float = IDLE_SECONDS,
+    ):
+        self.max_servers = max_servers
+        self.max_memory_mb = max_memory_mb
+        self.idle_seconds = idle_seconds
+        self._entries: Dict[ServerKey, _Entry] = {}
+        self._key_locks: Dict[ServerKey, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Counters
+        self.started = 0
+        self.reused = 0
+        self.unpooled = 0
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+        self.evicted_memory = 0
+        self._dropped_restarts = 0
+
+    @staticmethod
+    def key(language: str, project_root: Path, command: List[str]) -> ServerKey:
+        return (language, str(Path(project_root).resolve()), tuple(command))
+
+    def _bind_loop(self) -> None:
+        # Servers belong to the loop that started them; entries left behind
+        # by a finished loop are unusable.
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        for entry in self._entries.values():
+            entry.cancel_reaper()
+            entry.server.kill_now()
+        self._entries.clear()
+        self._key_locks.clear()
+        self._loop = loop
+
+    async def acquire(
+        self,
+        language: str,
+        project_root: Path,
+        command: List[str],
+        timeout: float = 10.0,
+    ) -> Optional[LanguageServer]:
+        """Lease a running server, starting (or restarting) it if needed.
+
+        Returns None if the server cannot be started. Pair with :meth:`release`.
+        """
+        self._bind_loop()
+        key = self.key(language, project_root, command)
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry.server.alive:
+                # Health check: a crashed server is restarted for its users
+                if not await entry.server.restart():
+                    await self._drop(key)
+                    return None
+            if entry is not None:
+                self.reused += 1
+            else:
+                server = LanguageServer(language, Path(key[1]), command, timeout)
+                pooled = await self._make_room()
+                if not await server.start():
+                    return None
+                if not pooled:
+                    self.unpooled += 1
+                    return server  # Private: stopped again on release
+                self.started += 1
+                entry = _Entry(server)
+                self._entries[key] = entry
+
+            entry.refs += 1
+            entry.last_used = time.monotonic()
+            entry.cancel_reaper()
+        await self._enforce_memory()
+        return entry.server
+
+    async def release(self, server: LanguageServer) -> None:
+        """Return a leased server; it stays warm for ``idle_seconds``."""
+        key, entry = self._find(server)
+        if entry is None:
+            await server.stop()  # Private, or evicted while leased
+            return
+        entry.refs = max(0, entry.refs - 1)
+        entry.last_used = time.monotonic()
+        if entry.refs:
+            return
+        if not server.alive:
+            await self._drop(key)
+            return
+        entry.reaper = asyncio.get_running_loop().call_later(
+            self.idle_seconds, self._reap_soon, key
+        )
+
+    def _find(self, server: LanguageServer) -> Tuple[Optional[ServerKey], Optional[_Entry]]:
+        for key, entry in self._entries.items():
+            if entry.server is server:
+                return key, entry
+        return None, None
+
+    def _idle_entries(self) -> List[Tuple[ServerKey, _Entry]]:
+        """Unleased entries, least recently used first."""
+        idle = [(k, e) for k, e in self._entries.items() if e.refs == 0]
+        return sorted(idle, key=lambda item: item[1].last_used)
+
+    async def _drop(self, key: ServerKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.cancel_reaper()
+            self._dropped_restarts += entry.server.restarts
+            await entry.server.stop()
+
+    async def _make_room(self) -> bool:
+        """Free a slot if the pool is full; False when every server is leased."""
+        if len(self._entries) < self.max_servers:
+            return True
+        idle = self._idle_entries()
+        if not idle:
+            return False
+        self.evicted_capacity += 1
+        await self._drop(idle[0][0])
+        return True
+
+    def memory_bytes(self) -> int:
+        return sum(rss_bytes(e.server.pid) or 0 for e in self._entries.values())
+
+    async def _enforce_memory(self) -> None:
+        if not self.max_memory_mb:
+            return
+        limit = self.max_memory_mb * 1024 * 1024
+        for key, _entry in self._idle_entries():
+            if self.memory_bytes() <= limit:
+                return
+            self.evicted_memory += 1
+            await self._drop(key)
+
+    def _reap_soon(self, key: ServerKey) -> None:
+        task = asyncio.get_running_loop().create_task(self._reap(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reap(self, key: ServerKey) -> None:
+        entry = self._entries.get(key)
+        if entry is not None and entry.refs == 0:
+            self.evicted_idle += 1
+            await self._drop(key)
+
+    async def evict_idle(self) -> int:
+        """Stop servers unleased for ``idle_seconds``; returns how many."""
+        deadline = time.monotonic() - self.idle_seconds
+        expired = [k for k, e in self._idle_entries() if e.last_used <= deadline]
+        self.evicted_idle += len(expired)
+        for key in expired:
+            await self._drop(key)
+        return len(expired)
+
+    async def check_health(self) -> int:
+        """Restart leased servers that died and drop idle dead ones; returns restarts."""
+        restarted = 0
+        for key, entry in list(self._entries.items()):
+            if entry.server.alive:
+                continue
+            if entry.refs and await entry.server.restart():
+                restarted += 1
+            else:
+                await self._drop(key)
+        return restarted
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool state and counters, JSON-serialisable."""
+        now = time.monotonic()
+        servers = []
+        for (language, root, command), entry in self._entries.items():
+            server = entry.server
+            memory = rss_bytes(server.pid)
+            connection = server.connection
+            servers.append(
+                {
+                    "language": language,
+                    "root": root,
+                    "command": list(command),
+                    "pid": server.pid,
+                    "alive": server.alive,
+                    "refs": entry.refs,
+                    "idle_seconds": round(now - entry.last_used, 1) if not entry.refs else 0.0,
+                    "uptime_seconds": round(now - server.started_at, 1),
+                    "restarts": server.restarts,
+                    "documents": len(server.documents),
+                    "requests": connection.requests_sent if connection else 0,
+                    "memory_mb": round(memory / 1024 / 1024, 1) if memory is not None else None,
+                }
+            )
+        return {
+            "servers": servers,
+            "in_use": sum(1 for e in self._entries.values() if e.refs),
+            "memory_mb": round(self.memory_bytes() / 1024 / 1024, 1),
+            "max_servers": self.max_servers,
+            "max_memory_mb": self.max_memory_mb,
+            "idle_seconds": self.idle_seconds,
+            "started": self.started,
+            "reused": self.reused,
+            "restarted": self._dropped_restarts
+            + sum(e.server.restarts for e in self._entries.values()),
+            "unpooled": self.unpooled,
+            "evicted_idle": self.evicted_idle,
+            "evicted_capacity": self.evicted_capacity,
+            "evicted_memory": self.evicted_memory,
+        }
+
+    def summary(self, stats: Optional[Dict[str, Any]] = None) -> str:
+        """One line for status dashboards."""
+        stats = stats or self.stats()
+        languages = ", ".join(sorted({s["language"] for s in stats["servers"]})) or "none"
+        return (
+            f"{len(stats['servers'])}/{stats['max_servers']} servers ({languages}), "
+            f"{stats['in_use']} in use, {stats['memory_mb']:.0f} MB, "
+            f"{stats['reused']} reused, {stats['restarted']} restarted"
+        )
+
+    def report(self) -> List[str]:
+        """Doctor-style lines: totals, then one line per server."""
+        stats = self.stats()
+        memory_cap = f"{stats['max_memory_mb']:.0f} MB" if stats["max_memory_mb"] else "no cap"
+        lines = [
+            f"LSP pool: {self.summary(stats)}",
+            f"  limits: {stats['max_servers']} servers, {memory_cap}, "
+            f"idle timeout {stats['idle_seconds']:.0f}s",
+            f"  started {stats['started']}, unpooled {stats['unpooled']}, evicted "
+            f"{stats['evicted_idle']} idle / {stats['evicted_capacity']} capacity / "
+            f"{stats['evicted_memory']} memory",
+        ]
+        for server in stats["servers"]:
+            memory = f"{server['memory_mb']:.0f} MB" if server["memory_mb"] is not None else "? MB"
+            state = "in use" if server["refs"] else f"idle {server['idle_seconds']:.0f}s"
+            lines.append(
+                f"  {server['language']:<11} pid {server['pid'] or '-':<7} {memory:>7}  "
+                f"refs {server['refs']}  {state}  docs {server['documents']}  "
+                f"restarts {server['restarts']}  {server['root']}"
+            )
+        return lines
+
+    async def aclose(self) -> None:
+        """Stop every pooled server from the event loop that runs them."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for key in list(self._entries):
+            await self._drop(key)
+
+    def close_all(self) -> None:
+        for entry in self._entries.values():
+            entry.cancel_reaper()
+            entry.server.kill_now()
+        self._entries.clear()
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, "") or default)
+    except ValueError:
+        return default
+
+
+_pool: Optional[LSPServerPool] = None
+
+
+def get_lsp_pool() -> LSPServerPool:
+    """The process-wide server pool, sized from the LSP pool environment variables."""
+    global _pool
+    if _pool is None:
+        _pool = LSPServerPool(
+            max_servers=int(_env_number(MAX_SERVERS_ENV, MAX_SERVERS)),
+            max_memory_mb=_env_number(MAX_MEMORY_ENV, MAX_MEMORY_MB),
+            idle_seconds=_env_number(IDLE_SECONDS_ENV, IDLE_SECONDS),
+        )
+        atexit.register(_pool.close_all)
+    return _pool
+
+
+def current_lsp_pool() -> Optional[LSPServerPool]:
+    """The process-wide pool if anything has used it, without creating one."""
+    return _pool
+
+
+__all__ = [
+    "LSPServerPool",
+    "current_lsp_pool",
+    "get_lsp_pool",
+    "rss_bytes",
+]
@@ -0,0 +1,276 @@
+"""
+LSP Transport - JSON-RPC over asyncio streams.
+
+One :class:`LSPConnection` per language server. Frames
+(``Content-Length`` headers + UTF-8 JSON body) are parsed by a single reader
+task on the event loop, so responses resolve their futures on the loop that
+is waiting for them. Any number of requests can be in flight at once; writes
+wait on ``drain()`` so a server that stops reading slows senders down instead
+of growing an unbounded buffer. A request that times out (or whose caller is
+cancelled) is withdrawn with ``$/cancelRequest``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+NotificationHandler = Callable[[str, Any], None]
+RequestHandler = Callable[[str, Any], Union[Any, Awaitable[Any]]]
+
+HEADER_END = b"\r\n\r\n"
+
+# JSON-RPC / LSP error codes
+INTERNAL_ERROR = -32603
+REQUEST_CANCELLED = -32800
+
+
+class LSPError(Exception):
+    """An LSP request failed (error response, timeout or lost connection)."""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class LSPTimeoutError(LSPError):
+    """A request got no response in time; it was cancelled on the server."""
+
+
+class LSPConnectionClosed(LSPError):
+    """The server closed its output (usually because it exited)."""
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Frame a JSON-RPC message. ``Content-Length`` counts bytes, not characters."""
+    body = json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Read one framed message; None at a clean end of stream."""
+    try:
+        header = await reader.readuntil(HEADER_END)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise LSPConnectionClosed("LSP stream ended inside a message header") from e
+    except asyncio.LimitOverrunError as e:
+        raise LSPError("LSP message header too long") from e
+
+    length = None
+    for line in header.decode("ascii", errors="replace").split("\r\n"):
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            try:
+                length = int(value.strip())
+            except ValueError:
+                break
+    if length is None or length < 0:
+        raise LSPError(f"LSP message without a valid Content-Length: {header[:80]!r}")
+
+    try:
+        body = await reader.readexactly(length)
+    except asyncio.IncompleteReadError as e:
+        raise LSPConnectionClosed("LSP stream ended inside a message body") from e
+    return json.loads(body)
+
+
+class LSPConnection:
+    """
+    JSON-RPC connection to one language server.
+
+    ``on_notification(method, params)`` is called on the event loop for every
+    server notification. ``on_request(method, params)`` answers requests the
+    server sends (``workspace/configuration``, capability registration, ...);
+    without one they get an empty result, which keeps servers that wait for an
+    answer moving.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        name: str = "",
+        timeout: float = 10.0,
+        on_notification: Optional[NotificationHandler] = None,
+        on_request: Optional[RequestHandler] = None,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self._reader = reader
+        self._writer = writer
+        self._on_notification = on_notification
+        self._on_request = on_request
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._close_reason = "connection closed"
+
+        # Counters, for benchmarks and health checks
+        self.requests_sent = 0
+        self.bytes_sent = 0
+        self.requests_cancelled = 0
+        self.notifications_received = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> "LSPConnection":
+        if self._reader_task is None:
+            self._reader_task = asyncio.get_running_loop().create_task(self._read_loop())
+        return self
+
+    async def request(
+        self, method: str, params: Any = None, timeout: Optional[float] = None
+    ) -> Any:
+        """Send a request and wait for its result."""
+        if self._closed:
+            raise LSPConnectionClosed(f"Language server not running: {self.name or method}")
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.requests_sent += 1
+        try:
+            await self._write(
+                {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            )
+            return await asyncio.wait_for(future, self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            await self._cancel(request_id)
+            raise LSPTimeoutError(f"LSP request timeout: {method}") from None
+        except asyncio.CancelledError:
+            await asyncio.shield(self._cancel(request_id))
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def notify(self, method: str, params: Any = None) -> None:
+        """Send a notification (no response)."""
+        if not self._closed:
+            await self._write({"jsonrpc": "2.0", "method": method, "params": params})
+
+    async def _cancel(self, request_id: int) -> None:
+        if self._pending.pop(request_id, None) is None or self._closed:
+            return
+        self.requests_cancelled += 1
+        try:
+            await self._write(
+                {"jsonrpc": "2.0", "method": "$/cancelRequest", "params": {"id": request_id}}
+            )
+        except (LSPError, OSError):
+            pass
+
+    async def _write(self, message: Dict[str, Any]) -> None:
+        data = encode_message(message)
+        self.bytes_sent += len(data)
+        try:
+            self._writer.write(data)
+            await self._writer.drain()
+        except (ConnectionError, RuntimeError) as e:
+            self._fail_pending(f"write failed: {e}")
+            raise LSPConnectionClosed(f"Language server not running: {self.name}") from e
+
+    async def _read_loop(self) -> None:
+        reason = "language server closed the connection"
+        try:
+            while True:
+                message = await read_message(self._reader)
+                if message is None:
+                    break
+                self._dispatch(message)
+        except asyncio.CancelledError:
+            reason = "connection closed"
+            raise
+        except (LSPError, ValueError, OSError) as e:
+            reason = str(e)
+        finally:
+            self._fail_pending(reason)
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        if "method" not in message:
+            future = self._pending.pop(message.get("id"), None)
+            if future is None or future.done():
+                return  # Answer to a request we already gave up on
+            error = message.get("error")
+            if error is not None:
+                future.set_exception(
+                    LSPError(error.get("message", "LSP Error"), code=error.get("code"))
+                )
+            else:
+                future.set_result(message.get("result"))
+        elif "id" in message:
+            asyncio.get_running_loop().create_task(
+                self._answer(message["id"], message["method"], message.get("params"))
+            )
+        else:
+            self.notifications_received += 1
+            if self._on_notification is not None:
+                try:
+                    self._on_notification(message["method"], message.get("params"))
+                except Exception:
+                    pass  # A broken handler must not stop the reader
+
+    async def _answer(self, request_id: Any, method: str, params: Any) -> None:
+        try:
+            if self._on_request is not None:
+                result = self._on_request(method, params)
+                if inspect.isawaitable(result):
+                    result = await result
+            elif method == "workspace/configuration":
+                result = [None] * len((params or {}).get("items", []))
+            else:
+                result = None
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except Exception as e:
+            response = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": INTERNAL_ERROR, "message": str(e)},
+            }
+        try:
+            await self._write(response)
+        except LSPError:
+            pass
+
+    def _fail_pending(self, reason: str) -> None:
+        self._closed = True
+        self._close_reason = reason
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(LSPConnectionClosed(f"{self.name or 'LSP'}: {reason}"))
+
+    async def close(self) -> None:
+        """Stop reading and fail anything still waiting for a response."""
+        self._fail_pending("connection closed")
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        try:
+            self._writer.close()
+        except (OSError, RuntimeError):
+            pass
+
+
+__all__ = [
+    "LSPConnection",
+    "LSPConnectionClosed",
+    "LSPError",
+    "LSPTimeoutError",
+    "encode_message",
+    "read_message",
+]
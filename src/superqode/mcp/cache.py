@@ -0,0 +1,93 @@
+"""Result cache for read-only MCP tools.
+
+Servers opt in with ``resultCacheTtl`` in ``mcp.json``. Only tools annotated
+``readOnlyHint`` are cached, since calling them again has no effect to lose.
+Entries expire after the TTL and each server keeps at most
+``resultCacheSize`` of them, evicting the least recently used.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+from superqode.mcp.types import MCPTool, MCPToolResult
+
+
+def is_cacheable(tool: MCPTool | None) -> bool:
+    """Whether a tool's results may be cached."""
+    return bool(tool and tool.annotations and tool.annotations.read_only_hint)
+
+
+def result_key(tool_name: str, arguments: dict[str, Any]) -> str | None:
+    """Cache key for a call, or None if the arguments are not JSON."""
+    try:
+        return json.dumps([tool_name, arguments], sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+
+
+class MCPResultCache:
+    """Per-server LRU caches of tool results with a time-to-live."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, OrderedDict[str, tuple[float, MCPToolResult]]] = {}
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def _count(self, server_id: str, event: str) -> None:
+        counts = self._counts.setdefault(
+            server_id, {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+        )
+        counts[event] += 1
+
+    def get(self, server_id: str, key: str) -> MCPToolResult | None:
+        """Return a live cached result, or None."""
+        entries = self._entries.get(server_id)
+        entry = entries.get(key) if entries else None
+        if entry is None:
+            self._count(server_id, "misses")
+            return None
+        expires, result = entry
+        if expires <= time.monotonic():
+            del entries[key]
+            self._count(server_id, "expired")
+            self._count(server_id, "misses")
+            return None
+        entries.move_to_end(key)
+        self._count(server_id, "hits")
+        return result
+
+    def put(
+        self, server_id: str, key: str, result: MCPToolResult, ttl: float, max_entries: int
+    ) -> None:
+        """Store a result for ``ttl`` seconds, evicting beyond ``max_entries``."""
+        if ttl <= 0 or max_entries <= 0:
+            return
+        entries = self._entries.setdefault(server_id, OrderedDict())
+        entries[key] = (time.monotonic() + ttl, result)
+        entries.move_to_end(key)
+        while len(entries) > max_entries:
+            entries.popitem(last=False)
+            self._count(server_id, "evicted")
+
+    def invalidate(self, server_id: str) -> None:
+        """Drop every cached result for a server."""
+        self._entries.pop(server_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit metrics in total and per server."""
+        servers = {
+            server_id: {**counts, "entries": len(self._entries.get(server_id, ()))}
+            for server_id, counts in self._counts.items()
+        }
+        hits = sum(counts["hits"] for counts in servers.values())
+        misses = sum(counts["misses"] for counts in servers.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": sum(len(entries) for entries in self._entries.values()),
+            "servers": servers,
+        }
@@ -7,12 +7,15 @@ Implements full MCP protocol support aligned with Zed editor's implementation.
 
 import asyncio
 import contextlib
+import contextvars
 import logging
+import time
 import webbrowser
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, Optional
 
+from superqode.mcp.cache import MCPResultCache, is_cacheable, result_key
 from superqode.mcp.config import (
     MCPServerConfig,
     MCPStdioConfig,
@@ -20,6 +23,7 @@ from superqode.mcp.config import (
     MCPSSEConfig,
     load_mcp_config,
 )
+from superqode.mcp.search import BM25Search, MCPToolMatch
 from superqode.mcp.types import (
     MCPTool,
     MCPResource,
@@ -45,6 +49,45 @@ logger = logging.getLogger(__name__)
 LATEST_PROTOCOL_VERSION = "2025-03-26"
 SUPPORTED_PROTOCOL_VERSIONS = [LATEST_PROTOCOL_VERSION, "2024-11-05"]
 
+# Servers started at once by connect_all
+CONNECT_CONCURRENCY = 8
+# Seconds before a server that failed to connect is retried by its next tool call
+RETRY_BACKOFF = 30.0
+
+# Ids of the tools/call requests sent by the current task (see _RequestRecorder)
+_sent_tool_calls: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar(
+    "superqode_mcp_sent_tool_calls", default=None
+)
+
+
+class _RequestRecorder:
+    """Session write stream that notes the id of each ``tools/call`` sent.
+
+    The session sends a request from the task that made the call, so a call
+    that sets :data:`_sent_tool_calls` learns the JSON-RPC id of its own
+    request, which ``notifications/cancelled`` needs.
+    """
+
+    def __init__(self, stream: Any):
+        self._stream = stream
+
+    async def send(self, message: Any) -> None:
+        sent = _sent_tool_calls.get()
+        request = getattr(message.message, "root", None)
+        if sent is not None and getattr(request, "method", None) == "tools/call":
+            sent.append(request.id)
+        await self._stream.send(message)
+
+    async def __aenter__(self) -> "_RequestRecorder":
+        await self._stream.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> Any:
+        return await self._stream.__aexit__(*exc_info)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
 
 class MCPConnectionState(Enum):
     """Connection state for an MCP server."""
@@ -86,6 +129,18 @@ class MCPConnection:
     subscribed_resources: set[str] = field(default_factory=set)
     error_message: str | None = None
     _exit_stack: Any = None  # contextlib.AsyncExitStack
+    _task: Any = None  # asyncio.Task owning the transport and session contexts
+    _ready: Any = None  # asyncio.Future resolved with whether the connect succeeded
+    _stop: Any = None  # asyncio.Event that closes the connection
+    _calls: Any = None  # asyncio.Semaphore bounding concurrent tool calls
+    _failed_at: float = 0.0
+    _detached: bool = False  # Still connecting after its caller stopped waiting
+
+
+def _resolve(future: asyncio.Future, result: bool) -> None:
+    """Resolve ``future`` unless it already is."""
+    if not future.done():
+        future.set_result(result)
 
 
 # Type aliases for callbacks
@@ -126,6 +181,12 @@ class MCPClientManager:
         self._server_configs: dict[str, MCPServerConfig] = {}
         self._exit_stack: contextlib.AsyncExitStack | None = None
 
+        # Tools of connected servers by name, and ranked for search
+        self._tool_index: dict[str, dict[str, MCPTool]] = {}
+        self._tool_search = BM25Search()
+        self._result_cache = MCPResultCache()
+        self._background: set[asyncio.Task] = set()
+
         # Callbacks
         self._state_callbacks: list[StateChangeCallback] = []
         self._tools_changed_callbacks: list[ToolsChangedCallback] = []
@@ -167,6 +228,8 @@ class MCPClientManager:
             del self._server_configs[server_id]
         if server_id in self._connections:
             del self._connections[server_id]
+        self._index_tools(server_id)
+        self._result_cache.invalidate(server_id)
         logger.debug(f"Removed MCP server config: {server_id}")
 
     def get_server_configs(self) -> dict[str, MCPServerConfig]:
@@ -290,8 +353,14 @@ class MCPClientManager:
                 return caps.completions
         return False
 
-    async def connect(self, server_id: str) -> bool:
-        """Connect to an MCP server."""
+    async def connect(self, server_id: str, deadline: float | None = None) -> bool:
+        """Connect to an MCP server.
+
+        Waits at most ``deadline`` seconds, by default the server's
+        ``startup_timeout``. A server still starting by then returns False but
+        keeps connecting in the background: it stays CONNECTING, tool calls
+        wait for it, and the state and tools callbacks fire once it is ready.
+        """
         if server_id not in self._server_configs:
             logger.error(f"Unknown MCP server: {server_id}")
             return False
@@ -302,30 +371,82 @@ class MCPClientManager:
             logger.info(f"MCP server {server_id} is disabled")
             return False
 
-        # Check if already connected
+        # Check if already connected, or join a connect still in progress
         existing = self._connections.get(server_id)
         if existing and existing.state == MCPConnectionState.CONNECTED:
             logger.debug(f"Already connected to {server_id}")
             return True
+        if existing and existing.state == MCPConnectionState.CONNECTING and existing._ready:
+            connection = existing
+        else:
+            connection = self._start_connection(config)
+
+        if deadline is None:
+            deadline = config.startup_timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(connection._ready), deadline)
+        except asyncio.TimeoutError:
+            connection._detached = True
+            logger.warning(
+                f"MCP server {server_id} still starting after {deadline:g}s; "
+                "continuing in the background"
+            )
+            return False
 
-        # Create connection object
-        connection = MCPConnection(server_config=config)
-        connection.state = MCPConnectionState.CONNECTING
-        self._connections[server_id] = connection
-        self._notify_state_change(server_id, MCPConnectionState.CONNECTING)
+    def _start_connection(self, config: MCPServerConfig) -> MCPConnection:
+        """Create a CONNECTING connection and start the task that owns it."""
+        connection = MCPConnection(server_config=config, state=MCPConnectionState.CONNECTING)
+        connection._ready = asyncio.get_running_loop().create_future()
+        connection._stop = asyncio.Event()
+        connection._calls = asyncio.Semaphore(max(1, config.max_concurrent_calls))
+        self._connections[config.id] = connection
+        self._notify_state_change(config.id, MCPConnectionState.CONNECTING)
+        connection._task = asyncio.create_task(
+            self._run_connection(connection), name=f"mcp-{config.id}"
+        )
+        return connection
+
+    async def _run_connection(self, connection: MCPConnection) -> None:
+        """Connect a server and hold its transport and session open until stopped.
 
+        Every context is entered and exited in this one task, as anyio cancel
+        scopes require, so servers can connect concurrently and be
+        disconnected from any task.
+        """
+        server_id = connection.server_config.id
         try:
             await self._establish_connection(connection)
-            connection.state = MCPConnectionState.CONNECTED
-            self._notify_state_change(server_id, MCPConnectionState.CONNECTED)
-            logger.info(f"Connected to MCP server: {server_id}")
-            return True
+        except asyncio.CancelledError:
+            _resolve(connection._ready, False)
+            raise
         except Exception as e:
             connection.state = MCPConnectionState.ERROR
             connection.error_message = str(e)
+            connection._failed_at = time.monotonic()
+            _resolve(connection._ready, False)
             self._notify_state_change(server_id, MCPConnectionState.ERROR)
             logger.error(f"Failed to connect to MCP server {server_id}: {e}")
-            return False
+            return
+
+        connection.state = MCPConnectionState.CONNECTED
+        self._index_tools(server_id)
+        _resolve(connection._ready, True)
+        self._notify_state_change(server_id, MCPConnectionState.CONNECTED)
+        if connection._detached:
+            self._notify_tools_changed(server_id)
+        logger.info(f"Connected to MCP server: {server_id}")
+
+        try:
+            await connection._stop.wait()
+        finally:
+            exit_stack, connection._exit_stack = connection._exit_stack, None
+            if exit_stack:
+                try:
+                    await exit_stack.aclose()
+                except Exception as e:
+                    # Output racing the close (e.g. the reply to a cancelled
+                    # call) breaks the transport's streams; nothing is lost
+                    logger.debug(f"Error closing transport for {server_id}: {e}")
 
     async def _establish_connection(self, connection: MCPConnection) -> None:
         """Establish connection to an MCP server."""
@@ -388,11 +509,12 @@ class MCPClientManager:
             session = await connection._exit_stack.enter_async_context(
                 mcp.ClientSession(
                     read_stream,
-                    write_stream,
+                    _RequestRecorder(write_stream),
                     client_info=mcp.Implementation(
                         name="SuperQode",
                         version="0.1.0",
                     ),
+                    message_handler=self._message_handler(server_id),
                 )
             )
 
@@ -417,7 +539,7 @@ class MCPClientManager:
             # Set up notification handlers
             self._setup_notification_handlers(connection, server_id)
 
-        except Exception:
+        except BaseException:
             if connection._exit_stack:
                 await connection._exit_stack.aclose()
                 connection._exit_stack = None
@@ -458,6 +580,52 @@ class MCPClientManager:
 
         return result
 
+    def _message_handler(self, server_id: str) -> Callable[[Any], Any]:
+        """Build a session message handler that follows list-changed notifications."""
+        import mcp.types as types
+
+        refresh = {
+            types.ToolListChangedNotification: self.refresh_tools,
+            types.ResourceListChangedNotification: self.refresh_resources,
+            types.PromptListChangedNotification: self.refresh_prompts,
+        }
+
+        async def handle(message: Any) -> None:
+            root = getattr(message, "root", None)
+            if type(root) in refresh:
+                # The session reads nothing until this returns, so the list
+                # request has to be made from another task
+                task = asyncio.create_task(refresh[type(root)](server_id))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            elif isinstance(root, types.ResourceUpdatedNotification):
+                self._notify_resource_updated(server_id, str(root.params.uri))
+
+        return handle
+
+    def _index_tools(self, server_id: str) -> None:
+        """Re-index a server's tools after it connects, disconnects or lists new ones."""
+        for name in [name for name, servers in self._tool_index.items() if server_id in servers]:
+            del self._tool_index[name][server_id]
+            if not self._tool_index[name]:
+                del self._tool_index[name]
+        self._tool_search.remove_server(server_id)
+
+        connection = self._connections.get(server_id)
+        if not connection or connection.state != MCPConnectionState.CONNECTED:
+            return
+        for tool in connection.tools:
+            self._tool_index.setdefault(tool.name, {})[server_id] = tool
+            self._tool_search.add(
+                MCPToolMatch(
+                    server=server_id,
+                    name=f"mcp_{server_id}_{tool.name}",
+                    description=tool.description,
+                    input_schema=tool.input_schema,
+                    original_name=tool.name,
+                )
+            )
+
     def _setup_notification_handlers(self, connection: MCPConnection, server_id: str) -> None:
         """Set up handlers for server notifications."""
         # Note: The MCP Python SDK handles notifications through callbacks
@@ -576,13 +744,17 @@ class MCPClientManager:
         old_state = connection.state
         connection.state = MCPConnectionState.DISCONNECTED
         connection.session = None
-
-        if connection._exit_stack:
+        self._index_tools(server_id)
+        self._result_cache.invalidate(server_id)
+
+        task = connection._task
+        if task and not task.done():
+            connection._stop.set()
+            if old_state == MCPConnectionState.CONNECTING:
+                task.cancel()
             try:
-                # Give the exit stack a chance to clean up with a timeout
-                import asyncio
-
-                await asyncio.wait_for(connection._exit_stack.aclose(), timeout=5.0)
+                # Give the owning task a chance to clean up with a timeout
+                await asyncio.wait_for(task, timeout=5.0)
             except asyncio.TimeoutError:
                 logger.warning(f"Timeout closing connection to {server_id}")
             except asyncio.CancelledError:
@@ -595,8 +767,6 @@ class MCPClientManager:
                     logger.warning(f"Runtime error closing connection to {server_id}: {e}")
             except Exception as e:
                 logger.warning(f"Error closing connection to {server_id}: {e}")
-            finally:
-                connection._exit_stack = None
 
         connection.tools = []
         connection.resources = []
@@ -608,23 +778,42 @@ class MCPClientManager:
             self._notify_state_change(server_id, MCPConnectionState.DISCONNECTED)
         logger.info(f"Disconnected from MCP server: {server_id}")
 
-    async def connect_all(self) -> dict[str, bool]:
-        """Connect to all enabled servers with auto_connect=True."""
-        results = {}
-        for server_id, config in self._server_configs.items():
-            if config.enabled and config.auto_connect:
-                results[server_id] = await self.connect(server_id)
-        return results
+    async def connect_all(
+        self,
+        max_concurrency: int = CONNECT_CONCURRENCY,
+        startup_deadline: float | None = None,
+    ) -> dict[str, bool]:
+        """Connect to all enabled servers with auto_connect=True concurrently.
+
+        At most ``max_concurrency`` servers are waited on at once, each for
+        ``startup_deadline`` seconds or its own ``startup_timeout``. Servers
+        that miss it report False and finish connecting in the background.
+        """
+        gate = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _connect(server_id: str) -> bool:
+            async with gate:
+                return await self.connect(server_id, startup_deadline)
+
+        server_ids = [
+            server_id
+            for server_id, config in self._server_configs.items()
+            if config.enabled and config.auto_connect
+        ]
+        results = await asyncio.gather(*(_connect(server_id) for server_id in server_ids))
+        return dict(zip(server_ids, results))
 
     async def disconnect_all(self) -> None:
         """Disconnect from all connected servers."""
-        # Must disconnect sequentially - anyio cancel scopes must be exited
-        # in the same task they were entered
-        for server_id in list(self._connections.keys()):
-            try:
-                await self.disconnect(server_id)
-            except Exception as e:
-                logger.warning(f"Error disconnecting from {server_id}: {e}")
+        # Each connection's contexts are exited by its own task, so these can
+        # run concurrently
+        server_ids = list(self._connections.keys())
+        results = await asyncio.gather(
+            *(self.disconnect(server_id) for server_id in server_ids), return_exceptions=True
+        )
+        for server_id, result in zip(server_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error disconnecting from {server_id}: {result}")
 
     async def reconnect(self, server_id: str) -> bool:
         """Reconnect to an MCP server."""
@@ -647,24 +836,25 @@ class MCPClientManager:
 
     def get_tool(self, server_id: str, tool_name: str) -> MCPTool | None:
         """Get a specific tool by server ID and name."""
-        connection = self._connections.get(server_id)
-        if not connection or connection.state != MCPConnectionState.CONNECTED:
-            return None
-
-        for tool in connection.tools:
-            if tool.name == tool_name:
-                return tool
-        return None
+        return self._tool_index.get(tool_name, {}).get(server_id)
 
     def find_tool(self, tool_name: str) -> tuple[str, MCPTool] | None:
         """Find a tool by name across all servers."""
-        for server_id, connection in self._connections.items():
-            if connection.state != MCPConnectionState.CONNECTED:
-                continue
-            for tool in connection.tools:
-                if tool.name == tool_name:
-                    return (server_id, tool)
-        return None
+        servers = self._tool_index.get(tool_name)
+        if not servers:
+            return None
+        if len(servers) > 1:
+            # Prefer servers in connection order, as a scan would
+            server_id = next(server_id for server_id in self._connections if server_id in servers)
+        else:
+            (server_id,) = servers
+        return (server_id, servers[server_id])
+
+    def search_tools(
+        self, query: str, limit: int = 10, server: str | None = None
+    ) -> list[MCPToolMatch]:
+        """Rank the tools of connected servers against a query with BM25."""
+        return self._tool_search.query(query, limit, server)
 
     async def execute_tool(
         self,
@@ -673,17 +863,52 @@ class MCPClientManager:
         arguments: dict[str, Any],
         timeout: float | None = None,
     ) -> MCPToolResult:
-        """Execute a tool on an MCP server."""
+        """Execute a tool on an MCP server.
+
+        The call is cancelled after ``timeout`` seconds, by default the
+        server's ``call_timeout``, counting time spent waiting for a server
+        still starting and for one of its ``max_concurrent_calls`` slots. The
+        server is sent ``notifications/cancelled`` so it can stop the work.
+        """
         connection = self._connections.get(server_id)
-        if not connection or connection.state != MCPConnectionState.CONNECTED:
+        if not connection or connection.state not in (
+            MCPConnectionState.CONNECTED,
+            MCPConnectionState.CONNECTING,
+            MCPConnectionState.ERROR,
+        ):
             return MCPToolResult(
                 content=[],
                 is_error=True,
                 error_message=f"Not connected to server: {server_id}",
             )
-
+        config = connection.server_config
+        if timeout is None:
+            timeout = config.call_timeout
+
+        cache_key = None
+        if config.result_cache_ttl > 0 and is_cacheable(self.get_tool(server_id, tool_name)):
+            cache_key = result_key(tool_name, arguments)
+        if cache_key is not None:
+            cached = self._result_cache.get(server_id, cache_key)
+            if cached is not None:
+                return cached
+
+        sent: list = []
         try:
-            result = await connection.session.call_tool(tool_name, arguments)
+            async with asyncio.timeout(timeout):
+                connection = await self._wait_connected(server_id)
+                if connection is None:
+                    return MCPToolResult(
+                        content=[],
+                        is_error=True,
+                        error_message=f"Not connected to server: {server_id}",
+                    )
+                async with connection._calls:
+                    recording = _sent_tool_calls.set(sent)
+                    try:
+                        result = await connection.session.call_tool(tool_name, arguments)
+                    finally:
+                        _sent_tool_calls.reset(recording)
 
             # Convert content to dict format
             content = []
@@ -726,11 +951,26 @@ class MCPClientManager:
                 if "Access denied" in first_text or "Error" in first_text:
                     is_error = True
 
-            return MCPToolResult(
+            tool_result = MCPToolResult(
                 content=content,
                 is_error=is_error,
                 structured_content=getattr(result, "structuredContent", None),
             )
+            if cache_key and not is_error:
+                self._result_cache.put(
+                    server_id,
+                    cache_key,
+                    tool_result,
+                    config.result_cache_ttl,
+                    config.result_cache_size,
+                )
+            return tool_result
+        except asyncio.TimeoutError:
+            message = f"Tool {tool_name} on {server_id} timed out after {timeout:g}s"
+            logger.warning(message)
+            if sent:
+                await self._cancel_request(connection, sent[0], message)
+            return MCPToolResult(content=[], is_error=True, error_message=message)
         except Exception as e:
             logger.error(f"Tool execution failed: {e}")
             return MCPToolResult(
@@ -739,6 +979,49 @@ class MCPClientManager:
                 error_message=str(e),
             )
 
+    async def _wait_connected(self, server_id: str) -> MCPConnection | None:
+        """Return a server's connection once connected, or None if it failed.
+
+        Waits for a server still starting, and retries one whose last connect
+        failed at least ``RETRY_BACKOFF`` seconds ago.
+        """
+        connection = self._connections.get(server_id)
+        config = self._server_configs.get(server_id)
+        if connection is None:
+            return None
+        if (
+            connection.state == MCPConnectionState.ERROR
+            and config is not None
+            and config.enabled
+            and time.monotonic() - connection._failed_at >= RETRY_BACKOFF
+        ):
+            logger.info(f"Retrying MCP server {server_id}")
+            connection = self._start_connection(config)
+        if connection.state == MCPConnectionState.CONNECTING and connection._ready:
+            await asyncio.shield(connection._ready)
+        return connection if connection.state == MCPConnectionState.CONNECTED else None
+
+    async def _cancel_request(
+        self, connection: MCPConnection, request_id: int | str, reason: str
+    ) -> None:
+        """Tell a server to stop work on a request nobody is waiting for."""
+        if connection.session is None:
+            return
+        try:
+            import mcp.types as types
+
+            await connection.session.send_notification(
+                types.ClientNotification(
+                    types.CancelledNotification(
+                        params=types.CancelledNotificationParams(
+                            requestId=request_id, reason=reason
+                        )
+                    )
+                )
+            )
+        except Exception as e:
+            logger.debug(f"Failed to cancel request {request_id}: {e}")
+
     async def call_tool(
         self,
         server_id: str,
@@ -961,6 +1244,8 @@ class MCPClientManager:
         try:
             tools_result = await connection.session.list_tools()
             connection.tools = [self._parse_tool(tool, server_id) for tool in tools_result.tools]
+            self._index_tools(server_id)
+            self._result_cache.invalidate(server_id)
             self._notify_tools_changed(server_id)
         except Exception as e:
             logger.error(f"Failed to refresh tools: {e}")
@@ -1034,6 +1319,7 @@ class MCPClientManager:
             "total_resources": len(self.list_all_resources()),
             "total_resource_templates": len(self.list_all_resource_templates()),
             "total_prompts": len(self.list_all_prompts()),
+            "result_cache": self._result_cache.stats(),
             "servers": {
                 server_id: {
                     "state": conn.state.value,
@@ -89,6 +89,13 @@ class MCPServerConfig:
         enabled: Whether the server is enabled
         auto_connect: Whether to connect automatically on startup
         config: Transport-specific configuration
+        startup_timeout: Seconds ``connect_all`` waits for this server before
+            leaving it to finish connecting in the background
+        call_timeout: Default seconds before a tool call is cancelled (None
+            waits for the server however long it takes)
+        max_concurrent_calls: Tool calls allowed in flight on this server at once
+        result_cache_ttl: Seconds to cache results of read-only tools (0 disables)
+        result_cache_size: Most cached results kept for this server
     """
 
     id: str
@@ -97,6 +104,11 @@ class MCPServerConfig:
     enabled: bool = True
     auto_connect: bool = True
     config: MCPStdioConfig | MCPHttpConfig | MCPSSEConfig = field(default_factory=MCPStdioConfig)
+    startup_timeout: float = 30.0
+    call_timeout: float | None = None
+    max_concurrent_calls: int = 4
+    result_cache_ttl: float = 0.0
+    result_cache_size: int = 128
 
 
 def find_mcp_config_file() -> Path | None:
@@ -237,9 +249,44 @@ def _parse_server_config(server_id: str, data: dict[str, Any]) -> MCPServerConfi
         enabled=data.get("enabled", not data.get("disabled", False)),
         auto_connect=data.get("autoConnect", data.get("auto_connect", True)),
         config=config,
+        startup_timeout=_number(data, "startupTimeout", "startup_timeout", 30.0),
+        call_timeout=_number(data, "callTimeout", "call_timeout", None, positive=True),
+        max_concurrent_calls=_number(
+            data, "maxConcurrentCalls", "max_concurrent_calls", 4, int, positive=True
+        ),
+        result_cache_ttl=data.get("resultCacheTtl", data.get("result_cache_ttl", 0.0)),
+        result_cache_size=data.get("resultCacheSize", data.get("result_cache_size", 128)),
     )
 
 
+def _number(
+    data: dict[str, Any],
+    key: str,
+    legacy_key: str,
+    default: Any,
+    kind: type = float,
+    *,
+    positive: bool = False,
+) -> Any:
+    """Read a numeric server setting, accepting numbers written as strings.
+
+    Raises ValueError for anything that is not a number, for negative values,
+    and for zero when ``positive`` is set.
+    """
+    value = data.get(key, data.get(legacy_key))
+    if value is None:
+        return default
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        number = kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a number, got {value!r}") from None
+    if number < 0 or (positive and number == 0):
+        raise ValueError(f"{key} must be {'positive' if positive else 'non-negative'}")
+    return number
+
+
 def _resolve_env_vars(env: dict[str, str]) -> dict[str, str]:
     """Resolve environment variable references in env dict.
 
@@ -284,6 +331,16 @@ def save_mcp_config(
 
         if server_config.description:
             server_data["description"] = server_config.description
+        if server_config.startup_timeout != 30.0:
+            server_data["startupTimeout"] = server_config.startup_timeout
+        if server_config.call_timeout is not None:
+            server_data["callTimeout"] = server_config.call_timeout
+        if server_config.max_concurrent_calls != 4:
+            server_data["maxConcurrentCalls"] = server_config.max_concurrent_calls
+        if server_config.result_cache_ttl:
+            server_data["resultCacheTtl"] = server_config.result_cache_ttl
+        if server_config.result_cache_size != 128:
+            server_data["resultCacheSize"] = server_config.result_cache_size
 
         config = server_config.config
         if isinstance(config, MCPStdioConfig):
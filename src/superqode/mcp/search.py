@@ -7,8 +7,9 @@ the BM25 ranking algorithm.
 
 from __future__ import annotations
 
+import heapq
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any, List, Optional
 
 
@@ -25,7 +26,13 @@ class MCPToolMatch:
 
 
 class BM25Search:
-    """BM25 ranking algorithm implementation for MCP tool search."""
+    """BM25 ranking algorithm implementation for MCP tool search.
+
+    Term statistics are kept up to date as tools are added and removed, and
+    an inverted index limits scoring to tools that share a term with the
+    query, so a long-lived index answers queries without re-reading every
+    tool.
+    """
 
     def __init__(self, k1: float = 1.5, b: float = 0.75):
         """
@@ -37,11 +44,21 @@ class BM25Search:
         """
         self.k1 = k1
         self.b = b
+        self._clear()
+
+    def _clear(self) -> None:
         self.doc_freqs: dict[str, int] = {}
         self.avgdl: float = 0
-        self.doc_lengths: List[int] = []
-        self.doc_term_freqs: List[dict[str, int]] = []
-        self._tools: List[MCPToolMatch] = []
+        self.doc_lengths: dict[int, int] = {}
+        self.doc_term_freqs: dict[int, dict[str, int]] = {}
+        self._tools: dict[int, MCPToolMatch] = {}
+        self._postings: dict[str, dict[int, int]] = {}
+        self._keys: dict[tuple[str, str], int] = {}
+        self._next_id = 0
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._tools)
 
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize text into lowercase terms."""
@@ -55,37 +72,71 @@ class BM25Search:
         """
         Index a list of tool matches for BM25 search.
 
+        Replaces anything indexed before. Documents are numbered in list
+        order, so ``score(query, i)`` scores ``tools[i]``.
+
         Args:
             tools: List of MCPToolMatch objects to index
 
         Returns:
             Self for method chaining
         """
-        self._tools = tools
-        self.doc_term_freqs = []
-        self.doc_lengths = []
-        self.doc_freqs = {}
-
+        self._clear()
         for tool in tools:
-            text = f"{tool.name} {tool.description} {tool.server}"
-            tokens = self._tokenize(text)
-            tf = {}
-            for token in tokens:
-                tf[token] = tf.get(token, 0) + 1
-
-            self.doc_term_freqs.append(tf)
-            self.doc_lengths.append(len(tokens))
-
-            for token in tf:
-                self.doc_freqs[token] = self.doc_freqs.get(token, 0) + 1
-
-        if self.doc_lengths:
-            self.avgdl = sum(self.doc_lengths) / len(self.doc_lengths)
-        else:
-            self.avgdl = 0
-
+            self._add(tool)
         return self
 
+    def add(self, tool: MCPToolMatch) -> None:
+        """Add a tool, replacing any indexed tool with the same server and name."""
+        self.remove(tool.server, tool.name)
+        self._keys[(tool.server, tool.name)] = self._add(tool)
+
+    def remove(self, server: str, name: str) -> bool:
+        """Remove the tool added under ``server`` and ``name``, if any."""
+        doc_id = self._keys.pop((server, name), None)
+        if doc_id is None:
+            return False
+        self._tools.pop(doc_id)
+        self._total_length -= self.doc_lengths.pop(doc_id)
+        for term in self.doc_term_freqs.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if postings:
+                self.doc_freqs[term] -= 1
+            else:
+                del self._postings[term]
+                del self.doc_freqs[term]
+        self._update_avgdl()
+        return True
+
+    def remove_server(self, server: str) -> int:
+        """Remove every tool added for ``server``; returns how many."""
+        names = [name for tool_server, name in self._keys if tool_server == server]
+        for name in names:
+            self.remove(server, name)
+        return len(names)
+
+    def _add(self, tool: MCPToolMatch) -> int:
+        doc_id = self._next_id
+        self._next_id += 1
+        tokens = self._tokenize(f"{tool.name} {tool.description} {tool.server}")
+        tf: dict[str, int] = {}
+        for token in tokens:
+            tf[token] = tf.get(token, 0) + 1
+
+        self._tools[doc_id] = tool
+        self.doc_term_freqs[doc_id] = tf
+        self.doc_lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+        for token, count in tf.items():
+            self._postings.setdefault(token, {})[doc_id] = count
+            self.doc_freqs[token] = self.doc_freqs.get(token, 0) + 1
+        self._update_avgdl()
+        return doc_id
+
+    def _update_avgdl(self) -> None:
+        self.avgdl = self._total_length / len(self._tools) if self._tools else 0
+
     def score(self, query: str, doc_idx: int) -> float:
         """
         Calculate BM25 score for a query against a document.
@@ -97,7 +148,9 @@ class BM25Search:
         Returns:
             BM25 relevance score
         """
-        query_terms = self._tokenize(query)
+        return self._score_terms(self._tokenize(query), doc_idx)
+
+    def _score_terms(self, query_terms: List[str], doc_idx: int) -> float:
         if not query_terms:
             return 0.0
 
@@ -121,6 +174,42 @@ class BM25Search:
 
         return score
 
+    def query(
+        self,
+        query: str,
+        limit: int = 10,
+        server: Optional[str] = None,
+    ) -> List[MCPToolMatch]:
+        """
+        Rank indexed tools against a query.
+
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+            server: Only return tools from this server
+
+        Returns:
+            Copies of the matching tools with ``score`` set, best first
+        """
+        query_terms = self._tokenize(query)
+        candidates: set[int] = set()
+        for term in query_terms:
+            candidates.update(self._postings.get(term, ()))
+
+        scored = []
+        for doc_id in candidates:
+            tool = self._tools[doc_id]
+            if server is not None and tool.server != server:
+                continue
+            score = self._score_terms(query_terms, doc_id)
+            if score > 0:
+                scored.append((score, tool.server, tool.name, doc_id))
+
+        best = (
+            heapq.nlargest(limit, scored) if limit < len(scored) else sorted(scored, reverse=True)
+        )
+        return [replace(self._tools[doc_id], score=score) for score, _, _, doc_id in best]
+
     @staticmethod
     def search(
         tools: List[MCPToolMatch],
@@ -130,6 +219,9 @@ class BM25Search:
         """
         Search tools using BM25 ranking.
 
+        Builds a throwaway index; keep a ``BM25Search`` and call ``query``
+        to search the same tools repeatedly.
+
         Args:
             tools: List of tools to search
             query: Search query string
@@ -141,17 +233,7 @@ class BM25Search:
         if not tools or not query.strip():
             return []
 
-        searcher = BM25Search().index(tools)
-
-        scored_tools = []
-        for idx, tool in enumerate(tools):
-            score = searcher.score(query, idx)
-            if score > 0:
-                tool.score = score
-                scored_tools.append(tool)
-
-        scored_tools.sort(key=lambda t: (t.score, t.server, t.name), reverse=True)
-        return scored_tools[:limit]
+        return BM25Search().index(tools).query(query, limit)
 
 
 def keyword_search(
@@ -2,7 +2,8 @@
 
 This package is provider-neutral. The default provider is local, user-scoped
 project memory. SpecMem is supported as a first-class read provider when a
-project contains a `.specmem/` workspace.
+project contains a `.specmem/` workspace. `federated_memory_search` queries
+every enabled provider at once (see `memory.federated`).
 """
 
 from __future__ import annotations
@@ -10,6 +11,12 @@ from __future__ import annotations
 from pathlib import Path
 
 from .config import MemoryConfig, MemoryProviderConfig, load_memory_config
+from .federated import (
+    DEFAULT_SEARCH_TIMEOUT,
+    FederatedSearchResult,
+    ProviderSearchReport,
+    federated_search,
+)
 from .providers import (
     AgentMemoryProvider,
     CogneeProvider,
@@ -62,9 +69,33 @@ def available_memory_providers(project_root: str | Path = ".") -> list[MemoryPro
     return [provider.status() for provider in providers]
 
 
+def enabled_memory_providers(project_root: str | Path = ".") -> list[AgentMemoryProvider]:
+    """Local memory plus every provider enabled in `superqode.yaml`."""
+    memory_config = load_memory_config(project_root)
+    return [
+        create_memory_provider(name, project_root=project_root)
+        for name in ("local", "specmem", "mem0", "cognee", "supermemory")
+        if memory_config.provider(name).enabled
+    ]
+
+
+def federated_memory_search(
+    query: str,
+    *,
+    project_root: str | Path = ".",
+    limit: int = 8,
+    timeout: float = DEFAULT_SEARCH_TIMEOUT,
+) -> FederatedSearchResult:
+    """Search every enabled provider concurrently and merge the results."""
+    return federated_search(
+        enabled_memory_providers(project_root), query, limit=limit, timeout=timeout
+    )
+
+
 __all__ = [
     "AgentMemoryProvider",
     "CogneeProvider",
+    "FederatedSearchResult",
     "LocalAgentMemoryProvider",
     "Mem0Provider",
     "MemoryConfig",
@@ -72,11 +103,15 @@ __all__ = [
     "MemoryProviderConfig",
     "MemoryRecord",
     "MemorySearchResult",
+    "ProviderSearchReport",
     "SpecMemProvider",
     "SupermemoryProvider",
     "available_memory_providers",
     "create_memory_provider",
     "default_local_memory_path",
+    "enabled_memory_providers",
+    "federated_memory_search",
+    "federated_search",
     "load_memory_config",
     "project_hash",
 ]
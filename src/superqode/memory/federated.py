@@ -0,0 +1,183 @@
+"""Search several memory providers at once.
+
+Each provider's ``search`` runs on its own daemon thread and gets its own
+deadline, so a slow hosted provider costs at most its timeout instead of
+holding up the others. A provider that misses its deadline is reported as
+``timeout`` and its late results are dropped; one that raises is reported as
+``error``.
+
+Providers score on different scales (the local store returns the fraction of
+query words matched, hosted providers return similarities or a flat 1.0), so
+each provider's scores are divided by its best score before merging. Results
+with the same content from several providers are kept once, at the higher
+score, with the other providers listed under ``metadata["also_in"]``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Iterable, Mapping
+
+from .providers import AgentMemoryProvider
+from .types import MemorySearchResult
+
+#: Seconds a provider may take unless ``search_timeout`` is configured for it.
+DEFAULT_SEARCH_TIMEOUT = 5.0
+
+
+@dataclass(frozen=True)
+class ProviderSearchReport:
+    """How one provider fared in a federated search."""
+
+    provider: str
+    status: str = "ok"
+    elapsed_ms: float = 0.0
+    result_count: int = 0
+    error: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "status": self.status,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "result_count": self.result_count,
+            "error": self.error,
+        }
+
+
+@dataclass(frozen=True)
+class FederatedSearchResult:
+    """Merged results plus a report per provider."""
+
+    results: tuple[MemorySearchResult, ...] = ()
+    providers: tuple[ProviderSearchReport, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "results": [result.to_dict() for result in self.results],
+            "providers": [report.to_dict() for report in self.providers],
+        }
+
+
+def provider_timeout(provider: AgentMemoryProvider, default: float) -> float:
+    """Deadline for a provider: its ``search_timeout`` setting, else ``default``."""
+    config = getattr(provider, "config", None)
+    value = config.get("search_timeout") if config is not None else None
+    try:
+        return float(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def normalize_scores(results: Iterable[MemorySearchResult]) -> list[MemorySearchResult]:
+    """Scale one provider's scores so its best result scores 1.0."""
+    results = list(results)
+    best = max((result.score for result in results), default=0.0)
+    if best <= 0:
+        return results
+    return [replace(result, score=result.score / best) for result in results]
+
+
+def merge_results(
+    batches: Iterable[list[MemorySearchResult]], *, limit: int
+) -> list[MemorySearchResult]:
+    """Merge normalized batches, keeping one result per distinct content."""
+    kept: dict[str, MemorySearchResult] = {}
+    also_in: dict[str, list[str]] = {}
+    for batch in batches:
+        for result in batch:
+            key = " ".join(result.record.content.split()).lower()
+            current = kept.get(key)
+            if current is None:
+                kept[key], also_in[key] = result, []
+            elif result.score > current.score:
+                kept[key] = result
+                also_in[key].append(current.provider)
+            else:
+                also_in[key].append(result.provider)
+
+    merged = []
+    for key, result in kept.items():
+        providers = [name for name in dict.fromkeys(also_in[key]) if name != result.provider]
+        if providers:
+            metadata = result.record.metadata | {"also_in": providers}
+            result = replace(result, record=replace(result.record, metadata=metadata))
+        merged.append(result)
+    # Stable: ties keep provider order
+    merged.sort(key=lambda result: result.score, reverse=True)
+    return merged[:limit]
+
+
+def federated_search(
+    providers: Iterable[AgentMemoryProvider],
+    query: str,
+    *,
+    limit: int = 8,
+    timeout: float = DEFAULT_SEARCH_TIMEOUT,
+    timeouts: Mapping[str, float] | None = None,
+) -> FederatedSearchResult:
+    """Search ``providers`` concurrently and merge what returns in time.
+
+    ``timeouts`` overrides the deadline for named providers; the others use
+    their ``search_timeout`` setting or ``timeout``.
+    """
+    providers = list(providers)
+    outcomes: list[dict[str, Any]] = [{} for _ in providers]
+    done = [threading.Event() for _ in providers]
+
+    def run(index: int, provider: AgentMemoryProvider) -> None:
+        started = time.perf_counter()
+        try:
+            outcomes[index]["results"] = provider.search(query, limit=limit)
+        except Exception as exc:
+            outcomes[index]["error"] = str(exc) or type(exc).__name__
+        outcomes[index]["elapsed"] = time.perf_counter() - started
+        done[index].set()
+
+    start = time.monotonic()
+    for index, provider in enumerate(providers):
+        threading.Thread(
+            target=run, args=(index, provider), name=f"memory-search-{provider.name}", daemon=True
+        ).start()
+
+    batches: list[list[MemorySearchResult]] = []
+    reports: list[ProviderSearchReport] = []
+    for index, provider in enumerate(providers):
+        deadline = (timeouts or {}).get(provider.name)
+        if deadline is None:
+            deadline = provider_timeout(provider, timeout)
+        if not done[index].wait(max(0.0, start + deadline - time.monotonic())):
+            reports.append(
+                ProviderSearchReport(
+                    provider=provider.name,
+                    status="timeout",
+                    elapsed_ms=deadline * 1000,
+                    error=f"no response within {deadline:g}s",
+                )
+            )
+            continue
+        outcome = outcomes[index]
+        elapsed_ms = outcome["elapsed"] * 1000
+        if "error" in outcome:
+            reports.append(
+                ProviderSearchReport(
+                    provider=provider.name,
+                    status="error",
+                    elapsed_ms=elapsed_ms,
+                    error=outcome["error"],
+                )
+            )
+            continue
+        results = outcome["results"][:limit]
+        batches.append(normalize_scores(results))
+        reports.append(
+            ProviderSearchReport(
+                provider=provider.name, elapsed_ms=elapsed_ms, result_count=len(results)
+            )
+        )
+
+    return FederatedSearchResult(
+        results=tuple(merge_results(batches, limit=limit)), providers=tuple(reports)
+    )
@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Any, Protocol
 
 from .config import MemoryProviderConfig
+from .store import LocalMemoryStore
 from .types import MemoryProviderStatus, MemoryRecord, MemorySearchResult, now_iso
 
 
@@ -45,82 +46,41 @@ def project_hash(project_root: str | Path = ".") -> str:
 
 
 def default_local_memory_path(project_root: str | Path = ".") -> Path:
-    """Default user-local memory file for a project."""
-    return Path.home() / ".superqode" / "memory" / f"agent-{project_hash(project_root)}.json"
+    """Default user-local memory database for a project."""
+    return Path.home() / ".superqode" / "memory" / f"agent-{project_hash(project_root)}.sqlite3"
 
 
 class LocalAgentMemoryProvider:
-    """Simple local JSON memory provider."""
+    """Local memory provider backed by an SQLite/FTS5 store.
+
+    ``path`` may name the database or a legacy ``.json`` memory file; either
+    way the database sits at the ``.sqlite3`` path and imports the JSON
+    records the first time it is created (see ``memory.store``).
+    """
 
     name = "local"
 
     def __init__(self, project_root: str | Path = ".", path: str | Path | None = None):
         self.project_root = Path(project_root).expanduser().resolve()
-        self.path = (
-            Path(path).expanduser() if path else default_local_memory_path(self.project_root)
-        )
-
-    def _load(self) -> dict:
-        if not self.path.exists():
-            return {
-                "version": 1,
-                "provider": self.name,
-                "project": str(self.project_root),
-                "records": [],
-            }
-        try:
-            data = json.loads(self.path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            data = {}
-        records = data.get("records", [])
-        if not isinstance(records, list):
-            records = []
-        return {
-            "version": 1,
-            "provider": self.name,
-            "project": str(self.project_root),
-            "records": records,
-        }
-
-    def _save(self, data: dict) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
-        )
-
-    def _records(self) -> list[MemoryRecord]:
-        return [
-            MemoryRecord.from_dict(item)
-            for item in self._load().get("records", [])
-            if isinstance(item, dict)
-        ]
+        path = Path(path).expanduser() if path else default_local_memory_path(self.project_root)
+        self.path = path.with_suffix(".sqlite3") if path.suffix == ".json" else path
+        self._store = LocalMemoryStore(self.path)
 
     def status(self) -> MemoryProviderStatus:
-        records = self._records()
         return MemoryProviderStatus(
             provider=self.name,
             available=True,
             detail="local user memory",
-            record_count=len(records),
+            record_count=self._store.count(),
             path=str(self.path),
             capabilities=("search", "remember", "forget", "export"),
         )
 
     def search(self, query: str, *, limit: int = 8) -> list[MemorySearchResult]:
-        terms = [term.lower() for term in query.split() if term.strip()]
-        results: list[MemorySearchResult] = []
-        for record in self._records():
-            haystack = " ".join([record.content, record.kind, " ".join(record.tags)]).lower()
-            if not terms:
-                score = 0.1
-            else:
-                hits = sum(1 for term in terms if term in haystack)
-                if hits == 0:
-                    continue
-                score = hits / max(1, len(terms))
-            results.append(MemorySearchResult(record=record, score=score, provider=self.name))
-        results.sort(key=lambda item: (item.score, item.record.updated_at), reverse=True)
-        return results[:limit]
+        return [
+            MemorySearchResult(record=record, score=score, provider=self.name)
+            for record, score in self._store.search(query, limit=limit)
+        ]
 
     def remember(
         self,
@@ -133,7 +93,6 @@ class LocalAgentMemoryProvider:
         content = content.strip()
         if not content:
             raise ValueError("memory content cannot be empty")
-        data = self._load()
         now = now_iso()
         memory_id = hashlib.sha256(f"{content}:{now}".encode()).hexdigest()[:12]
         record = MemoryRecord(
@@ -147,22 +106,19 @@ class LocalAgentMemoryProvider:
             updated_at=now,
             metadata={"project": str(self.project_root)},
         )
-        data["records"].append(record.to_dict())
-        self._save(data)
+        self._store.add(record)
         return record
 
     def forget(self, memory_id: str) -> bool:
-        data = self._load()
-        records = [item for item in data.get("records", []) if isinstance(item, dict)]
-        kept = [item for item in records if not str(item.get("id", "")).startswith(memory_id)]
-        if len(kept) == len(records):
-            return False
-        data["records"] = kept
-        self._save(data)
-        return True
+        return self._store.delete_prefix(memory_id) > 0
 
     def export(self) -> dict:
-        return self._load()
+        return {
+            "version": 1,
+            "provider": self.name,
+            "project": str(self.project_root),
+            "records": [record.to_dict() for record in self._store.records()],
+        }
 
 
 class SpecMemProvider:
@@ -0,0 +1,253 @@
+"""SQLite/FTS5 store behind the local memory provider.
+
+Memories live in one SQLite database per project
+(``~/.superqode/memory/agent-<hash>.sqlite3``): a ``memories`` table plus an
+FTS5 index over content, kind and tags. Writes append or delete rows instead
+of rewriting a file, and searches use the index instead of reading every
+memory.
+
+Ranking
+-------
+``score`` keeps the meaning it had with the JSON store: the fraction of query
+terms a memory contains, so recall thresholds and duplicate checks are
+unchanged. Memories with the same score are ordered by BM25, with tag matches
+weighted above content matches and recently updated memories boosted.
+
+Migration
+---------
+When the database is first created, records from the JSON file of the same
+name (``agent-<hash>.json``) are imported in one transaction. The JSON file
+is left in place as a backup and is not read again.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+from superqode.session.catalog import fts_query
+
+from .types import MemoryRecord
+
+SCHEMA_VERSION = 1
+
+#: bm25() column weights for (content, kind, tags).
+COLUMN_WEIGHTS = (1.0, 0.5, 3.0)
+#: A memory updated just now ranks up to this much higher than an old one.
+RECENCY_BOOST = 0.5
+RECENCY_HALF_LIFE_DAYS = 30.0
+#: Candidates (most query terms matched, then BM25) re-ranked per requested result.
+CANDIDATES_PER_RESULT = 25
+
+
+def query_terms(query: str) -> list[str]:
+    """Distinct lowercase word terms of a search query."""
+    return list(dict.fromkeys(re.findall(r"\w+", query.lower())))
+
+
+def _recency(updated_at: str, now: datetime) -> float:
+    try:
+        age = (now - datetime.fromisoformat(updated_at)).total_seconds() / 86400
+    except (TypeError, ValueError):
+        return 1.0
+    return 1.0 + RECENCY_BOOST * 0.5 ** (max(age, 0.0) / RECENCY_HALF_LIFE_DAYS)
+
+
+class LocalMemoryStore:
+    """FTS5-indexed memory records for one project."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.legacy_path = self.path.with_suffix(".json")
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            created = not self.path.exists()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                _create_schema(conn)
+                if created and self.legacy_path.is_file():
+                    _insert(conn, _legacy_records(self.legacy_path))
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta(key, value) VALUES('migrated_from', ?)",
+                        (str(self.legacy_path),),
+                    )
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def add(self, record: MemoryRecord) -> None:
+        """Append one memory."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                _insert(conn, [record])
+
+    def delete_prefix(self, memory_id: str) -> int:
+        """Delete memories whose id starts with ``memory_id``; returns how many."""
+        scope = "substr(id, 1, ?) = ?"
+        args = (len(memory_id), memory_id)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    f"DELETE FROM memories_fts WHERE rowid IN "
+                    f"(SELECT rowid FROM memories WHERE {scope})",
+                    args,
+                )
+                return conn.execute(f"DELETE FROM memories WHERE {scope}", args).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._connect().execute("SELECT COUNT(*) FROM memories").fetchone()[0])
+
+    def records(self) -> list[MemoryRecord]:
+        """Every memory, oldest first."""
+        with self._lock:
+            rows = self._connect().execute("SELECT * FROM memories ORDER BY rowid").fetchall()
+        return [_record_from_row(row) for row in rows]
+
+    def search(self, query: str, *, limit: int = 8) -> list[tuple[MemoryRecord, float]]:
+        """Rank memories against ``query``; returns (record, score) pairs."""
+        terms = query_terms(query)
+        with self._lock:
+            conn = self._connect()
+            if not terms:
+                rows = conn.execute(
+                    "SELECT * FROM memories ORDER BY updated_at DESC, rowid DESC LIMIT ?",
+                    (limit,),
+                ).fetchall()
+                return [(_record_from_row(row), 0.1) for row in rows]
+            weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+            # Candidates are cut by the number of terms matched first, so a
+            # memory matching more terms is never crowded out by BM25.
+            coverage = " + ".join(
+                "(m.rowid IN (SELECT rowid FROM memories_fts WHERE memories_fts MATCH ?))"
+                for _ in terms
+            )
+            patterns = [fts_query(term) + "*" for term in terms]
+            rows = conn.execute(
+                f"""
+                SELECT m.*, bm25(memories_fts, {weights}) AS rank, {coverage} AS coverage
+                FROM memories_fts JOIN memories m ON m.rowid = memories_fts.rowid
+                WHERE memories_fts MATCH ?
+                ORDER BY coverage DESC, rank
+                LIMIT ?
+                """,
+                (
+                    *patterns,
+                    " OR ".join(patterns),
+                    max(limit * CANDIDATES_PER_RESULT, 200),
+                ),
+            ).fetchall()
+
+        now = datetime.now()
+        ranked = []
+        for row in rows:
+            record = _record_from_row(row)
+            words = set(re.findall(r"\w+", f"{record.content} {record.kind} {record.tags}".lower()))
+            hits = sum(1 for term in terms if any(word.startswith(term) for word in words))
+            score = hits / len(terms)
+            # bm25() is lower-is-better
+            relevance = -float(row["rank"]) * _recency(record.updated_at, now)
+            ranked.append((score, relevance, record))
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [(record, score) for score, _, record in ranked[:limit]]
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS meta(
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS memories(
+            rowid INTEGER PRIMARY KEY,
+            id TEXT NOT NULL,
+            content TEXT NOT NULL,
+            kind TEXT NOT NULL DEFAULT 'note',
+            scope TEXT NOT NULL DEFAULT 'project',
+            source TEXT NOT NULL DEFAULT 'user',
+            tags TEXT NOT NULL DEFAULT '[]',
+            created_at TEXT NOT NULL DEFAULT '',
+            updated_at TEXT NOT NULL DEFAULT '',
+            metadata_json TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE INDEX IF NOT EXISTS idx_memories_id ON memories(id);
+        CREATE INDEX IF NOT EXISTS idx_memories_updated ON memories(updated_at);
+        CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+            content,
+            kind,
+            tags,
+            tokenize = 'unicode61'
+        );
+        """
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO meta(key, value) VALUES('schema_version', ?)",
+        (str(SCHEMA_VERSION),),
+    )
+
+
+def _insert(conn: sqlite3.Connection, records: Iterable[MemoryRecord]) -> None:
+    for record in records:
+        cursor = conn.execute(
+            """
+            INSERT INTO memories(id, content, kind, scope, source, tags, created_at,
+                                 updated_at, metadata_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                record.id,
+                record.content,
+                record.kind,
+                record.scope,
+                record.source,
+                json.dumps(list(record.tags), ensure_ascii=False),
+                record.created_at,
+                record.updated_at,
+                json.dumps(record.metadata, ensure_ascii=False),
+            ),
+        )
+        conn.execute(
+            "INSERT INTO memories_fts(rowid, content, kind, tags) VALUES (?, ?, ?, ?)",
+            (cursor.lastrowid, record.content, record.kind, " ".join(record.tags)),
+        )
+
+
+def _legacy_records(path: Path) -> list[MemoryRecord]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return []
+    records = data.get("records", []) if isinstance(data, dict) else []
+    if not isinstance(records, list):
+        return []
+    return [MemoryRecord.from_dict(item) for item in records if isinstance(item, dict)]
+
+
+def _record_from_row(row: sqlite3.Row) -> MemoryRecord:
+    data: dict[str, Any] = {key: row[key] for key in row.keys() if key != "rank"}
+    try:
+        data["tags"] = json.loads(data["tags"] or "[]")
+        data["metadata"] = json.loads(data.pop("metadata_json") or "{}")
+    except json.JSONDecodeError:
+        data["tags"], data["metadata"] = [], {}
+    return MemoryRecord.from_dict(data)
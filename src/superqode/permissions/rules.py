@@ -7,20 +7,33 @@ Provides granular control over what operations agents can perform:
 - Directory-scoped rules
 - Allow/Deny/Ask actions
 - Optimized for SuperQode's multi-agent workflow
+
+Rules are compiled per scope into one regex, and decisions are cached per
+(scope, path) until the rule set changes, so a check does not walk every
+rule with ``fnmatch``.
 """
 
 from __future__ import annotations
 
 import fnmatch
 import json
+import os
 import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 import hashlib
 
+# Cached (scope, path) decisions per manager; cleared whenever the rules change
+_DECISION_CACHE_SIZE = 4096
+
+# fnmatch.fnmatch compares os.path.normcase() forms. Where that is not the
+# identity (Windows) the compiled regex would differ, so rules are walked instead.
+_NORMCASE_IS_IDENTITY = os.path.normcase("A/b") == "A/b"
+
 
 class PermissionAction(Enum):
     """Action to take when permission rule matches."""
@@ -120,6 +133,54 @@ class PermissionRule:
         )
 
 
+def _rule_regex(pattern: str) -> str:
+    """Regex accepting exactly the paths ``PermissionRule.matches`` accepts for ``pattern``."""
+    alternatives = [re.escape(pattern) + r"\Z", fnmatch.translate(pattern)]
+    if pattern.endswith("/**"):
+        alternatives.append(re.escape(pattern[:-3]))
+    return "|".join(alternatives)
+
+
+class _CompiledRules:
+    """One scope's rules, in precedence order, folded into a single alternation.
+
+    Alternative ``r<i>`` matches when ``rules[i]`` would. The regex engine tries
+    alternatives left to right, so the group that matched is the first rule in
+    precedence order, the one the sequential walk would have returned.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, PermissionRule]], scope: PermissionScope):
+        self.scope = scope
+        self.expiring = [rule for _, rule in rules if rule.expires_at is not None]
+        self.expired = [rule.is_expired for rule in self.expiring]
+        self.rules = [(source, rule) for source, rule in rules if not rule.is_expired]
+        self._regex: Optional[re.Pattern[str]] = None
+        if self.rules and _NORMCASE_IS_IDENTITY:
+            try:
+                self._regex = re.compile(
+                    "|".join(
+                        f"(?P<r{i}>{_rule_regex(rule.pattern)})"
+                        for i, (_, rule) in enumerate(self.rules)
+                    )
+                )
+            except (re.error, RecursionError):
+                self._regex = None
+
+    @property
+    def is_stale(self) -> bool:
+        """True once a rule has expired (or un-expired) since compiling."""
+        return any(rule.is_expired != was for rule, was in zip(self.expiring, self.expired))
+
+    def first_match(self, path: str) -> Optional[Tuple[str, PermissionRule]]:
+        if self._regex is None:
+            return next(
+                ((source, rule) for source, rule in self.rules if rule.matches(path, self.scope)),
+                None,
+            )
+        match = self._regex.match(path)
+        return self.rules[int(match.lastgroup[1:])] if match else None
+
+
 @dataclass
 class PermissionRequest:
     """A request for permission."""
@@ -159,6 +220,10 @@ class PermissionManager:
     Provides rule-based access control with wildcard support,
     session-scoped permissions, and decision history.
 
+    Rules are treated as immutable once added. Change them through the
+    manager (``add_rule``, ``remove_rule``, ...) so cached decisions are
+    dropped.
+
     Usage:
         manager = PermissionManager()
 
@@ -255,6 +320,10 @@ class PermissionManager:
         self._session_rules: List[PermissionRule] = []  # Session-only rules
         self._decisions: List[PermissionDecision] = []
         self._rules_file = rules_file
+        self._compiled: Dict[PermissionScope, _CompiledRules] = {}
+        self._decision_cache: OrderedDict[
+            Tuple[PermissionScope, str], Optional[Tuple[str, PermissionRule]]
+        ] = OrderedDict()
 
         # Load default rules
         if include_defaults:
@@ -283,6 +352,7 @@ class PermissionManager:
         # Sort by priority (highest first)
         self._rules.sort(key=lambda r: r.priority, reverse=True)
         self._session_rules.sort(key=lambda r: r.priority, reverse=True)
+        self._rules_changed()
 
     def remove_rule(self, pattern: str, scope: PermissionScope) -> bool:
         """Remove a rule by pattern and scope."""
@@ -290,34 +360,54 @@ class PermissionManager:
             for rule in rules_list[:]:
                 if rule.pattern == pattern and rule.scope == scope:
                     rules_list.remove(rule)
+                    self._rules_changed()
                     return True
         return False
 
+    def _rules_changed(self) -> None:
+        """Drop compiled rules and cached decisions after the rule set changes."""
+        self._compiled.clear()
+        self._decision_cache.clear()
+
+    def _first_match(
+        self, scope: PermissionScope, path: str
+    ) -> Optional[Tuple[str, PermissionRule]]:
+        """The first matching rule: session rules, then persistent rules, by priority."""
+        compiled = self._compiled.get(scope)
+        if compiled is not None and compiled.is_stale:
+            self._rules_changed()
+            compiled = None
+        if compiled is None:
+            ordered = [("session_rule", r) for r in self._session_rules if r.scope == scope]
+            ordered += [("rule", r) for r in self._rules if r.scope == scope]
+            compiled = self._compiled[scope] = _CompiledRules(ordered, scope)
+
+        key = (scope, path)
+        if key in self._decision_cache:
+            self._decision_cache.move_to_end(key)
+            return self._decision_cache[key]
+        found = compiled.first_match(path)
+        self._decision_cache[key] = found
+        if len(self._decision_cache) > _DECISION_CACHE_SIZE:
+            self._decision_cache.popitem(last=False)
+        return found
+
     def check_permission(self, request: PermissionRequest) -> PermissionDecision:
         """
         Check if a permission request should be allowed.
 
         Returns a decision based on matching rules.
         """
-        # Check session rules first (highest priority)
-        for rule in self._session_rules:
-            if rule.matches(request.path, request.scope):
-                return PermissionDecision(
-                    request_id=request.id,
-                    action=rule.action,
-                    decided_by=f"session_rule:{rule.pattern}",
-                    rule_pattern=rule.pattern,
-                )
-
-        # Check persistent rules
-        for rule in self._rules:
-            if rule.matches(request.path, request.scope):
-                return PermissionDecision(
-                    request_id=request.id,
-                    action=rule.action,
-                    decided_by=f"rule:{rule.pattern}",
-                    rule_pattern=rule.pattern,
-                )
+        # Session rules first, then persistent rules, each by priority
+        found = self._first_match(request.scope, request.path)
+        if found is not None:
+            source, rule = found
+            return PermissionDecision(
+                request_id=request.id,
+                action=rule.action,
+                decided_by=f"{source}:{rule.pattern}",
+                rule_pattern=rule.pattern,
+            )
 
         # Default: ask
         return PermissionDecision(
@@ -419,6 +509,7 @@ class PermissionManager:
     def clear_session_rules(self) -> None:
         """Clear all session-only rules."""
         self._session_rules.clear()
+        self._rules_changed()
 
     def get_rules(self, include_session: bool = True) -> List[PermissionRule]:
         """Get all rules."""
@@ -447,6 +538,7 @@ class PermissionManager:
             self._rules.sort(key=lambda r: r.priority, reverse=True)
         except (json.JSONDecodeError, KeyError):
             pass
+        self._rules_changed()
 
     def save_rules(self) -> None:
         """Save rules to file."""
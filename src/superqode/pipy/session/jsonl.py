@@ -7,17 +7,30 @@ File layout, byte-compatible with pi:
 
 - line 1 is a session header, ``{"type":"session","version":3, ...}``
 - every later line is one tree entry, appended and never rewritten
+
+PiPy also keeps a sidecar index next to each file (``<file>.jsonl.idx``, see
+:class:`JsonlSessionStorage`). pi ignores it, and it is rebuilt from the
+session file whenever it is missing or out of date.
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
+import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from .codec import SessionCodecError, decode_entry, encode_entry
-from .entries import LeafEntry, MessageEntry, SessionMetadata, SessionStats, SessionTreeEntry
+from .entries import (
+    LabelEntry,
+    LeafEntry,
+    SessionInfoEntry,
+    SessionMetadata,
+    SessionStats,
+    SessionTreeEntry,
+)
 from .storage import SessionError
 
 SESSION_FORMAT_VERSION = 3
@@ -95,21 +108,73 @@ def read_session_metadata(path: Path) -> SessionMetadata:
     return decode_header(first, path)
 
 
+@dataclass(frozen=True, slots=True)
+class _EntryRecord:
+    """Where one entry lives in the session file, and what the tree needs of it."""
+
+    id: str
+    parent_id: str | None
+    type: str
+    offset: int
+    length: int
+    #: ``targetId`` for leaf entries, ``[targetId, label]`` for labels and the
+    #: name for session_info entries; None otherwise.
+    extra: Any = None
+
+    def to_line(self, size: int, mtime_ns: int) -> str:
+        row = [self.id, self.parent_id, self.type, self.offset, self.length, self.extra]
+        return json.dumps([*row, size, mtime_ns], separators=(",", ":"))
+
+
+def _record_for(entry: SessionTreeEntry, offset: int, length: int) -> _EntryRecord:
+    extra: Any = None
+    if isinstance(entry, LeafEntry):
+        extra = entry.target_id
+    elif isinstance(entry, LabelEntry):
+        extra = [entry.target_id, entry.label]
+    elif isinstance(entry, SessionInfoEntry):
+        extra = entry.name
+    return _EntryRecord(entry.id, entry.parent_id, entry.type, offset, length, extra)
+
+
 class JsonlSessionStorage:
-    """One session file, indexed in memory and appended to on disk."""
+    """One session file, indexed by a sidecar and appended to on disk.
+
+    ``<file>.jsonl.idx`` is an append-only list of entry records (id, parent,
+    type, byte range, and the leaf/label/name payload) that also notes the
+    session file's size and mtime after each append. Opening a file whose
+    sidecar matches decodes nothing but the header: the tree, leaf, labels and
+    name come from the records, and entries are decoded from their byte range
+    the first time they are read, so resuming only decodes the active branch.
+    Lines appended by another writer are indexed from the covered offset; a
+    missing, unreadable or stale sidecar falls back to a full scan and is
+    regenerated.
+    """
+
+    index_suffix = ".idx"
+    _INDEX_VERSION = 1
 
     def __init__(self, path: Path, metadata: SessionMetadata) -> None:
         self.path = path
         self._metadata = metadata
-        self._entries: list[SessionTreeEntry] = []
-        self._by_id: dict[str, SessionTreeEntry] = {}
+        self._order: list[str] = []
+        self._records: dict[str, _EntryRecord] = {}
+        self._decoded: dict[str, SessionTreeEntry] = {}
+        self._labels: dict[str, str | None] = {}
+        self._name: str | None = None
+        self._message_count = 0
         self._leaf_id: str | None = None
+        self._end = 0
         self._write_lock = asyncio.Lock()
 
     @property
     def metadata(self) -> SessionMetadata:
         return self._metadata
 
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(self.path.name + self.index_suffix)
+
     # -- construction ----------------------------------------------------- #
 
     @classmethod
@@ -118,39 +183,180 @@ class JsonlSessionStorage:
         path.parent.mkdir(parents=True, exist_ok=True)
         if path.exists():
             raise SessionError("invalid_session", f"Session already exists: {path}")
-        with path.open("w", encoding="utf-8") as handle:
-            handle.write(json.dumps(encode_header(metadata), separators=(",", ":")) + "\n")
-        return cls(path, metadata)
+        header = (json.dumps(encode_header(metadata), separators=(",", ":")) + "\n").encode()
+        with path.open("wb") as handle:
+            handle.write(header)
+        storage = cls(path, metadata)
+        storage._end = len(header)
+        storage._write_index()
+        return storage
 
     @classmethod
     def open(cls, path: Path) -> JsonlSessionStorage:
-        """Open an existing session file and replay it into memory."""
+        """Open an existing session file, from its sidecar index when it is current."""
         if not path.is_file():
             raise SessionError("not_found", f"Session not found: {path}")
-        lines = [line for line in path.read_text(encoding="utf-8").split("\n") if line.strip()]
-        if not lines:
+        with path.open("rb") as handle:
+            first = handle.readline()
+            while first and not first.strip():
+                first = handle.readline()
+            header_end = handle.tell()
+        if not first.strip():
             raise _invalid_session(path, "missing session header")
-        metadata = decode_header(lines[0], path)
-        storage = cls(path, metadata)
-        for offset, line in enumerate(lines[1:]):
-            line_number = offset + 2
-            try:
-                payload = json.loads(line)
-            except json.JSONDecodeError as error:
-                raise _invalid_entry(path, line_number, "is not valid JSON") from error
-            try:
-                entry = decode_entry(payload)
-            except SessionCodecError as error:
-                raise _invalid_entry(path, line_number, str(error)) from error
-            if entry.id in storage._by_id:
-                raise _invalid_session(path, f"duplicate entry id {entry.id}")
-            storage._index(entry)
+        storage = cls(path, decode_header(first.decode("utf-8"), path))
+        if not storage._load_index(header_end):
+            storage._reset(header_end)
+            storage._scan(full=True)
         return storage
 
-    def _index(self, entry: SessionTreeEntry) -> None:
-        self._entries.append(entry)
-        self._by_id[entry.id] = entry
-        self._leaf_id = entry.target_id if isinstance(entry, LeafEntry) else entry.id
+    def _load_index(self, header_end: int) -> bool:
+        """Adopt the sidecar if it describes a prefix of the file; False to rebuild."""
+        try:
+            lines = self.index_path.read_text(encoding="utf-8").splitlines()
+            meta = json.loads(lines[0]) if lines else None
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            return False
+        if not isinstance(meta, dict) or meta.get("version") != self._INDEX_VERSION:
+            return False
+        size, mtime_ns = meta.get("size"), meta.get("mtime_ns")
+        for line in lines[1:]:
+            try:
+                row = json.loads(line)
+                record = _EntryRecord(*row[:6])
+                size, mtime_ns = row[6], row[7]
+            except (json.JSONDecodeError, TypeError, IndexError):
+                # A torn trailing record: the scan below re-indexes that entry.
+                break
+            self._remember(record)
+        if not isinstance(size, int) or size < header_end:
+            return False
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return False
+        self._end = size
+        if stat.st_size == size:
+            # Same size but a different mtime means the file was rewritten.
+            return stat.st_mtime_ns == mtime_ns
+        if stat.st_size < size or not self._covers_prefix():
+            return False
+        self._scan(full=False)
+        return True
+
+    def _covers_prefix(self) -> bool:
+        """Check that the indexed region still ends where the file says it does."""
+        with self.path.open("rb") as handle:
+            handle.seek(self._end - 1)
+            if handle.read(1) != b"\n":
+                return False
+            if not self._order:
+                return True
+            last = self._records[self._order[-1]]
+            handle.seek(last.offset)
+            line = handle.read(last.length)
+        try:
+            return json.loads(line).get("id") == last.id
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            return False
+
+    def _scan(self, *, full: bool) -> None:
+        """Decode and index every line after the covered offset, then persist."""
+        added: list[_EntryRecord] = []
+        with self.path.open("rb") as handle:
+            handle.seek(self._end)
+            offset = self._end
+            for raw in handle:
+                start, offset = offset, offset + len(raw)
+                if not raw.strip():
+                    continue
+                line_number = len(self._order) + 2
+                try:
+                    payload = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError) as error:
+                    raise _invalid_entry(self.path, line_number, "is not valid JSON") from error
+                try:
+                    entry = decode_entry(payload)
+                except SessionCodecError as error:
+                    raise _invalid_entry(self.path, line_number, str(error)) from error
+                if entry.id in self._records:
+                    raise _invalid_session(self.path, f"duplicate entry id {entry.id}")
+                record = _record_for(entry, start, len(raw.rstrip(b"\r\n")))
+                self._remember(record)
+                self._decoded[entry.id] = entry
+                added.append(record)
+        self._end = offset
+        if full:
+            self._write_index()
+        elif added:
+            self._append_index(added)
+
+    def _reset(self, end: int) -> None:
+        self._order, self._records, self._decoded, self._labels = [], {}, {}, {}
+        self._name, self._leaf_id, self._message_count = None, None, 0
+        self._end = end
+
+    def _remember(self, record: _EntryRecord) -> None:
+        self._order.append(record.id)
+        self._records[record.id] = record
+        if record.type == "message":
+            self._message_count += 1
+        elif record.type == "label" and isinstance(record.extra, list):
+            self._labels[record.extra[0]] = record.extra[1]
+        elif record.type == "session_info":
+            self._name = record.extra
+        self._leaf_id = record.extra if record.type == "leaf" else record.id
+
+    # -- sidecar ---------------------------------------------------------- #
+
+    def _stat(self) -> tuple[int, int]:
+        stat = self.path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def _write_index(self) -> None:
+        """Rewrite the whole sidecar from the in-memory records."""
+        size, mtime_ns = self._stat()
+        if size != self._end:
+            return
+        lines = [json.dumps({"version": self._INDEX_VERSION, "size": size, "mtime_ns": mtime_ns})]
+        lines.extend(self._records[entry_id].to_line(size, mtime_ns) for entry_id in self._order)
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except OSError:
+            # Read-only session directories (pi's own store) still open fine.
+            pass
+
+    def _append_index(self, records: list[_EntryRecord]) -> None:
+        size, mtime_ns = self._stat()
+        if size != self._end:
+            return
+        try:
+            with self.index_path.open("a", encoding="utf-8") as handle:
+                handle.write("".join(r.to_line(size, mtime_ns) + "\n" for r in records))
+        except OSError:
+            pass
+
+    # -- decoding --------------------------------------------------------- #
+
+    def _decode(self, entry_ids: list[str]) -> list[SessionTreeEntry]:
+        """Decode entries from their byte ranges, caching the results."""
+        missing = [entry_id for entry_id in entry_ids if entry_id not in self._decoded]
+        if missing:
+            position = {entry_id: n for n, entry_id in enumerate(self._order)}
+            with self.path.open("rb") as handle:
+                for entry_id in sorted(missing, key=lambda i: self._records[i].offset):
+                    record = self._records[entry_id]
+                    handle.seek(record.offset)
+                    line_number = position[entry_id] + 2
+                    try:
+                        entry = decode_entry(json.loads(handle.read(record.length)))
+                    except (json.JSONDecodeError, UnicodeDecodeError) as error:
+                        raise _invalid_entry(self.path, line_number, "is not valid JSON") from error
+                    except SessionCodecError as error:
+                        raise _invalid_entry(self.path, line_number, str(error)) from error
+                    self._decoded[entry_id] = entry
+        return [self._decoded[entry_id] for entry_id in entry_ids]
 
     # -- SessionStorage --------------------------------------------------- #
 
@@ -158,57 +364,55 @@ class JsonlSessionStorage:
         return self._leaf_id
 
     async def read_entry(self, entry_id: str) -> SessionTreeEntry | None:
-        return self._by_id.get(entry_id)
+        if entry_id not in self._records:
+            return None
+        return self._decode([entry_id])[0]
 
     async def read_entries(self) -> list[SessionTreeEntry]:
-        return list(self._entries)
+        return self._decode(self._order)
 
     async def read_path_to_root(self, leaf_id: str | None) -> list[SessionTreeEntry]:
-        path: list[SessionTreeEntry] = []
+        path: list[str] = []
         seen: set[str] = set()
         current = leaf_id
         while current is not None:
-            entry = self._by_id.get(current)
-            if entry is None or entry.id in seen:
+            record = self._records.get(current)
+            if record is None or record.id in seen:
                 break
-            seen.add(entry.id)
-            path.append(entry)
-            current = entry.parent_id
+            seen.add(record.id)
+            path.append(record.id)
+            current = record.parent_id
         path.reverse()
-        return path
+        return self._decode(path)
 
     async def append_entry(self, entry: SessionTreeEntry) -> None:
         async with self._write_lock:
-            if entry.id in self._by_id:
+            if entry.id in self._records:
                 raise SessionError("invalid_entry", f"Entry {entry.id} already exists")
-            line = json.dumps(encode_entry(entry), separators=(",", ":"))
-            with self.path.open("a", encoding="utf-8") as handle:
-                handle.write(line + "\n")
-            self._index(entry)
+            line = json.dumps(encode_entry(entry), separators=(",", ":")).encode("utf-8")
+            with self.path.open("ab") as handle:
+                offset = handle.tell()
+                handle.write(line + b"\n")
+            record = _record_for(entry, offset, len(line))
+            self._remember(record)
+            self._decoded[entry.id] = entry
+            if offset == self._end:
+                self._end = offset + len(line) + 1
+                self._append_index([record])
+            else:
+                # Someone else wrote to the file since we indexed it; the next
+                # open rescans rather than trusting a sidecar with a gap.
+                self._end = offset + len(line) + 1
+                self.index_path.unlink(missing_ok=True)
 
     async def get_label(self, entry_id: str) -> str | None:
-        from .entries import LabelEntry
-
-        label: str | None = None
-        for entry in self._entries:
-            if isinstance(entry, LabelEntry) and entry.target_id == entry_id:
-                label = entry.label
-        return label
+        return self._labels.get(entry_id)
 
     async def get_name(self) -> str | None:
-        from .entries import SessionInfoEntry
-
-        name: str | None = None
-        for entry in self._entries:
-            if isinstance(entry, SessionInfoEntry):
-                name = entry.name
-        return name
+        return self._name
 
     async def get_stats(self) -> SessionStats:
-        return SessionStats(
-            entry_count=len(self._entries),
-            message_count=sum(1 for entry in self._entries if isinstance(entry, MessageEntry)),
-        )
+        return SessionStats(entry_count=len(self._order), message_count=self._message_count)
 
 
 __all__ = [
@@ -0,0 +1,546 @@
+"""SQLite/FTS5 catalog of stored sessions.
+
+The catalog sits next to a session store (``<storage_dir>/catalog.sqlite3``)
+and mirrors what listing and search need: one row per session plus the text
+of every message, indexed with FTS5. Stores feed it incrementally as they
+write, so ``superqode sessions list`` and ``superqode sessions search`` answer
+from one database instead of opening every transcript or metadata file.
+
+Rows are keyed by ``(store, session_id)`` where ``store`` names the writer
+(``"agent"`` for the JSONL store, ``"persisted"`` for the gzip store), so both
+can share a directory without clobbering each other.
+
+Soft-fail policy
+----------------
+The transcripts stay the source of truth. Every write path swallows
+``sqlite3.Error``/``OSError`` and read paths return empty results, so a
+broken or locked catalog never breaks a live session. Each store's
+``reindex()`` rebuilds its rows from disk (``superqode sessions reindex``).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+CATALOG_FILENAME = "catalog.sqlite3"
+SCHEMA_VERSION = 1
+
+#: Roles searched unless a query opts into tool output.
+CONVERSATION_ROLES = ("user", "assistant")
+
+
+class CatalogMessage(NamedTuple):
+    """One message handed to the catalog; ``position`` is its 0-based index."""
+
+    position: int
+    role: str
+    content: str
+    timestamp: str = ""
+    entry_id: str = ""
+
+
+@dataclass
+class CatalogSession:
+    """A session row as stored in the catalog."""
+
+    store: str
+    session_id: str
+    title: str = ""
+    agents: List[str] = field(default_factory=list)
+    provider: str = ""
+    model: str = ""
+    project_path: str = ""
+    parent_session_id: Optional[str] = None
+    created_at: str = ""
+    updated_at: str = ""
+    message_count: int = 0
+    tags: List[str] = field(default_factory=list)
+    metadata: dict = field(default_factory=dict)
+
+
+@dataclass
+class CatalogHit:
+    """One ranked search result."""
+
+    session: CatalogSession
+    score: float
+    snippet: str = ""
+    role: str = ""
+    position: Optional[int] = None
+    timestamp: str = ""
+
+
+def _when(value: Any) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query that ANDs quoted terms.
+
+    Quoting each token keeps user input from being parsed as FTS syntax; a
+    trailing ``*`` is kept so ``refact*`` still works as a prefix search.
+    """
+    terms = []
+    for token in re.findall(r"[\w.\-/]+\*?", text):
+        prefix = token.endswith("*")
+        token = token.rstrip("*")
+        if token:
+            terms.append(f'"{token}"' + ("*" if prefix else ""))
+    return " ".join(terms) if terms else '""'
+
+
+class SessionCatalog:
+    """FTS5-backed listing and search index for one session directory."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        #: True when this instance created the database file, i.e. sessions
+        #: already in the directory still need to be reindexed.
+        self.created = not self.path.exists()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_storage(cls, storage_dir: str | Path, **kwargs: Any) -> "SessionCatalog":
+        return cls(Path(storage_dir) / CATALOG_FILENAME, **kwargs)
+
+    # ------------------------------------------------------------------ setup
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                _create_schema(conn)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _write(self, fn) -> bool:
+        """Run ``fn(conn)`` in a transaction; False when the catalog failed."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    fn(conn)
+                return True
+            except (sqlite3.Error, OSError):
+                return False
+
+    def _read(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            try:
+                return self._connect().execute(sql, list(params)).fetchall()
+            except (sqlite3.Error, OSError):
+                return []
+
+    # ----------------------------------------------------------------- writes
+
+    def upsert_session(self, record: CatalogSession) -> bool:
+        """Insert or update a session row (message rows are untouched)."""
+        return self._write(lambda conn: _upsert_session(conn, record))
+
+    def add_messages(
+        self,
+        store: str,
+        session_id: str,
+        messages: Iterable[CatalogMessage],
+        *,
+        updated_at: str = "",
+    ) -> bool:
+        """Index messages at the given positions, replacing any already there."""
+        rows = list(messages)
+        if not rows:
+            return True
+
+        def apply(conn: sqlite3.Connection) -> None:
+            _delete_entries(conn, store, session_id, "position >= ?", (rows[0].position,))
+            self._insert_messages(conn, store, session_id, rows)
+            conn.execute(
+                """
+                UPDATE sessions
+                SET message_count = MAX(message_count, ?),
+                    updated_at = MAX(updated_at, ?)
+                WHERE store = ? AND session_id = ?
+                """,
+                (rows[-1].position + 1, updated_at or rows[-1].timestamp, store, session_id),
+            )
+
+        return self._write(apply)
+
+    def _insert_messages(
+        self,
+        conn: sqlite3.Connection,
+        store: str,
+        session_id: str,
+        rows: List[CatalogMessage],
+    ) -> None:
+        for row in rows:
+            cursor = conn.execute(
+                """
+                INSERT INTO entries(store, session_id, position, role, timestamp, entry_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (store, session_id, row.position, row.role, row.timestamp, row.entry_id),
+            )
+            conn.execute(
+                "INSERT INTO entries_fts(rowid, content) VALUES (?, ?)",
+                (cursor.lastrowid, row.content or ""),
+            )
+
+    def truncate_messages(self, store: str, session_id: str, keep: int) -> bool:
+        """Drop indexed messages from position ``keep`` on (rewind)."""
+
+        def apply(conn: sqlite3.Connection) -> None:
+            _delete_entries(conn, store, session_id, "position >= ?", (keep,))
+            conn.execute(
+                "UPDATE sessions SET message_count = ? WHERE store = ? AND session_id = ?",
+                (keep, store, session_id),
+            )
+
+        return self._write(apply)
+
+    def copy_messages(self, store: str, source_id: str, target_id: str) -> bool:
+        """Duplicate the indexed messages of ``source_id`` under ``target_id`` (fork)."""
+
+        def apply(conn: sqlite3.Connection) -> None:
+            _delete_entries(conn, store, target_id, "1", ())
+            rows = conn.execute(
+                """
+                SELECT e.position, e.role, e.timestamp, e.entry_id, f.content
+                FROM entries e LEFT JOIN entries_fts f ON f.rowid = e.rowid
+                WHERE e.store = ? AND e.session_id = ?
+                ORDER BY e.position
+                """,
+                (store, source_id),
+            ).fetchall()
+            for row in rows:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO entries(store, session_id, position, role, timestamp, entry_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        store,
+                        target_id,
+                        row["position"],
+                        row["role"],
+                        row["timestamp"],
+                        row["entry_id"],
+                    ),
+                )
+                if row["content"] is not None:
+                    conn.execute(
+                        "INSERT INTO entries_fts(rowid, content) VALUES (?, ?)",
+                        (cursor.lastrowid, row["content"]),
+                    )
+            conn.execute(
+                "UPDATE sessions SET message_count = ? WHERE store = ? AND session_id = ?",
+                (len(rows), store, target_id),
+            )
+
+        return self._write(apply)
+
+    def delete_session(self, store: str, session_id: str) -> bool:
+        def apply(conn: sqlite3.Connection) -> None:
+            _delete_entries(conn, store, session_id, "1", ())
+            conn.execute(
+                "DELETE FROM sessions WHERE store = ? AND session_id = ?", (store, session_id)
+            )
+
+        return self._write(apply)
+
+    def replace_store(
+        self,
+        store: str,
+        sessions: Iterable[Tuple[CatalogSession, Iterable[CatalogMessage]]],
+    ) -> bool:
+        """Rebuild every row of ``store`` from ``sessions`` in one transaction."""
+
+        def apply(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "DELETE FROM entries_fts WHERE rowid IN (SELECT rowid FROM entries WHERE store = ?)",
+                (store,),
+            )
+            conn.execute("DELETE FROM entries WHERE store = ?", (store,))
+            conn.execute("DELETE FROM sessions WHERE store = ?", (store,))
+            for record, messages in sessions:
+                _upsert_session(conn, record)
+                self._insert_messages(conn, store, record.session_id, list(messages))
+
+        return self._write(apply)
+
+    # ------------------------------------------------------------------ reads
+
+    def indexed_count(self, store: str, session_id: str) -> int:
+        """Return how many messages of a session are indexed."""
+        rows = self._read(
+            "SELECT COUNT(*) AS n FROM entries WHERE store = ? AND session_id = ?",
+            (store, session_id),
+        )
+        return int(rows[0]["n"]) if rows else 0
+
+    def entry_id(self, store: str, session_id: str, position: int) -> Optional[str]:
+        """Return the caller-supplied id recorded for one indexed message."""
+        rows = self._read(
+            "SELECT entry_id FROM entries WHERE store = ? AND session_id = ? AND position = ?",
+            (store, session_id, position),
+        )
+        return str(rows[0]["entry_id"]) if rows else None
+
+    def list_sessions(
+        self,
+        *,
+        store: Optional[str] = None,
+        agent: Optional[str] = None,
+        model: Optional[str] = None,
+        project: Optional[str] = None,
+        since: Any = None,
+        until: Any = None,
+        limit: Optional[int] = None,
+    ) -> List[CatalogSession]:
+        """List sessions newest first, filtered without touching session files."""
+        where, params = _session_filters(store, agent, model, project, since, until, "s")
+        sql = f"SELECT s.* FROM sessions s WHERE {where} ORDER BY s.updated_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_session_from_row(row) for row in self._read(sql, params)]
+
+    def search(
+        self,
+        query: str,
+        *,
+        store: Optional[str] = None,
+        agent: Optional[str] = None,
+        model: Optional[str] = None,
+        project: Optional[str] = None,
+        since: Any = None,
+        until: Any = None,
+        include_tool_output: bool = False,
+        per_session: bool = True,
+        limit: int = 20,
+    ) -> List[CatalogHit]:
+        """Rank messages matching ``query`` with BM25 and return snippets.
+
+        ``since``/``until`` bound the message timestamp. With
+        ``per_session`` only the best hit of each session is returned.
+        """
+        where, params = _session_filters(store, agent, model, project, since, until, "s")
+        roles = list(CONVERSATION_ROLES) + (["tool", "system"] if include_tool_output else [])
+        where += f" AND e.role IN ({','.join('?' for _ in roles)})"
+        params.extend(roles)
+        if _when(since):
+            where += " AND e.timestamp >= ?"
+            params.append(_when(since))
+        if _when(until):
+            where += " AND e.timestamp <= ?"
+            params.append(_when(until))
+        rows = self._read(
+            f"""
+            SELECT s.*, e.position AS hit_position, e.role AS hit_role,
+                   e.timestamp AS hit_timestamp,
+                   snippet(entries_fts, 0, '[', ']', '...', 16) AS hit_snippet,
+                   bm25(entries_fts) AS hit_rank
+            FROM entries_fts
+            JOIN entries e ON e.rowid = entries_fts.rowid
+            JOIN sessions s ON s.store = e.store AND s.session_id = e.session_id
+            WHERE entries_fts MATCH ? AND {where}
+            ORDER BY hit_rank
+            LIMIT ?
+            """,
+            [fts_query(query), *params, limit * 8 if per_session else limit],
+        )
+        hits: List[CatalogHit] = []
+        seen: set[Tuple[str, str]] = set()
+        for row in rows:
+            key = (row["store"], row["session_id"])
+            if per_session and key in seen:
+                continue
+            seen.add(key)
+            hits.append(
+                CatalogHit(
+                    session=_session_from_row(row),
+                    # bm25() is lower-is-better; expose higher-is-better scores.
+                    score=-float(row["hit_rank"]),
+                    snippet=str(row["hit_snippet"] or ""),
+                    role=str(row["hit_role"] or ""),
+                    position=int(row["hit_position"]),
+                    timestamp=str(row["hit_timestamp"] or ""),
+                )
+            )
+            if len(hits) >= limit:
+                break
+        return hits
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS meta(
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sessions(
+            store TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            title TEXT NOT NULL DEFAULT '',
+            agents TEXT NOT NULL DEFAULT '',
+            provider TEXT NOT NULL DEFAULT '',
+            model TEXT NOT NULL DEFAULT '',
+            project_path TEXT NOT NULL DEFAULT '',
+            parent_session_id TEXT,
+            created_at TEXT NOT NULL DEFAULT '',
+            updated_at TEXT NOT NULL DEFAULT '',
+            message_count INTEGER NOT NULL DEFAULT 0,
+            tags TEXT NOT NULL DEFAULT '[]',
+            metadata_json TEXT NOT NULL DEFAULT '{}',
+            PRIMARY KEY(store, session_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at);
+        CREATE TABLE IF NOT EXISTS entries(
+            rowid INTEGER PRIMARY KEY,
+            store TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            role TEXT NOT NULL,
+            timestamp TEXT NOT NULL DEFAULT '',
+            entry_id TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_session
+            ON entries(store, session_id, position);
+        CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+            content,
+            tokenize = 'unicode61'
+        );
+        """
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO meta(key, value) VALUES('schema_version', ?)",
+        (str(SCHEMA_VERSION),),
+    )
+
+
+def _upsert_session(conn: sqlite3.Connection, record: CatalogSession) -> None:
+    conn.execute(
+        """
+        INSERT INTO sessions(store, session_id, title, agents, provider, model, project_path,
+                             parent_session_id, created_at, updated_at, message_count, tags,
+                             metadata_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(store, session_id) DO UPDATE SET
+            title = excluded.title,
+            agents = excluded.agents,
+            provider = excluded.provider,
+            model = excluded.model,
+            project_path = excluded.project_path,
+            parent_session_id = excluded.parent_session_id,
+            created_at = excluded.created_at,
+            updated_at = MAX(sessions.updated_at, excluded.updated_at),
+            message_count = excluded.message_count,
+            tags = excluded.tags,
+            metadata_json = excluded.metadata_json
+        """,
+        (
+            record.store,
+            record.session_id,
+            record.title,
+            # Comma-wrapped so an agent filter can match whole names with LIKE.
+            "," + ",".join(record.agents) + "," if record.agents else "",
+            record.provider,
+            record.model,
+            record.project_path,
+            record.parent_session_id,
+            record.created_at,
+            record.updated_at,
+            record.message_count,
+            json.dumps(record.tags),
+            json.dumps(record.metadata, ensure_ascii=False),
+        ),
+    )
+
+
+def _delete_entries(
+    conn: sqlite3.Connection, store: str, session_id: str, clause: str, params: tuple
+) -> None:
+    scope = f"store = ? AND session_id = ? AND {clause}"
+    args = (store, session_id, *params)
+    conn.execute(
+        f"DELETE FROM entries_fts WHERE rowid IN (SELECT rowid FROM entries WHERE {scope})",
+        args,
+    )
+    conn.execute(f"DELETE FROM entries WHERE {scope}", args)
+
+
+def _session_filters(
+    store: Optional[str],
+    agent: Optional[str],
+    model: Optional[str],
+    project: Optional[str],
+    since: Any,
+    until: Any,
+    alias: str,
+) -> Tuple[str, List[Any]]:
+    clauses = ["1"]
+    params: List[Any] = []
+    if store:
+        clauses.append(f"{alias}.store = ?")
+        params.append(store)
+    if agent:
+        clauses.append(f"{alias}.agents LIKE ?")
+        params.append(f"%,{agent},%")
+    if model:
+        clauses.append(f"{alias}.model = ?")
+        params.append(model)
+    if project:
+        clauses.append(f"{alias}.project_path = ?")
+        params.append(str(project))
+    if _when(since):
+        clauses.append(f"{alias}.updated_at >= ?")
+        params.append(_when(since))
+    if _when(until):
+        clauses.append(f"{alias}.created_at <= ?")
+        params.append(_when(until))
+    return " AND ".join(clauses), params
+
+
+def _session_from_row(row: sqlite3.Row) -> CatalogSession:
+    try:
+        tags = json.loads(row["tags"] or "[]")
+        metadata = json.loads(row["metadata_json"] or "{}")
+    except json.JSONDecodeError:
+        tags, metadata = [], {}
+    return CatalogSession(
+        store=row["store"],
+        session_id=row["session_id"],
+        title=row["title"],
+        agents=[agent for agent in (row["agents"] or "").split(",") if agent],
+        provider=row["provider"],
+        model=row["model"],
+        project_path=row["project_path"],
+        parent_session_id=row["parent_session_id"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        message_count=int(row["message_count"]),
+        tags=list(tags),
+        metadata=dict(metadata),
+    )
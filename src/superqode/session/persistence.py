@@ -6,6 +6,7 @@ Provides comprehensive session persistence including:
 - Session state (files, tasks, quality issues)
 - Session forking and sharing
 - Export to various formats
+- Full-text search through the shared session catalog
 - Tailored for SuperQode's multi-agent workflow
 """
 
@@ -16,13 +17,28 @@ import hashlib
 import json
 import os
 import shutil
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import time
 
+from .catalog import CatalogMessage, CatalogSession, SessionCatalog
+from .segments import (
+    DIR_SUFFIX,
+    KINDS,
+    SEGMENT_ENTRIES,
+    Segment,
+    SessionSegments,
+    plan_merges,
+    total,
+)
+
+#: ``store`` key for this module's rows in the shared session catalog.
+CATALOG_STORE = "persisted"
+
 
 class MessageRole(Enum):
     """Role of message sender."""
@@ -121,6 +137,15 @@ class SessionSnapshot:
     created_at: datetime = field(default_factory=datetime.now)
     description: str = ""
 
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "message_count": self.message_count,
+            "created_at": self.created_at.isoformat(),
+            "description": self.description,
+        }
+
 
 @dataclass
 class Session:
@@ -151,6 +176,16 @@ class Session:
     # Additional data
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    # Partial loads (SessionStore.load(last_messages=...)): absolute position of
+    # the first loaded message / tool execution.
+    message_offset: int = 0
+    tool_offset: int = 0
+
+    @property
+    def total_messages(self) -> int:
+        """Message count including any not loaded by a partial load."""
+        return self.message_offset + len(self.messages)
+
     def add_message(
         self,
         role: MessageRole,
@@ -160,7 +195,7 @@ class Session:
         tool_call_id: Optional[str] = None,
     ) -> Message:
         """Add a message to the session."""
-        msg_id = f"msg-{len(self.messages) + 1}-{int(time.time() * 1000) % 10000}"
+        msg_id = f"msg-{self.total_messages + 1}-{int(time.time() * 1000) % 10000}"
 
         message = Message(
             id=msg_id,
@@ -189,7 +224,10 @@ class Session:
         agent_name: Optional[str] = None,
     ) -> ToolExecution:
         """Record a tool execution."""
-        exec_id = f"tool-{len(self.tool_executions) + 1}-{int(time.time() * 1000) % 10000}"
+        exec_id = (
+            f"tool-{self.tool_offset + len(self.tool_executions) + 1}"
+            f"-{int(time.time() * 1000) % 10000}"
+        )
 
         execution = ToolExecution(
             id=exec_id,
@@ -213,7 +251,7 @@ class Session:
         snapshot = SessionSnapshot(
             id=snap_id,
             name=name,
-            message_count=len(self.messages),
+            message_count=self.total_messages,
             description=description,
         )
 
@@ -225,7 +263,9 @@ class Session:
         for snapshot in self.snapshots:
             if snapshot.id == snapshot_id:
                 # Truncate messages and tool executions
-                self.messages = self.messages[: snapshot.message_count]
+                self.messages = self.messages[
+                    : max(0, snapshot.message_count - self.message_offset)
+                ]
 
                 # Find corresponding tool executions
                 if self.messages:
@@ -242,7 +282,16 @@ class Session:
         return False
 
     def fork(self, new_title: str) -> "Session":
-        """Create a forked copy of this session."""
+        """Create a forked copy of this session.
+
+        The fork has no stored history of its own, so a partially loaded
+        session (``SessionStore.load(last_messages=...)``) cannot be forked;
+        load it in full first.
+        """
+        if self.message_offset or self.tool_offset:
+            raise ValueError(
+                f"Session {self.id} was partially loaded; load it in full before forking"
+            )
         fork_id = f"session-{int(time.time())}-fork"
 
         forked = Session(
@@ -275,16 +324,7 @@ class Session:
             "agents_used": self.agents_used,
             "tags": self.tags,
             "parent_session_id": self.parent_session_id,
-            "snapshots": [
-                {
-                    "id": s.id,
-                    "name": s.name,
-                    "message_count": s.message_count,
-                    "created_at": s.created_at.isoformat(),
-                    "description": s.description,
-                }
-                for s in self.snapshots
-            ],
+            "snapshots": [s.to_dict() for s in self.snapshots],
             "metadata": self.metadata,
         }
 
@@ -327,7 +367,14 @@ class SessionStore:
     """
     Persistent storage for sessions.
 
-    Stores sessions as compressed JSON files with indexing for fast listing.
+    Stores each session as an immutable header, a small manifest and
+    compressed message / tool-execution segments
+    (:mod:`superqode.session.segments`). A save only writes the entries added
+    since the previous save, in segments of at most ``segment_entries``.
+    Once ``compact_after`` smaller segments have accumulated, a background
+    compaction packs adjacent ones up to that size. Sessions saved
+    by older versions as a single ``<id>.json.gz`` are still loaded and are
+    migrated on their next save.
 
     Usage:
         store = SessionStore()
@@ -345,17 +392,48 @@ class SessionStore:
 
         # Resume last session
         session = store.load_latest()
+
+        # Only the newest messages of a long session
+        session = store.load("session-1", last_messages=50)
     """
 
-    def __init__(self, storage_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        storage_dir: Optional[Path] = None,
+        *,
+        catalog: bool = True,
+        compact_after: int = 16,
+        background_compaction: bool = True,
+        segment_entries: int = SEGMENT_ENTRIES,
+    ):
         self.storage_dir = storage_dir or (Path.home() / ".superqode" / "sessions")
         self.storage_dir.mkdir(parents=True, exist_ok=True)
 
         self._index_file = self.storage_dir / "index.json"
         self._index: Dict[str, dict] = {}
 
+        self._use_catalog = catalog
+        self._catalog_instance: Optional[SessionCatalog] = None
+
+        self.compact_after = max(2, compact_after)
+        self.segment_entries = max(1, segment_entries)
+        self.background_compaction = background_compaction
+        # Guards manifest read-modify-write between saves and compactions.
+        self._lock = threading.RLock()
+        self._compactions: Dict[str, threading.Thread] = {}
+
         self._load_index()
 
+    def _catalog(self) -> Optional[SessionCatalog]:
+        """Open the directory's session catalog, reindexing it on first creation."""
+        if not self._use_catalog:
+            return None
+        if self._catalog_instance is None:
+            self._catalog_instance = SessionCatalog.for_storage(self.storage_dir)
+            if self._catalog_instance.created:
+                self.reindex()
+        return self._catalog_instance
+
     def _load_index(self) -> None:
         """Load session index from file."""
         if self._index_file.exists():
@@ -372,34 +450,237 @@ class SessionStore:
         """Get path for a session file."""
         return self.storage_dir / f"{session_id}.json.gz"
 
+    def _segments(self, session_id: str, compress: bool = True) -> SessionSegments:
+        """Get the segment directory of a session."""
+        return SessionSegments(self.storage_dir / f"{session_id}{DIR_SUFFIX}", compress=compress)
+
     def save(self, session: Session, compress: bool = True) -> None:
-        """Save a session to storage."""
-        data = json.dumps(session.to_dict(), indent=2)
+        """Save a session to storage.
 
-        file_path = self._session_path(session.id)
+        Only messages and tool executions added since the previous save are
+        written. If the in-memory history no longer extends what is stored
+        (rewind, snapshot revert) the stored history is cut back to the common
+        prefix first. A partially loaded session can be saved as long as the
+        stored history covers the part that was not loaded.
+        """
+        with self._lock:
+            log = self._segments(session.id, compress=compress)
+            manifest = log.read_manifest()
+            if manifest is None and (session.message_offset or session.tool_offset):
+                raise ValueError(
+                    f"Session {session.id} was partially loaded and has no stored history"
+                )
+            before = {kind: log.segments(manifest, kind) for kind in KINDS}
+            after = {
+                "messages": self._sync_segments(
+                    log,
+                    before["messages"],
+                    "messages",
+                    session.messages,
+                    session.message_offset,
+                    self.segment_entries,
+                ),
+                "tool_executions": self._sync_segments(
+                    log,
+                    before["tool_executions"],
+                    "tool_executions",
+                    session.tool_executions,
+                    session.tool_offset,
+                    self.segment_entries,
+                ),
+            }
+            log.write_header(
+                {
+                    "id": session.id,
+                    "created_at": session.created_at.isoformat(),
+                    "parent_session_id": session.parent_session_id,
+                }
+            )
+            log.write_manifest(_session_state(session), after)
+            log.remove_unreferenced(before, after)
+            self._remove_legacy_file(session.id)
+
+            # Update index
+            self._index[session.id] = {
+                "id": session.id,
+                "title": session.title,
+                "created_at": session.created_at.isoformat(),
+                "updated_at": session.updated_at.isoformat(),
+                "project_path": session.project_path,
+                "message_count": session.total_messages,
+                "agents_used": session.agents_used,
+                "tags": session.tags,
+            }
+            self._save_index()
+            self._catalog_session(session)
+
+        mergeable = max(
+            sum(len(group) for group in plan_merges(segments, self.segment_entries))
+            for segments in after.values()
+        )
+        if mergeable >= self.compact_after:
+            if self.background_compaction:
+                self._compact_in_background(session.id)
+            else:
+                self.compact(session.id)
+
+    @staticmethod
+    def _sync_segments(
+        log: SessionSegments,
+        segments: List[Segment],
+        kind: str,
+        entries: List[Any],
+        offset: int,
+        segment_entries: int,
+    ) -> List[Segment]:
+        """Make the stored ``kind`` entries equal ``entries`` (which start at ``offset``)."""
+        stored = total(segments)
+        keep = min(stored, offset + len(entries))
+        if keep > offset and log.id_at(segments, keep - 1) != entries[keep - 1 - offset].id:
+            # History diverged; everything we hold in memory is rewritten.
+            keep = offset
+        if keep < stored:
+            segments = log.truncate(segments, keep)
+        new = entries[keep - offset :]
+        for start in range(0, len(new), segment_entries):
+            chunk = new[start : start + segment_entries]
+            segments = segments + [
+                log.write_segment(kind, keep + start, [e.to_dict() for e in chunk])
+            ]
+        return segments
+
+    def _remove_legacy_file(self, session_id: str) -> None:
+        """Drop a single-file session written by an older version after migration."""
+        legacy = self._session_path(session_id)
+        legacy.unlink(missing_ok=True)
+        legacy.with_suffix("").unlink(missing_ok=True)
+
+    def compact(self, session_id: str) -> bool:
+        """Pack runs of small segments of a session into segments of ``segment_entries``.
+
+        Full segments are left alone (see :func:`~superqode.session.segments.plan_merges`).
+        Merged segments are written without holding the store lock and only
+        swapped in if no save rewrote the merged range meanwhile; a merge
+        whose segments were removed by a rewind or delete is dropped. Returns
+        True when a merge was committed.
+        """
+        with self._lock:
+            log = self._segments(session_id)
+            manifest = log.read_manifest()
+            if manifest is None:
+                return False
+            snapshot = {kind: log.segments(manifest, kind) for kind in KINDS}
+        merged = []
+        for kind, segments in snapshot.items():
+            for group in plan_merges(segments, self.segment_entries):
+                try:
+                    merged.append((kind, group, log.merge(kind, group)))
+                except (OSError, EOFError, json.JSONDecodeError):
+                    # A rewinding save or delete() removed these segments meanwhile.
+                    continue
+        if not merged:
+            return False
+        with self._lock:
+            manifest = log.read_manifest()
+            current = {kind: log.segments(manifest, kind) for kind in KINDS}
+            after = {kind: list(segments) for kind, segments in current.items()}
+            for kind, group, segment in merged:
+                segments = after[kind]
+                at = segments.index(group[0]) if group[0] in segments else -1
+                if at >= 0 and segments[at : at + len(group)] == group:
+                    segments[at : at + len(group)] = [segment]
+            if manifest is not None and after != current:
+                log.write_manifest(manifest.get("state", {}), after)
+                log.remove_unreferenced(current, after)
+            # Merges that lost a race with a rewriting save are discarded.
+            log.remove_unreferenced({"merged": [segment for _, _, segment in merged]}, after)
+            if manifest is None:
+                # The session was deleted while merging; drop the recreated directory.
+                shutil.rmtree(log.directory, ignore_errors=True)
+            return after != current
+
+    def _compact_in_background(self, session_id: str) -> None:
+        running = self._compactions.get(session_id)
+        if running is not None and running.is_alive():
+            return
+        thread = threading.Thread(
+            target=self.compact,
+            args=(session_id,),
+            name=f"superqode-session-compact-{session_id}",
+            daemon=True,
+        )
+        self._compactions[session_id] = thread
+        thread.start()
 
-        if compress:
-            with gzip.open(file_path, "wt", encoding="utf-8") as f:
-                f.write(data)
-        else:
-            file_path = file_path.with_suffix("")  # Remove .gz
-            file_path.write_text(data)
-
-        # Update index
-        self._index[session.id] = {
-            "id": session.id,
-            "title": session.title,
-            "created_at": session.created_at.isoformat(),
-            "updated_at": session.updated_at.isoformat(),
-            "project_path": session.project_path,
-            "message_count": len(session.messages),
-            "agents_used": session.agents_used,
-            "tags": session.tags,
-        }
-        self._save_index()
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Wait for background compactions started by this store."""
+        for thread in list(self._compactions.values()):
+            thread.join(timeout)
+
+    def _catalog_session(self, session: Session) -> None:
+        """Index the messages added since the last save.
 
-    def load(self, session_id: str) -> Optional[Session]:
-        """Load a session from storage."""
+        The catalog remembers the id of each indexed message; when the
+        message at the previous end no longer matches (rewind, snapshot
+        revert) the session is reindexed from the start.
+        """
+        catalog = self._catalog()
+        if catalog is None:
+            return
+        catalog.upsert_session(_catalog_record(session))
+        indexed = catalog.indexed_count(CATALOG_STORE, session.id)
+        offset = session.message_offset
+        start = max(indexed, offset)
+        if indexed > session.total_messages or (
+            indexed > offset
+            and catalog.entry_id(CATALOG_STORE, session.id, indexed - 1)
+            != session.messages[indexed - 1 - offset].id
+        ):
+            start = offset
+        if start < session.total_messages:
+            catalog.add_messages(
+                CATALOG_STORE,
+                session.id,
+                _catalog_messages(session, start),
+                updated_at=session.updated_at.isoformat(),
+            )
+        if session.total_messages < indexed:
+            catalog.truncate_messages(CATALOG_STORE, session.id, session.total_messages)
+
+    def load(
+        self,
+        session_id: str,
+        *,
+        last_messages: Optional[int] = None,
+        metadata_only: bool = False,
+    ) -> Optional[Session]:
+        """Load a session from storage.
+
+        ``metadata_only`` skips messages and tool executions;
+        ``last_messages=K`` loads only the newest K messages (and no tool
+        executions). Both only open the segments they need and set
+        ``message_offset``/``tool_offset`` on the returned session.
+        """
+        with self._lock:
+            log = self._segments(session_id)
+            manifest = log.read_manifest()
+            if manifest is not None:
+                try:
+                    return _session_from_segments(log, manifest, last_messages, metadata_only)
+                except (OSError, EOFError, json.JSONDecodeError, KeyError, ValueError):
+                    return None
+
+        session = self._load_legacy(session_id)
+        if session is not None and (metadata_only or last_messages is not None):
+            keep = 0 if metadata_only else max(0, last_messages)
+            session.message_offset = max(0, len(session.messages) - keep)
+            session.messages = session.messages[session.message_offset :]
+            session.tool_offset = len(session.tool_executions)
+            session.tool_executions = []
+        return session
+
+    def _load_legacy(self, session_id: str) -> Optional[Session]:
+        """Load a session saved as a single JSON (or gzip'd JSON) file."""
         file_path = self._session_path(session_id)
 
         if not file_path.exists():
@@ -422,16 +703,24 @@ class SessionStore:
     def delete(self, session_id: str) -> bool:
         """Delete a session from storage."""
         file_path = self._session_path(session_id)
-
-        if file_path.exists():
-            file_path.unlink()
-        elif file_path.with_suffix("").exists():
-            file_path.with_suffix("").unlink()
-        else:
-            return False
+        segments_dir = self._segments(session_id).directory
+
+        with self._lock:
+            if segments_dir.exists():
+                shutil.rmtree(segments_dir, ignore_errors=True)
+                self._remove_legacy_file(session_id)
+            elif file_path.exists():
+                file_path.unlink()
+            elif file_path.with_suffix("").exists():
+                file_path.with_suffix("").unlink()
+            else:
+                return False
 
         self._index.pop(session_id, None)
         self._save_index()
+        catalog = self._catalog()
+        if catalog is not None:
+            catalog.delete_session(CATALOG_STORE, session_id)
         return True
 
     def list_sessions(
@@ -465,8 +754,13 @@ class SessionStore:
 
         return None
 
-    def search(self, query: str, limit: int = 20) -> List[dict]:
-        """Search sessions by title or content."""
+    def search(self, query: str, limit: int = 20, **filters: Any) -> List[dict]:
+        """Search sessions by title, tags or message content.
+
+        Title and tag matches come first; full-text matches from the session
+        catalog follow, best first, with ``snippet`` and ``score`` keys.
+        ``filters`` are passed to :meth:`SessionCatalog.search`.
+        """
         query_lower = query.lower()
         results = []
 
@@ -489,8 +783,34 @@ class SessionStore:
             reverse=True,
         )
 
+        catalog = self._catalog()
+        if catalog is not None and len(results) < limit:
+            seen = {info["id"] for info in results}
+            for hit in catalog.search(query, store=CATALOG_STORE, limit=limit, **filters):
+                info = self._index.get(hit.session.session_id)
+                if info is None or info["id"] in seen:
+                    continue
+                seen.add(info["id"])
+                results.append({**info, "snippet": hit.snippet, "score": hit.score})
+
         return results[:limit]
 
+    def reindex(self) -> bool:
+        """Rebuild this directory's catalog rows from the stored session files.
+
+        Returns False when the catalog could not be written.
+        """
+        catalog = self._catalog()
+        if catalog is None:
+            return False
+        return catalog.replace_store(CATALOG_STORE, self._catalog_rows())
+
+    def _catalog_rows(self) -> Iterator[Tuple[CatalogSession, List[CatalogMessage]]]:
+        for session_id in list(self._index):
+            session = self.load(session_id)
+            if session is not None:
+                yield _catalog_record(session), list(_catalog_messages(session, 0))
+
     def export_session(
         self,
         session_id: str,
@@ -563,6 +883,78 @@ class SessionStore:
         return deleted
 
 
+def _catalog_record(session: Session) -> CatalogSession:
+    return CatalogSession(
+        store=CATALOG_STORE,
+        session_id=session.id,
+        title=session.title,
+        agents=list(session.agents_used),
+        model=str(session.metadata.get("model") or ""),
+        project_path=session.project_path,
+        parent_session_id=session.parent_session_id,
+        created_at=session.created_at.isoformat(),
+        updated_at=session.updated_at.isoformat(),
+        message_count=session.total_messages,
+        tags=list(session.tags),
+    )
+
+
+def _catalog_messages(session: Session, start: int) -> Iterator[CatalogMessage]:
+    for position, message in enumerate(session.messages[start - session.message_offset :], start):
+        yield CatalogMessage(
+            position,
+            message.role.value,
+            message.content,
+            message.timestamp.isoformat(),
+            message.id,
+        )
+
+
+def _session_state(session: Session) -> dict:
+    """Session fields stored in the manifest (everything but the entry lists).
+
+    Built from the scalar fields so a save does not serialize the history.
+    """
+    return {
+        "id": session.id,
+        "title": session.title,
+        "created_at": session.created_at.isoformat(),
+        "updated_at": session.updated_at.isoformat(),
+        "project_path": session.project_path,
+        "files_modified": session.files_modified,
+        "files_created": session.files_created,
+        "agents_used": session.agents_used,
+        "tags": session.tags,
+        "parent_session_id": session.parent_session_id,
+        "snapshots": [s.to_dict() for s in session.snapshots],
+        "metadata": session.metadata,
+    }
+
+
+def _session_from_segments(
+    log: SessionSegments,
+    manifest: dict,
+    last_messages: Optional[int],
+    metadata_only: bool,
+) -> Session:
+    session = Session.from_dict(manifest["state"])
+    messages = log.segments(manifest, "messages")
+    tools = log.segments(manifest, "tool_executions")
+    if metadata_only:
+        start = total(messages)
+    elif last_messages is not None:
+        start = max(0, total(messages) - max(0, last_messages))
+    else:
+        start = 0
+    session.message_offset = start
+    session.messages = [Message.from_dict(m) for m in log.read(messages, start)]
+    if metadata_only or last_messages is not None:
+        session.tool_offset = total(tools)
+    else:
+        session.tool_executions = [ToolExecution.from_dict(t) for t in log.read(tools)]
+    return session
+
+
 def create_session(
     title: str = "",
     project_path: Optional[Path] = None,
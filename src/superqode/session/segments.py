@@ -0,0 +1,241 @@
+"""
+Append-oriented on-disk layout for persisted sessions.
+
+A session saved by :class:`~superqode.session.persistence.SessionStore` lives
+in ``<storage_dir>/<id>.session/``::
+
+    header.json                          immutable: format, id, created_at, parent
+    manifest.json                        session fields + ordered segment list
+    messages-000000000-<tag>.jsonl.gz    one gzip'd JSON object per line
+    tool_executions-000000012-<tag>.jsonl.gz
+
+A save writes one new segment per kind holding only the entries added since
+the previous save, then atomically replaces the (small) manifest, so autosave
+cost tracks what changed rather than the length of the session. Segments are
+never modified in place: a rewind rewrites at most the one segment that
+straddles the cut, and compaction writes a merged segment before swapping it
+into the manifest and deleting the originals.
+
+Segments hold at most ``SEGMENT_ENTRIES`` entries. Compaction only packs runs
+of adjacent smaller segments up to that size and never touches a full one, so
+each entry is rewritten a bounded number of times over the life of a session
+and a tail load opens about ``K / SEGMENT_ENTRIES`` segments.
+
+The manifest records each segment's start position, entry count and last
+entry id, which is enough to materialize the last K messages by opening only
+the trailing segments, and to tell whether the caller's in-memory history
+still extends what is on disk.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+FORMAT_VERSION = 1
+KINDS = ("messages", "tool_executions")
+DIR_SUFFIX = ".session"
+SEGMENT_ENTRIES = 256
+
+
+@dataclass(frozen=True)
+class Segment:
+    """One immutable segment file and the entry range it holds."""
+
+    file: str
+    start: int
+    count: int
+    last_id: str = ""
+
+    @property
+    def stop(self) -> int:
+        return self.start + self.count
+
+    def to_dict(self) -> dict:
+        return {
+            "file": self.file,
+            "start": self.start,
+            "count": self.count,
+            "last_id": self.last_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Segment":
+        return cls(
+            file=data["file"],
+            start=int(data["start"]),
+            count=int(data["count"]),
+            last_id=data.get("last_id", ""),
+        )
+
+
+def total(segments: List[Segment]) -> int:
+    """Number of entries held by an ordered segment list."""
+    return segments[-1].stop if segments else 0
+
+
+def plan_merges(segments: List[Segment], target: int = SEGMENT_ENTRIES) -> List[List[Segment]]:
+    """Runs of adjacent segments below ``target`` entries, packed up to ``target``.
+
+    Only runs of two or more segments are returned; a segment that already
+    holds ``target`` entries ends a run and is never merged again.
+    """
+    groups: List[List[Segment]] = []
+    run: List[Segment] = []
+    size = 0
+    for segment in segments:
+        if segment.count >= target or size + segment.count > target:
+            if len(run) > 1:
+                groups.append(run)
+            run, size = [], 0
+            if segment.count >= target:
+                continue
+        run.append(segment)
+        size += segment.count
+    if len(run) > 1:
+        groups.append(run)
+    return groups
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class SessionSegments:
+    """Reads and writes the segment directory of one session."""
+
+    def __init__(self, directory: Path, *, compress: bool = True):
+        self.directory = Path(directory)
+        self.compress = compress
+
+    @property
+    def header_path(self) -> Path:
+        return self.directory / "header.json"
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / "manifest.json"
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    # ----------------------------------------------------------- header/manifest
+
+    def write_header(self, header: Dict[str, Any]) -> None:
+        """Write the immutable header once; later calls leave it untouched."""
+        if self.header_path.exists():
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.header_path, json.dumps({"format": FORMAT_VERSION, **header}, indent=2))
+
+    def read_header(self) -> Optional[dict]:
+        try:
+            return json.loads(self.header_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def read_manifest(self) -> Optional[dict]:
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return manifest if isinstance(manifest, dict) else None
+
+    def write_manifest(self, state: Dict[str, Any], segments: Dict[str, List[Segment]]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "format": FORMAT_VERSION,
+            "state": state,
+            "segments": {kind: [s.to_dict() for s in segments.get(kind, [])] for kind in KINDS},
+        }
+        _write_atomic(self.manifest_path, json.dumps(manifest, indent=2))
+
+    @staticmethod
+    def segments(manifest: Optional[dict], kind: str) -> List[Segment]:
+        if not manifest:
+            return []
+        return [Segment.from_dict(s) for s in manifest.get("segments", {}).get(kind, [])]
+
+    # ------------------------------------------------------------------ segments
+
+    def write_segment(self, kind: str, start: int, entries: List[dict]) -> Segment:
+        """Write ``entries`` (positions ``start``..) to a new segment file."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        name = f"{kind}-{start:09d}-{uuid.uuid4().hex[:8]}{suffix}"
+        payload = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        tmp = self.directory / f".{name}.tmp"
+        if self.compress:
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+                f.write(payload)
+        else:
+            tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.directory / name)
+        return Segment(name, start, len(entries), str(entries[-1].get("id", "")) if entries else "")
+
+    def read_segment(self, segment: Segment) -> List[dict]:
+        path = self.directory / segment.file
+        if path.suffix == ".gz":
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        else:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        return [json.loads(line) for line in lines if line.strip()]
+
+    def read(
+        self, segments: List[Segment], start: int = 0, stop: Optional[int] = None
+    ) -> List[dict]:
+        """Return entries ``start``..``stop``, opening only overlapping segments."""
+        stop = total(segments) if stop is None else min(stop, total(segments))
+        entries: List[dict] = []
+        for segment in segments:
+            if segment.stop <= start or segment.start >= stop:
+                continue
+            rows = self.read_segment(segment)
+            entries.extend(rows[max(0, start - segment.start) : stop - segment.start])
+        return entries
+
+    def id_at(self, segments: List[Segment], position: int) -> Optional[str]:
+        """Return the id of the entry at ``position`` (cheap for the last one)."""
+        if not 0 <= position < total(segments):
+            return None
+        if position == total(segments) - 1:
+            return segments[-1].last_id
+        rows = self.read(segments, position, position + 1)
+        return str(rows[0].get("id", "")) if rows else None
+
+    def truncate(self, segments: List[Segment], keep: int) -> List[Segment]:
+        """Drop entries from ``keep`` on; rewrites only a straddling segment."""
+        kept: List[Segment] = []
+        for segment in segments:
+            if segment.stop <= keep:
+                kept.append(segment)
+            elif segment.start < keep:
+                rows = self.read_segment(segment)[: keep - segment.start]
+                kind = segment.file.split("-", 1)[0]
+                kept.append(self.write_segment(kind, segment.start, rows))
+        return kept
+
+    def merge(self, kind: str, segments: List[Segment]) -> Segment:
+        """Write one segment holding every entry of ``segments``."""
+        rows: List[dict] = []
+        for segment in segments:
+            rows.extend(self.read_segment(segment))
+        return self.write_segment(kind, segments[0].start if segments else 0, rows)
+
+    def remove_unreferenced(
+        self, before: Dict[str, List[Segment]], after: Dict[str, List[Segment]]
+    ) -> None:
+        """Delete segment files listed in ``before`` but no longer in ``after``."""
+        live = {s.file for segments in after.values() for s in segments}
+        for segments in before.values():
+            for segment in segments:
+                if segment.file not in live:
+                    (self.directory / segment.file).unlink(missing_ok=True)
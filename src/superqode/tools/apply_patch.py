@@ -38,7 +38,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from .base import Tool, ToolContext, ToolResult
 from .diff_utils import build_unified_diff, diff_stats
 from .file_tracking import check_file_unchanged, record_file_read
-from .post_edit import verify_edit
+from .post_edit import verify_edits
 from .validation import validate_path_in_working_directory
 
 BEGIN_MARKER = "*** Begin Patch"
@@ -394,6 +394,7 @@ class ApplyPatchTool(Tool):
         diffs: List[str] = []
         total_add = total_del = 0
         result = ToolResult(success=True, output="")
+        written: List[Path] = []
         for op, file_path, move_path, old_content, new_content in planned:
             if op.kind == "delete":
                 file_path.unlink()
@@ -427,7 +428,9 @@ class ApplyPatchTool(Tool):
                 record_file_read(session_id, str(target.resolve()), target.stat().st_mtime)
             except OSError:
                 pass
-            result = await verify_edit(result, target, ctx)
+            written.append(target)
+        # One batched check for every written file
+        result = await verify_edits(result, written, ctx)
 
         output = "Done. Applied patch to {} file(s):\n{}".format(len(planned), "\n".join(summary))
         if total_add or total_del:
@@ -192,35 +192,33 @@ class DiagnosticsTool(Tool):
         """Try to get diagnostics from LSP client."""
         try:
             from superqode.lsp.client import LSPClient, LSPConfig
+            from superqode.lsp.pool import get_lsp_pool
+
+            language = self._get_language(path)
+            if not path.is_file() or not language:
+                return None
+
+            # Hands the pooled server back even when the request fails
+            async with LSPClient(ctx.working_directory, LSPConfig(), pool=get_lsp_pool()) as client:
+                await client.start_server(language)
+                # Returns as soon as the server publishes for this content
+                diagnostics = await client.wait_for_diagnostics(
+                    str(path.relative_to(ctx.working_directory)), timeout=1.0
+                )
 
-            # Check if LSP client is available
-            client = LSPClient(ctx.working_directory, LSPConfig())
-
-            if path.is_file():
-                language = self._get_language(path)
-                if language:
-                    await client.start_server(language)
-                    await client.open_file(str(path.relative_to(ctx.working_directory)))
-                    # Wait for diagnostics
-                    await asyncio.sleep(1.0)
-                    diagnostics = await client.get_diagnostics(str(path))
-                    await client.shutdown()
-
-                    if diagnostics:
-                        return [
-                            {
-                                "file": str(path),
-                                "line": d.range.start.line + 1,
-                                "column": d.range.start.character + 1,
-                                "severity": d.severity_name,
-                                "message": d.message,
-                                "source": d.source or "lsp",
-                            }
-                            for d in diagnostics
-                        ]
-
-            await client.shutdown()
-            return None
+            if not diagnostics:
+                return None
+            return [
+                {
+                    "file": str(path),
+                    "line": d.range.start.line + 1,
+                    "column": d.range.start.character + 1,
+                    "severity": d.severity_name,
+                    "message": d.message,
+                    "source": d.source or "lsp",
+                }
+                for d in diagnostics
+            ]
 
         except ImportError:
             return None
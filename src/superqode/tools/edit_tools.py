@@ -19,7 +19,7 @@ from .base import Tool, ToolResult, ToolContext
 from .validation import validate_path_in_working_directory
 from .file_tracking import check_file_unchanged
 from .diff_utils import build_unified_diff, diff_stats
-from .post_edit import verify_edit
+from .post_edit import verify_edit, verify_edits
 from ..agent.edit_strategies import replace_with_strategies
 
 
@@ -443,13 +443,13 @@ class PatchTool(Tool):
 
             # Run post-edit verification on directly-written files (skip when a
             # workspace worktree owns the writes - the project path is stale then).
-            if success and not workspace:
-                primary = patch_result.metadata.get("path")
-                if primary:
-                    try:
-                        patch_result = await verify_edit(patch_result, Path(primary), ctx)
-                    except Exception:
-                        pass
+            if success and not workspace and file_patches:
+                try:
+                    patch_result = await verify_edits(
+                        patch_result, [Path(name) for name in file_patches], ctx
+                    )
+                except Exception:
+                    pass
             return patch_result
 
         except Exception as e:
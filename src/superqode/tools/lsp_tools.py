@@ -136,8 +136,9 @@ Operations:
         try:
             # Import LSP client
             from superqode.lsp.client import LSPClient, LSPConfig
+            from superqode.lsp.pool import get_lsp_pool
 
-            client = LSPClient(ctx.working_directory, LSPConfig())
+            client = LSPClient(ctx.working_directory, LSPConfig(), pool=get_lsp_pool())
 
             # Determine language and start server
             language = client._get_language(str(target_path))
@@ -148,23 +149,23 @@ Operations:
                     error=f"No language server configured for file type: {target_path.suffix}",
                 )
 
-            started = await client.start_server(language)
-            if not started:
-                return ToolResult(
-                    success=False,
-                    output="",
-                    error=f"Failed to start language server for {language}",
-                )
+            try:
+                started = await client.start_server(language)
+                if not started:
+                    return ToolResult(
+                        success=False,
+                        output="",
+                        error=f"Failed to start language server for {language}",
+                    )
 
-            # Open the file to initialize
-            rel_path = str(target_path.relative_to(ctx.working_directory))
-            await client.open_file(rel_path)
+                # Open the file to initialize
+                rel_path = str(target_path.relative_to(ctx.working_directory))
+                await client.open_file(rel_path)
 
-            # Wait for initialization
-            await asyncio.sleep(0.5)
+                # Wait for initialization
+                await asyncio.sleep(0.5)
 
-            # Dispatch to operation handler
-            try:
+                # Dispatch to operation handler
                 if operation == "goto_definition":
                     result = await self._goto_definition(
                         client, language, target_path, line, character
@@ -190,6 +191,7 @@ Operations:
                 else:
                     result = ToolResult(success=False, output="", error="Operation not implemented")
             finally:
+                # Hands a pooled server back even when a request fails
                 await client.shutdown()
 
             return result
@@ -92,12 +92,13 @@ Example: Search for "web search" to find EXA or other search tools."""
                 return None
         return await _get_default_mcp_manager()
 
-    async def _load_tools(self) -> List[MCPToolMatch]:
+    async def _load_tools(self, mcp_manager: Any = None) -> List[MCPToolMatch]:
         """Load and cache MCP tools from all servers."""
         if self._cache_loaded:
             return self._cache
 
-        mcp_manager = await self._get_mcp_manager()
+        if mcp_manager is None:
+            mcp_manager = await self._get_mcp_manager()
         if not mcp_manager:
             return []
 
@@ -132,7 +133,13 @@ Example: Search for "web search" to find EXA or other search tools."""
                 error="Search query is required",
             )
 
-        tools = await self._load_tools()
+        mcp_manager = await self._get_mcp_manager()
+        # The manager keeps its own BM25 index current as servers connect and change
+        indexed = use_bm25 and callable(getattr(mcp_manager, "search_tools", None))
+        if indexed:
+            tools = mcp_manager.list_all_tools()
+        else:
+            tools = await self._load_tools(mcp_manager)
 
         if not tools:
             return ToolResult(
@@ -141,16 +148,19 @@ Example: Search for "web search" to find EXA or other search tools."""
                 metadata={"query": query, "count": 0},
             )
 
-        filtered_tools = tools
-        if server_filter:
-            filtered_tools = [t for t in tools if t.server == server_filter]
-
-        if use_bm25:
-            results = BM25Search.search(filtered_tools, query, limit)
+        if indexed:
+            results = mcp_manager.search_tools(query, limit, server_filter)
         else:
-            from ..mcp.search import keyword_search
+            filtered_tools = tools
+            if server_filter:
+                filtered_tools = [t for t in tools if t.server == server_filter]
+
+            if use_bm25:
+                results = BM25Search.search(filtered_tools, query, limit)
+            else:
+                from ..mcp.search import keyword_search
 
-            results = keyword_search(filtered_tools, query, limit)
+                results = keyword_search(filtered_tools, query, limit)
 
         if not results:
             return ToolResult(
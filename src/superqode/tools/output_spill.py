@@ -19,7 +19,7 @@ import os
 import time
 import uuid
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import BinaryIO, Optional, Tuple
 
 SPILL_DIR_ENV = "SUPERQODE_TOOL_OUTPUT_DIR"
 RETENTION_SECONDS = 7 * 24 * 3600
@@ -68,23 +68,92 @@ def cleanup_spill_dir(now: Optional[float] = None) -> int:
     return removed
 
 
-def spill_output(text: str, prefix: str = "tool") -> Optional[Path]:
-    """Write full output to a spill file. Returns the path, or None on failure."""
+def _new_spill_path(prefix: str) -> Path:
+    """Path for a new spill file, creating (and pruning) the spill dir."""
     global _cleanup_done
     directory = get_spill_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    if not _cleanup_done:
+        _cleanup_done = True
+        cleanup_spill_dir()
+    name = (
+        f"{SPILL_FILE_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}_{prefix}_{uuid.uuid4().hex[:8]}.txt"
+    )
+    return directory / name
+
+
+def spill_output(text: str, prefix: str = "tool") -> Optional[Path]:
+    """Write full output to a spill file. Returns the path, or None on failure."""
     try:
-        directory.mkdir(parents=True, exist_ok=True)
-        if not _cleanup_done:
-            _cleanup_done = True
-            cleanup_spill_dir()
-        name = f"{SPILL_FILE_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}_{prefix}_{uuid.uuid4().hex[:8]}.txt"
-        path = directory / name
+        path = _new_spill_path(prefix)
         path.write_text(text, encoding="utf-8", errors="replace")
         return path
     except OSError:
         return None
 
 
+class SpillWriter:
+    """Write a spill file incrementally, keeping at most ``limit`` bytes.
+
+    For producers whose output should never be held in memory whole. The
+    file is created on the first write; a failed write leaves no file and
+    makes :meth:`close` return None, like :func:`spill_output`.
+    """
+
+    def __init__(self, prefix: str = "tool", limit: int = SPILL_HARD_CAP_BYTES):
+        self.prefix = prefix
+        self.limit = limit
+        self.written = 0
+        self.dropped = 0  # Bytes past ``limit``
+        self._path: Optional[Path] = None
+        self._file: Optional[BinaryIO] = None
+        self._failed = False
+
+    def write(self, data: bytes) -> None:
+        room = self.limit - self.written
+        if len(data) > room:
+            self.dropped += len(data) - max(room, 0)
+            data = data[: max(room, 0)]
+        if not data or self._failed:
+            return
+        try:
+            if self._file is None:
+                self._path = _new_spill_path(self.prefix)
+                self._file = open(self._path, "wb")
+            self._file.write(data)
+            self.written += len(data)
+        except OSError:
+            self.discard()
+            self._failed = True
+
+    def close(self) -> Optional[Path]:
+        """Finish the file; returns its path, or None if nothing was spilled."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                self._failed = True
+            self._file = None
+        if self._failed:
+            self.discard()
+        return self._path
+
+    def discard(self) -> None:
+        """Close and delete the file."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+        if self._path is not None:
+            try:
+                self._path.unlink()
+            except OSError:
+                pass
+            self._path = None
+
+
 def _cut_at_line_boundary(text: str, limit: int, from_end: bool) -> str:
     """Cut text to at most ``limit`` bytes, preferring a line boundary."""
     encoded = text.encode("utf-8", errors="replace")
@@ -127,18 +196,47 @@ def truncate_with_spill(
         return text, False, None
 
     spill_path = spill_output(text[: SPILL_HARD_CAP_BYTES * 4], prefix=prefix)
+    content = spill_preview(
+        text,
+        text,
+        total_bytes,
+        max_bytes=max_bytes,
+        spill_path=spill_path,
+        label=label,
+        direction=direction,
+    )
+    return content, True, spill_path
 
+
+def preview_budgets(max_bytes: int, direction: str = "head_tail") -> Tuple[int, int]:
+    """Bytes of head and tail shown in a ``max_bytes`` preview."""
     if direction == "head":
-        head = _cut_at_line_boundary(text, max_bytes, from_end=False)
-        tail = ""
-    elif direction == "tail":
-        head = ""
-        tail = _cut_at_line_boundary(text, max_bytes, from_end=True)
-    else:  # head_tail
-        head_budget = max(256, int(max_bytes * _HEAD_FRACTION))
-        tail_budget = max(256, max_bytes - head_budget)
-        head = _cut_at_line_boundary(text, head_budget, from_end=False)
-        tail = _cut_at_line_boundary(text, tail_budget, from_end=True)
+        return max_bytes, 0
+    if direction == "tail":
+        return 0, max_bytes
+    head_budget = max(256, int(max_bytes * _HEAD_FRACTION))
+    return head_budget, max(256, max_bytes - head_budget)
+
+
+def spill_preview(
+    head_source: str,
+    tail_source: str,
+    total_bytes: int,
+    *,
+    max_bytes: int,
+    spill_path: Optional[Path],
+    label: str = "output",
+    direction: str = "head_tail",
+) -> str:
+    """The truncated preview :func:`truncate_with_spill` returns.
+
+    ``head_source`` must start like the full text and ``tail_source`` end
+    like it, each covering at least its :func:`preview_budgets` share, so
+    callers that never hold the whole text can still build the preview.
+    """
+    head_budget, tail_budget = preview_budgets(max_bytes, direction)
+    head = _cut_at_line_boundary(head_source, head_budget, from_end=False) if head_budget else ""
+    tail = _cut_at_line_boundary(tail_source, tail_budget, from_end=True) if tail_budget else ""
 
     shown = len(head.encode("utf-8", errors="replace")) + len(
         tail.encode("utf-8", errors="replace")
@@ -155,19 +253,20 @@ def truncate_with_spill(
         note = f"\n\n[{label} truncated: {omitted:,} of {total_bytes:,} bytes omitted.]\n\n"
 
     if direction == "head":
-        content = head + note.rstrip("\n")
-    elif direction == "tail":
-        content = note.lstrip("\n") + tail
-    else:
-        content = head + note + tail
-    return content, True, spill_path
+        return head + note.rstrip("\n")
+    if direction == "tail":
+        return note.lstrip("\n") + tail
+    return head + note + tail
 
 
 __all__ = [
     "SPILL_DIR_ENV",
     "SPILL_HARD_CAP_BYTES",
+    "SpillWriter",
     "cleanup_spill_dir",
     "get_spill_dir",
+    "preview_budgets",
     "spill_output",
+    "spill_preview",
     "truncate_with_spill",
 ]
@@ -1,6 +1,6 @@
 """
 Post-edit verification — the feedback loop that runs after the agent writes or
-edits a file. It runs a *fast, single-file* check (syntax + lint) and, when
+edits a file. It runs a *fast, per-file* check (syntax + lint) and, when
 enabled, an auto-format, then returns concise findings that get appended to the
 tool result so the model can self-correct immediately instead of shipping a
 broken edit.
@@ -11,24 +11,48 @@ Design goals:
 - Quiet on success: clean files add nothing (keeps local-model context lean).
 - Safe by default: diagnostics ON, auto-format OFF (formatting mutates files).
 
+Checks go through one :class:`PostEditVerifier` per process, which keeps the
+cost per edit down:
+- Batched: the files of one tool call (``verify_edits``) and of tool calls
+  that arrive together are checked with one checker process per language
+  (``ruff check a.py b.py``), not one per file.
+- Debounced: a file edited again while its check is still queued is checked
+  once, against its latest content. Requests arriving while a batch runs
+  wait for the next batch.
+- Warm: the syntax-only Python fallback runs in a long-lived interpreter
+  instead of ``python -m py_compile`` per file, and ``eslint_d`` is used in
+  place of ``eslint`` when installed.
+- Cached: findings are kept by file content hash, so re-verifying an
+  unchanged file costs a hash.
+
 Env toggles:
 - ``SUPERQODE_VERIFY_EDITS=0``     disable diagnostics entirely.
 - ``SUPERQODE_FORMAT_ON_EDIT=1``   enable auto-format after edit.
+- ``SUPERQODE_VERIFY_DEBOUNCE_MS`` quiet period before a batch starts (default
+  0: the batch takes whatever was requested in the same event-loop turn).
 """
 
 from __future__ import annotations
 
 import asyncio
+import atexit
+import hashlib
 import json
 import os
 import shutil
+import subprocess
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .base import ToolResult
 
 _MAX_FINDINGS = 15
 _TIMEOUT_SECONDS = 12
+_CACHE_SIZE = 512
+
+DEBOUNCE_ENV = "SUPERQODE_VERIFY_DEBOUNCE_MS"
 
 
 def _diagnostics_enabled() -> bool:
@@ -49,6 +73,13 @@ def _format_enabled() -> bool:
     )
 
 
+def _debounce_seconds() -> float:
+    try:
+        return max(0.0, float(os.environ.get(DEBOUNCE_ENV, "0"))) / 1000
+    except ValueError:
+        return 0.0
+
+
 def _arg(path: Path, cwd: Path) -> str:
     """Path to hand a checker — relative to cwd when possible for tidy output."""
     try:
@@ -64,7 +95,12 @@ async def _run(args: List[str], cwd: Path) -> tuple[int, str, str]:
         stderr=asyncio.subprocess.PIPE,
         cwd=str(cwd),
     )
-    out, err = await asyncio.wait_for(proc.communicate(), timeout=_TIMEOUT_SECONDS)
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout=_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
     return (
         proc.returncode if proc.returncode is not None else 1,
         out.decode("utf-8", errors="replace"),
@@ -72,78 +108,196 @@ async def _run(args: List[str], cwd: Path) -> tuple[int, str, str]:
     )
 
 
+def _by_file(lines: Sequence[str], files: Sequence[Path], cwd: Path) -> Dict[Path, List[str]]:
+    """Attribute ``path:...`` output lines of a batched checker to their files."""
+    prefixes = []
+    for path in files:
+        prefixes.append((_arg(path, cwd) + ":", path))
+        prefixes.append((str(path) + ":", path))
+    # Longest first, so a.py: never claims lines of a.pyi:
+    prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+    found: Dict[Path, List[str]] = {path: [] for path in files}
+    for line in lines:
+        for prefix, path in prefixes:
+            if line.startswith(prefix):
+                if len(found[path]) < _MAX_FINDINGS:
+                    found[path].append(line)
+                break
+    return found
+
+
+# ── Warm syntax checker ─────────────────────────────────────────────────────
+
+_SYNTAX_WORKER = r"""
+import json, os, sys, traceback
+for request in sys.stdin:
+    request = json.loads(request)
+    found = {}
+    for name in request["files"]:
+        try:
+            with open(os.path.join(request["cwd"], name), "rb") as handle:
+                compile(handle.read(), name, "exec", dont_inherit=True)
+        except OSError:
+            pass
+        except Exception as exc:
+            found[name] = traceback.format_exception_only(type(exc), exc)
+    sys.stdout.write(json.dumps(found) + "\n")
+    sys.stdout.flush()
+"""
+
+
+class _SyntaxWorker:
+    """A long-lived ``python`` that compiles files on request.
+
+    Replaces one ``python -m py_compile`` per file, so the interpreter starts
+    once per process instead of once per edit (and no ``.pyc`` files land in
+    the project). Requests are serialized; a worker that dies or times out
+    is replaced on the next request.
+    """
+
+    def __init__(self) -> None:
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _request(self, cwd: str, files: List[str]) -> Dict[str, List[str]]:
+        with self._lock:
+            for _ in range(2):
+                if self._proc is None or self._proc.poll() is not None:
+                    self._proc = subprocess.Popen(
+                        ["python", "-c", _SYNTAX_WORKER],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                        text=True,
+                    )
+                try:
+                    self._proc.stdin.write(json.dumps({"cwd": cwd, "files": files}) + "\n")
+                    self._proc.stdin.flush()
+                    reply = self._proc.stdout.readline()
+                    if reply:
+                        return json.loads(reply)
+                except (OSError, ValueError):
+                    pass
+                self.close()
+            return {}
+
+    async def check(self, files: Sequence[Path], cwd: Path) -> Dict[Path, List[str]]:
+        names = {_arg(path, cwd): path for path in files}
+        try:
+            found = await asyncio.wait_for(
+                asyncio.to_thread(self._request, str(cwd), list(names)), _TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            self.close()
+            return {}
+        return {
+            names[name]: [
+                line.rstrip() for chunk in chunks for line in chunk.splitlines() if line.strip()
+            ][:_MAX_FINDINGS]
+            for name, chunks in found.items()
+            if name in names
+        }
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+_syntax_worker = _SyntaxWorker()
+atexit.register(_syntax_worker.close)
+
+
 # ── Per-language diagnostics ────────────────────────────────────────────────
 
 
-async def _check_python(file_path: Path, cwd: Path) -> List[str]:
-    """Prefer ruff (lint + syntax); fall back to py_compile (syntax only)."""
+async def _check_python(files: Sequence[Path], cwd: Path) -> Dict[Path, List[str]]:
+    """Prefer ruff (lint + syntax); fall back to compiling (syntax only)."""
     if shutil.which("ruff"):
         try:
             _, out, _ = await _run(
-                ["ruff", "check", _arg(file_path, cwd), "--output-format", "concise", "--quiet"],
+                [
+                    "ruff",
+                    "check",
+                    *(_arg(path, cwd) for path in files),
+                    "--output-format",
+                    "concise",
+                    "--quiet",
+                ],
                 cwd,
             )
-            lines = [ln.strip() for ln in out.splitlines() if ln.strip()]
             # ruff concise lines look like: path:line:col: CODE message
-            return [ln for ln in lines if ":" in ln][:_MAX_FINDINGS]
+            return _by_file([ln.strip() for ln in out.splitlines() if ln.strip()], files, cwd)
         except Exception:
             pass
     # Syntax-only fallback.
     try:
-        code, _, err = await _run(["python", "-m", "py_compile", _arg(file_path, cwd)], cwd)
-        if code != 0:
-            msg = err.strip().splitlines()
-            return [m for m in msg if m.strip()][:_MAX_FINDINGS]
+        return await _syntax_worker.check(files, cwd)
     except Exception:
-        pass
-    return []
+        return {}
+
 
+async def _check_js_ts(files: Sequence[Path], cwd: Path) -> Dict[Path, List[str]]:
+    """eslint on the edited files when it's configured; otherwise stay silent.
 
-async def _check_js_ts(file_path: Path, cwd: Path) -> List[str]:
-    """eslint on the single file when it's configured; otherwise stay silent."""
-    if not shutil.which("eslint"):
-        return []
+    ``eslint_d`` keeps eslint loaded between runs and is preferred when
+    installed.
+    """
+    eslint = "eslint_d" if shutil.which("eslint_d") else "eslint"
+    if not shutil.which(eslint):
+        return {}
     try:
-        _, out, _ = await _run(["eslint", _arg(file_path, cwd), "--format", "compact"], cwd)
+        _, out, _ = await _run(
+            [eslint, *(_arg(path, cwd) for path in files), "--format", "compact"], cwd
+        )
         lines = [ln.strip() for ln in out.splitlines() if ": line " in ln or "error" in ln.lower()]
-        return lines[:_MAX_FINDINGS]
+        if len(files) == 1:
+            return {files[0]: lines[:_MAX_FINDINGS]}
+        return _by_file(lines, files, cwd)
     except Exception:
-        return []
+        return {}
 
 
-async def _check_go(file_path: Path, cwd: Path) -> List[str]:
-    """gofmt -e surfaces syntax errors without rewriting the file."""
+async def _check_go(files: Sequence[Path], cwd: Path) -> Dict[Path, List[str]]:
+    """gofmt -e -l surfaces syntax errors without rewriting the files."""
     if not shutil.which("gofmt"):
-        return []
+        return {}
     try:
-        code, _, err = await _run(["gofmt", "-e", _arg(file_path, cwd)], cwd)
+        code, _, err = await _run(["gofmt", "-e", "-l", *(_arg(path, cwd) for path in files)], cwd)
         if code != 0 and err.strip():
-            return [ln.strip() for ln in err.splitlines() if ln.strip()][:_MAX_FINDINGS]
+            return _by_file([ln.strip() for ln in err.splitlines() if ln.strip()], files, cwd)
     except Exception:
         pass
-    return []
+    return {}
 
 
-async def _check_json(file_path: Path, cwd: Path) -> List[str]:
-    try:
-        json.loads(file_path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
-        return [f"{file_path.name}:{exc.lineno}:{exc.colno}: invalid JSON: {exc.msg}"]
-    except Exception:
-        pass
-    return []
+async def _check_json(files: Sequence[Path], cwd: Path) -> Dict[Path, List[str]]:
+    found: Dict[Path, List[str]] = {}
+    for file_path in files:
+        try:
+            json.loads(file_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            found[file_path] = [
+                f"{file_path.name}:{exc.lineno}:{exc.colno}: invalid JSON: {exc.msg}"
+            ]
+        except Exception:
+            pass
+    return found
 
 
-async def _check_yaml(file_path: Path, cwd: Path) -> List[str]:
+async def _check_yaml(files: Sequence[Path], cwd: Path) -> Dict[Path, List[str]]:
     try:
         import yaml  # type: ignore
     except Exception:
-        return []
-    try:
-        yaml.safe_load(file_path.read_text(encoding="utf-8"))
-    except Exception as exc:  # yaml.YAMLError
-        return [f"{file_path.name}: invalid YAML: {str(exc).splitlines()[0]}"]
-    return []
+        return {}
+    found: Dict[Path, List[str]] = {}
+    for file_path in files:
+        try:
+            yaml.safe_load(file_path.read_text(encoding="utf-8"))
+        except Exception as exc:  # yaml.YAMLError
+            found[file_path] = [f"{file_path.name}: invalid YAML: {str(exc).splitlines()[0]}"]
+    return found
 
 
 _DIAGNOSTIC_CHECKERS = {
@@ -164,43 +318,209 @@ _DIAGNOSTIC_CHECKERS = {
 
 # ── Per-language formatters (opt-in) ────────────────────────────────────────
 
+_PRETTIER_SUFFIXES = (".js", ".jsx", ".ts", ".tsx", ".json", ".css", ".md", ".yaml", ".yml")
+
+
+def _formatter(suffix: str) -> Optional[List[str]]:
+    """Command that formats files with ``suffix`` in place, if one is installed."""
+    if suffix in (".py", ".pyi") and shutil.which("ruff"):
+        return ["ruff", "format", "--quiet"]
+    if suffix == ".go" and shutil.which("gofmt"):
+        return ["gofmt", "-w"]
+    if suffix in _PRETTIER_SUFFIXES and shutil.which("prettier"):
+        return ["prettier", "--write"]
+    return None
+
+
+async def _format_files(files: Sequence[Path], cwd: Path) -> List[Path]:
+    """Format files in place, one formatter run per tool. Returns the files it ran on."""
+    groups: Dict[Tuple[str, ...], List[Path]] = {}
+    for path in files:
+        command = _formatter(path.suffix.lower())
+        if command:
+            groups.setdefault(tuple(command), []).append(path)
+    formatted: List[Path] = []
+    for command, paths in groups.items():
+        try:
+            await _run([*command, *(str(path) for path in paths)], cwd)
+            formatted.extend(paths)
+        except Exception:
+            pass
+    return formatted
+
 
 async def _format_file(file_path: Path, cwd: Path) -> bool:
     """Format the file in place if a formatter is available. Returns True if run."""
-    suffix = file_path.suffix.lower()
-    try:
-        if suffix in (".py", ".pyi") and shutil.which("ruff"):
-            await _run(["ruff", "format", str(file_path), "--quiet"], cwd)
-            return True
-        if suffix == ".go" and shutil.which("gofmt"):
-            await _run(["gofmt", "-w", str(file_path)], cwd)
-            return True
-        if suffix in (".js", ".jsx", ".ts", ".tsx", ".json", ".css", ".md", ".yaml", ".yml"):
-            if shutil.which("prettier"):
-                await _run(["prettier", "--write", str(file_path)], cwd)
-                return True
-    except Exception:
-        return False
-    return False
+    return bool(await _format_files([file_path], cwd))
+
+
+async def _diagnose_files(files: Sequence[Path], cwd: Path) -> Dict[Path, List[str]]:
+    """Findings per file, running each language's checker once for all its files."""
+    groups: Dict[object, List[Path]] = {}
+    for path in files:
+        checker = _DIAGNOSTIC_CHECKERS.get(path.suffix.lower())
+        if checker is not None:
+            groups.setdefault(checker, []).append(path)
+    found: Dict[Path, List[str]] = {}
+
+    async def run(checker, paths: List[Path]) -> None:
+        try:
+            found.update(await checker(paths, cwd))
+        except Exception:
+            pass
+
+    await asyncio.gather(*(run(checker, paths) for checker, paths in groups.items()))
+    return found
 
 
 async def _diagnose(file_path: Path, cwd: Path) -> List[str]:
-    checker = _DIAGNOSTIC_CHECKERS.get(file_path.suffix.lower())
-    if checker is None:
-        return []
+    return (await _diagnose_files([file_path], cwd)).get(file_path, [])
+
+
+# ── Verification service ────────────────────────────────────────────────────
+
+_Key = Tuple[Path, Path, bool, bool]  # (file, cwd, format, diagnose)
+
+
+class PostEditVerifier:
+    """Debounces, batches and caches post-edit checks (see module docstring)."""
+
+    def __init__(self, cache_size: int = _CACHE_SIZE):
+        self.cache_size = cache_size
+        # (cwd, file, content sha256) -> findings
+        self._findings: OrderedDict[Tuple[str, str, str], List[str]] = OrderedDict()
+        # (cwd, file) -> sha256 of the content the formatter last left
+        self._formatted: Dict[Tuple[str, str], str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[_Key, asyncio.Future] = {}
+        self._running: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.counters = {"requests": 0, "coalesced": 0, "batches": 0, "checked": 0, "cached": 0}
+
+    async def verify(
+        self, files: Sequence[Path], cwd: Path, *, fmt: bool, diagnose: bool
+    ) -> Dict[Path, Tuple[bool, List[str]]]:
+        """(formatted, findings) per file, once each file's batch has run."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._pending, self._running, self._timer = loop, {}, None, None
+        futures: Dict[Path, asyncio.Future] = {}
+        for path in dict.fromkeys(files):
+            key = (path, cwd, fmt, diagnose)
+            self.counters["requests"] += 1
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = loop.create_future()
+            else:
+                self.counters["coalesced"] += 1
+            futures[path] = future
+        self._schedule()
+        return {path: await asyncio.shield(future) for path, future in futures.items()}
+
+    def _schedule(self) -> None:
+        if self._running is not None or not self._pending:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._loop.call_later(_debounce_seconds(), self._start)
+
+    def _start(self) -> None:
+        self._timer = None
+        if self._running is None and self._pending:
+            batch, self._pending = self._pending, {}
+            self._running = self._loop.create_task(self._run(batch))
+
+    async def _run(self, batch: Dict[_Key, asyncio.Future]) -> None:
+        self.counters["batches"] += 1
+        groups: Dict[Tuple[Path, bool, bool], List[Path]] = {}
+        for path, cwd, fmt, diagnose in batch:
+            groups.setdefault((cwd, fmt, diagnose), []).append(path)
+        try:
+            for (cwd, fmt, diagnose), paths in groups.items():
+                try:
+                    results = await self._check(paths, cwd, fmt, diagnose)
+                except Exception:
+                    results = {}
+                for path in paths:
+                    future = batch[(path, cwd, fmt, diagnose)]
+                    if not future.done():
+                        future.set_result(results.get(path, (False, [])))
+        finally:
+            for future in batch.values():
+                if not future.done():
+                    future.set_result((False, []))
+            self._running = None
+            self._schedule()
+
+    async def _check(
+        self, paths: List[Path], cwd: Path, fmt: bool, diagnose: bool
+    ) -> Dict[Path, Tuple[bool, List[str]]]:
+        digests = {path: _digest(path) for path in paths}
+        formatted: set[Path] = set()
+        if fmt:
+            todo = []
+            for path in paths:
+                if self._formatted.get((str(cwd), str(path))) == digests[path]:
+                    formatted.add(path)  # Formatter output, so formatting again is a no-op
+                else:
+                    todo.append(path)
+            for path in await _format_files(todo, cwd):
+                formatted.add(path)
+                digests[path] = _digest(path)
+                self._formatted[(str(cwd), str(path))] = digests[path]
+
+        findings: Dict[Path, List[str]] = {}
+        if diagnose:
+            todo = []
+            for path in paths:
+                key = (str(cwd), str(path), digests[path])
+                if key in self._findings:
+                    self._findings.move_to_end(key)
+                    findings[path] = self._findings[key]
+                    self.counters["cached"] += 1
+                else:
+                    todo.append(path)
+            if todo:
+                self.counters["checked"] += len(todo)
+                fresh = await _diagnose_files(todo, cwd)
+                for path in todo:
+                    findings[path] = fresh.get(path, [])
+                    if digests[path] and digests[path] == _digest(path):  # Unchanged meanwhile
+                        self._remember((str(cwd), str(path), digests[path]), findings[path])
+        return {path: (path in formatted, findings.get(path, [])) for path in paths}
+
+    def _remember(self, key: Tuple[str, str, str], findings: List[str]) -> None:
+        self._findings[key] = findings
+        while len(self._findings) > self.cache_size:
+            self._findings.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget cached findings and formatter state."""
+        self._findings.clear()
+        self._formatted.clear()
+
+
+def _digest(path: Path) -> str:
     try:
-        return await checker(file_path, cwd)
-    except asyncio.TimeoutError:
-        return []
-    except Exception:
-        return []
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
 
 
-async def verify_edit(result: ToolResult, file_path: Path, ctx) -> ToolResult:
+_verifier = PostEditVerifier()
+
+
+def get_post_edit_verifier() -> PostEditVerifier:
+    """The process-wide verifier used by the edit tools."""
+    return _verifier
+
+
+async def verify_edits(result: ToolResult, file_paths: Sequence[Path], ctx) -> ToolResult:
     """Augment a successful edit/write result with format + diagnostics feedback.
 
-    Returns the (possibly mutated) result. Failures and unsupported file types
-    pass through untouched. Errors here never break the edit itself.
+    All files are checked in one batch and reported in one block. Returns the
+    (possibly mutated) result. Failures and unsupported file types pass
+    through untouched. Errors here never break the edit itself.
     """
     if not getattr(result, "success", False):
         return result
@@ -209,17 +529,21 @@ async def verify_edit(result: ToolResult, file_path: Path, ctx) -> ToolResult:
 
     try:
         cwd = Path(getattr(ctx, "working_directory", Path.cwd()))
-        path = Path(file_path)
-        if not path.is_absolute():
-            path = cwd / path
-        if not path.exists() or not path.is_file():
+        paths = []
+        for file_path in file_paths:
+            path = Path(file_path)
+            if not path.is_absolute():
+                path = cwd / path
+            if path.exists() and path.is_file():
+                paths.append(path)
+        if not paths:
             return result
 
-        formatted = False
-        if _format_enabled():
-            formatted = await _format_file(path, cwd)
-
-        findings = await _diagnose(path, cwd) if _diagnostics_enabled() else []
+        checked = await _verifier.verify(
+            paths, cwd, fmt=_format_enabled(), diagnose=_diagnostics_enabled()
+        )
+        formatted = any(done for done, _ in checked.values())
+        findings = [finding for _, found in checked.values() for finding in found]
 
         extra_parts: List[str] = []
         if formatted:
@@ -240,3 +564,8 @@ async def verify_edit(result: ToolResult, file_path: Path, ctx) -> ToolResult:
         # Verification is best-effort; never fail the underlying edit.
         return result
     return result
+
+
+async def verify_edit(result: ToolResult, file_path: Path, ctx) -> ToolResult:
+    """:func:`verify_edits` for a single file."""
+    return await verify_edits(result, [file_path], ctx)
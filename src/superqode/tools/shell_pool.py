@@ -0,0 +1,423 @@
+"""Persistent shell workers for one-shot ``bash`` commands.
+
+Every ``bash`` tool call normally starts a fresh ``/bin/sh``. With the pool
+enabled (``SUPERQODE_SHELL_POOL=1`` or ``BashTool(use_worker_pool=True)``)
+commands instead run in long-lived shells kept per session and working
+directory, the one-shot counterpart of the interactive processes in
+:mod:`superqode.tools.shell_session`.
+
+Each command is framed by the worker shell::
+
+    ( cd -- <cwd> && eval <command> ) </dev/null N>&- &   # own process group
+    printf 'P %d\\n' $! >&N                                # control pipe
+    wait $!; rc=$?
+    printf <token>; printf <token> >&2                      # end of output
+    printf 'R %d\\n' $rc >&N
+
+so output is delimited by a random token on stdout and stderr, the exit code
+comes back on a separate control pipe (fd ``N``), and a timeout kills only
+the command's process group while the worker lives on. The subshell keeps
+``cd``/``export`` from leaking between commands. A worker is recycled when it
+dies, when a command leaves background processes behind, when
+the environment it was started with changes, or after
+``MAX_COMMANDS_PER_WORKER`` commands.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import shlex
+import shutil
+import signal
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+POOL_ENV = "SUPERQODE_SHELL_POOL"
+
+MAX_WORKERS = 8
+MAX_COMMANDS_PER_WORKER = 500
+IDLE_SECONDS = 300
+KILL_GRACE_SECONDS = 2.0
+READ_SIZE = 64 * 1024
+
+OutputSink = Callable[[bytes], None]
+
+
+def pool_enabled() -> bool:
+    """Whether ``SUPERQODE_SHELL_POOL`` opts ``bash`` into pooled workers."""
+    return os.environ.get(POOL_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ShellWorkerError(Exception):
+    """The worker shell died or broke the framing protocol."""
+
+
+@dataclass
+class ShellRunResult:
+    """Outcome of one pooled command."""
+
+    returncode: Optional[int]  # None if the worker died mid-command
+    timed_out: bool = False
+    worker_recycled: bool = False
+
+
+def _shell_env() -> Tuple[Optional[Dict[str, str]], int]:
+    """The environment for new workers and a fingerprint to spot changes to it."""
+    from .env_policy import build_shell_env
+
+    env = build_shell_env()
+    if env is None:
+        # Hash the raw mapping: decoding every variable on each command costs
+        # more than the fork the pool saves.
+        source = getattr(os.environ, "_data", os.environ)
+    else:
+        source = env
+    return env, hash(frozenset(source.items()))
+
+
+def _killpg(pgid: int, sig: int) -> bool:
+    """Signal a process group; False if it no longer exists."""
+    try:
+        os.killpg(pgid, sig)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+class ShellWorker:
+    """One long-lived shell running framed commands, one at a time."""
+
+    def __init__(self, cwd: Path, env_fingerprint: int):
+        self.cwd = cwd
+        self.env_fingerprint = env_fingerprint
+        self.commands_run = 0
+        self.last_used = time.monotonic()
+        self.healthy = True
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._control: Optional[asyncio.StreamReader] = None
+        self._control_transport: Optional[asyncio.BaseTransport] = None
+        self._control_fd = -1
+        self._job_pgid: Optional[int] = None  # Process group of the running command
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.healthy and self._process is not None and self._process.returncode is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    def usable_from(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return self.alive and self._loop is loop
+
+    async def start(self, env: Optional[Dict[str, str]]) -> None:
+        shell = shutil.which("bash")
+        argv = [shell, "--noprofile", "--norc"] if shell else ["/bin/sh"]
+        read_fd, write_fd = os.pipe()
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(self.cwd),
+                env=env,
+                pass_fds=(write_fd,),
+                start_new_session=True,
+            )
+        except BaseException:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        self._control_fd = write_fd
+        self._loop = asyncio.get_running_loop()
+        self._control = asyncio.StreamReader(limit=READ_SIZE)
+        self._control_transport, _ = await self._loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(self._control),
+            os.fdopen(read_fd, "rb", buffering=0),
+        )
+        # Job control gives every command its own process group
+        self._process.stdin.write(b"set -m\n")
+
+    async def run(
+        self,
+        command: str,
+        cwd: Path,
+        timeout: float,
+        on_stdout: OutputSink,
+        on_stderr: OutputSink,
+    ) -> ShellRunResult:
+        """Run one command; raises :class:`ShellWorkerError` if the worker broke."""
+        assert self._process is not None and self._control is not None
+        token = f"__superqode_{uuid.uuid4().hex}__"
+        fd = self._control_fd
+        script = (
+            f"( cd -- {shlex.quote(str(cwd))} && eval {shlex.quote(command)} ) "
+            f"</dev/null {fd}>&- &\n"
+            f"printf 'P %d\\n' $! >&{fd}\n"
+            "wait $!; __superqode_rc=$?\n"
+            f"printf '%s' '{token}'; printf '%s' '{token}' >&2\n"
+            f"printf 'R %d\\n' $__superqode_rc >&{fd}\n"
+        )
+        self.commands_run += 1
+        self.last_used = time.monotonic()
+        end = token.encode()
+        out = asyncio.create_task(self._read_until(self._process.stdout, end, on_stdout))
+        err = asyncio.create_task(self._read_until(self._process.stderr, end, on_stderr))
+        # The control pipe closes if the worker dies, even while a child of the
+        # command still holds its output pipes open.
+        control = asyncio.create_task(self._read_control())
+        timed_out = False
+        try:
+            self._process.stdin.write(script.encode("utf-8", errors="surrogateescape"))
+            await self._process.stdin.drain()
+            done, _ = await asyncio.wait(
+                {out, control}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                timed_out = True
+                if self._job_pgid is None:
+                    raise ShellWorkerError("command did not start")
+                await self._kill_group(self._job_pgid)
+            async with asyncio.timeout(KILL_GRACE_SECONDS * 2):
+                returncode = await control
+                await out
+                await err
+        except BaseException as e:
+            for task in (out, err, control):
+                task.cancel()
+            self.healthy = False
+            if isinstance(e, (ShellWorkerError, TimeoutError, OSError, ConnectionError)):
+                raise ShellWorkerError(str(e) or type(e).__name__) from e
+            raise
+        finally:
+            self.last_used = time.monotonic()
+
+        pgid, self._job_pgid = self._job_pgid, None
+        if _killpg(pgid, signal.SIGKILL):
+            # Background processes the command left behind would write into
+            # the next command's output; they are gone now, and so is this worker.
+            self.healthy = False
+        return ShellRunResult(returncode=returncode, timed_out=timed_out)
+
+    async def _read_control(self) -> int:
+        """Record the command's process group, then return its exit code."""
+        self._job_pgid = await self._control_value(b"P")
+        return await self._control_value(b"R")
+
+    async def _control_value(self, kind: bytes) -> int:
+        line = await self._control.readline()
+        if not line:
+            raise ShellWorkerError("worker shell exited")
+        parts = line.split()
+        if len(parts) != 2 or parts[0] != kind:
+            raise ShellWorkerError(f"unexpected control line {line!r}")
+        return int(parts[1])
+
+    @staticmethod
+    async def _read_until(stream: asyncio.StreamReader, token: bytes, sink: OutputSink) -> None:
+        """Forward ``stream`` to ``sink`` up to (not including) ``token``."""
+        pending = b""
+        keep = len(token) - 1
+        while True:
+            chunk = await stream.read(READ_SIZE)
+            if not chunk:
+                raise ShellWorkerError("worker shell closed its output")
+            pending += chunk
+            index = pending.find(token)
+            if index >= 0:
+                if index:
+                    sink(pending[:index])
+                return
+            if len(pending) > keep:
+                sink(pending[:-keep])
+                pending = pending[-keep:]
+
+    async def _kill_group(self, pgid: int) -> None:
+        if not _killpg(pgid, signal.SIGTERM):
+            return
+        deadline = time.monotonic() + KILL_GRACE_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            try:
+                os.killpg(pgid, 0)
+            except (ProcessLookupError, PermissionError):
+                return
+        _killpg(pgid, signal.SIGKILL)
+
+    async def close(self) -> None:
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        self.healthy = False
+        if self._job_pgid is not None:
+            # Children of a crashed worker would keep its output pipes open
+            _killpg(self._job_pgid, signal.SIGKILL)
+            self._job_pgid = None
+        if process.returncode is None:
+            _killpg(process.pid, signal.SIGKILL)
+            try:
+                await asyncio.wait_for(process.wait(), KILL_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+        if process.stdin is not None:
+            process.stdin.close()
+        self._close_control()
+
+    def _close_control(self) -> None:
+        transport, self._control_transport = self._control_transport, None
+        if transport is not None:
+            try:
+                transport.close()
+            except RuntimeError:  # Event loop already closed
+                pass
+
+    def kill_now(self) -> None:
+        """Synchronous kill, for workers whose event loop is gone."""
+        if self._process is not None and self._process.returncode is None:
+            _killpg(self._process.pid, signal.SIGKILL)
+        if self._job_pgid is not None:
+            _killpg(self._job_pgid, signal.SIGKILL)
+            self._job_pgid = None
+        self._process = None
+        self.healthy = False
+        self._close_control()
+
+
+class ShellWorkerPool:
+    """Idle :class:`ShellWorker` processes keyed by (session, working directory)."""
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        max_commands_per_worker: int = MAX_COMMANDS_PER_WORKER,
+        idle_seconds: float = IDLE_SECONDS,
+    ):
+        self.max_workers = max_workers
+        self.max_commands_per_worker = max_commands_per_worker
+        self.idle_seconds = idle_seconds
+        self._idle: Dict[Tuple[str, str], List[ShellWorker]] = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.recycled = 0
+
+    def _take_idle(self, key: Tuple[str, str], fingerprint: int) -> Optional[ShellWorker]:
+        loop = asyncio.get_running_loop()
+        stale: List[ShellWorker] = []
+        found: Optional[ShellWorker] = None
+        now = time.monotonic()
+        with self._lock:
+            for pool_key in list(self._idle):
+                keep = []
+                for worker in self._idle[pool_key]:
+                    expired = now - worker.last_used > self.idle_seconds
+                    if not worker.usable_from(loop) or expired:
+                        stale.append(worker)
+                    elif (
+                        found is None and pool_key == key and worker.env_fingerprint == fingerprint
+                    ):
+                        found = worker
+                    elif pool_key == key and worker.env_fingerprint != fingerprint:
+                        stale.append(worker)  # Started with an environment that changed
+                    else:
+                        keep.append(worker)
+                if keep:
+                    self._idle[pool_key] = keep
+                else:
+                    del self._idle[pool_key]
+        for worker in stale:
+            self.recycled += 1
+            worker.kill_now()
+        return found
+
+    def _park(self, key: Tuple[str, str], worker: ShellWorker) -> bool:
+        with self._lock:
+            if sum(len(workers) for workers in self._idle.values()) >= self.max_workers:
+                return False
+            self._idle.setdefault(key, []).append(worker)
+            return True
+
+    async def run(
+        self,
+        session_id: str,
+        command: str,
+        cwd: Path,
+        timeout: float,
+        on_stdout: OutputSink,
+        on_stderr: OutputSink,
+    ) -> ShellRunResult:
+        """Run ``command`` in a pooled worker for ``(session_id, cwd)``."""
+        key = (session_id, str(cwd))
+        env, fingerprint = _shell_env()
+        worker = self._take_idle(key, fingerprint)
+        if worker is None:
+            worker = ShellWorker(cwd, fingerprint)
+            await worker.start(env)
+            self.started += 1
+
+        try:
+            result = await worker.run(command, cwd, timeout, on_stdout, on_stderr)
+        except ShellWorkerError:
+            await worker.close()
+            self.recycled += 1
+            return ShellRunResult(returncode=None, worker_recycled=True)
+        except BaseException:
+            worker.kill_now()  # Cancelled mid-command
+            raise
+
+        if (
+            worker.alive
+            and worker.commands_run < self.max_commands_per_worker
+            and self._park(key, worker)
+        ):
+            return result
+        await worker.close()
+        self.recycled += 1
+        result.worker_recycled = True
+        return result
+
+    async def aclose(self) -> None:
+        """Shut down idle workers from the event loop that runs them."""
+        with self._lock:
+            workers = [w for workers in self._idle.values() for w in workers]
+            self._idle.clear()
+        for worker in workers:
+            await worker.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            workers = [w for workers in self._idle.values() for w in workers]
+            self._idle.clear()
+        for worker in workers:
+            worker.kill_now()
+
+
+_pool: Optional[ShellWorkerPool] = None
+
+
+def get_shell_pool() -> ShellWorkerPool:
+    """The process-wide worker pool."""
+    global _pool
+    if _pool is None:
+        _pool = ShellWorkerPool()
+        atexit.register(_pool.close_all)
+    return _pool
+
+
+__all__ = [
+    "POOL_ENV",
+    "ShellRunResult",
+    "ShellWorker",
+    "ShellWorkerError",
+    "ShellWorkerPool",
+    "get_shell_pool",
+    "pool_enabled",
+]
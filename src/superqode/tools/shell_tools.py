@@ -10,17 +10,85 @@ Git operations can be blocked during workspace tracking to maintain immutable re
 Performance features:
 - Streaming output as command runs (via ctx.on_output callback)
 - Non-blocking execution with proper timeout handling
+- Optional persistent shell workers for buffered runs (see shell_pool.py)
 """
 
 import asyncio
+import tempfile
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
 
 from .base import Tool, ToolResult, ToolContext
-from .output_spill import SPILL_HARD_CAP_BYTES, truncate_with_spill
+from .output_spill import SPILL_HARD_CAP_BYTES, SpillWriter, spill_preview, truncate_with_spill
 from .validation import validate_working_dir_parameter
 
 
+class _StreamCapture:
+    """One output stream held in bounded memory.
+
+    Keeps the first ``keep`` bytes and (at least) the last ``keep`` bytes. Once
+    the stream outgrows ``keep``, it is also written in full, up to
+    ``SPILL_HARD_CAP_BYTES``, to a sink opened with ``open_sink``;
+    ``truncated`` records that the sink was cut at that cap.
+    """
+
+    def __init__(self, keep: int, open_sink: Callable[[], Any]):
+        self.keep = keep
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+        self.sink: Optional[Any] = None
+        self._open_sink = open_sink
+        self._sunk = 0
+        self.truncated = False
+
+    @property
+    def complete(self) -> bool:
+        """Whether ``head`` holds the entire stream."""
+        return self.total <= self.keep
+
+    def feed(self, chunk: bytes) -> None:
+        if self.sink is None and self.total + len(chunk) > self.keep:
+            self.sink = self._open_sink()
+            self._sink_write(bytes(self.head))
+        if self.sink is not None:
+            self._sink_write(chunk)
+        if len(self.head) < self.keep:
+            self.head += chunk[: self.keep - len(self.head)]
+        self.tail += chunk
+        if len(self.tail) > 2 * self.keep:
+            del self.tail[: len(self.tail) - self.keep]
+        self.total += len(chunk)
+
+    def _sink_write(self, data: bytes) -> None:
+        room = max(0, SPILL_HARD_CAP_BYTES - self._sunk)
+        if len(data) > room:
+            self.truncated = True
+            data = data[:room]
+        if data:
+            self.sink.write(data)
+            self._sunk += len(data)
+
+    def copy_to(self, writer: SpillWriter) -> None:
+        """Write the captured stream (as far as it was kept) to ``writer``."""
+        if self.sink is None:
+            writer.write(bytes(self.head))
+            return
+        sink: BinaryIO = self.sink
+        sink.seek(0)
+        while chunk := sink.read(1024 * 1024):
+            writer.write(chunk)
+        sink.close()
+        self.sink = None
+
+    def discard(self) -> None:
+        if isinstance(self.sink, SpillWriter):
+            self.sink.discard()
+        elif self.sink is not None:
+            self.sink.close()
+        self.sink = None
+
+
 class BashTool(Tool):
     """Execute shell commands.
 
@@ -35,6 +103,7 @@ class BashTool(Tool):
     DEFAULT_TIMEOUT = 300  # 5 minutes
     MAX_OUTPUT = 50000  # 50KB - fallback cap when ctx.max_output_bytes is None
     CHUNK_SIZE = 1024  # Read chunks for streaming
+    BUFFERED_READ_SIZE = 64 * 1024  # Read chunks for buffered mode
 
     @staticmethod
     def _effective_max_output(ctx: ToolContext, default: int) -> int:
@@ -47,14 +116,18 @@ class BashTool(Tool):
         """
         return ctx.max_output_bytes if ctx.max_output_bytes else default
 
-    def __init__(self, git_guard_enabled: bool = True):
+    def __init__(self, git_guard_enabled: bool = True, use_worker_pool: Optional[bool] = None):
         """
         Initialize BashTool.
 
         Args:
             git_guard_enabled: If True, block git write operations during workspace tracking.
+            use_worker_pool: Run buffered commands in pooled persistent shells
+                (see :mod:`superqode.tools.shell_pool`). None defers to the
+                ``SUPERQODE_SHELL_POOL`` environment variable.
         """
         self._git_guard_enabled = git_guard_enabled
+        self._use_worker_pool = use_worker_pool
 
     @property
     def name(self) -> str:
@@ -171,24 +244,30 @@ class BashTool(Tool):
             return ToolResult(success=False, output="", error=str(e))
 
     @staticmethod
-    async def _spawn(command: str, cwd: Path):
+    def _sandbox_plan(command: str, cwd: Path):
+        """Return the applied local OS sandbox plan for ``command``, if any."""
+        try:
+            from superqode.sandbox.local_sandbox import build_sandboxed_command
+
+            plan = build_sandboxed_command(command, cwd)
+        except Exception:
+            return None
+        return plan if plan is not None and plan.applied else None
+
+    @classmethod
+    async def _spawn(cls, command: str, cwd: Path):
         """Spawn a command, applying the local OS sandbox when one is active.
 
         When ``SUPERQODE_SANDBOX`` selects a sandbox mode and a backend
         (Seatbelt/bwrap) is available, the command is confined to the workspace;
         otherwise it runs through the shell unchanged.
         """
-        try:
-            from superqode.sandbox.local_sandbox import build_sandboxed_command
-
-            plan = build_sandboxed_command(command, cwd)
-        except Exception:
-            plan = None
+        plan = cls._sandbox_plan(command, cwd)
 
         from .env_policy import build_shell_env
 
         env = build_shell_env()
-        if plan is not None and plan.applied:
+        if plan is not None:
             return await asyncio.create_subprocess_exec(
                 *plan.argv,
                 stdout=asyncio.subprocess.PIPE,
@@ -211,56 +290,193 @@ class BashTool(Tool):
         timeout: int,
         ctx: ToolContext,
     ) -> ToolResult:
-        """Execute command and buffer all output (original behavior)."""
+        """Execute command and return its output once it exits.
+
+        Output is read as it is produced into bounded head/tail buffers
+        (:class:`_StreamCapture`); a stream that outgrows them is written to
+        the spill file as it arrives, so a runaway producer never has to fit
+        in memory. The preview and spill file match what
+        :func:`truncate_with_spill` gives for the whole output, except that
+        the spill file stops at ``SPILL_HARD_CAP_BYTES``.
+        """
+        if self._pool_enabled() and self._sandbox_plan(command, cwd) is None:
+            return await self._execute_pooled(command, cwd, timeout, ctx)
+
         process = await self._spawn(command, cwd)
 
+        cap = self._effective_max_output(ctx, self.MAX_OUTPUT)
+        keep = max(cap, 256)
+        stdout = _StreamCapture(keep, lambda: SpillWriter(prefix="bash"))
+        stderr = _StreamCapture(keep, tempfile.TemporaryFile)
+
+        async def pump(stream, capture: _StreamCapture) -> None:
+            while chunk := await stream.read(self.BUFFERED_READ_SIZE):
+                capture.feed(chunk)
+
         try:
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            await asyncio.wait_for(
+                asyncio.gather(
+                    pump(process.stdout, stdout),
+                    pump(process.stderr, stderr),
+                    process.wait(),
+                ),
+                timeout=timeout,
+            )
         except asyncio.TimeoutError:
             process.kill()
-            return ToolResult(
-                success=False,
-                output="",
-                error=f"Command timed out after {timeout} seconds",
-                metadata={
-                    "command": command,
-                    "cwd": str(cwd),
-                    "timed_out": True,
-                    "timeout": timeout,
-                },
-            )
+            await process.wait()
+            stdout.discard()
+            stderr.discard()
+            return self._timeout_result(command, cwd, timeout)
+        except BaseException:
+            stdout.discard()
+            stderr.discard()
+            raise
+
+        return await self._captured_result(
+            stdout, stderr, cap, process.returncode, command, cwd, ctx
+        )
 
-        # Decode output
-        stdout_str = stdout.decode("utf-8", errors="replace")
-        stderr_str = stderr.decode("utf-8", errors="replace")
+    def _pool_enabled(self) -> bool:
+        if self._use_worker_pool is not None:
+            return self._use_worker_pool
+        from .shell_pool import pool_enabled
 
-        # Combine output
-        output = stdout_str
-        if stderr_str:
-            output += f"\n[stderr]\n{stderr_str}" if output else stderr_str
+        return pool_enabled()
+
+    async def _execute_pooled(
+        self,
+        command: str,
+        cwd: Path,
+        timeout: int,
+        ctx: ToolContext,
+    ) -> ToolResult:
+        """Buffered execution in a persistent shell from the worker pool.
+
+        Saves the shell start-up per command; output capture and the result
+        are the same as :meth:`_execute_buffered`. A timeout kills only the
+        command, not the worker.
+        """
+        from .shell_pool import get_shell_pool
 
-        # Bound the output for the model. The full text is spilled to disk so
-        # nothing is lost — the model gets a head/tail preview plus the path.
-        # Per-call cap so we can size to the active model's context window.
         cap = self._effective_max_output(ctx, self.MAX_OUTPUT)
-        output, _truncated, spill_path = self._bound_output(output, cap)
+        keep = max(cap, 256)
+        stdout = _StreamCapture(keep, lambda: SpillWriter(prefix="bash"))
+        stderr = _StreamCapture(keep, tempfile.TemporaryFile)
+        try:
+            run = await get_shell_pool().run(
+                ctx.session_id, command, cwd, timeout, stdout.feed, stderr.feed
+            )
+        except BaseException:
+            stdout.discard()
+            stderr.discard()
+            raise
 
-        success = process.returncode == 0
+        if run.timed_out:
+            stdout.discard()
+            stderr.discard()
+            return self._timeout_result(command, cwd, timeout)
+        return await self._captured_result(stdout, stderr, cap, run.returncode, command, cwd, ctx)
+
+    @staticmethod
+    def _timeout_result(command: str, cwd: Path, timeout: int) -> ToolResult:
+        return ToolResult(
+            success=False,
+            output="",
+            error=f"Command timed out after {timeout} seconds",
+            metadata={
+                "command": command,
+                "cwd": str(cwd),
+                "timed_out": True,
+                "timeout": timeout,
+            },
+        )
+
+    async def _captured_result(
+        self,
+        stdout: "_StreamCapture",
+        stderr: "_StreamCapture",
+        cap: int,
+        returncode: Optional[int],
+        command: str,
+        cwd: Path,
+        ctx: ToolContext,
+    ) -> ToolResult:
+        """Build the bounded result for a finished buffered command.
+
+        ``returncode`` is None when a pooled worker shell died mid-command.
+        """
+        if stdout.complete and stderr.complete:
+            # Everything fits in memory: bound it exactly as a string.
+            stdout_str = stdout.head.decode("utf-8", errors="replace")
+            stderr_str = stderr.head.decode("utf-8", errors="replace")
+
+            # Combine output
+            output = stdout_str
+            if stderr_str:
+                output += f"\n[stderr]\n{stderr_str}" if output else stderr_str
+
+            # Bound the output for the model. The full text is spilled to disk so
+            # nothing is lost — the model gets a head/tail preview plus the path.
+            # Per-call cap so we can size to the active model's context window.
+            output, _truncated, spill_path = self._bound_output(output, cap)
+        else:
+            output, spill_path = self._spill_captures(stdout, stderr, cap)
+
+        success = returncode == 0
         await ctx.emit_progress(1.0, "Complete" if success else "Failed")
 
         metadata: Dict[str, Any] = {
-            "exit_code": process.returncode,
+            "exit_code": returncode,
             "command": command,
             "cwd": str(cwd),
         }
         if spill_path is not None:
             metadata["spilled_to"] = str(spill_path)
-        return ToolResult(
-            success=success,
-            output=output,
-            error=None if success else f"Exit code: {process.returncode}",
-            metadata=metadata,
+        if success:
+            error = None
+        elif returncode is None:
+            error = "Shell worker exited while running the command"
+        else:
+            error = f"Exit code: {returncode}"
+        return ToolResult(success=success, output=output, error=error, metadata=metadata)
+
+    @staticmethod
+    def _spill_captures(
+        stdout: "_StreamCapture", stderr: "_StreamCapture", cap: int
+    ) -> Tuple[str, Optional[Path]]:
+        """Finish the spill file for oversized output and build its preview."""
+        sep = b"\n[stderr]\n" if stdout.total and stderr.total else b""
+
+        # The spill file holds stdout, then stderr, as the combined string would.
+        writer = stdout.sink if stdout.sink is not None else SpillWriter(prefix="bash")
+        if stdout.sink is None:
+            writer.write(bytes(stdout.head))
+        writer.write(sep)
+        stderr.copy_to(writer)
+        spill_path = writer.close()
+
+        head_source = bytes(stdout.head)
+        if stdout.complete:
+            head_source += sep + bytes(stderr.head)
+        tail_source = bytes(stderr.tail)
+        if stderr.complete:
+            tail_source = bytes(stdout.tail) + sep + tail_source
+
+        output = spill_preview(
+            head_source.decode("utf-8", errors="replace"),
+            tail_source.decode("utf-8", errors="replace"),
+            stdout.total + len(sep) + stderr.total,
+            max_bytes=cap,
+            spill_path=spill_path,
+            label="Command output",
         )
+        if writer.dropped or stdout.truncated or stderr.truncated:
+            output += (
+                f"\n\n[Process produced more than {SPILL_HARD_CAP_BYTES:,} bytes; "
+                "the spill file keeps only the first part.]"
+            )
+        return output, spill_path
 
     @staticmethod
     def _bound_output(output: str, cap: int) -> Tuple[str, bool, Optional[Path]]:
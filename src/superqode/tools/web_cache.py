@@ -0,0 +1,331 @@
+"""On-disk HTTP cache for ``web_fetch``.
+
+Agents (and their subagents) keep fetching the same documentation pages. This
+cache keeps the decoded body of each successful response together with its
+validators, so a repeat fetch is answered from disk while the response is
+fresh (``Cache-Control: max-age``, ``Expires``, or the usual 10% heuristic on
+``Last-Modified``) and is otherwise revalidated with ``If-None-Match`` /
+``If-Modified-Since``; a ``304`` reuses the stored body. Converted output
+(markdown, text, ...) is cached next to the body, keyed by the conversion
+options and a converter version, so a page is converted only once per body.
+
+Layout, one set of files per URL (``<key>`` is a hash of the URL)::
+
+    <key>.json           metadata: validators, freshness, content type
+    <key>.body           decoded body text
+    <key>.<variant>.out  converted output for one set of options
+
+The directory is bounded by size; the least recently used URLs are evicted
+first (a hit touches ``<key>.json``, whose mtime is the LRU clock). Set
+``SUPERQODE_WEB_CACHE=0`` to disable it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+WEB_CACHE_ENV = "SUPERQODE_WEB_CACHE"
+WEB_CACHE_DIR_ENV = "SUPERQODE_WEB_CACHE_DIR"
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+HEURISTIC_FRACTION = 0.1  # RFC 9111 section 4.2.2
+HEURISTIC_MAX_SECONDS = 24 * 3600
+EVICT_TO_FRACTION = 0.9
+
+# Response headers the cache needs; WebFetchTool passes these through.
+CACHE_HEADERS = ("cache-control", "expires", "date", "age", "etag", "last-modified")
+# The ones kept with an entry; a 304 updates only those it carries.
+STORED_HEADERS = ("cache-control", "expires", "etag", "last-modified")
+
+
+def get_web_cache_dir() -> Path:
+    """Directory for cached web responses (created on first store)."""
+    raw = os.environ.get(WEB_CACHE_DIR_ENV, "").strip()
+    if raw:
+        return Path(os.path.abspath(os.path.expanduser(raw)))
+    return Path.home() / ".superqode" / "cache" / "web"
+
+
+def _http_date(value: str) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _directives(cache_control: str) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in cache_control.split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else None
+    return directives
+
+
+def freshness(headers: Mapping[str, str], now: float) -> Tuple[bool, bool, float]:
+    """Return ``(storable, no_cache, fresh_until)`` for a 200 response."""
+    directives = _directives(headers.get("cache-control", ""))
+    if "no-store" in directives:
+        return False, False, now
+    no_cache = "no-cache" in directives
+
+    lifetime: Optional[float] = None
+    if directives.get("max-age") is not None:
+        try:
+            lifetime = max(0.0, float(directives["max-age"]))
+        except ValueError:
+            lifetime = 0.0
+    elif headers.get("expires"):
+        expires = _http_date(headers["expires"])
+        date = _http_date(headers.get("date", "")) or now
+        lifetime = max(0.0, expires - date) if expires is not None else 0.0
+    elif headers.get("last-modified"):
+        modified = _http_date(headers["last-modified"])
+        date = _http_date(headers.get("date", "")) or now
+        if modified is not None:
+            lifetime = min(HEURISTIC_MAX_SECONDS, max(0.0, date - modified) * HEURISTIC_FRACTION)
+
+    try:
+        age = max(0.0, float(headers.get("age", 0) or 0))
+    except ValueError:
+        age = 0.0
+    fresh_until = now + max(0.0, (lifetime or 0.0) - age)
+    validators = bool(headers.get("etag") or headers.get("last-modified"))
+    # Without validators or a freshness lifetime the entry could never be reused
+    return validators or fresh_until > now, no_cache, fresh_until
+
+
+@dataclass
+class CachedResponse:
+    """Metadata of one cached URL."""
+
+    key: str
+    url: str
+    content_type: str
+    stored_at: float
+    fresh_until: float
+    no_cache: bool = False
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str:
+        return self.headers.get("etag", "")
+
+    @property
+    def last_modified(self) -> str:
+        return self.headers.get("last-modified", "")
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return not self.no_cache and (now if now is not None else time.time()) < self.fresh_until
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class WebCache:
+    """Size-bounded LRU cache of HTTP responses and their converted forms."""
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / f"{key}{suffix}"
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached entry for ``url`` (fresh or not), marking it used."""
+        meta = self._path(self.key_for(url), ".json")
+        try:
+            entry = CachedResponse(**json.loads(meta.read_text(encoding="utf-8")))
+            os.utime(meta)
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry if entry.url == url else None
+
+    def read_body(self, entry: CachedResponse) -> Optional[str]:
+        try:
+            return self._path(entry.key, ".body").read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def store(
+        self,
+        url: str,
+        content: str,
+        content_type: str,
+        headers: Mapping[str, str],
+        now: Optional[float] = None,
+    ) -> Optional[CachedResponse]:
+        """Cache a 200 response; returns None when it may not be stored."""
+        now = time.time() if now is None else now
+        storable, no_cache, fresh_until = freshness(headers, now)
+        key = self.key_for(url)
+        if not storable:
+            self.forget(url)
+            return None
+        entry = CachedResponse(
+            key=key,
+            url=url,
+            content_type=content_type,
+            stored_at=now,
+            fresh_until=fresh_until,
+            no_cache=no_cache,
+            headers={name: headers[name] for name in STORED_HEADERS if headers.get(name)},
+        )
+        with self._lock:
+            self._remove_files(key)  # Converted output belongs to the old body
+            self._write(self._path(key, ".body"), content.encode("utf-8"))
+            self._write_meta(entry)
+            self._evict()
+        return entry
+
+    def refresh(
+        self, entry: CachedResponse, headers: Mapping[str, str], now: Optional[float] = None
+    ) -> CachedResponse:
+        """Update freshness and validators from a ``304 Not Modified``."""
+        now = time.time() if now is None else now
+        merged = dict(entry.headers)
+        merged.update({name: value for name, value in headers.items() if value})
+        _storable, no_cache, fresh_until = freshness(merged, now)
+        entry.fresh_until = fresh_until
+        entry.no_cache = no_cache
+        entry.headers = {name: merged[name] for name in STORED_HEADERS if merged.get(name)}
+        with self._lock:
+            self._write_meta(entry)
+        return entry
+
+    def get_converted(self, entry: CachedResponse, variant: str) -> Optional[str]:
+        try:
+            return self._path(entry.key, f".{variant}.out").read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def put_converted(self, entry: CachedResponse, variant: str, text: str) -> None:
+        with self._lock:
+            if self._path(entry.key, ".json").exists():
+                self._write(self._path(entry.key, f".{variant}.out"), text.encode("utf-8"))
+                self._evict()
+
+    def forget(self, url: str) -> None:
+        with self._lock:
+            self._remove_files(self.key_for(url))
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._files():
+                self._unlink(path)
+            self._size = 0
+
+    # Internals (callers hold self._lock)
+
+    def _files(self):
+        try:
+            return [p for p in self.directory.iterdir() if p.is_file()]
+        except OSError:
+            return []
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            total = 0
+            for path in self._files():
+                try:
+                    total += path.stat().st_size
+                except OSError:
+                    pass
+            self._size = total
+        return self._size
+
+    def _write(self, path: Path, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._current_size()
+        try:
+            self._size -= path.stat().st_size
+        except OSError:
+            pass
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._size += len(data)
+
+    def _write_meta(self, entry: CachedResponse) -> None:
+        self._write(self._path(entry.key, ".json"), json.dumps(asdict(entry)).encode("utf-8"))
+
+    def _unlink(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._size is not None:
+            self._size = max(0, self._size - size)
+
+    def _remove_files(self, key: str) -> None:
+        for path in self.directory.glob(f"{key}.*"):
+            self._unlink(path)
+
+    def _evict(self) -> None:
+        if self._current_size() <= self.max_bytes:
+            return
+        by_key: Dict[str, Tuple[float, int]] = {}
+        for path in self._files():
+            key = path.name.split(".", 1)[0]
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            used, size = by_key.get(key, (0.0, 0))
+            if path.suffix == ".json":
+                used = stat.st_mtime
+            by_key[key] = (used, size + stat.st_size)
+        self._size = sum(size for _used, size in by_key.values())
+        target = self.max_bytes * EVICT_TO_FRACTION
+        for key, (_used, _size) in sorted(by_key.items(), key=lambda item: item[1][0]):
+            if self._size <= target:
+                break
+            self._remove_files(key)
+
+
+_cache: Optional[WebCache] = None
+
+
+def get_web_cache() -> Optional[WebCache]:
+    """The shared web cache, or None when ``SUPERQODE_WEB_CACHE=0``."""
+    global _cache
+    if os.environ.get(WEB_CACHE_ENV, "").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    directory = get_web_cache_dir()
+    if _cache is None or _cache.directory != directory:
+        _cache = WebCache(directory)
+    return _cache
+
+
+__all__ = [
+    "CACHE_HEADERS",
+    "CachedResponse",
+    "WEB_CACHE_DIR_ENV",
+    "WEB_CACHE_ENV",
+    "WebCache",
+    "freshness",
+    "get_web_cache",
+    "get_web_cache_dir",
+]
@@ -11,12 +11,14 @@ Features:
 - Optional Tavily/SerpAPI integration
 - Content extraction and summarization
 - Configurable result limits
+- On-disk HTTP cache with conditional revalidation for fetches (web_cache.py)
 """
 
 from __future__ import annotations
 
 import asyncio
 import gzip
+import hashlib
 import json
 import re
 import ssl
@@ -25,10 +27,15 @@ import urllib.request
 import urllib.error
 import urllib.parse
 from html.parser import HTMLParser
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 from .base import Tool, ToolResult, ToolContext
+from .web_cache import CACHE_HEADERS, CachedResponse, WebCache, get_web_cache
+
+# Part of the key for cached converted output: bump whenever HTMLToMarkdown,
+# TextExtractor or WebFetchTool._process_content change what they produce.
+CONVERTER_VERSION = 1
 
 
 def _is_network_error(exc: BaseException) -> bool:
@@ -548,6 +555,8 @@ class WebFetchTool(Tool):
     - Text extraction
     - Optional summarization
     - Configurable output format
+    - HTTP cache shared across calls (see :mod:`superqode.tools.web_cache`);
+      requests with custom (e.g. credential) headers bypass it
     """
 
     read_only = True
@@ -632,14 +641,18 @@ Useful for reading documentation, API responses, web pages, etc."""
                 success=False, output="", error="Only http:// and https:// URLs are supported"
             )
 
+        cache = None if headers else get_web_cache()
         try:
             loop = asyncio.get_event_loop()
-            fetch_call = (
-                (lambda: self._sync_fetch(url, timeout, max_size, headers))
-                if headers
-                else (lambda: self._sync_fetch(url, timeout, max_size))
-            )
-            result = await asyncio.wait_for(
+
+            def fetch_call():
+                if cache is not None:
+                    return self._cached_fetch(url, timeout, max_size, cache)
+                if headers:
+                    return self._sync_fetch(url, timeout, max_size, headers), None, "bypass"
+                return self._sync_fetch(url, timeout, max_size), None, "bypass"
+
+            result, entry, cache_status = await asyncio.wait_for(
                 loop.run_in_executor(None, fetch_call),
                 timeout=timeout + 5,
             )
@@ -650,10 +663,19 @@ Useful for reading documentation, API responses, web pages, etc."""
             content = result["content"]
             content_type = result.get("content_type", "")
 
-            # Process content based on format
-            output = self._process_content(
-                content, content_type, format_type, extract_main, selector
-            )
+            # Process content based on format, reusing an earlier conversion
+            # of the same cached body
+            variant = self._variant(format_type, extract_main, selector)
+            output = cache.get_converted(entry, variant) if entry is not None else None
+            if output is None:
+                output = self._process_content(
+                    content, content_type, format_type, extract_main, selector
+                )
+                if entry is not None:
+                    try:
+                        cache.put_converted(entry, variant, output)
+                    except OSError:
+                        pass
 
             # Truncate if needed
             if len(output) > max_length:
@@ -669,6 +691,7 @@ Useful for reading documentation, API responses, web pages, etc."""
                     "output_size": len(output),
                     "format": format_type,
                     "local_model_caps": local_model,
+                    "cache": cache_status,
                 },
             )
 
@@ -681,6 +704,50 @@ Useful for reading documentation, API responses, web pages, etc."""
         except Exception as e:
             return ToolResult(success=False, output="", error=f"Fetch error: {str(e)}")
 
+    @staticmethod
+    def _variant(format_type: str, extract_main: bool, selector: str) -> str:
+        """Cache key part for one set of conversion options."""
+        options = f"{format_type}\0{bool(extract_main)}\0{selector}\0{CONVERTER_VERSION}"
+        return hashlib.sha256(options.encode("utf-8")).hexdigest()[:16]
+
+    def _cached_fetch(
+        self, url: str, timeout: int | float, max_size: int, cache: WebCache
+    ) -> Tuple[Dict[str, Any], Optional[CachedResponse], str]:
+        """Fetch through the HTTP cache.
+
+        Returns the fetch result, the cache entry now holding the body (None
+        if the response was not cacheable) and how the cache was used:
+        ``hit`` (fresh, no request), ``revalidated`` (304) or ``miss``.
+        """
+        entry = cache.lookup(url)
+        if entry is not None:
+            body = cache.read_body(entry)
+            if body is None:
+                entry = None
+            elif entry.is_fresh():
+                return {"content": body, "content_type": entry.content_type}, entry, "hit"
+
+        if entry is not None and entry.conditional_headers():
+            result = self._sync_fetch(url, timeout, max_size, entry.conditional_headers())
+            if result.get("not_modified"):
+                try:
+                    entry = cache.refresh(entry, result.get("headers", {}))
+                except OSError:
+                    pass
+                return {"content": body, "content_type": entry.content_type}, entry, "revalidated"
+        else:
+            result = self._sync_fetch(url, timeout, max_size)
+
+        if result.get("error") or result.get("truncated") or result.get("not_modified"):
+            return result, None, "miss"
+        try:
+            entry = cache.store(
+                url, result["content"], result.get("content_type", ""), result.get("headers", {})
+            )
+        except OSError:
+            entry = None
+        return result, entry, "miss"
+
     def _sync_fetch(
         self,
         url: str,
@@ -725,15 +792,29 @@ Useful for reading documentation, API responses, web pages, etc."""
                 if truncated:
                     text += f"\n\n[Content truncated at {max_size} bytes]"
 
-                return {"content": text, "content_type": content_type, "truncated": truncated}
+                return {
+                    "content": text,
+                    "content_type": content_type,
+                    "truncated": truncated,
+                    "headers": self._cache_headers(response.headers),
+                }
 
         except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return {"not_modified": True, "headers": self._cache_headers(e.headers)}
             return {"error": f"HTTP {e.code}: {e.reason}"}
         except urllib.error.URLError as e:
             return {"error": f"URL Error: {str(e.reason)}"}
         except Exception as e:
             return {"error": str(e)}
 
+    @staticmethod
+    def _cache_headers(headers: Any) -> Dict[str, str]:
+        """The response headers the HTTP cache uses, with lower-case names."""
+        if headers is None:
+            return {}
+        return {name: headers.get(name) for name in CACHE_HEADERS if headers.get(name)}
+
     def _decode_body(self, content: bytes, encoding: str) -> bytes:
         """Decode common HTTP content encodings."""
         encoding = encoding.lower()
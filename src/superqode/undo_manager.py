@@ -5,6 +5,14 @@ Provides reliable undo/redo functionality using Git's object database
 for tracking file changes. Each operation creates a checkpoint that
 can be restored.
 
+Checkpoints never touch the user's index or working tree while being taken:
+the working tree is staged into a private index file (``GIT_INDEX_FILE``)
+kept in the git directory, written out with ``git write-tree`` and wrapped
+with ``git commit-tree``. The resulting commit hash is the checkpoint id and
+is pinned under ``refs/superqode/checkpoints/`` so it survives ``git gc``.
+Because the private index keeps git's stat data between checkpoints, only
+files changed since the previous checkpoint are re-hashed.
+
 Features:
 - Automatic checkpoint creation before agent operations
 - Named checkpoints for easier navigation
@@ -31,6 +39,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+import shutil
 import subprocess
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -47,7 +56,7 @@ from typing import Dict, List, Optional, Tuple
 class Checkpoint:
     """A checkpoint representing a point in time."""
 
-    id: str  # Git commit or stash reference
+    id: str  # Git commit hash (legacy: stash reference)
     name: str
     timestamp: datetime
     message: str = ""
@@ -74,16 +83,30 @@ class UndoManager:
     """
     Git-based undo/redo manager.
 
-    Uses Git's stash and commit system to create reliable checkpoints
-    that can be restored.
+    Checkpoints are commits built from a private index and pinned under
+    :attr:`CHECKPOINT_REF_PREFIX`; restoring one rewrites only the files that
+    differ from the current working tree.
     """
 
+    CHECKPOINT_REF_PREFIX = "refs/superqode/checkpoints/"
+    INDEX_FILE_NAME = "superqode-checkpoint.index"
+
+    # Checkpoint commits carry a fixed identity so they work without user config.
+    _IDENTITY = {
+        "GIT_AUTHOR_NAME": "SuperQode",
+        "GIT_AUTHOR_EMAIL": "checkpoints@superqode.invalid",
+        "GIT_COMMITTER_NAME": "SuperQode",
+        "GIT_COMMITTER_EMAIL": "checkpoints@superqode.invalid",
+    }
+
     def __init__(self, working_dir: Optional[Path] = None):
         self.working_dir = working_dir or Path.cwd()
         self._checkpoints: List[Checkpoint] = []
         self._redo_stack: List[Checkpoint] = []
         self._current_index: int = -1
         self._initialized = False
+        self._git_dir: Optional[Path] = None
+        self._toplevel: Optional[Path] = None
 
     # ========================================================================
     # INITIALIZATION
@@ -101,24 +124,155 @@ class UndoManager:
 
         # Check if git is available
         try:
-            result = self._run_git(["rev-parse", "--git-dir"])
+            result = self._run_git(["rev-parse", "--absolute-git-dir", "--show-toplevel"])
             if result.returncode != 0:
                 return False
 
+            lines = result.stdout.splitlines()
+            if len(lines) < 2:
+                # Bare repository: nothing to checkpoint
+                return False
+            self._git_dir = Path(lines[0])
+            self._toplevel = Path(lines[1])
             self._initialized = True
             return True
         except Exception:
             return False
 
-    def _run_git(self, args: List[str], capture_output: bool = True) -> subprocess.CompletedProcess:
+    def _run_git(
+        self,
+        args: List[str],
+        capture_output: bool = True,
+        env: Optional[Dict[str, str]] = None,
+        input: Optional[str] = None,
+        cwd: Optional[Path] = None,
+    ) -> subprocess.CompletedProcess:
         """Run a git command."""
         cmd = ["git"] + args
         return subprocess.run(
             cmd,
-            cwd=str(self.working_dir),
+            cwd=str(cwd or self.working_dir),
             capture_output=capture_output,
             text=True,
+            env={**os.environ, **env} if env else None,
+            input=input,
+        )
+
+    # ========================================================================
+    # PRIVATE INDEX PLUMBING
+    # ========================================================================
+
+    def _index_env(self, index_file: Path) -> Dict[str, str]:
+        return {"GIT_INDEX_FILE": str(index_file), **self._IDENTITY}
+
+    def _private_index(self) -> Path:
+        """The checkpoint index, seeded from the user's index for its stat data."""
+        assert self._git_dir is not None
+        index_file = self._git_dir / self.INDEX_FILE_NAME
+        if not index_file.exists():
+            user_index = self._git_dir / "index"
+            if user_index.exists():
+                shutil.copyfile(user_index, index_file)
+        return index_file
+
+    def _write_worktree_tree(self) -> Optional[str]:
+        """Stage the working tree into the private index and return its tree id."""
+        env = self._index_env(self._private_index())
+        # SuperQode's own state (.superqode/) is never checkpointed or restored
+        add = ["add", "-A", "--", ".", ":(exclude).superqode"]
+        if self._run_git(add, env=env, cwd=self._toplevel).returncode != 0:
+            return None
+        result = self._run_git(["write-tree"], env=env, cwd=self._toplevel)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def _head_commit(self) -> Optional[str]:
+        result = self._run_git(["rev-parse", "--verify", "--quiet", "HEAD^{commit}"])
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def _changed_paths(self, old: Optional[str], new: str) -> List[str]:
+        """Paths that differ between two tree-ish objects (all of ``new`` if no ``old``)."""
+        if old is None:
+            args = ["ls-tree", "-r", "--name-only", "-z", new]
+        else:
+            args = ["diff-tree", "-r", "--name-only", "-z", old, new]
+        result = self._run_git(args, cwd=self._toplevel)
+        if result.returncode != 0:
+            return []
+        return [p for p in result.stdout.split("\0") if p]
+
+    def _commit_tree(self, tree: str, parent: Optional[str], message: str) -> Optional[str]:
+        """Create a checkpoint commit for ``tree`` and pin it under the ref namespace."""
+        args = ["commit-tree", tree, "-m", message]
+        if parent:
+            args += ["-p", parent]
+        result = self._run_git(args, env=self._IDENTITY)
+        if result.returncode != 0:
+            return None
+        commit = result.stdout.strip()
+        pinned = self._run_git(["update-ref", self.CHECKPOINT_REF_PREFIX + commit, commit])
+        return commit if pinned.returncode == 0 else None
+
+    def _unpin(self, commit: str) -> bool:
+        ref = self.CHECKPOINT_REF_PREFIX + commit
+        return self._run_git(["update-ref", "-d", ref]).returncode == 0
+
+    def _snapshot_worktree(self, message: str) -> Optional[str]:
+        """Commit the current working tree without touching the user's index."""
+        tree = self._write_worktree_tree()
+        if tree is None:
+            return None
+        return self._commit_tree(tree, self._head_commit(), message)
+
+    def _restore_tree(self, target: str, current: Optional[str] = None) -> bool:
+        """Make the working tree match ``target``, rewriting only differing files.
+
+        ``current`` is a commit of the present working tree; one is taken if
+        not given. Files are written through a throwaway index so the user's
+        index stays untouched.
+        """
+        assert self._git_dir is not None and self._toplevel is not None
+        if current is None:
+            tree = self._write_worktree_tree()
+            if tree is None:
+                return False
+            current = tree
+
+        diff = self._run_git(
+            ["diff-tree", "-r", "-z", "--no-renames", "--name-status", current, target],
+            cwd=self._toplevel,
         )
+        if diff.returncode != 0:
+            return False
+        fields = [f for f in diff.stdout.split("\0") if f]
+        write: List[str] = []
+        delete: List[str] = []
+        for status, path in zip(fields[0::2], fields[1::2]):
+            (delete if status == "D" else write).append(path)
+
+        for path in delete:
+            file_path = self._toplevel / path
+            if file_path.is_file() or file_path.is_symlink():
+                file_path.unlink()
+
+        return not write or self._checkout_paths(target, write, self._toplevel)
+
+    def _checkout_paths(self, target: str, paths: List[str], cwd: Path) -> bool:
+        """Write ``paths`` (relative to ``cwd``) from ``target`` via a throwaway index."""
+        assert self._git_dir is not None
+        scratch = self._git_dir / f"superqode-restore-{os.getpid()}.index"
+        env = self._index_env(scratch)
+        try:
+            if self._run_git(["read-tree", target], env=env, cwd=cwd).returncode != 0:
+                return False
+            result = self._run_git(
+                ["checkout-index", "-f", "-z", "--stdin"],
+                env=env,
+                input="\0".join(paths) + "\0",
+                cwd=cwd,
+            )
+            return result.returncode == 0
+        finally:
+            scratch.unlink(missing_ok=True)
 
     # ========================================================================
     # CHECKPOINT CREATION
@@ -128,66 +282,44 @@ class UndoManager:
         """
         Create a checkpoint of the current state.
 
-        Uses git stash to save changes without affecting the working tree.
-        Returns the checkpoint ID if successful.
+        Stages the working tree (including untracked, non-ignored files) into
+        a private index and commits it with ``commit-tree``; the user's index,
+        working tree and stash are left alone. Returns the checkpoint's commit
+        hash, or None if nothing differs from HEAD.
         """
         if not self.initialize():
             return None
 
         try:
-            # Get list of changed files
-            status = self._run_git(["status", "--porcelain"])
-            changed_files = []
-            for line in status.stdout.strip().split("\n"):
-                if line.strip():
-                    # Parse status line: "XY filename"
-                    parts = line.split(maxsplit=1)
-                    if len(parts) >= 2:
-                        changed_files.append(parts[1].strip('"'))
+            tree = self._write_worktree_tree()
+            if tree is None:
+                return None
 
+            head = self._head_commit()
+            changed_files = self._changed_paths(head, tree)
             if not changed_files:
                 # No changes to checkpoint
                 return None
 
-            # Create a stash with all changes (including untracked)
-            stash_msg = f"superqode-checkpoint: {name or 'Checkpoint'}"
+            commit_msg = f"superqode-checkpoint: {name or 'Checkpoint'}"
             if message:
-                stash_msg += f" - {message}"
+                commit_msg += f" - {message}"
 
-            # Stage all changes including untracked
-            self._run_git(["add", "-A"])
-
-            # Create stash
-            result = self._run_git(["stash", "push", "-m", stash_msg, "--include-untracked"])
-
-            if result.returncode != 0:
-                # Unstage changes
-                self._run_git(["reset"])
-                return None
-
-            # Get the stash reference
-            stash_list = self._run_git(["stash", "list", "-1"])
-            if not stash_list.stdout.strip():
+            commit = self._commit_tree(tree, head, commit_msg)
+            if commit is None:
                 return None
 
-            # Parse stash reference (e.g., "stash@{0}: ...")
-            stash_ref = stash_list.stdout.split(":")[0].strip()
-
-            # Immediately restore working directory (we just want the checkpoint)
-            self._run_git(["stash", "pop", "--quiet"])
-
             # Create checkpoint record
             checkpoint = Checkpoint(
-                id=stash_ref,
+                id=commit,
                 name=name or f"Checkpoint {len(self._checkpoints) + 1}",
                 timestamp=datetime.now(),
                 message=message,
                 files_changed=changed_files,
-                is_stash=True,
             )
 
             # Clear redo stack when creating new checkpoint
-            self._redo_stack.clear()
+            self._clear_redo_stack()
 
             self._checkpoints.append(checkpoint)
             self._current_index = len(self._checkpoints) - 1
@@ -244,7 +376,7 @@ class UndoManager:
                 is_stash=False,
             )
 
-            self._redo_stack.clear()
+            self._clear_redo_stack()
             self._checkpoints.append(checkpoint)
             self._current_index = len(self._checkpoints) - 1
 
@@ -261,32 +393,25 @@ class UndoManager:
         """
         Undo to the previous checkpoint.
 
+        The current working tree is checkpointed onto the redo stack first,
+        then files are restored to the checkpoint's contents.
         Returns the checkpoint that was restored, or None if nothing to undo.
         """
-        if not self._checkpoints or self._current_index < 0:
+        if not self._checkpoints or self._current_index < 0 or not self.initialize():
             return None
 
         try:
             # Save current state to redo stack
             current_state = self._capture_current_state()
-            if current_state:
-                self._redo_stack.append(current_state)
+            if current_state is None:
+                return None
 
-            # Get checkpoint to restore
             checkpoint = self._checkpoints[self._current_index]
+            if not self._restore_tree(checkpoint.id, current_state.id):
+                self._unpin(current_state.id)
+                return None
 
-            # Restore based on type
-            if checkpoint.is_stash:
-                # For stash-based, we need to reverse the changes
-                # This is tricky - we'll use git checkout
-                for file_path in checkpoint.files_changed:
-                    self._run_git(["checkout", "HEAD", "--", file_path])
-            else:
-                # For commit-based, reset to previous commit
-                if self._current_index > 0:
-                    prev_checkpoint = self._checkpoints[self._current_index - 1]
-                    self._run_git(["reset", "--hard", prev_checkpoint.id])
-
+            self._redo_stack.append(current_state)
             self._current_index -= 1
             return checkpoint
 
@@ -299,17 +424,16 @@ class UndoManager:
 
         Returns the checkpoint that was restored, or None if nothing to redo.
         """
-        if not self._redo_stack:
+        if not self._redo_stack or not self.initialize():
             return None
 
         try:
-            checkpoint = self._redo_stack.pop()
-
-            # Apply the changes
-            for file_path in checkpoint.files_changed:
-                # This is simplified - full implementation would restore content
-                pass
+            checkpoint = self._redo_stack[-1]
+            if not self._restore_tree(checkpoint.id):
+                return None
 
+            self._redo_stack.pop()
+            self._unpin(checkpoint.id)
             self._current_index += 1
             return checkpoint
 
@@ -319,23 +443,26 @@ class UndoManager:
     def _capture_current_state(self) -> Optional[Checkpoint]:
         """Capture the current state as a checkpoint for redo."""
         try:
-            status = self._run_git(["status", "--porcelain"])
-            changed_files = []
-            for line in status.stdout.strip().split("\n"):
-                if line.strip():
-                    parts = line.split(maxsplit=1)
-                    if len(parts) >= 2:
-                        changed_files.append(parts[1].strip('"'))
+            commit = self._snapshot_worktree("superqode-checkpoint: Current state")
+            if commit is None:
+                return None
 
             return Checkpoint(
-                id="current",
+                id=commit,
                 name="Current state",
                 timestamp=datetime.now(),
-                files_changed=changed_files,
+                files_changed=self._changed_paths(f"{commit}^", commit)
+                if self._head_commit()
+                else self._changed_paths(None, commit),
             )
         except Exception:
             return None
 
+    def _clear_redo_stack(self) -> None:
+        for checkpoint in self._redo_stack:
+            self._unpin(checkpoint.id)
+        self._redo_stack.clear()
+
     # ========================================================================
     # RESTORE
     # ========================================================================
@@ -362,17 +489,11 @@ class UndoManager:
             return False
 
         try:
-            if checkpoint.is_stash:
-                # Find and apply the stash
-                result = self._run_git(["stash", "apply", checkpoint.id])
-                return result.returncode == 0
-            else:
-                # Reset to commit
-                result = self._run_git(["reset", "--hard", checkpoint.id])
-                if result.returncode == 0:
-                    self._current_index = index
-                    return True
-                return False
+            # Rewrite only the files that differ; HEAD and the index stay put
+            if self._restore_tree(checkpoint.id):
+                self._current_index = index
+                return True
+            return False
         except Exception:
             return False
 
@@ -396,14 +517,7 @@ class UndoManager:
             return False
 
         try:
-            if checkpoint.is_stash:
-                # Restore file from stash
-                result = self._run_git(["checkout", checkpoint.id, "--", file_path])
-            else:
-                # Restore file from commit
-                result = self._run_git(["checkout", checkpoint.id, "--", file_path])
-
-            return result.returncode == 0
+            return self._checkout_paths(checkpoint.id, [file_path], self.working_dir)
         except Exception:
             return False
 
@@ -509,13 +623,12 @@ class UndoManager:
         removed = 0
 
         for checkpoint in to_remove:
-            if checkpoint.is_stash:
-                # Drop the stash
-                try:
-                    self._run_git(["stash", "drop", checkpoint.id])
+            # Unpin the commit so git gc can reclaim it
+            try:
+                if self._unpin(checkpoint.id):
                     removed += 1
-                except Exception:
-                    pass
+            except Exception:
+                pass
 
         self._checkpoints = self._checkpoints[-keep_count:]
         self._current_index = min(self._current_index, len(self._checkpoints) - 1)
@@ -17,6 +17,7 @@ from .manager import WorkspaceManager, WorkspaceState
 from .artifacts import ArtifactManager, ArtifactType
 from .git_guard import GitGuard, GitOperationBlocked
 from .snapshot import SnapshotManager
+from .blob_store import BlobStore
 from .worktree import GitWorktreeManager, WorktreeInfo, prepare_workspace_worktree
 from .coordinator import WorkspaceCoordinator, WorkspaceLock, notify_file_change
 from .diff_tracker import DiffTracker, ChangeType, generate_patch_file
@@ -31,7 +32,9 @@ from .git_snapshot import (
 )
 from .watcher import (
     DirectoryWatcher,
+    IncrementalScanner,
     PollingWatcher,
+    ScanStats,
     WatcherConfig,
     FileChange as WatcherFileChange,
     ChangeType as WatcherChangeType,
@@ -47,6 +50,7 @@ __all__ = [
     "GitGuard",
     "GitOperationBlocked",
     "SnapshotManager",
+    "BlobStore",
     # Git worktree
     "GitWorktreeManager",
     "WorktreeInfo",
@@ -67,7 +71,9 @@ __all__ = [
     "create_git_snapshot_manager",
     # Directory watching
     "DirectoryWatcher",
+    "IncrementalScanner",
     "PollingWatcher",
+    "ScanStats",
     "WatcherConfig",
     "WatcherFileChange",
     "WatcherChangeType",
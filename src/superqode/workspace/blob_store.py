@@ -0,0 +1,262 @@
+"""
+Content-addressed blob store for workspace snapshots.
+
+Original file contents captured by :class:`~superqode.workspace.snapshot.
+SnapshotManager` are stored once per distinct content, keyed by SHA-256, and
+compressed with zstd when the optional ``zstandard`` package is installed
+(zlib otherwise)::
+
+    <root>/objects/ab/cdef0123...     compressed content
+    <root>/sessions/<session>.refs    one hash per line, blobs a session holds
+
+Files are hashed and compressed in fixed-size chunks, so a multi-gigabyte
+file never has to fit in memory. The same content captured by several
+sessions is stored once; each session records its references, and
+:meth:`BlobStore.collect_garbage` deletes blobs no session refers to.
+A reference is recorded *before* its blob is written, so a collection running
+in another process never removes a blob that is still being stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Iterator, Optional, Set, Tuple
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:  # pragma: no cover - exercised when zstandard is absent
+    zstandard = None
+    HAS_ZSTD = False
+
+CHUNK_SIZE = 1024 * 1024
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Unreferenced blobs (and abandoned temp files) younger than this are kept:
+# they may come from a writer that stores blobs without a session.
+GC_GRACE_SECONDS = 3600
+
+# Session reference files untouched for this long belong to crashed sessions.
+STALE_SESSION_SECONDS = 7 * 24 * 3600
+
+
+class BlobStoreError(Exception):
+    """A blob is missing or cannot be decoded."""
+
+
+def hash_file(path: Path) -> Tuple[str, int]:
+    """Return ``(sha256 hex, size)`` of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class BlobStore:
+    """Compressed, deduplicated blobs shared by every session of a project."""
+
+    def __init__(self, root: Path, *, compression_level: Optional[int] = None):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.sessions_dir = self.root / "sessions"
+        self.compression_level = compression_level
+
+    # ------------------------------------------------------------------ paths
+
+    def _object_path(self, blob_hash: str) -> Path:
+        return self.objects_dir / blob_hash[:2] / blob_hash[2:]
+
+    def _refs_path(self, session_id: str) -> Path:
+        return self.sessions_dir / f"{session_id}.refs"
+
+    def contains(self, blob_hash: str) -> bool:
+        return self._object_path(blob_hash).exists()
+
+    # ---------------------------------------------------------------- writing
+
+    def _compressor(self):
+        if HAS_ZSTD:
+            level = 3 if self.compression_level is None else self.compression_level
+            return zstandard.ZstdCompressor(level=level).compressobj()
+        level = 6 if self.compression_level is None else self.compression_level
+        return zlib.compressobj(level)
+
+    def _write_chunks(
+        self, chunks: Iterator[bytes], session_id: Optional[str], expected: Optional[str]
+    ) -> Tuple[str, int]:
+        """Compress ``chunks`` into the store; returns ``(hash, size)``."""
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.objects_dir / f".tmp-{uuid.uuid4().hex}"
+        digest = hashlib.sha256()
+        size = 0
+        compressor = self._compressor()
+        try:
+            with open(tmp, "wb") as out:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    out.write(compressor.compress(chunk))
+                out.write(compressor.flush())
+            blob_hash = digest.hexdigest()
+            if session_id and blob_hash != expected:
+                self.add_ref(session_id, blob_hash)
+            target = self._object_path(blob_hash)
+            if target.exists():
+                os.utime(target)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp, target)
+            return blob_hash, size
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def put(self, data: bytes, session_id: Optional[str] = None) -> str:
+        """Store ``data`` (referenced by ``session_id``) and return its hash."""
+        blob_hash = hashlib.sha256(data).hexdigest()
+        if session_id:
+            self.add_ref(session_id, blob_hash)
+        target = self._object_path(blob_hash)
+        if target.exists():
+            os.utime(target)
+            return blob_hash
+        chunks = (data[i : i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+        return self._write_chunks(chunks, session_id, blob_hash)[0]
+
+    def put_file(self, path: Path, session_id: Optional[str] = None) -> Tuple[str, int]:
+        """Store a file's content without loading it whole; returns ``(hash, size)``.
+
+        The file is hashed first so content already in the store is never
+        recompressed. The hash of what is actually written is recomputed, so
+        a file modified between the two passes is still stored correctly.
+        """
+        blob_hash, size = hash_file(path)
+        if session_id:
+            self.add_ref(session_id, blob_hash)
+        target = self._object_path(blob_hash)
+        if target.exists():
+            os.utime(target)
+            return blob_hash, size
+
+        def chunks() -> Iterator[bytes]:
+            with open(path, "rb") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    yield chunk
+
+        return self._write_chunks(chunks(), session_id, blob_hash)
+
+    # ---------------------------------------------------------------- reading
+
+    def _decompressed_chunks(self, blob_hash: str) -> Iterator[bytes]:
+        path = self._object_path(blob_hash)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError as e:
+            raise BlobStoreError(f"Blob not found: {blob_hash}") from e
+        with f:
+            head = f.read(4)
+            f.seek(0)
+            if head == ZSTD_MAGIC:
+                if not HAS_ZSTD:
+                    raise BlobStoreError(f"Blob {blob_hash} needs the zstandard package")
+                reader = zstandard.ZstdDecompressor().stream_reader(f)
+                while chunk := reader.read(CHUNK_SIZE):
+                    yield chunk
+            else:
+                decompressor = zlib.decompressobj()
+                try:
+                    while chunk := f.read(CHUNK_SIZE):
+                        yield decompressor.decompress(chunk)
+                    yield decompressor.flush()
+                except zlib.error as e:
+                    raise BlobStoreError(f"Corrupt blob: {blob_hash}") from e
+
+    def get(self, blob_hash: str) -> bytes:
+        """Return a blob's content."""
+        return b"".join(self._decompressed_chunks(blob_hash))
+
+    def copy_to(self, blob_hash: str, dest: Path) -> None:
+        """Stream a blob's content into ``dest``."""
+        chunks = self._decompressed_chunks(blob_hash)
+        first = next(chunks, b"")  # a missing blob raises before dest is truncated
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with open(dest, "wb") as out:
+            out.write(first)
+            for chunk in chunks:
+                out.write(chunk)
+
+    # ------------------------------------------------------------- references
+
+    def add_ref(self, session_id: str, blob_hash: str) -> None:
+        """Record that ``session_id`` holds ``blob_hash``."""
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._refs_path(session_id), "a", encoding="utf-8") as f:
+            f.write(blob_hash + "\n")
+
+    def release_session(self, session_id: str) -> None:
+        """Drop every reference held by ``session_id``."""
+        self._refs_path(session_id).unlink(missing_ok=True)
+
+    def _live_hashes(self, stale_after: float) -> Set[str]:
+        live: Set[str] = set()
+        if not self.sessions_dir.exists():
+            return live
+        now = time.time()
+        for refs in self.sessions_dir.glob("*.refs"):
+            try:
+                if now - refs.stat().st_mtime > stale_after:
+                    refs.unlink(missing_ok=True)
+                    continue
+                live.update(line for line in refs.read_text(encoding="utf-8").split() if line)
+            except OSError:
+                continue
+        return live
+
+    def collect_garbage(
+        self,
+        grace_seconds: float = GC_GRACE_SECONDS,
+        stale_session_seconds: float = STALE_SESSION_SECONDS,
+    ) -> int:
+        """Delete blobs no session refers to; returns how many were removed."""
+        if not self.objects_dir.exists():
+            return 0
+        live = self._live_hashes(stale_session_seconds)
+        now = time.time()
+        cutoff = now - grace_seconds
+        removed = 0
+        for bucket in self.objects_dir.iterdir():
+            if not bucket.is_dir():
+                # Temp file left by an interrupted write (or one in progress)
+                try:
+                    if bucket.stat().st_mtime < now - max(grace_seconds, GC_GRACE_SECONDS):
+                        bucket.unlink()
+                except OSError:
+                    pass
+                continue
+            for blob in bucket.iterdir():
+                try:
+                    if bucket.name + blob.name in live or blob.stat().st_mtime > cutoff:
+                        continue
+                    blob.unlink()
+                    removed += 1
+                except OSError:
+                    continue
+            try:
+                bucket.rmdir()
+            except OSError:
+                pass  # not empty
+        return removed
+
+    def disk_usage(self) -> int:
+        """Total compressed bytes held in the store."""
+        if not self.objects_dir.exists():
+            return 0
+        return sum(p.stat().st_size for p in self.objects_dir.rglob("*") if p.is_file())
@@ -18,15 +18,16 @@ Usage:
     print(patch)
 """
 
-import difflib
 import hashlib
 import os
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import logging
 
+from ..diff_engine import diff_many, unified_diff, unified_diff_from_opcodes
+
 logger = logging.getLogger(__name__)
 
 
@@ -156,10 +157,14 @@ class DiffTracker:
         # Update path mapping
         self._path_mappings[old_abs] = new_abs
 
-    def get_unified_diff(self) -> Optional[str]:
+    def get_unified_diff(self, workers: Optional[int] = None) -> Optional[str]:
         """
         Generate a unified diff of all changes.
 
+        Args:
+            workers: Diff large change sets in this many processes
+                (``0`` = one per CPU; see :func:`superqode.diff_engine.diff_many`)
+
         Returns:
             Git-format unified diff string, or None if no changes
         """
@@ -171,9 +176,21 @@ class DiffTracker:
         # Sort by path for deterministic output
         changes.sort(key=lambda c: str(c.original_path))
 
+        bodies: List[Optional[List[str]]] = [None] * len(changes)
+        if workers is not None:
+            texts = [self._change_texts(change) for change in changes]
+            pairs = [
+                (old.splitlines(keepends=True), new.splitlines(keepends=True)) for old, new in texts
+            ]
+            for i, result in enumerate(diff_many(pairs, workers=workers)):
+                old_lines, new_lines = pairs[i]
+                bodies[i] = self._hunk_lines(
+                    unified_diff_from_opcodes(old_lines, new_lines, result.opcodes, lineterm="")
+                )
+
         diff_parts = []
-        for change in changes:
-            diff = self._generate_file_diff(change)
+        for change, body in zip(changes, bodies):
+            diff = self._generate_file_diff(change, body)
             if diff:
                 diff_parts.append(diff)
 
@@ -258,8 +275,23 @@ class DiffTracker:
 
         return changes
 
-    def _generate_file_diff(self, change: FileChange) -> str:
-        """Generate unified diff for a single file change."""
+    def _change_texts(self, change: FileChange) -> Tuple[str, str]:
+        """Old and new text of a change (empty for a missing side)."""
+        old_text = ""
+        new_text = ""
+        if change.change_type != ChangeType.ADD and change.baseline.content:
+            old_text = change.baseline.content.decode("utf-8", errors="replace")
+        if change.change_type != ChangeType.DELETE:
+            current_content = self._read_file_safe(change.current_path)
+            if current_content:
+                new_text = current_content.decode("utf-8", errors="replace")
+        return old_text, new_text
+
+    def _generate_file_diff(self, change: FileChange, body: Optional[List[str]] = None) -> str:
+        """Generate unified diff for a single file change.
+
+        ``body`` is the precomputed hunk lines, if the caller already has them.
+        """
         lines = []
 
         # Git diff header
@@ -282,7 +314,9 @@ class DiffTracker:
             lines.append(f"--- {self.DEV_NULL}")
             lines.append(f"+++ {b_path}")
 
-            if current_content:
+            if body is not None:
+                lines.extend(body)
+            elif current_content:
                 lines.extend(self._text_diff("", current_content.decode("utf-8", errors="replace")))
 
         elif change.change_type == ChangeType.DELETE:
@@ -291,7 +325,9 @@ class DiffTracker:
             lines.append(f"--- {a_path}")
             lines.append(f"+++ {self.DEV_NULL}")
 
-            if change.baseline.content:
+            if body is not None:
+                lines.extend(body)
+            elif change.baseline.content:
                 lines.extend(
                     self._text_diff(change.baseline.content.decode("utf-8", errors="replace"), "")
                 )
@@ -313,6 +349,10 @@ class DiffTracker:
             lines.append(f"+++ {b_path}")
 
             # Content diff
+            if body is not None:
+                lines.extend(body)
+                return "\n".join(lines)
+
             old_text = ""
             new_text = ""
 
@@ -330,16 +370,14 @@ class DiffTracker:
         old_lines = old_text.splitlines(keepends=True)
         new_lines = new_text.splitlines(keepends=True)
 
-        diff = difflib.unified_diff(
-            old_lines,
-            new_lines,
-            lineterm="",
-        )
+        return self._hunk_lines(unified_diff(old_lines, new_lines, lineterm=""))
 
-        # Skip the header lines (--- and +++)
+    @staticmethod
+    def _hunk_lines(diff: Iterable[str]) -> List[str]:
+        """Hunk lines of a unified diff, without its header."""
         result = []
         for i, line in enumerate(diff):
-            if i < 2:  # Skip header
+            if i < 2:  # Skip header (--- and +++)
                 continue
             # Remove trailing newline for clean output
             result.append(line.rstrip("\n\r"))
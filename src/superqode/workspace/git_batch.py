@@ -0,0 +1,224 @@
+"""
+Long-lived git coprocesses for bulk object I/O.
+
+Hashing or reading one object per ``git`` invocation costs a process spawn
+per file, which dominates snapshot and restore time on large repositories.
+These wrappers keep ``git hash-object -w --stdin-paths`` and ``git cat-file
+--batch`` / ``--batch-check`` processes alive and stream requests through them:
+a writer task feeds stdin while replies are read from stdout, so neither
+pipe can fill up and stall the other.
+
+Each wrapper is bound to the event loop that started its process and is
+transparently restarted when used from another loop or after git exits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Sequence, Set, Tuple
+
+
+class GitBatchError(Exception):
+    """A batch git process exited or answered out of protocol."""
+
+
+class _GitCoprocess:
+    """A ``git`` process spoken to line by line over stdin/stdout."""
+
+    def __init__(self, project_root: Path, *args: str):
+        self.project_root = Path(project_root)
+        self.args = args
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _ensure(self) -> asyncio.subprocess.Process:
+        loop = asyncio.get_running_loop()
+        proc = self._proc
+        if proc is None or proc.returncode is not None or self._loop is not loop:
+            self._discard()
+            self._proc = await asyncio.create_subprocess_exec(
+                "git",
+                "-C",
+                str(self.project_root),
+                *self.args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            self._loop = loop
+        return self._proc
+
+    def _lock_for_loop(self) -> asyncio.Lock:
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def _discard(self) -> None:
+        """Drop the current process; it is restarted on next use."""
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+
+    async def _abort(self) -> None:
+        """Kill the current process and reap it before the loop can close."""
+        proc = self._proc
+        self._discard()
+        if proc is not None:
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(proc.wait(), timeout=5)
+
+    async def _feed(self, proc: asyncio.subprocess.Process, lines: Sequence[bytes]) -> None:
+        assert proc.stdin is not None
+        for n, line in enumerate(lines, 1):
+            proc.stdin.write(line)
+            if n % 512 == 0:
+                await proc.stdin.drain()
+        await proc.stdin.drain()
+
+    async def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        if self._loop is not asyncio.get_running_loop():
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            return
+        if proc.stdin is not None:
+            proc.stdin.close()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+
+
+class GitHashBatch(_GitCoprocess):
+    """Write files to the object database through ``hash-object --stdin-paths``.
+
+    ``--no-filters`` hashes the bytes on disk, exactly like piping the file
+    through ``hash-object --stdin``.
+    """
+
+    def __init__(self, project_root: Path):
+        super().__init__(project_root, "hash-object", "-w", "--no-filters", "--stdin-paths")
+
+    async def hash_paths(self, paths: Sequence[str]) -> List[str]:
+        """Return the blob id of each path (relative to the project root).
+
+        Paths must exist and must not contain newlines; git aborts the whole
+        stream on an unreadable path, which surfaces as :class:`GitBatchError`
+        after the process has been discarded.
+        """
+        if not paths:
+            return []
+        async with self._lock_for_loop():
+            proc = await self._ensure()
+            assert proc.stdout is not None
+            writer = asyncio.create_task(self._feed(proc, [p.encode() + b"\n" for p in paths]))
+            hashes: List[str] = []
+            try:
+                for _ in paths:
+                    line = await proc.stdout.readline()
+                    if not line:
+                        raise GitBatchError("git hash-object exited mid-batch")
+                    hashes.append(line.decode().strip())
+                await writer
+            except BaseException:
+                writer.cancel()
+                await self._abort()
+                with contextlib.suppress(BaseException):
+                    await writer
+                raise
+            return hashes
+
+
+class GitCatFileBatch(_GitCoprocess):
+    """Read objects through ``cat-file --batch``."""
+
+    def __init__(self, project_root: Path):
+        super().__init__(project_root, "cat-file", "--batch")
+
+    async def iter_objects(
+        self, object_ids: Sequence[str]
+    ) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+        """Yield ``(object id, content)`` in request order; None if missing.
+
+        Contents are read one object at a time, so memory use is bounded by
+        the largest object rather than the whole batch.
+        """
+        if not object_ids:
+            return
+        async with self._lock_for_loop():
+            proc = await self._ensure()
+            assert proc.stdout is not None
+            writer = asyncio.create_task(
+                self._feed(proc, [oid.encode() + b"\n" for oid in object_ids])
+            )
+            done = False
+            try:
+                for oid in object_ids:
+                    header = await proc.stdout.readline()
+                    if not header:
+                        raise GitBatchError("git cat-file exited mid-batch")
+                    fields = header.split()
+                    if len(fields) != 3:
+                        # "<oid> missing" / "<oid> ambiguous"
+                        yield oid, None
+                        continue
+                    size = int(fields[2])
+                    content = await proc.stdout.readexactly(size + 1)
+                    yield oid, content[:-1]
+                await writer
+                done = True
+            finally:
+                if not done:
+                    # The consumer stopped early or git failed: unread replies
+                    # would desynchronise the next batch.
+                    writer.cancel()
+                    await self._abort()
+
+    async def read(self, object_id: str) -> Optional[bytes]:
+        """Return one object's content, or None when it does not exist."""
+        result = None
+        async for _, content in self.iter_objects([object_id]):
+            result = content
+        return result
+
+
+class GitCheckBatch(_GitCoprocess):
+    """Check that objects exist through ``cat-file --batch-check``."""
+
+    def __init__(self, project_root: Path):
+        super().__init__(project_root, "cat-file", "--batch-check")
+
+    async def missing(self, object_ids: Sequence[str]) -> Set[str]:
+        """Return the ids in ``object_ids`` the object database does not hold."""
+        if not object_ids:
+            return set()
+        async with self._lock_for_loop():
+            proc = await self._ensure()
+            assert proc.stdout is not None
+            writer = asyncio.create_task(
+                self._feed(proc, [oid.encode() + b"\n" for oid in object_ids])
+            )
+            missing: Set[str] = set()
+            try:
+                for oid in object_ids:
+                    header = await proc.stdout.readline()
+                    if not header:
+                        raise GitBatchError("git cat-file exited mid-batch")
+                    if len(header.split()) != 3:
+                        # "<oid> missing" / "<oid> ambiguous"
+                        missing.add(oid)
+                await writer
+            except BaseException:
+                writer.cancel()
+                await self._abort()
+                with contextlib.suppress(BaseException):
+                    await writer
+                raise
+            return missing
@@ -8,6 +8,24 @@ Much more reliable than in-memory/tempfile approach:
 - Full history and diffing capabilities
 - Works with existing Git workflows
 - Adapted for SuperQode's workspace needs
+
+Objects are written and read through long-lived ``git hash-object
+--stdin-paths`` / ``git cat-file --batch`` coprocesses
+(:mod:`superqode.workspace.git_batch`), so snapshotting or restoring N files
+costs a handful of processes rather than N.
+
+Snapshotting is incremental on two levels:
+
+- A stat cache (:mod:`superqode.workspace.stat_cache`) reuses the blob hash
+  of any file whose mtime, size and inode are unchanged, so only edited files
+  are read and hashed. Cached blobs are unreferenced, so ``git gc`` may prune
+  them; one ``cat-file --batch-check`` pass finds those and they are hashed
+  again.
+- Each snapshot is stored as a delta against its parent's ``file_hashes``
+  (changed paths, and ``null`` for removed ones), with a full keyframe every
+  :data:`MAX_DELTA_CHAIN` snapshots or when the delta would not be smaller.
+  :class:`Snapshot` objects returned by the manager always carry the full
+  ``file_hashes`` map.
 """
 
 from __future__ import annotations
@@ -15,14 +33,23 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import os
+import stat
 import subprocess
+import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 import json
 
+from .git_batch import GitBatchError, GitCatFileBatch, GitCheckBatch, GitHashBatch
+from .stat_cache import StatCache
+
+# Longest run of delta snapshots before a full keyframe is written.
+MAX_DELTA_CHAIN = 32
+
 
 class SnapshotError(Exception):
     """Error during snapshot operations."""
@@ -60,6 +87,8 @@ class Snapshot:
     message: str
     file_hashes: Dict[str, str]  # path -> git object hash
     parent_id: Optional[str] = None
+    base_id: Optional[str] = None  # snapshot this one is stored as a delta of
+    depth: int = 0  # deltas between this snapshot and its keyframe
 
     def to_dict(self) -> dict:
         return {
@@ -111,6 +140,11 @@ class GitSnapshotManager:
         self._snapshots_dir = self.project_root / ".superqode" / "snapshots"
         self._current_snapshot: Optional[str] = None
         self._tracked_files: Set[Path] = set()
+        self._hasher = GitHashBatch(self.project_root)
+        self._reader = GitCatFileBatch(self.project_root)
+        self._checker = GitCheckBatch(self.project_root)
+        self._stat_cache = StatCache(self._snapshots_dir / "stat-cache.json")
+        self._loaded: "OrderedDict[str, Snapshot]" = OrderedDict()
 
         # Verify Git repo exists
         if not self._git_dir.exists():
@@ -181,22 +215,13 @@ class GitSnapshotManager:
 
     async def _get_object(self, obj_hash: str) -> bytes:
         """Retrieve content from Git object database."""
-        proc = await asyncio.create_subprocess_exec(
-            "git",
-            "-C",
-            str(self.project_root),
-            "cat-file",
-            "blob",
-            obj_hash,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
-
-        if proc.returncode != 0:
+        try:
+            content = await self._reader.read(obj_hash)
+        except (GitBatchError, OSError) as e:
+            raise SnapshotError(f"Object not found: {obj_hash}") from e
+        if content is None:
             raise SnapshotError(f"Object not found: {obj_hash}")
-
-        return stdout
+        return content
 
     async def _get_file_hash(self, file_path: Path) -> Optional[str]:
         """Get the Git hash for a file's current content."""
@@ -211,6 +236,67 @@ class GitSnapshotManager:
         except (IOError, OSError):
             return None
 
+    async def _hash_files(self, file_paths: Iterable[Path]) -> Dict[str, Optional[str]]:
+        """Hash and store many files at once; missing files map to None.
+
+        Files whose stat tuple matches the stat cache reuse the cached hash
+        as long as git still holds the blob. The rest go through the
+        hash-object coprocess, falling back to one process per file for paths
+        git cannot take on a line (embedded newlines) or when the batch fails,
+        e.g. because a file vanished mid-stream.
+        """
+        hashes: Dict[str, Optional[str]] = {}
+        stats: Dict[str, os.stat_result] = {}
+        cached: Dict[str, str] = {}
+        for file_path in file_paths:
+            path_str = str(file_path)
+            try:
+                st = os.stat(self.project_root / file_path)
+            except OSError:
+                hashes[path_str] = None
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                hashes[path_str] = None
+                continue
+            stats[path_str] = st
+            cached_hash = self._stat_cache.lookup(path_str, st)
+            if cached_hash:
+                cached[path_str] = cached_hash
+
+        # Nothing references the cached blobs, so git gc may have pruned them.
+        try:
+            pruned = await self._checker.missing(sorted(set(cached.values())))
+        except (GitBatchError, OSError):
+            pruned = set(cached.values())
+
+        batch: List[str] = []
+        for path_str in stats:
+            if cached.get(path_str) and cached[path_str] not in pruned:
+                hashes[path_str] = cached[path_str]
+            elif "\n" in path_str or "\r" in path_str:
+                hashes[path_str] = await self._get_file_hash(Path(path_str))
+            else:
+                batch.append(path_str)
+        try:
+            hashes.update(zip(batch, await self._hasher.hash_paths(batch)))
+        except (GitBatchError, OSError):
+            for path_str in batch:
+                hashes[path_str] = await self._get_file_hash(Path(path_str))
+
+        # Record the stat taken *before* hashing: if the file changed since,
+        # the next stat will differ and the file is simply hashed again.
+        for path_str, st in stats.items():
+            if hashes.get(path_str):
+                self._stat_cache.record(path_str, st, hashes[path_str])
+        self._stat_cache.save()
+        return hashes
+
+    async def close(self) -> None:
+        """Stop the git coprocesses (they restart on next use)."""
+        await self._hasher.close()
+        await self._reader.close()
+        await self._checker.close()
+
     def _generate_snapshot_id(self) -> str:
         """Generate a unique snapshot ID."""
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -238,14 +324,16 @@ class GitSnapshotManager:
         if files:
             target_files = [Path(f) for f in files]
         else:
-            # Get all tracked files from Git
-            result = await self._run_git("ls-files")
-            target_files = [Path(f) for f in result.stdout.strip().split("\n") if f]
+            # Get all tracked files from Git (NUL-separated: no path quoting)
+            result = await self._run_git("ls-files", "-z")
+            target_files = [Path(f) for f in result.stdout.split("\0") if f]
+            self._stat_cache.retain(str(f) for f in target_files)
 
         # Capture file hashes
         file_hashes = {}
+        hashes = await self._hash_files(target_files)
         for file_path in target_files:
-            hash_val = await self._get_file_hash(file_path)
+            hash_val = hashes.get(str(file_path))
             if hash_val:
                 file_hashes[str(file_path)] = hash_val
                 self._tracked_files.add(file_path)
@@ -259,38 +347,131 @@ class GitSnapshotManager:
             parent_id=self._current_snapshot,
         )
 
-        # Save snapshot metadata
-        self._snapshots_dir.mkdir(parents=True, exist_ok=True)
-        snapshot_file = self._snapshots_dir / f"{snapshot_id}.json"
-        snapshot_file.write_text(json.dumps(snapshot.to_dict(), indent=2))
+        # Save snapshot metadata as a delta against the parent when possible
+        parent = self._load_snapshot(self._current_snapshot) if self._current_snapshot else None
+        self._write_snapshot(snapshot, parent)
 
         self._current_snapshot = snapshot_id
 
         return snapshot_id
 
-    async def get_snapshot(self, snapshot_id: str) -> Optional[Snapshot]:
-        """Get a snapshot by ID."""
-        snapshot_file = self._snapshots_dir / f"{snapshot_id}.json"
+    def _snapshot_file(self, snapshot_id: str) -> Path:
+        return self._snapshots_dir / f"{snapshot_id}.json"
+
+    def _remember(self, snapshot: Snapshot) -> None:
+        """Keep recently materialized snapshots so delta chains replay once."""
+        self._loaded[snapshot.id] = snapshot
+        self._loaded.move_to_end(snapshot.id)
+        while len(self._loaded) > 8:
+            self._loaded.popitem(last=False)
+
+    def _write_snapshot(self, snapshot: Snapshot, base: Optional[Snapshot]) -> None:
+        """Persist ``snapshot``, as a delta of ``base`` if that is worthwhile."""
+        data = snapshot.to_dict()
+        snapshot.base_id, snapshot.depth = None, 0
+        if base is not None and base.depth + 1 < MAX_DELTA_CHAIN:
+            changes: Dict[str, Optional[str]] = {
+                path: obj_hash
+                for path, obj_hash in snapshot.file_hashes.items()
+                if base.file_hashes.get(path) != obj_hash
+            }
+            changes.update(
+                (path, None) for path in base.file_hashes if path not in snapshot.file_hashes
+            )
+            if len(changes) <= len(snapshot.file_hashes) // 2:
+                snapshot.base_id, snapshot.depth = base.id, base.depth + 1
+                del data["file_hashes"]
+                data.update(base_id=base.id, depth=snapshot.depth, changes=changes)
 
-        if not snapshot_file.exists():
+        self._snapshots_dir.mkdir(parents=True, exist_ok=True)
+        snapshot_file = self._snapshot_file(snapshot.id)
+        tmp = snapshot_file.with_name(f".{snapshot_file.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        os.replace(tmp, snapshot_file)
+        self._remember(snapshot)
+
+    def _read_snapshot_data(self, snapshot_id: str) -> Optional[dict]:
+        try:
+            return json.loads(self._snapshot_file(snapshot_id).read_text())
+        except FileNotFoundError:
             return None
 
-        data = json.loads(snapshot_file.read_text())
-        return Snapshot.from_dict(data)
+    def _load_snapshot(
+        self, snapshot_id: str, raw: Optional[Dict[str, dict]] = None
+    ) -> Optional[Snapshot]:
+        """Materialize a snapshot, replaying deltas from the nearest keyframe.
+
+        ``raw`` optionally supplies already-parsed snapshot files by ID.
+        """
+        # Walk back to a full snapshot (or one already materialized) ...
+        chain: List[dict] = []
+        file_hashes: Dict[str, str] = {}
+        current: Optional[str] = snapshot_id
+        while current is not None:
+            known = self._loaded.get(current)
+            if known is not None:
+                if not chain:
+                    self._loaded.move_to_end(current)
+                    return known
+                file_hashes = dict(known.file_hashes)
+                break
+            data = raw.get(current) if raw is not None else None
+            if data is None:
+                data = self._read_snapshot_data(current)
+            if data is None:
+                if not chain:
+                    return None
+                raise SnapshotError(f"Snapshot {chain[-1]['id']} is missing its base {current}")
+            chain.append(data)
+            current = data.get("base_id") if "changes" in data else None
+            if len(chain) > MAX_DELTA_CHAIN * 4:
+                raise SnapshotError(f"Snapshot delta chain too long: {snapshot_id}")
+
+        # ... then apply the deltas forward.
+        snapshot: Optional[Snapshot] = None
+        for data in reversed(chain):
+            if "changes" in data:
+                for path, obj_hash in data["changes"].items():
+                    if obj_hash is None:
+                        file_hashes.pop(path, None)
+                    else:
+                        file_hashes[path] = obj_hash
+                snapshot = Snapshot.from_dict({**data, "file_hashes": dict(file_hashes)})
+                snapshot.base_id = data["base_id"]
+                snapshot.depth = int(data.get("depth", 1))
+            else:
+                snapshot = Snapshot.from_dict(data)
+                file_hashes = dict(snapshot.file_hashes)
+            self._remember(snapshot)
+        return snapshot
+
+    async def get_snapshot(self, snapshot_id: str) -> Optional[Snapshot]:
+        """Get a snapshot by ID."""
+        return self._load_snapshot(snapshot_id)
 
     async def list_snapshots(self) -> List[Snapshot]:
         """List all available snapshots."""
         if not self._snapshots_dir.exists():
             return []
 
-        snapshots = []
+        raw: Dict[str, dict] = {}
         for file_path in self._snapshots_dir.glob("snap-*.json"):
             try:
                 data = json.loads(file_path.read_text())
-                snapshots.append(Snapshot.from_dict(data))
+                raw[data["id"]] = data
             except (json.JSONDecodeError, KeyError):
                 continue
 
+        # Oldest first, so each delta finds its base already materialized
+        snapshots = []
+        for data in sorted(raw.values(), key=lambda d: d.get("timestamp", "")):
+            try:
+                snapshot = self._load_snapshot(data["id"], raw)
+            except (SnapshotError, KeyError, ValueError):
+                continue
+            if snapshot is not None:
+                snapshots.append(snapshot)
+
         # Sort by timestamp, newest first
         snapshots.sort(key=lambda s: s.timestamp, reverse=True)
         return snapshots
@@ -323,10 +504,11 @@ class GitSnapshotManager:
         for path_str in snapshot.file_hashes:
             check_files.add(Path(path_str))
 
+        current_hashes = await self._hash_files(check_files)
         for file_path in check_files:
             path_str = str(file_path)
             original_hash = snapshot.file_hashes.get(path_str)
-            current_hash = await self._get_file_hash(file_path)
+            current_hash = current_hashes.get(path_str)
 
             if original_hash == current_hash:
                 status = FileStatus.UNCHANGED
@@ -386,21 +568,28 @@ class GitSnapshotManager:
             if (self.project_root / file_path).exists():
                 current_files.add(str(file_path))
 
-        # Restore files from snapshot
-        for path_str in target_files:
-            if path_str not in snapshot.file_hashes:
-                continue
-
-            abs_path = self.project_root / path_str
-            obj_hash = snapshot.file_hashes[path_str]
+        # Restore files from snapshot, streaming blobs from one cat-file process
+        restore = [p for p in target_files if p in snapshot.file_hashes]
+        paths_by_hash: Dict[str, List[str]] = {}
+        for path_str in restore:
+            paths_by_hash.setdefault(snapshot.file_hashes[path_str], []).append(path_str)
 
-            try:
-                content = await self._get_object(obj_hash)
-                abs_path.parent.mkdir(parents=True, exist_ok=True)
-                abs_path.write_bytes(content)
-                result["restored"].append(path_str)
-            except Exception as e:
-                result["errors"].append(f"{path_str}: {e}")
+        try:
+            async for obj_hash, content in self._reader.iter_objects(list(paths_by_hash)):
+                for path_str in paths_by_hash.pop(obj_hash):
+                    if content is None:
+                        result["errors"].append(f"{path_str}: Object not found: {obj_hash}")
+                        continue
+                    try:
+                        abs_path = self.project_root / path_str
+                        abs_path.parent.mkdir(parents=True, exist_ok=True)
+                        abs_path.write_bytes(content)
+                        result["restored"].append(path_str)
+                    except Exception as e:
+                        result["errors"].append(f"{path_str}: {e}")
+        except (GitBatchError, OSError) as e:
+            for obj_hash, paths in paths_by_hash.items():
+                result["errors"].extend(f"{path_str}: {e}" for path_str in paths)
 
         # Delete files that were added after the snapshot
         files_to_delete = current_files - target_files
@@ -483,14 +672,36 @@ class GitSnapshotManager:
             )
 
     async def delete_snapshot(self, snapshot_id: str) -> bool:
-        """Delete a snapshot."""
-        snapshot_file = self._snapshots_dir / f"{snapshot_id}.json"
+        """Delete a snapshot.
 
-        if snapshot_file.exists():
-            snapshot_file.unlink()
-            return True
+        Snapshots stored as deltas of this one are rewritten first against
+        its own base (or as full snapshots), so they stay loadable.
+        """
+        snapshot_file = self._snapshot_file(snapshot_id)
+
+        if not snapshot_file.exists():
+            return False
 
-        return False
+        snapshot = self._load_snapshot(snapshot_id)
+        dependents = []
+        for file_path in self._snapshots_dir.glob("snap-*.json"):
+            try:
+                data = json.loads(file_path.read_text())
+            except json.JSONDecodeError:
+                continue
+            if data.get("base_id") == snapshot_id and "changes" in data:
+                dependents.append(data["id"])
+
+        if dependents:
+            base = self._load_snapshot(snapshot.base_id) if snapshot and snapshot.base_id else None
+            for dependent_id in dependents:
+                dependent = self._load_snapshot(dependent_id)
+                if dependent is not None:
+                    self._write_snapshot(dependent, base)
+
+        snapshot_file.unlink()
+        self._loaded.pop(snapshot_id, None)
+        return True
 
     async def cleanup_old_snapshots(self, keep_count: int = 10) -> int:
         """Delete old snapshots, keeping the most recent ones."""
@@ -2,31 +2,36 @@
 Snapshot Manager for Ephemeral Workspace.
 
 Captures the state of modified files and enables full reversion
-after workspace tracking session completes. Uses efficient in-memory tracking
-with disk backup for large files.
+after workspace tracking session completes. Small originals are kept in
+memory up to a total budget; everything else goes to the project's
+content-addressed :class:`~superqode.workspace.blob_store.BlobStore`, which
+compresses and deduplicates across sessions and is garbage-collected when a
+session ends.
 """
 
 from __future__ import annotations
 
 import hashlib
-import shutil
-import tempfile
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 import json
 
+from .blob_store import BlobStore, BlobStoreError
+
 
 @dataclass
 class FileSnapshot:
     """Snapshot of a single file's state."""
 
     path: Path
-    original_content: Optional[bytes]  # None if file didn't exist
-    original_hash: Optional[str]
+    original_content: Optional[bytes]  # None if file didn't exist or is in the blob store
+    original_hash: Optional[str]  # SHA-256, also the blob store key
     existed: bool
     timestamp: datetime = field(default_factory=datetime.now)
+    stored: bool = False  # original content lives in the blob store
+    size: int = 0
 
     @property
     def was_created(self) -> bool:
@@ -35,7 +40,7 @@ class FileSnapshot:
 
     def content_changed(self, current_content: bytes) -> bool:
         """Check if content has changed from original."""
-        if self.original_content is None:
+        if self.original_hash is None:
             return True
         current_hash = hashlib.sha256(current_content).hexdigest()
         return current_hash != self.original_hash
@@ -70,18 +75,28 @@ class SnapshotManager:
         snapshot.revert_all()
     """
 
-    # Files larger than this are backed up to disk
-    LARGE_FILE_THRESHOLD = 10 * 1024 * 1024  # 10MB
+    # Files larger than this go to the blob store instead of memory
+    LARGE_FILE_THRESHOLD = 1024 * 1024  # 1MB
+
+    # Total original content kept in memory per session
+    MEMORY_LIMIT = 64 * 1024 * 1024  # 64MB
 
-    def __init__(self, project_root: Path):
+    def __init__(
+        self,
+        project_root: Path,
+        blob_store: Optional[BlobStore] = None,
+        memory_limit: Optional[int] = None,
+    ):
         self.project_root = project_root.resolve()
         self.session_id: Optional[str] = None
         self.session_start: Optional[datetime] = None
+        self.blob_store = blob_store or BlobStore(self.project_root / ".superqode" / "blobs")
+        self.memory_limit = self.MEMORY_LIMIT if memory_limit is None else memory_limit
 
         # Tracking state
         self._file_snapshots: Dict[Path, FileSnapshot] = {}
         self._dir_snapshots: Dict[Path, DirectorySnapshot] = {}
-        self._large_file_backup_dir: Optional[Path] = None
+        self._memory_used = 0
 
         # Statistics
         self._files_modified: Set[Path] = set()
@@ -97,12 +112,10 @@ class SnapshotManager:
         self.session_id = session_id or f"workspace-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
         self.session_start = datetime.now()
 
-        # Create temp dir for large file backups
-        self._large_file_backup_dir = Path(tempfile.mkdtemp(prefix=f"superqode-{self.session_id}-"))
-
         # Reset tracking
         self._file_snapshots.clear()
         self._dir_snapshots.clear()
+        self._memory_used = 0
         self._files_modified.clear()
         self._files_created.clear()
         self._files_deleted.clear()
@@ -128,24 +141,28 @@ class SnapshotManager:
 
         # Capture current state
         if abs_path.exists() and abs_path.is_file():
-            content = abs_path.read_bytes()
-            content_hash = hashlib.sha256(content).hexdigest()
-
-            # Large files go to disk backup
-            if len(content) > self.LARGE_FILE_THRESHOLD:
-                backup_path = self._large_file_backup_dir / rel_path
-                backup_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(abs_path, backup_path)
-                original_content = None  # Don't keep in memory
+            size = abs_path.stat().st_size
+            if size <= self.LARGE_FILE_THRESHOLD and self._memory_used + size <= self.memory_limit:
+                content = abs_path.read_bytes()
+                self._memory_used += len(content)
+                snapshot = FileSnapshot(
+                    path=rel_path,
+                    original_content=content,
+                    original_hash=hashlib.sha256(content).hexdigest(),
+                    existed=True,
+                    size=len(content),
+                )
             else:
-                original_content = content
-
-            snapshot = FileSnapshot(
-                path=rel_path,
-                original_content=original_content,
-                original_hash=content_hash,
-                existed=True,
-            )
+                # Large files (or over the memory budget) are streamed into the blob store
+                content_hash, size = self.blob_store.put_file(abs_path, self.session_id)
+                snapshot = FileSnapshot(
+                    path=rel_path,
+                    original_content=None,
+                    original_hash=content_hash,
+                    existed=True,
+                    stored=True,
+                    size=size,
+                )
         else:
             # File doesn't exist yet
             snapshot = FileSnapshot(
@@ -212,18 +229,20 @@ class SnapshotManager:
             return True
 
         # Restore original content
-        if snapshot.original_content is not None:
-            abs_path.parent.mkdir(parents=True, exist_ok=True)
-            abs_path.write_bytes(snapshot.original_content)
-        else:
-            # Large file - restore from backup
-            backup_path = self._large_file_backup_dir / rel_path
-            if backup_path.exists():
-                abs_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(backup_path, abs_path)
-
+        try:
+            self._restore_original(snapshot, abs_path)
+        except BlobStoreError:
+            return False
         return True
 
+    def _restore_original(self, snapshot: FileSnapshot, abs_path: Path) -> None:
+        """Write a snapshot's original content back to ``abs_path``."""
+        if snapshot.stored:
+            self.blob_store.copy_to(snapshot.original_hash, abs_path)
+        else:
+            abs_path.parent.mkdir(parents=True, exist_ok=True)
+            abs_path.write_bytes(snapshot.original_content or b"")
+
     def revert_all(self) -> Dict[str, List[str]]:
         """
         Revert ALL changes made during the session.
@@ -252,15 +271,7 @@ class SnapshotManager:
                         reverted["files_deleted"].append(str(rel_path))
                 else:
                     # Restore original content
-                    if snapshot.original_content is not None:
-                        abs_path.parent.mkdir(parents=True, exist_ok=True)
-                        abs_path.write_bytes(snapshot.original_content)
-                    else:
-                        # Large file from backup
-                        backup_path = self._large_file_backup_dir / rel_path
-                        if backup_path.exists():
-                            abs_path.parent.mkdir(parents=True, exist_ok=True)
-                            shutil.copy2(backup_path, abs_path)
+                    self._restore_original(snapshot, abs_path)
                     reverted["files_restored"].append(str(rel_path))
             except Exception as e:
                 reverted["errors"].append(f"{rel_path}: {e}")
@@ -304,16 +315,20 @@ class SnapshotManager:
             revert_result = self.revert_all()
             result["revert_result"] = revert_result
 
-        # Cleanup temp backup dir
-        if self._large_file_backup_dir and self._large_file_backup_dir.exists():
-            shutil.rmtree(self._large_file_backup_dir, ignore_errors=True)
+        # Release this session's blobs; content no other session holds is
+        # collected. Writers record references first, so no grace is needed.
+        self.blob_store.release_session(self.session_id)
+        try:
+            result["blobs_collected"] = self.blob_store.collect_garbage(grace_seconds=0)
+        except OSError:
+            result["blobs_collected"] = 0
 
         # Reset state
         self.session_id = None
         self.session_start = None
         self._file_snapshots.clear()
         self._dir_snapshots.clear()
-        self._large_file_backup_dir = None
+        self._memory_used = 0
 
         return result
 
@@ -346,12 +361,11 @@ class SnapshotManager:
         if not snapshot.existed:
             return None
 
-        if snapshot.original_content is not None:
+        if not snapshot.stored:
             return snapshot.original_content
 
-        # Large file from backup
-        backup_path = self._large_file_backup_dir / rel_path
-        if backup_path.exists():
-            return backup_path.read_bytes()
-
-        return None
+        # Large file from the blob store
+        try:
+            return self.blob_store.get(snapshot.original_hash)
+        except BlobStoreError:
+            return None
@@ -0,0 +1,100 @@
+"""
+Persistent stat cache for snapshot hashing.
+
+Like git's index, remembers ``path -> (mtime_ns, size, inode, blob hash)`` so a
+file whose stat tuple has not changed since it was last hashed reuses the
+recorded hash instead of being read again. The cache lives in
+``.superqode/snapshots/stat-cache.json`` and is replaced atomically.
+
+Entries are only recorded for files whose mtime is older than
+:data:`RACY_WINDOW_NS` at record time. A file rewritten within the same
+timestamp tick as it was hashed could otherwise keep an identical stat tuple
+with different content (git's "racily clean" problem); such files are simply
+hashed again next time.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FORMAT_VERSION = 1
+RACY_WINDOW_NS = 2_000_000_000
+
+StatKey = Tuple[int, int, int]
+
+
+def stat_key(st: os.stat_result) -> StatKey:
+    """The part of a stat result that must match for a cached hash to apply."""
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class StatCache:
+    """Path to blob-hash cache keyed on stat tuples, persisted as JSON."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, List]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, List]:
+        if self._entries is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if not isinstance(data, dict) or data.get("format") != FORMAT_VERSION:
+                data = {}
+            entries = data.get("entries")
+            if not isinstance(entries, dict):
+                entries = {}
+            self._entries = entries
+        return self._entries
+
+    def lookup(self, path: str, st: os.stat_result) -> Optional[str]:
+        """Return the cached hash for ``path`` if its stat tuple is unchanged."""
+        entry = self._load().get(path)
+        if entry and len(entry) == 4 and tuple(entry[:3]) == stat_key(st):
+            return entry[3]
+        return None
+
+    def record(self, path: str, st: os.stat_result, blob_hash: str) -> None:
+        """Remember ``blob_hash`` for ``path`` as it was when ``st`` was taken."""
+        entries = self._load()
+        if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+            # Too fresh to trust; drop any older entry as well.
+            if entries.pop(path, None) is not None:
+                self._dirty = True
+            return
+        entry = [*stat_key(st), blob_hash]
+        if entries.get(path) != entry:
+            entries[path] = entry
+            self._dirty = True
+
+    def retain(self, paths: Iterable[str]) -> None:
+        """Forget every path not in ``paths`` (after a full scan)."""
+        entries = self._load()
+        keep = set(paths)
+        for path in [p for p in entries if p not in keep]:
+            del entries[path]
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache if it changed since it was loaded."""
+        if not self._dirty or self._entries is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_text(
+            json.dumps({"format": FORMAT_VERSION, "entries": self._entries}, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._load())
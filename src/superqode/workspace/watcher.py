@@ -13,16 +13,20 @@ from __future__ import annotations
 
 import asyncio
 import fnmatch
+import logging
 import os
+import re
 import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from weakref import WeakSet
 
+from .stat_cache import RACY_WINDOW_NS
+
 try:
     from watchdog.observers import Observer
     from watchdog.events import (
@@ -42,6 +46,8 @@ except ImportError:
     Observer = None
     FileSystemEventHandler = object
 
+logger = logging.getLogger(__name__)
+
 
 class ChangeType(Enum):
     """Type of file system change."""
@@ -108,12 +114,42 @@ class WatcherConfig:
 
 # Type alias for change callbacks
 ChangeCallback = Callable[[FileChange], None]
+# Batch callbacks receive every coalesced change of one burst at once
+BatchCallback = Callable[[List[FileChange]], None]
 # Async callbacks should be standard async callables taking a FileChange
 AsyncChangeCallback = Callable[
     [FileChange], "asyncio.Future | asyncio.Task | asyncio.coroutines.CoroutineType"
 ]
 
 
+def _coalesce(pending: Dict[str, FileChange], change: FileChange) -> bool:
+    """Merge ``change`` into ``pending`` (keyed by path).
+
+    Returns False when the change cancelled out a pending one.
+    """
+    path_key = str(change.path)
+    existing = pending.get(path_key)
+
+    if existing:
+        # Merge changes (e.g., create + modify = create)
+        if existing.change_type == ChangeType.CREATED and change.change_type == ChangeType.MODIFIED:
+            change = existing  # Keep as created
+        elif (
+            existing.change_type == ChangeType.CREATED and change.change_type == ChangeType.DELETED
+        ):
+            # Created then deleted = no change
+            del pending[path_key]
+            return False
+        elif (
+            existing.change_type == ChangeType.DELETED and change.change_type == ChangeType.CREATED
+        ):
+            # Deleted then recreated (e.g. an atomic save) = modified
+            change = FileChange(path=change.path, change_type=ChangeType.MODIFIED)
+
+    pending[path_key] = change
+    return True
+
+
 class _WatchdogHandler(FileSystemEventHandler):
     """Internal handler for watchdog events."""
 
@@ -251,28 +287,9 @@ class DirectoryWatcher:
 
     def _handle_change(self, change: FileChange) -> None:
         """Handle a change event (with debouncing)."""
-        path_key = str(change.path)
-
         with self._debounce_lock:
-            # Update or add the pending change
-            existing = self._pending_changes.get(path_key)
-
-            if existing:
-                # Merge changes (e.g., create + modify = create)
-                if (
-                    existing.change_type == ChangeType.CREATED
-                    and change.change_type == ChangeType.MODIFIED
-                ):
-                    change = existing  # Keep as created
-                elif (
-                    existing.change_type == ChangeType.CREATED
-                    and change.change_type == ChangeType.DELETED
-                ):
-                    # Created then deleted = no change
-                    del self._pending_changes[path_key]
-                    return
-
-            self._pending_changes[path_key] = change
+            if not _coalesce(self._pending_changes, change):
+                return
 
             # Reset debounce timer
             if self._debounce_timer:
@@ -402,11 +419,196 @@ class DirectoryWatcher:
         self.stop()
 
 
+@dataclass
+class ScanStats:
+    """Cost of one :class:`IncrementalScanner` scan."""
+
+    full_sweep: bool
+    directories: int = 0  # Directories tracked after the scan
+    directories_listed: int = 0  # Directories re-read with scandir
+    stat_calls: int = 0  # Directory and file stats, including scandir entries
+    files: int = 0  # Files tracked after the scan
+    changes: int = 0
+    duration: float = 0.0  # Seconds
+
+
+class IncrementalScanner:
+    """
+    Tracks file mtimes under a directory without re-walking it on every scan.
+
+    Creating, deleting or renaming an entry changes its directory's mtime, so
+    each scan stats every known directory and re-lists (with ``os.scandir``,
+    whose entries carry their stat results) only those whose mtime moved.
+    Editing a file in place does not touch its directory, so files in
+    unchanged directories are re-stat'd only while "hot" (changed within
+    ``hot_seconds``) and during a full sweep, which runs every
+    ``full_sweep_interval`` seconds as a safety net.
+
+    Directories modified within :data:`~superqode.workspace.stat_cache.
+    RACY_WINDOW_NS` of a listing are listed again on the next scan, since a
+    further change in the same timestamp tick would not move their mtime.
+    """
+
+    def __init__(
+        self,
+        root_path: Path,
+        should_ignore: Callable[[str], bool],
+        full_sweep_interval: float = 30.0,
+        hot_seconds: float = 60.0,
+    ):
+        self.root_path = str(Path(root_path).resolve())
+        self.should_ignore = should_ignore
+        self.full_sweep_interval = full_sweep_interval
+        self.hot_seconds = hot_seconds
+
+        # directory -> (mtime_ns or None if it must be re-listed, {name: is_dir})
+        self._dirs: Dict[str, Tuple[Optional[int], Dict[str, bool]]] = {}
+        # file -> (mtime_ns, size)
+        self._files: Dict[str, Tuple[int, int]] = {}
+        # file -> monotonic time of its last change
+        self._hot: Dict[str, float] = {}
+        self._last_full_sweep = 0.0
+
+    @property
+    def mtimes(self) -> Dict[str, float]:
+        """Modification time (seconds) of every tracked file."""
+        return {path: key[0] / 1e9 for path, key in self._files.items()}
+
+    def scan(self, full: bool = False) -> Tuple[List[FileChange], ScanStats]:
+        """Detect changes since the previous scan.
+
+        The first scan is always a full sweep and reports every file as created.
+        """
+        started = time.monotonic()
+        initial = not self._dirs
+        full = full or initial or started - self._last_full_sweep >= self.full_sweep_interval
+        stats = ScanStats(full_sweep=full)
+        changes: List[FileChange] = []
+        self._hot = {p: t for p, t in self._hot.items() if started - t < self.hot_seconds}
+
+        stack = [self.root_path]
+        while stack:
+            directory = stack.pop()
+            try:
+                st = os.stat(directory)
+            except OSError:
+                self._drop_directory(directory, changes)
+                continue
+            stats.stat_calls += 1
+
+            cached = self._dirs.get(directory)
+            if full or cached is None or cached[0] != st.st_mtime_ns:
+                stats.directories_listed += 1
+                listing = self._list_directory(directory, st, changes, stats)
+            else:
+                listing = cached[1]
+                for name, is_dir in listing.items():
+                    if not is_dir and os.path.join(directory, name) in self._hot:
+                        self._stat_file(os.path.join(directory, name), changes, stats)
+
+            stack.extend(
+                os.path.join(directory, name) for name, is_dir in listing.items() if is_dir
+            )
+
+        if full:
+            self._last_full_sweep = started
+        if not initial:
+            for change in changes:
+                if change.change_type != ChangeType.DELETED:
+                    self._hot[str(change.path)] = started
+
+        stats.directories = len(self._dirs)
+        stats.files = len(self._files)
+        stats.changes = len(changes)
+        stats.duration = time.monotonic() - started
+        return changes, stats
+
+    def _list_directory(
+        self,
+        directory: str,
+        st: os.stat_result,
+        changes: List[FileChange],
+        stats: ScanStats,
+    ) -> Dict[str, bool]:
+        """Re-read a directory, recording file changes and removed entries."""
+        listing: Dict[str, bool] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if self.should_ignore(entry.path):
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                        if is_dir and entry.is_symlink():
+                            continue  # Like os.walk, never descend into links
+                        if not is_dir:
+                            entry_stat = entry.stat()
+                    except OSError:
+                        continue
+                    listing[entry.name] = is_dir
+                    if not is_dir:
+                        stats.stat_calls += 1
+                        self._record_file(entry.path, entry_stat, changes)
+        except OSError:
+            self._drop_directory(directory, changes)
+            return {}
+
+        old = self._dirs.get(directory)
+        if old is not None:
+            for name, was_dir in old[1].items():
+                if listing.get(name) == was_dir:
+                    continue
+                path = os.path.join(directory, name)
+                if was_dir:
+                    self._drop_directory(path, changes)
+                elif self._files.pop(path, None) is not None:
+                    changes.append(FileChange(path=Path(path), change_type=ChangeType.DELETED))
+
+        racy = time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS
+        self._dirs[directory] = (None if racy else st.st_mtime_ns, listing)
+        return listing
+
+    def _stat_file(self, path: str, changes: List[FileChange], stats: ScanStats) -> None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return  # Removal also changes the directory mtime; handled there
+        stats.stat_calls += 1
+        self._record_file(path, st, changes)
+
+    def _record_file(self, path: str, st: os.stat_result, changes: List[FileChange]) -> None:
+        key = (st.st_mtime_ns, st.st_size)
+        previous = self._files.get(path)
+        if previous == key:
+            return
+        self._files[path] = key
+        change_type = ChangeType.CREATED if previous is None else ChangeType.MODIFIED
+        changes.append(FileChange(path=Path(path), change_type=change_type))
+
+    def _drop_directory(self, directory: str, changes: List[FileChange]) -> None:
+        """Forget a removed directory, reporting its files as deleted."""
+        cached = self._dirs.pop(directory, None)
+        if cached is None:
+            return
+        for name, is_dir in cached[1].items():
+            path = os.path.join(directory, name)
+            if is_dir:
+                self._drop_directory(path, changes)
+            elif self._files.pop(path, None) is not None:
+                self._hot.pop(path, None)
+                changes.append(FileChange(path=Path(path), change_type=ChangeType.DELETED))
+
+
 class PollingWatcher:
     """
     Fallback directory watcher using polling.
 
-    Used when watchdog is not available. Less efficient but works everywhere.
+    Used when watchdog is not available. Each poll runs an
+    :class:`IncrementalScanner`, so its cost follows the number of directories
+    rather than files. Changes found by consecutive polls are coalesced per
+    path (create + modify = create, create + delete = nothing) and delivered
+    once a poll finds nothing new, as one batch to ``on_batch`` callbacks and
+    one by one to ``on_change`` callbacks.
     """
 
     def __init__(
@@ -414,6 +616,7 @@ class PollingWatcher:
         root_path: Path,
         poll_interval: float = 1.0,
         config: Optional[WatcherConfig] = None,
+        full_sweep_interval: float = 30.0,
     ):
         self.root_path = Path(root_path).resolve()
         self.poll_interval = poll_interval
@@ -421,79 +624,109 @@ class PollingWatcher:
 
         self._running = False
         self._thread: Optional[threading.Thread] = None
-        self._file_mtimes: Dict[str, float] = {}
+        self._ignore_patterns: Tuple[str, ...] = ()
+        self._ignore_re = re.compile("(?!)")
+        self._scanner = IncrementalScanner(
+            self.root_path, self._should_ignore, full_sweep_interval=full_sweep_interval
+        )
         self._callbacks: Set[ChangeCallback] = set()
+        self._batch_callbacks: Set[BatchCallback] = set()
+
+        # Coalescing
+        self._pending_changes: Dict[str, FileChange] = {}
+        self._pending_since: Optional[float] = None
+
+        self.last_scan_stats: Optional[ScanStats] = None
 
     def on_change(self, callback: ChangeCallback) -> ChangeCallback:
         """Register a change callback."""
         self._callbacks.add(callback)
         return callback
 
+    def on_batch(self, callback: BatchCallback) -> BatchCallback:
+        """Register a callback receiving each burst of changes as one list."""
+        self._batch_callbacks.add(callback)
+        return callback
+
     def _should_ignore(self, path: str) -> bool:
         """Check if path should be ignored."""
-        for pattern in self.config.ignore_patterns:
-            if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern):
-                return True
-        return False
+        patterns = tuple(self.config.ignore_patterns)
+        if patterns != self._ignore_patterns:
+            # One compiled regex instead of two fnmatch calls per pattern
+            self._ignore_patterns = patterns
+            self._ignore_re = re.compile(
+                "|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns) or "(?!)"
+            )
+        path = os.path.normcase(path)
+        return bool(self._ignore_re.match(path) or self._ignore_re.match(os.path.basename(path)))
 
-    def _scan_directory(self) -> Dict[str, float]:
-        """Scan directory and get file modification times."""
-        mtimes = {}
+    def poll(self, full: bool = False) -> List[FileChange]:
+        """Scan once and deliver any burst that has settled.
 
-        for root, dirs, files in os.walk(self.root_path):
-            # Filter ignored directories
-            dirs[:] = [d for d in dirs if not self._should_ignore(d)]
+        The first poll only records the baseline. Returns the changes
+        delivered by this call.
+        """
+        baseline = self.last_scan_stats is None
+        changes, stats = self._scanner.scan(full=full)
+        self.last_scan_stats = stats
+        logger.debug(
+            "Polled %s: %d dirs (%d listed), %d stats, %d changes in %.1f ms%s",
+            self.root_path,
+            stats.directories,
+            stats.directories_listed,
+            stats.stat_calls,
+            stats.changes,
+            stats.duration * 1000,
+            " (full sweep)" if stats.full_sweep else "",
+        )
 
-            for file in files:
-                file_path = os.path.join(root, file)
-                if self._should_ignore(file_path):
-                    continue
+        if baseline:
+            return []  # Files that already existed are not changes
 
+        now = time.monotonic()
+        for change in changes:
+            _coalesce(self._pending_changes, change)
+        if changes and self._pending_since is None:
+            self._pending_since = now
+
+        if not self._pending_changes:
+            self._pending_since = None
+            return []
+        # A burst ends with a quiet poll, but is never held back indefinitely
+        max_hold = max(self.config.debounce_interval, self.poll_interval) * 4
+        if (
+            changes
+            and now - self._pending_since < max_hold
+            and len(self._pending_changes) < self.config.max_buffer_size
+        ):
+            return []
+        return self._flush_changes()
+
+    def _flush_changes(self) -> List[FileChange]:
+        """Deliver pending changes to callbacks."""
+        batch = list(self._pending_changes.values())
+        self._pending_changes.clear()
+        self._pending_since = None
+        if not batch:
+            return batch
+
+        for batch_callback in self._batch_callbacks:
+            try:
+                batch_callback(batch)
+            except Exception:
+                pass  # Don't let one callback break others
+        for change in batch:
+            for callback in self._callbacks:
                 try:
-                    mtimes[file_path] = os.path.getmtime(file_path)
-                except OSError:
-                    continue
-
-        return mtimes
+                    callback(change)
+                except Exception:
+                    pass
+        return batch
 
     def _poll_loop(self) -> None:
         """Main polling loop."""
         while self._running:
-            current_mtimes = self._scan_directory()
-
-            # Check for changes
-            current_files = set(current_mtimes.keys())
-            previous_files = set(self._file_mtimes.keys())
-
-            # New files
-            for path in current_files - previous_files:
-                change = FileChange(path=Path(path), change_type=ChangeType.CREATED)
-                for callback in self._callbacks:
-                    try:
-                        callback(change)
-                    except Exception:
-                        pass
-
-            # Deleted files
-            for path in previous_files - current_files:
-                change = FileChange(path=Path(path), change_type=ChangeType.DELETED)
-                for callback in self._callbacks:
-                    try:
-                        callback(change)
-                    except Exception:
-                        pass
-
-            # Modified files
-            for path in current_files & previous_files:
-                if current_mtimes[path] != self._file_mtimes[path]:
-                    change = FileChange(path=Path(path), change_type=ChangeType.MODIFIED)
-                    for callback in self._callbacks:
-                        try:
-                            callback(change)
-                        except Exception:
-                            pass
-
-            self._file_mtimes = current_mtimes
+            self.poll()
             time.sleep(self.poll_interval)
 
     def start(self) -> None:
@@ -501,7 +734,7 @@ class PollingWatcher:
         if self._running:
             return
 
-        self._file_mtimes = self._scan_directory()
+        self.last_scan_stats = self._scanner.scan(full=True)[1]  # Baseline
         self._running = True
         self._thread = threading.Thread(target=self._poll_loop, daemon=True)
         self._thread.start()
@@ -512,6 +745,7 @@ class PollingWatcher:
         if self._thread:
             self._thread.join(timeout=5.0)
             self._thread = None
+        self._flush_changes()
 
 
 def create_watcher(
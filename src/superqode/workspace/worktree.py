@@ -24,21 +24,98 @@ Usage:
 
     # Cleanup
     await manager.remove_worktree(worktree)
+
+Worktree pool:
+    Removed worktrees are parked in a per-repository pool (up to
+    ``pool_size``, default 2 or ``SUPERQODE_WORKTREE_POOL_SIZE``) instead of
+    being deleted, and the next ``create_qe_worktree`` takes one over with
+    ``git worktree move`` + ``reset --hard`` + ``clean``, which only rewrites
+    files that differ from the requested commit. ``warm_pool()`` pre-creates
+    pool entries and seeds them with the repository's untracked
+    ``node_modules``, reflinked or hardlinked where the filesystem allows it.
+    Hardlinked files are shared with the main checkout, so seeded
+    ``node_modules`` must be treated as read-only: reinstall rather than edit
+    packages in place. Virtualenvs are never seeded; their scripts hardcode
+    the source interpreter path, so ``pip`` in the worktree would install
+    into the main checkout's environment.
 """
 
 import asyncio
+import errno
 import hashlib
 import json
 import os
 import shutil
+import sys
+import time
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 2
+
+# Pooled worktrees idle for longer than this are removed
+POOL_MAX_IDLE_HOURS = 24
+
+# Untracked directories worth seeding into pooled worktrees. Virtualenvs
+# are left out: they cannot be moved, so a seeded one still runs (and
+# installs into) the source checkout's interpreter.
+DEPENDENCY_DIRS = ("node_modules",)
+
+FICLONE = 0x40049409  # Linux ioctl: share the source file's extents (reflink)
+
+
+def _clone_file(src: str, dst: str, modes: List[str]) -> None:
+    """Copy one file using the cheapest method in ``modes`` that still works.
+
+    Methods that the filesystem rejects are dropped from ``modes`` so the rest
+    of a tree does not retry them.
+    """
+    while modes[0] != "copy":
+        try:
+            if modes[0] == "reflink":
+                import fcntl
+
+                with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                shutil.copystat(src, dst)
+            else:
+                os.link(src, dst)
+            return
+        except OSError as e:
+            if modes[0] == "reflink":
+                try:
+                    os.unlink(dst)
+                except OSError:
+                    pass
+            if e.errno in (errno.EEXIST, errno.ENOENT, errno.EACCES):
+                raise
+            modes.pop(0)
+    shutil.copy2(src, dst)
+
+
+def link_tree(src: Path, dest: Path) -> str:
+    """Copy a directory tree by reflink, else hardlink, else plain copy.
+
+    Reflinks are copy-on-write and fully independent. Hardlinks share inodes,
+    which is only safe for dependency trees that tools replace rather than
+    edit in place. Returns the method used for the last file.
+    """
+    modes = (["reflink"] if sys.platform.startswith("linux") else []) + ["hardlink", "copy"]
+    shutil.copytree(
+        src,
+        dest,
+        symlinks=True,
+        copy_function=lambda s, d: _clone_file(s, d, modes),
+        dirs_exist_ok=True,
+    )
+    return modes[0]
+
 
 @dataclass
 class WorktreeInfo:
@@ -50,6 +127,8 @@ class WorktreeInfo:
     base_commit: str
     created_at: datetime
     repo_root: Path
+    from_pool: bool = False  # Recycled from the warm pool
+    checkout_seconds: float = 0.0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -76,8 +155,14 @@ class GitWorktreeManager:
     WORKTREE_ROOT = Path.home() / ".superqode" / "working"
     SESSION_REGISTRY = Path.home() / ".superqode" / "working" / "_sessions"
 
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, pool_size: Optional[int] = None):
         self.project_root = project_root.resolve()
+        if pool_size is None:
+            try:
+                pool_size = int(os.environ.get("SUPERQODE_WORKTREE_POOL_SIZE", DEFAULT_POOL_SIZE))
+            except ValueError:
+                pool_size = DEFAULT_POOL_SIZE
+        self.pool_size = max(0, pool_size)
         configured_home = os.environ.get("SUPERQODE_HOME", "").strip()
         if configured_home:
             self.worktree_root = Path(configured_home).expanduser().resolve() / "working"
@@ -112,6 +197,11 @@ class GitWorktreeManager:
         """Base directory for this repo's worktrees."""
         return self.worktree_root / self.repo_name / "workspace"
 
+    @property
+    def pool_dir(self) -> Path:
+        """Directory holding idle pooled worktrees for this repo."""
+        return self.worktree_root / self.repo_name / "pool"
+
     def _find_git_root(self) -> Path:
         """Find the git repository root."""
         current = self.project_root
@@ -206,11 +296,19 @@ class GitWorktreeManager:
         # Resolve the base commit
         base_commit = await self._get_git_output(["rev-parse", base_ref])
 
+        started = time.perf_counter()
+        from_pool = False
+
         # Check if worktree already exists
         if worktree_path.exists():
             logger.info(f"Reusing existing worktree: {worktree_path}")
             # Reset to base commit
             await self._reset_worktree(worktree_path, base_commit, keep_gitignored)
+        elif await self._acquire_from_pool(worktree_path):
+            from_pool = True
+            await self._reset_worktree(worktree_path, base_commit, keep_gitignored)
+            if keep_gitignored:
+                await asyncio.to_thread(self._seed_dependencies, worktree_path)
         else:
             # Create new detached worktree
             await self._create_worktree(worktree_path, base_commit)
@@ -227,12 +325,17 @@ class GitWorktreeManager:
             base_commit=base_commit,
             created_at=datetime.now(),
             repo_root=self.git_root,
+            from_pool=from_pool,
+            checkout_seconds=time.perf_counter() - started,
         )
 
         # Register worktree
         await self._register_worktree(info)
 
-        logger.info(f"Created workspace worktree: {worktree_path} @ {base_commit[:8]}")
+        logger.info(
+            f"Created workspace worktree: {worktree_path} @ {base_commit[:8]} "
+            f"in {info.checkout_seconds * 1000:.0f} ms{' (pooled)' if from_pool else ''}"
+        )
 
         return info
 
@@ -330,11 +433,16 @@ class GitWorktreeManager:
         return copied
 
     async def remove_worktree(self, worktree: WorktreeInfo, force: bool = False) -> None:
-        """Remove a workspace worktree."""
+        """Remove a workspace worktree, parking it in the pool if there is room."""
         if not worktree.path.exists():
             logger.debug(f"Worktree already removed: {worktree.path}")
             return
 
+        if await self._recycle(worktree.path, force):
+            await self._unregister_worktree(worktree.session_id)
+            logger.info(f"Returned worktree to pool: {worktree.path}")
+            return
+
         args = ["worktree", "remove"]
         if force:
             args.append("--force")
@@ -354,6 +462,113 @@ class GitWorktreeManager:
 
         logger.info(f"Removed worktree: {worktree.path}")
 
+    # ------------------------------------------------------------------ pool
+
+    def _pool_entries(self) -> List[Path]:
+        """Idle pooled worktrees, least recently parked first."""
+        return [path for _, path in self._pool_entries_by_age()]
+
+    def _pool_entries_by_age(self) -> List[Tuple[float, Path]]:
+        if not self.pool_dir.exists():
+            return []
+        entries = []
+        for path in self.pool_dir.iterdir():
+            try:
+                if path.is_dir():
+                    entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue  # Claimed by another process meanwhile
+        return sorted(entries)
+
+    async def warm_pool(self, count: Optional[int] = None, base_ref: str = "HEAD") -> int:
+        """Pre-create idle worktrees at ``base_ref`` (up to ``pool_size``).
+
+        Returns:
+            Number of worktrees created
+        """
+        if not await self.is_git_repo():
+            return 0
+        await self._evict_stale()
+        target = self.pool_size if count is None else min(count, self.pool_size)
+        missing = target - len(self._pool_entries())
+        if missing <= 0:
+            return 0
+
+        commit = await self._get_git_output(["rev-parse", base_ref])
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        for _ in range(missing):
+            path = self.pool_dir / f"warm-{uuid.uuid4().hex[:12]}"
+            await self._create_worktree(path, commit)
+            await asyncio.to_thread(self._seed_dependencies, path)
+        return missing
+
+    async def _acquire_from_pool(self, worktree_path: Path) -> bool:
+        """Move the most recently parked pool entry to ``worktree_path``."""
+        await self._evict_stale()
+        for entry in reversed(self._pool_entries()):
+            try:
+                await self._run_git(["worktree", "move", str(entry), str(worktree_path)])
+                return True
+            except RuntimeError as e:
+                # Claimed concurrently, or no longer a registered worktree
+                logger.debug(f"Skipping pooled worktree {entry}: {e}")
+                if entry.exists():
+                    await self._evict(entry)
+        return False
+
+    async def _recycle(self, worktree_path: Path, force: bool) -> bool:
+        """Park a worktree in the pool; False if it should be removed instead."""
+        if self.pool_size <= 0 or len(self._pool_entries()) >= self.pool_size:
+            return False
+        try:
+            if not force and await self._get_git_output(
+                ["status", "--porcelain"], cwd=worktree_path
+            ):
+                return False  # Leave dirty worktrees to `git worktree remove`
+            await self._run_git(["reset", "--hard", "--quiet"], cwd=worktree_path)
+            await self._run_git(["clean", "-fdq"], cwd=worktree_path)
+            self.pool_dir.mkdir(parents=True, exist_ok=True)
+            target = self.pool_dir / f"warm-{uuid.uuid4().hex[:12]}"
+            await self._run_git(["worktree", "move", str(worktree_path), str(target)])
+            os.utime(target)
+            return True
+        except (RuntimeError, OSError) as e:
+            logger.debug(f"Could not recycle worktree {worktree_path}: {e}")
+            return False
+
+    async def _evict_stale(self) -> int:
+        """Remove pooled worktrees idle too long or beyond ``pool_size``."""
+        entries = self._pool_entries_by_age()
+        cutoff = time.time() - POOL_MAX_IDLE_HOURS * 3600
+        excess = len(entries) - self.pool_size
+        evicted = 0
+        for index, (mtime, entry) in enumerate(entries):
+            if index < excess or mtime < cutoff:
+                await self._evict(entry)
+                evicted += 1
+        return evicted
+
+    async def _evict(self, entry: Path) -> None:
+        try:
+            await self._run_git(["worktree", "remove", "--force", str(entry)])
+        except RuntimeError:
+            shutil.rmtree(entry, ignore_errors=True)
+            await self._run_git(["worktree", "prune"], check=False)
+
+    def _seed_dependencies(self, worktree_path: Path) -> None:
+        """Link the repo's untracked dependency directories into a worktree."""
+        for name in DEPENDENCY_DIRS:
+            src = self.git_root / name
+            dest = worktree_path / name
+            if not src.is_dir() or src.is_symlink() or dest.exists():
+                continue
+            try:
+                method = link_tree(src, dest)
+                logger.debug(f"Seeded {dest} ({method})")
+            except (OSError, shutil.Error) as e:
+                logger.debug(f"Could not seed {dest}: {e}")
+                shutil.rmtree(dest, ignore_errors=True)
+
     async def list_worktrees(self) -> List[WorktreeInfo]:
         """List all workspace worktrees for this repository."""
         worktrees = []
@@ -56,3 +56,15 @@ def _clear_cli_probe_caches():
     clear_devin_cli_cache()
     clear_antigravity_cli_cache()
     clear_effective_models_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_web_cache(tmp_path, monkeypatch):
+    """Keep ``web_fetch`` responses out of the real ``~/.superqode/cache``.
+
+    The cache is shared across calls on purpose, so a page cached by one test
+    would otherwise answer another test's fetch without touching its stub.
+    """
+    from superqode.tools.web_cache import WEB_CACHE_DIR_ENV
+
+    monkeypatch.setenv(WEB_CACHE_DIR_ENV, str(tmp_path / "web-cache"))
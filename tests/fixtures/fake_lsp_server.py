@@ -0,0 +1,215 @@
+"""Scripted language server used to exercise the LSP transport and client.
+
+Speaks real framed JSON-RPC, either in-process over a socket pair
+(:func:`connect_in_process`) or as a subprocess over stdio
+(``python tests/fixtures/fake_lsp_server.py``), so the transport and
+``LSPClient`` are exercised end to end without pyright or tsserver installed.
+
+Behaviour:
+
+- ``initialize`` advertises full document sync (``sync_kind``; pass
+  ``--incremental`` on the command line for ranged changes);
+  ``shutdown``/``exit`` stop it.
+- ``didOpen``/``didChange`` keep the document text and publish one error
+  diagnostic per line containing ``ERROR``, tagged with the document version.
+- ``test/echo`` returns its params; ``test/sleep`` waits ``params["seconds"]``
+  and honours ``$/cancelRequest``.
+- Any other request returns ``null``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from superqode.lsp.transport import REQUEST_CANCELLED, encode_message, read_message
+
+TEXT_DOCUMENT_SYNC_FULL = 1
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+
+_serving: Set[asyncio.Task] = set()
+
+
+class FakeLanguageServer:
+    """In-memory language server; inspect ``requests``/``cancelled``/``documents``."""
+
+    def __init__(self, sync_kind: int = TEXT_DOCUMENT_SYNC_FULL, ask_configuration: bool = False):
+        self.sync_kind = sync_kind
+        self.ask_configuration = ask_configuration
+        self.documents: Dict[str, str] = {}
+        self.versions: Dict[str, int] = {}
+        self.requests: List[str] = []
+        self.notifications: List[Tuple[str, Any]] = []
+        self.cancelled: List[Any] = []
+        self.configuration: Optional[Any] = None
+        self._running: Dict[Any, asyncio.Task] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer messages from ``reader`` until ``exit`` or end of stream."""
+        self._writer = writer
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None or message.get("method") == "exit":
+                    break
+                if "method" not in message:
+                    if message.get("id") == "config":
+                        self.configuration = message.get("result")
+                elif "id" in message:
+                    self.requests.append(message["method"])
+                    task = asyncio.get_running_loop().create_task(self._handle_request(message))
+                    self._running[message["id"]] = task
+                else:
+                    await self._handle_notification(message["method"], message.get("params"))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for task in self._running.values():
+                task.cancel()
+            writer.close()
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        self._writer.write(encode_message({"jsonrpc": "2.0", **message}))
+        await self._writer.drain()
+
+    async def _handle_request(self, message: Dict[str, Any]) -> None:
+        request_id, method, params = message["id"], message["method"], message.get("params")
+        try:
+            if method == "initialize":
+                result: Any = {
+                    "capabilities": {
+                        "textDocumentSync": {"openClose": True, "change": self.sync_kind}
+                    },
+                    "serverInfo": {"name": "superqode-fake-lsp"},
+                }
+            elif method == "test/echo":
+                result = params
+            elif method == "test/sleep":
+                await asyncio.sleep(params.get("seconds", 1.0))
+                result = "slept"
+            else:
+                result = None
+            await self._send({"id": request_id, "result": result})
+        except asyncio.CancelledError:
+            await self._send(
+                {"id": request_id, "error": {"code": REQUEST_CANCELLED, "message": "cancelled"}}
+            )
+        finally:
+            self._running.pop(request_id, None)
+
+    async def _handle_notification(self, method: str, params: Any) -> None:
+        self.notifications.append((method, params))
+        if method == "$/cancelRequest":
+            self.cancelled.append(params["id"])
+            task = self._running.get(params["id"])
+            if task is not None:
+                task.cancel()
+        elif method == "initialized" and self.ask_configuration:
+            await self._send(
+                {
+                    "id": "config",
+                    "method": "workspace/configuration",
+                    "params": {"items": [{"section": "python"}]},
+                }
+            )
+        elif method == "textDocument/didOpen":
+            document = params["textDocument"]
+            self.documents[document["uri"]] = document["text"]
+            self.versions[document["uri"]] = document.get("version", 0)
+            await self._publish(document["uri"], document.get("version"))
+        elif method == "textDocument/didChange":
+            uri = params["textDocument"]["uri"]
+            text = self.documents.get(uri, "")
+            for change in params["contentChanges"]:
+                text = apply_change(text, change)
+            self.documents[uri] = text
+            self.versions[uri] = params["textDocument"].get("version", 0)
+            await self._publish(uri, self.versions[uri])
+        elif method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            self.documents.pop(uri, None)
+            self.versions.pop(uri, None)
+
+    async def _publish(self, uri: str, version: Optional[int]) -> None:
+        diagnostics = [
+            {
+                "range": {
+                    "start": {"line": number, "character": line.index("ERROR")},
+                    "end": {"line": number, "character": line.index("ERROR") + 5},
+                },
+                "message": "fake error",
+                "severity": 1,
+                "source": "fake",
+            }
+            for number, line in enumerate(self.documents.get(uri, "").split("\n"))
+            if "ERROR" in line
+        ]
+        params: Dict[str, Any] = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+        await self._send({"method": "textDocument/publishDiagnostics", "params": params})
+
+
+def apply_change(text: str, change: Dict[str, Any]) -> str:
+    """Apply one ``TextDocumentContentChangeEvent`` (full or ranged) to ``text``.
+
+    Positions count UTF-16 code units, as LSP specifies.
+    """
+    if "range" not in change:
+        return change["text"]
+    start = _offset(text, change["range"]["start"])
+    end = _offset(text, change["range"]["end"])
+    return text[:start] + change["text"] + text[end:]
+
+
+def _offset(text: str, position: Dict[str, int]) -> int:
+    lines = text.split("\n")
+    line = min(position["line"], len(lines))
+    offset = sum(len(lines[i]) + 1 for i in range(line))
+    if line == len(lines):
+        return len(text)
+    units = 0
+    for index, char in enumerate(lines[line]):
+        if units >= position["character"]:
+            return offset + index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return offset + len(lines[line])
+
+
+async def connect_in_process(
+    server: FakeLanguageServer,
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, asyncio.Task]:
+    """Start ``server`` on a socket pair; returns the client's streams and the server task."""
+    client_sock, server_sock = socket.socketpair()
+    server_reader, server_writer = await asyncio.open_connection(sock=server_sock)
+    task = asyncio.get_running_loop().create_task(server.serve(server_reader, server_writer))
+    # The loop only keeps weak references to tasks; callers often drop this one
+    _serving.add(task)
+    task.add_done_callback(_serving.discard)
+    reader, writer = await asyncio.open_connection(sock=client_sock)
+    return reader, writer, task
+
+
+async def _serve_stdio(sync_kind: int) -> None:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+    transport, protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin, sys.stdout.buffer
+    )
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    await FakeLanguageServer(sync_kind=sync_kind).serve(reader, writer)
+
+
+def main() -> None:
+    incremental = "--incremental" in sys.argv[1:]
+    asyncio.run(
+        _serve_stdio(TEXT_DOCUMENT_SYNC_INCREMENTAL if incremental else TEXT_DOCUMENT_SYNC_FULL)
+    )
+
+
+if __name__ == "__main__":
+    main()
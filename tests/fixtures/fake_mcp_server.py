@@ -0,0 +1,69 @@
+"""Scripted stdio MCP server used to exercise MCP startup and call timeouts."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.types import ToolAnnotations
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--startup-delay", type=float, default=0.0)
+parser.add_argument("--start-when", default="", help="Answer nothing until this file exists")
+parser.add_argument("--cancel-marker", default="")
+options = parser.parse_args()
+
+server = FastMCP("fake", log_level="WARNING")
+active = 0
+peak = 0
+calls = 0
+
+
+@server.tool()
+def echo(text: str) -> str:
+    return text
+
+
+@server.tool()
+async def sleep(seconds: float) -> str:
+    global active, peak
+    active += 1
+    peak = max(peak, active)
+    try:
+        await asyncio.sleep(seconds)
+    except asyncio.CancelledError:
+        if options.cancel_marker:
+            Path(options.cancel_marker).write_text("cancelled")
+        raise
+    finally:
+        active -= 1
+    return f"slept {seconds}"
+
+
+@server.tool()
+def peak_calls() -> int:
+    return peak
+
+
+@server.tool(annotations=ToolAnnotations(readOnlyHint=True))
+def count_calls(label: str) -> str:
+    global calls
+    calls += 1
+    return f"{label} {calls}"
+
+
+@server.tool()
+async def add_tool(name: str, ctx: Context) -> str:
+    server.add_tool(lambda: name, name=name, description=f"Added at runtime: {name}")
+    await ctx.session.send_tool_list_changed()
+    return name
+
+
+# Blocking before the stdio loop starts answers nothing, like a slow server
+time.sleep(options.startup_delay)
+while options.start_when and not Path(options.start_when).exists():
+    time.sleep(0.05)
+server.run("stdio")
@@ -19,6 +19,7 @@ from superqode.pipy.messages import ImageContent, Usage, UsageCost
 from superqode.pipy.session import (
     SESSION_FORMAT_VERSION,
     JsonlSessionStorage,
+    MessageEntry,
     SessionError,
     SessionRepository,
     create_session,
@@ -398,6 +399,88 @@ async def test_concurrent_appends_land_on_disk_in_order(repo, tmp_path):
     assert len(lines) == 11
 
 
+# -- sidecar index ----------------------------------------------------------- #
+
+
+def _count_decodes(monkeypatch) -> list:
+    from superqode.pipy.session import jsonl
+
+    decoded: list = []
+    real = jsonl.decode_entry
+
+    def counting(payload):
+        decoded.append(payload.get("id"))
+        return real(payload)
+
+    monkeypatch.setattr(jsonl, "decode_entry", counting)
+    return decoded
+
+
+async def test_open_with_current_sidecar_decodes_only_the_branch(repo, tmp_path, monkeypatch):
+    session, path = await repo.create(tmp_path)
+    root = await session.append_message(UserMessage(content="root"))
+    abandoned = [
+        await session.append_message(UserMessage(content=f"abandoned {i}")) for i in range(5)
+    ]
+    await session.move_to(root)
+    taken = await session.append_message(UserMessage(content="taken"))
+    await session.append_label(taken, "keep")
+    await session.append_session_name("indexed")
+    assert path.with_name(path.name + ".idx").exists()
+
+    decoded = _count_decodes(monkeypatch)
+    reopened = await repo.open(path)
+
+    assert await reopened.get_label(taken) == "keep"
+    assert await reopened.get_session_name() == "indexed"
+    assert (await reopened.get_stats()).message_count == 7
+    # The label and name entries move the leaf; the context only needs the
+    # branch from root through them.
+    assert [m.text for m in (await reopened.build_context()).messages] == ["root", "taken"]
+    assert root in decoded and taken in decoded
+    assert not set(abandoned) & set(decoded)
+
+
+async def test_lines_appended_without_the_sidecar_are_indexed_on_open(repo, tmp_path):
+    session, path = await repo.create(tmp_path)
+    first = await session.append_message(UserMessage(content="first"))
+    line = encode_entry(
+        MessageEntry(
+            id="ext00001",
+            parent_id=first,
+            timestamp="2026-01-01T00:00:00Z",
+            message=UserMessage(content="external"),
+        )
+    )
+    with path.open("a") as handle:
+        handle.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+    reopened = await repo.open(path)
+    assert [m.text for m in (await reopened.build_context()).messages] == ["first", "external"]
+    index_lines = path.with_name(path.name + ".idx").read_text().splitlines()
+    assert json.loads(index_lines[-1])[0] == "ext00001"
+
+
+@pytest.mark.parametrize("damage", ["delete", "garble", "rewrite"])
+async def test_missing_or_stale_sidecar_falls_back_to_a_full_scan(repo, tmp_path, damage):
+    session, path = await repo.create(tmp_path)
+    await session.append_message(UserMessage(content="one"))
+    await session.append_message(UserMessage(content="two"))
+    index = path.with_name(path.name + ".idx")
+    if damage == "delete":
+        index.unlink()
+    elif damage == "garble":
+        index.write_text("not an index\n")
+    else:
+        # Same-size rewrite: only the mtime tells the sidecar is stale.
+        path.write_text(path.read_text().replace('"one"', '"uno"'))
+
+    reopened = await repo.open(path)
+    expected = ["uno" if damage == "rewrite" else "one", "two"]
+    assert [m.text for m in (await reopened.build_context()).messages] == expected
+    assert json.loads(index.read_text().splitlines()[0])["size"] == path.stat().st_size
+
+
 # -- pi wire compatibility --------------------------------------------------- #
 
 
@@ -12,7 +12,7 @@ from superqode.memory import (
 
 
 def test_local_agent_memory_remember_search_forget(tmp_path):
-    memory_path = tmp_path / "memory.json"
+    memory_path = tmp_path / "memory.sqlite3"
     provider = LocalAgentMemoryProvider(project_root=tmp_path, path=memory_path)
 
     record = provider.remember(
@@ -31,6 +31,63 @@ def test_local_agent_memory_remember_search_forget(tmp_path):
     assert provider.search("pnpm") == []
 
 
+def test_local_agent_memory_migrates_json_and_ranks_with_bm25(tmp_path):
+    legacy = tmp_path / "memory.json"
+    old = [
+        {
+            "id": "aaa111",
+            "content": "Deploy with make release",
+            "kind": "procedure",
+            "updated_at": "2020-01-01T00:00:00",
+        },
+        {
+            "id": "bbb222",
+            "content": "Release notes live in docs",
+            "tags": ["release"],
+            "updated_at": "2020-01-01T00:00:00",
+        },
+    ]
+    legacy.write_text(json.dumps({"version": 1, "records": old}), encoding="utf-8")
+
+    provider = LocalAgentMemoryProvider(project_root=tmp_path, path=legacy)
+    assert provider.path == tmp_path / "memory.sqlite3"
+    assert provider.status().record_count == 2
+    assert [r["id"] for r in provider.export()["records"]] == ["aaa111", "bbb222"]
+
+    # Both match "release"; the tag match ranks first
+    results = provider.search("release")
+    assert [r.record.id for r in results] == ["bbb222", "aaa111"]
+    assert [r.score for r in results] == [1.0, 1.0]
+
+    # Recency breaks an otherwise even match
+    fresh = provider.remember("Deploy with make release", kind="procedure")
+    assert provider.search("deploy make")[0].record.id == fresh.id
+
+    # Word prefixes match, and the score is the share of query words found
+    (result,) = provider.search("note changelog")
+    assert result.record.id == "bbb222" and result.score == 0.5
+    assert provider.search("rel")[0].score == 1.0
+
+    # The JSON file is only read when the database is created
+    legacy.write_text(json.dumps({"version": 1, "records": []}), encoding="utf-8")
+    provider = LocalAgentMemoryProvider(project_root=tmp_path, path=legacy)
+    assert provider.status().record_count == 3
+    assert provider.forget("aaa") is True and provider.status().record_count == 2
+
+
+def test_local_agent_memory_ranks_term_coverage_beyond_the_bm25_cut(tmp_path):
+    provider = LocalAgentMemoryProvider(project_root=tmp_path, path=tmp_path / "memory.sqlite3")
+    filler = " ".join(f"word{i}" for i in range(400))
+    target = provider.remember(f"deploy {filler} staging")
+    # More single-term matches than the BM25 candidate cut, each outscoring the target
+    for i in range(150):
+        provider.remember(f"deploy deploy {i}", tags=("deploy",))
+        provider.remember(f"staging staging {i}", tags=("staging",))
+
+    (best, *_) = provider.search("deploy staging", limit=3)
+    assert best.record.id == target.id and best.score == 1.0
+
+
 def test_specmem_provider_searches_agent_experience_pack(tmp_path):
     specmem = tmp_path / ".specmem"
     specmem.mkdir()
@@ -0,0 +1,192 @@
+"""Append-path behaviour of the agent JSONL ``SessionStore``."""
+
+import json
+
+import pytest
+
+from superqode.agent.session_manager import SessionManager, SessionMessage, SessionStore
+from superqode.session.switchboard import SessionGraphStore
+
+
+def _meta(store: SessionStore, session_id: str) -> dict:
+    return json.loads((store.base_dir / f"{session_id}.meta.json").read_text())
+
+
+def test_append_does_not_rewrite_metadata_or_graph(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"))
+    store.create_session("s1", provider="p", model="m")
+    meta_path = store.base_dir / "s1.meta.json"
+    graph = SessionGraphStore(store.base_dir)
+    meta_before = meta_path.stat().st_mtime_ns
+    graph_before = graph.graph_path.read_text()
+
+    for i in range(20):
+        store.append_message("s1", SessionMessage(role="user", content=f"m{i}"))
+
+    assert meta_path.stat().st_mtime_ns == meta_before
+    assert graph.graph_path.read_text() == graph_before
+    # Counters are derived from the transcript without a metadata rewrite.
+    assert store.get_metadata("s1").message_count == 20
+    assert store.list_sessions()[0].message_count == 20
+
+
+def test_flush_checkpoints_metadata_and_graph_preview(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"))
+    store.create_session("s1")
+    store.append_message("s1", SessionMessage(role="user", content="question"))
+    store.append_message("s1", SessionMessage(role="assistant", content="final answer"))
+
+    store.flush()
+
+    meta = _meta(store, "s1")
+    assert meta["message_count"] == 2
+    assert meta["log_bytes"] == store.get_session_size("s1")
+    record = SessionGraphStore(store.base_dir).get("s1")
+    assert record.last_result_preview == "final answer"
+
+
+def test_counts_resume_from_checkpoint_and_see_external_appends(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"))
+    store.create_session("s1")
+    store.append_message("s1", SessionMessage(role="user", content="a"))
+    store.flush()
+
+    other = SessionStore(str(tmp_path / "sessions"))
+    other.append_message("s1", SessionMessage(role="assistant", content="b"))
+
+    assert store.get_metadata("s1").message_count == 2
+    assert SessionStore(str(tmp_path / "sessions")).get_metadata("s1").message_count == 2
+
+
+def test_legacy_metadata_without_checkpoint_is_counted(tmp_path):
+    base = tmp_path / "sessions"
+    base.mkdir()
+    (base / "old.jsonl").write_text(
+        "".join(json.dumps({"role": "user", "content": str(i)}) + "\n" for i in range(3))
+    )
+    (base / "old.meta.json").write_text(
+        json.dumps(
+            {
+                "session_id": "old",
+                "created_at": "2024-01-01T00:00:00",
+                "updated_at": "2024-01-01T00:00:00",
+                "message_count": 3,
+            }
+        )
+    )
+
+    metadata = SessionStore(str(base)).get_metadata("old")
+
+    assert metadata.message_count == 3
+    assert metadata.updated_at > "2024-01-01T00:00:00"
+
+
+def test_buffered_policy_defers_writes_until_flush(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"), flush_policy="buffered", flush_every=100)
+    store.create_session("s1")
+    path = store.base_dir / "s1.jsonl"
+
+    store.append_message("s1", SessionMessage(role="user", content="hi"))
+    store.append_message("s1", SessionMessage(role="assistant", content="hello"))
+
+    assert not path.exists()
+    assert store.get_metadata("s1").message_count == 2
+    store.flush()
+    assert len(path.read_text().splitlines()) == 2
+
+
+def test_buffered_policy_flushes_before_reads_and_at_threshold(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"), flush_policy="buffered", flush_every=3)
+    store.create_session("s1")
+    path = store.base_dir / "s1.jsonl"
+
+    for i in range(3):
+        store.append_message("s1", SessionMessage(role="user", content=str(i)))
+    assert len(path.read_text().splitlines()) == 3
+
+    store.append_message("s1", SessionMessage(role="user", content="3"))
+    assert [m.content for m in store.get_messages("s1", limit=2)] == ["2", "3"]
+
+
+def test_buffered_rewind_and_fork_see_pending_messages(tmp_path):
+    manager = SessionManager(str(tmp_path / "sessions"), flush_policy="buffered")
+    manager.start_session("s1")
+    manager.add_user_message("q1")
+    manager.add_assistant_message("a1")
+    manager.add_user_message("q2")
+
+    fork_id = manager.fork_current_session("s1-fork")
+    assert manager.get_session_info(fork_id).message_count == 3
+    assert manager.rewind_to_user_message(2) == 1
+    assert manager.get_session_info(fork_id).message_count == 2
+
+
+def test_unknown_flush_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="flush policy"):
+        SessionStore(str(tmp_path), flush_policy="sometimes")
+
+
+def _fill(store: SessionStore, session_id: str, turns: int) -> None:
+    store.create_session(session_id)
+    for i in range(turns):
+        store.append_message(session_id, SessionMessage(role="user", content=f"q{i}"))
+        store.append_message(session_id, SessionMessage(role="assistant", content=f"a{i}"))
+
+
+def test_offset_index_serves_tail_and_random_access(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"))
+    _fill(store, "s1", 50)
+
+    assert (store.base_dir / "s1.idx").exists()
+    assert [m.content for m in store.get_messages("s1", limit=3)] == ["a48", "q49", "a49"]
+    assert store.get_message("s1", 0).content == "q0"
+    assert store.get_message("s1", 41).content == "a20"
+    assert store.get_message("s1", -1).content == "a49"
+    assert store.get_message("s1", 100) is None
+
+
+def test_offset_index_rewind_truncates_at_offset(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"))
+    _fill(store, "s1", 5)
+
+    assert store.truncate_to_user_message("s1", 3) == 6
+    assert [m.content for m in store.get_messages("s1")] == ["q0", "a0", "q1", "a1"]
+    assert store.get_metadata("s1").message_count == 4
+
+    store.append_message("s1", SessionMessage(role="user", content="again"))
+    assert store.truncate_to_user_message("s1", 3) == 1
+    assert store.get_message("s1", -1).content == "a1"
+
+
+def test_offset_index_catches_up_and_rebuilds(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"))
+    _fill(store, "s1", 2)
+    path = store.base_dir / "s1.jsonl"
+
+    # Lines written without the index (older versions, other writers).
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n" + json.dumps({"role": "user", "content": "external"}) + "\n")
+        f.write("not json\n")
+    assert [m.content for m in store.get_messages("s1", limit=2)] == ["a1", "external"]
+    assert store.truncate_to_user_message("s1", 3) == 2
+
+    # Replacing the transcript invalidates the index.
+    path.write_text(json.dumps({"role": "user", "content": "fresh"}) + "\n")
+    assert [m.content for m in SessionStore(str(store.base_dir)).get_messages("s1", limit=5)] == [
+        "fresh"
+    ]
+    assert store.get_message("s1", 0).content == "fresh"
+    (store.base_dir / "s1.idx").unlink()
+    assert store.get_message("s1", 0).content == "fresh"
+
+
+def test_delete_and_fork_handle_index(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"))
+    _fill(store, "s1", 2)
+
+    store.fork_session("s1", "s2")
+    assert (store.base_dir / "s2.idx").exists()
+    assert store.get_message("s2", -1).content == "a1"
+
+    store.delete_session("s1")
+    assert not (store.base_dir / "s1.idx").exists()
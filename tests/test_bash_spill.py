@@ -1,8 +1,10 @@
 """Tests for BashTool output spill (full output preserved on truncation)."""
 
+import os
+
 import pytest
 
-from superqode.tools import output_spill
+from superqode.tools import output_spill, shell_tools
 from superqode.tools.base import ToolContext
 from superqode.tools.shell_tools import BashTool
 
@@ -56,3 +58,48 @@ async def test_streaming_oversized_output_spills_and_completes(tmp_path):
     assert "20000" in full
     # Live stream stayed bounded near the cap.
     assert sum(len(c) for c in chunks) <= 2100
+
+
+@pytest.mark.asyncio
+async def test_buffered_runaway_output_stays_bounded_in_memory(tmp_path):
+    import tracemalloc
+
+    ctx = _ctx(tmp_path, max_output_bytes=4000)
+    command = "yes 'runaway line' | head -c 30000000; echo boom >&2"
+    tracemalloc.start()
+    try:
+        result = await BashTool().execute({"command": command}, ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert result.success
+    assert peak < 4 * 1024 * 1024
+    assert "of 30,000,015 bytes omitted" in result.output
+    assert result.output.startswith("runaway line\n")
+    assert "[stderr]\nboom" in result.output
+    assert "spill file keeps only the first part" in result.output
+    spilled = result.metadata["spilled_to"]
+    assert os.path.getsize(spilled) == output_spill.SPILL_HARD_CAP_BYTES
+
+
+@pytest.mark.asyncio
+async def test_buffered_large_stderr_follows_stdout_in_spill(tmp_path):
+    ctx = _ctx(tmp_path, max_output_bytes=2000)
+    result = await BashTool().execute({"command": "echo first; seq 1 20000 >&2"}, ctx)
+    full = open(result.metadata["spilled_to"]).read()
+    assert full.startswith("first\n\n[stderr]\n1\n2\n")
+    assert full.endswith("20000\n")
+    assert result.output.startswith("first\n\n[stderr]\n1\n")
+    assert result.output.endswith("20000\n")
+
+
+@pytest.mark.asyncio
+async def test_buffered_stdout_past_the_hard_cap_is_noted(tmp_path, monkeypatch):
+    monkeypatch.setattr(shell_tools, "SPILL_HARD_CAP_BYTES", 100_000)
+    ctx = _ctx(tmp_path, max_output_bytes=2000)
+    result = await BashTool().execute({"command": "head -c 300000 /dev/zero | tr '\\0' x"}, ctx)
+
+    assert "of 300,000 bytes omitted" in result.output
+    assert "spill file keeps only the first part" in result.output
+    assert os.path.getsize(result.metadata["spilled_to"]) == 100_000
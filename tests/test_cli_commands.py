@@ -2616,6 +2616,27 @@ class TestHeadlessCommand:
             assert payload[0]["harness_id"] == "workbench"
             assert payload[0]["message_count"] == 1
 
+    def test_sessions_search_json(self, runner, tmp_path):
+        """Message content should be searchable from the CLI."""
+        from superqode.agent.session_manager import SessionManager
+
+        with runner.isolated_filesystem(temp_dir=tmp_path):
+            manager = SessionManager(".superqode/sessions")
+            manager.start_session("abc123", provider="test", model="m")
+            manager.add_user_message("the flaky websocket reconnect test")
+            manager.start_session("def456", provider="test", model="m")
+            manager.add_user_message("unrelated question")
+
+            result = runner.invoke(cli_main, ["sessions", "search", "websocket", "--json"])
+            reindexed = runner.invoke(cli_main, ["sessions", "reindex"])
+
+            assert result.exit_code == 0
+            payload = json.loads(result.output)
+            assert [hit["session_id"] for hit in payload] == ["abc123"]
+            assert "[websocket]" in payload[0]["snippet"]
+            assert reindexed.exit_code == 0
+            assert "Reindexed 2 sessions" in reindexed.output
+
     def test_sessions_export_file(self, runner, tmp_path):
         """Stored sessions should export to files."""
         from superqode.agent.session_manager import SessionManager
@@ -10,7 +10,7 @@ import click
 from superqode.main import cli_main
 
 
-EXPECTED_COMMAND_COUNT = 268
+EXPECTED_COMMAND_COUNT = 270
 # Rebaselined for `superqode update` (261 -> 262: exactly one command added),
 # and again for the `copilot-cli` / `grok-cli` subscription runtimes, which
 # widen the --runtime choice list without adding a Click command. The same work
@@ -75,7 +75,11 @@ EXPECTED_COMMAND_COUNT = 268
 # list. No Click command was added, so the count is unchanged.
 # Rebaselined for `connect uhp --max-output-tokens`, one new option on an
 # existing command, so the count is again unchanged.
-EXPECTED_HELP_TREE_SHA256 = "62862d9771aa4089fbebd67339595830930bf86b636ab2b82bf02936147ff1c9"
+# Rebaselined for `sessions search` and `sessions reindex` (268 -> 270: two
+# commands added), which query and rebuild the FTS5 session catalog.
+# Rebaselined for `memory search --provider all` and its `--timeout` option,
+# which search every enabled memory provider at once. No Click command added.
+EXPECTED_HELP_TREE_SHA256 = "ad06185cac1acfed22cd602a3c348adf2f493a2d8ba0d887da39cefb2eb930e9"
 
 
 def _render_help_tree() -> tuple[int, str]:
@@ -0,0 +1,135 @@
+"""Budgeted diff engine and its use by the diff view and ``DiffTracker``."""
+
+import difflib
+import random
+
+from superqode.diff_engine import DiffBudget, diff_lines, diff_many, unified_diff
+from superqode.diff_view import compute_diff
+from superqode.workspace.diff_tracker import DiffTracker
+
+
+def _apply(a, b, opcodes):
+    out = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        out.extend(a[i1:i2] if tag == "equal" else b[j1:j2])
+    return out
+
+
+def _edited(rng, lines):
+    out = list(lines)
+    for _ in range(rng.randrange(8)):
+        i = rng.randrange(len(out) + 1)
+        roll = rng.random()
+        if roll < 0.4 or not out:
+            out.insert(i, rng.choice("abcxyz") + "\n")
+        elif roll < 0.8:
+            del out[min(i, len(out) - 1)]
+        else:
+            out[min(i, len(out) - 1)] = "changed\n"
+    return out
+
+
+def test_opcodes_are_a_valid_edit_script_no_larger_than_difflib():
+    rng = random.Random(11)
+    for _ in range(300):
+        a = [rng.choice("abcdefg") + "\n" for _ in range(rng.randrange(60))]
+        b = _edited(rng, a)
+        result = diff_lines(a, b)
+        assert _apply(a, b, result.opcodes) == b
+        matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+        difflib_edits = sum(
+            (i2 - i1) + (j2 - j1) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"
+        )
+        assert result.additions + result.deletions <= difflib_edits
+
+
+def test_unified_diff_matches_difflib_format():
+    a = [f"line {i}\n" for i in range(40)]
+    b = list(a)
+    b[5] = "changed\n"
+    del b[20]
+    b.append("tail\n")
+    ours = list(unified_diff(a, b, "a/x.py", "b/x.py"))
+    assert ours == list(difflib.unified_diff(a, b, "a/x.py", "b/x.py"))
+    assert list(unified_diff(a, a)) == []
+
+
+def test_budget_degrades_to_replaced_but_keeps_prefix_and_suffix():
+    a = ["head\n"] + [f"{i}\n" for i in range(100)] + ["tail\n"]
+    b = ["head\n"] + [f"{i}\n" for i in range(100, 0, -1)] + ["tail\n"]
+
+    too_big = diff_lines(a, b, DiffBudget(max_lines=50))
+    assert too_big.degraded and too_big.algorithm == "replaced"
+    assert too_big.opcodes[0] == ("equal", 0, 1, 0, 1)
+    assert too_big.opcodes[-1][0] == "equal"
+    assert _apply(a, b, too_big.opcodes) == b
+    assert "file replaced" in too_big.summary()
+
+    out_of_time = diff_lines(a, b, DiffBudget(max_seconds=0))
+    assert out_of_time.degraded and _apply(a, b, out_of_time.opcodes) == b
+
+    assert not diff_lines(a, b).degraded
+
+
+def test_diff_many_parallel_matches_sequential(monkeypatch):
+    import superqode.diff_engine as engine
+
+    monkeypatch.setattr(engine, "PARALLEL_MIN_LINES", 0)
+    rng = random.Random(5)
+    pairs = []
+    for _ in range(4):
+        a = [f"{rng.randrange(50)}\n" for _ in range(300)]
+        pairs.append((a, _edited(rng, a)))
+
+    sequential = diff_many(pairs)
+    parallel = diff_many(pairs, workers=2)
+    assert [r.opcodes for r in parallel] == [r.opcodes for r in sequential]
+
+
+def test_compute_diff_summarises_oversized_degraded_diff(monkeypatch):
+    import superqode.diff_view as diff_view
+
+    old = "".join(f"old {i}\n" for i in range(300))
+    new = "".join(f"new {i}\n" for i in range(300))
+    diff = compute_diff(old, new, "big.txt")
+    assert diff.summary is None and diff.additions == 300 and diff.deletions == 300
+
+    monkeypatch.setattr(diff_view, "DIFF_VIEW_BUDGET", DiffBudget(max_lines=100))
+    monkeypatch.setattr(diff_view, "MAX_RENDERED_DEGRADED_LINES", 100)
+    diff = compute_diff(old, new, "big.txt")
+    assert diff.hunks == []
+    assert (diff.additions, diff.deletions) == (300, 300)
+    assert diff.summary == "+300 -300 lines (file replaced: size budget)"
+
+
+def test_compute_diff_hunks_number_lines_like_unified_diff():
+    diff = compute_diff("a\nb\nc\n", "a\nB\nc\nd\n")
+    (hunk,) = diff.hunks
+    assert (hunk.old_start, hunk.old_count, hunk.new_start, hunk.new_count) == (1, 3, 1, 4)
+    assert [(ln.change_type, ln.line_no_old, ln.line_no_new, ln.content) for ln in hunk.lines] == [
+        (" ", 1, 1, "a"),
+        ("-", 2, None, "b"),
+        ("+", None, 2, "B"),
+        (" ", 3, 3, "c"),
+        ("+", None, 4, "d"),
+    ]
+
+
+def test_diff_tracker_parallel_patch_matches_sequential(tmp_path, monkeypatch):
+    import superqode.diff_engine as engine
+
+    monkeypatch.setattr(engine, "PARALLEL_MIN_LINES", 0)
+    tracker = DiffTracker(tmp_path)
+    for name in ("a.py", "b.py", "gone.py"):
+        path = tmp_path / name
+        path.write_text("".join(f"{name} {i}\n" for i in range(50)))
+        tracker.capture_baseline(path)
+    (tmp_path / "a.py").write_text("changed\n")
+    (tmp_path / "b.py").write_text("b.py 0\nb.py 1\n")
+    (tmp_path / "gone.py").unlink()
+    tracker.capture_baseline(tmp_path / "new.py")
+    (tmp_path / "new.py").write_text("new\n")
+
+    patch = tracker.get_unified_diff()
+    assert "@@ -1,50 +1,2 @@" in patch
+    assert tracker.get_unified_diff(workers=2) == patch
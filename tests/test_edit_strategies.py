@@ -0,0 +1,58 @@
+"""Tests for the fuzzy matching engine behind replace_with_strategies."""
+
+import random
+
+from superqode.agent.edit_strategies import (
+    _block_anchor_replacer,
+    _levenshtein,
+    replace_with_strategies,
+)
+
+
+def _reference_levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def test_levenshtein_matches_reference_and_respects_cutoff():
+    rng = random.Random(0)
+    for _ in range(2000):
+        a = "".join(rng.choice("ab c\t") for _ in range(rng.randint(0, 80)))
+        b = "".join(rng.choice("ab c\t") for _ in range(rng.randint(0, 80)))
+        expected = _reference_levenshtein(a, b)
+        assert _levenshtein(a, b) == expected
+        cap = rng.randint(0, 20)
+        assert _levenshtein(a, b, cap) == min(expected, cap + 1)
+
+
+def test_block_anchor_picks_most_similar_candidate_and_earliest_on_ties():
+    noise = "{\n    unrelated line here\n    something else\n}"
+    two = "{\n    alpha = 1\n    beta = 2\n}"
+    four = "{\n    alpha = 1\n    beta = 4\n}"
+    find = "{\n    alpha = 1\n    beta = 3\n}"
+
+    # Both are one edit away; the first in the file wins
+    assert list(_block_anchor_replacer("\n".join([noise, two, noise, four]), find)) == [two]
+    assert list(_block_anchor_replacer("\n".join([noise, four, noise, two]), find)) == [four]
+
+    content = "\n".join([noise, two, noise, two])
+    new, count = replace_with_strategies(content, find, "X", replace_all=True)
+    assert count == 2 and new == content.replace(two, "X")
+
+
+def test_near_miss_in_large_file_replaces_the_intended_block():
+    lines = []
+    for i in range(5000):
+        lines += [f"def f{i}():", f"    x = {i}", f"    y = x * {i % 7}", "    return y"]
+    content = "\n".join(lines)
+    find = "    return y\ndef f4321():\n    x = 4321\n    y = x * 99\n    return y"
+
+    new, count = replace_with_strategies(content, find, "REPLACED")
+    assert count == 1
+    assert "def f4321():" not in new
+    assert new.count("REPLACED") == 1 and "def f4320():" in new and "def f4322():" in new
@@ -0,0 +1,186 @@
+"""Batched object I/O in ``GitSnapshotManager``."""
+
+import json
+import os
+import subprocess
+
+import pytest
+
+from superqode.workspace.git_batch import GitCatFileBatch, GitHashBatch
+from superqode.workspace.git_snapshot import FileStatus, GitSnapshotManager
+
+
+def _git(root, *args):
+    return subprocess.run(["git", "-C", str(root), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "t@example.com")
+    _git(root, "config", "user.name", "t")
+    for i in range(40):
+        (root / "pkg").mkdir(exist_ok=True)
+        (root / "pkg" / f"m{i}.py").write_text(f"value = {i}\n")
+    (root / "ünïcode name.txt").write_text("quoted by plain ls-files\n")
+    (root / "crlf.txt").write_bytes(b"a\r\nb\r\n")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-qm", "init")
+    return root
+
+
+async def test_snapshot_hashes_match_git_and_restore_round_trips(repo):
+    manager = GitSnapshotManager(repo)
+    snapshot_id = await manager.create_snapshot("before")
+    snapshot = await manager.get_snapshot(snapshot_id)
+
+    assert len(snapshot.file_hashes) == 42
+    expected = _git(repo, "hash-object", "--no-filters", "crlf.txt").stdout.decode().strip()
+    assert snapshot.file_hashes["crlf.txt"] == expected
+    assert "ünïcode name.txt" in snapshot.file_hashes
+
+    (repo / "pkg" / "m3.py").write_text("changed\n")
+    (repo / "pkg" / "m4.py").unlink()
+    changes = {str(c.path): c.status for c in await manager.get_changes(snapshot_id)}
+    assert changes == {"pkg/m3.py": FileStatus.MODIFIED, "pkg/m4.py": FileStatus.DELETED}
+
+    result = await manager.restore_snapshot(snapshot_id)
+    assert result["errors"] == []
+    assert (repo / "pkg" / "m3.py").read_text() == "value = 3\n"
+    assert (repo / "pkg" / "m4.py").read_text() == "value = 4\n"
+    assert (repo / "crlf.txt").read_bytes() == b"a\r\nb\r\n"
+    assert await manager.get_file_at_snapshot(snapshot_id, "pkg/m5.py") == b"value = 5\n"
+    await manager.close()
+
+
+async def test_batches_reuse_one_process_and_survive_failures(repo):
+    hasher = GitHashBatch(repo)
+    first = await hasher.hash_paths(["pkg/m0.py", "pkg/m1.py"])
+    proc = hasher._proc
+    assert await hasher.hash_paths(["pkg/m0.py"]) == first[:1]
+    assert hasher._proc is proc
+
+    with pytest.raises(Exception):
+        await hasher.hash_paths(["does/not/exist"])
+    assert await hasher.hash_paths(["pkg/m1.py"]) == first[1:]
+    await hasher.close()
+
+    reader = GitCatFileBatch(repo)
+    objects = [(oid, data) async for oid, data in reader.iter_objects([first[0], "0" * 40])]
+    assert objects == [(first[0], b"value = 0\n"), ("0" * 40, None)]
+    assert await reader.read(first[1]) == b"value = 1\n"
+    await reader.close()
+
+
+async def test_restore_reports_missing_objects(repo):
+    manager = GitSnapshotManager(repo)
+    snapshot_id = await manager.create_snapshot("before", files=["pkg/m0.py"])
+    snapshot_file = manager._snapshots_dir / f"{snapshot_id}.json"
+    snapshot_file.write_text(
+        snapshot_file.read_text().replace(
+            (await manager.get_snapshot(snapshot_id)).file_hashes["pkg/m0.py"], "f" * 40
+        )
+    )
+
+    # A fresh manager, since the first one remembers the untampered snapshot.
+    fresh = GitSnapshotManager(repo)
+    result = await fresh.restore_snapshot(snapshot_id)
+    await fresh.close()
+
+    assert result["restored"] == []
+    assert result["errors"] == [f"pkg/m0.py: Object not found: {'f' * 40}"]
+    await manager.close()
+
+
+def _age(root, seconds=60):
+    """Backdate every file so the stat cache treats it as settled."""
+    for path in root.rglob("*"):
+        if path.is_file() and ".git" not in path.parts:
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+async def test_stat_cache_rehashes_only_changed_files(repo, monkeypatch):
+    _age(repo)
+    manager = GitSnapshotManager(repo)
+    await manager.create_snapshot("first")
+    assert len(manager._stat_cache) == 42
+
+    hashed = []
+    original = manager._hasher.hash_paths
+
+    async def spy(paths):
+        hashed.extend(paths)
+        return await original(paths)
+
+    monkeypatch.setattr(manager._hasher, "hash_paths", spy)
+    (repo / "pkg" / "m3.py").write_text("changed\n")
+    second = await manager.create_snapshot("second")
+
+    assert hashed == ["pkg/m3.py"]
+    expected = _git(repo, "hash-object", "pkg/m3.py").stdout.decode().strip()
+    assert (await manager.get_snapshot(second)).file_hashes["pkg/m3.py"] == expected
+    # A fresh manager reads the persisted cache; m3.py is too fresh to cache.
+    assert len(GitSnapshotManager(repo)._stat_cache) == 41
+    await manager.close()
+
+
+async def test_stat_cache_rehashes_blobs_pruned_by_gc(repo):
+    (repo / "scratch.txt").write_text("never committed\n")
+    _age(repo)
+    manager = GitSnapshotManager(repo)
+    first = await manager.create_snapshot("first", files=["scratch.txt"])
+    blob = (await manager.get_snapshot(first)).file_hashes["scratch.txt"]
+    # Nothing references the blob, so a prune may delete it.
+    (repo / ".git" / "objects" / blob[:2] / blob[2:]).unlink()
+
+    second = await manager.create_snapshot("second", files=["scratch.txt"])
+
+    assert (await manager.get_snapshot(second)).file_hashes["scratch.txt"] == blob
+    assert _git(repo, "cat-file", "-t", blob).stdout.decode().strip() == "blob"
+    (repo / "scratch.txt").write_text("edited\n")
+    assert (await manager.restore_snapshot(second))["errors"] == []
+    assert (repo / "scratch.txt").read_text() == "never committed\n"
+    await manager.close()
+
+
+async def test_stat_cache_does_not_trust_racily_clean_files(repo):
+    manager = GitSnapshotManager(repo)
+    path = repo / "pkg" / "m7.py"
+    snapshot_id = await manager.create_snapshot("fresh")
+    mtime = path.stat().st_mtime_ns
+    path.write_text("value = 8\n")  # same size, same tick
+    os.utime(path, ns=(mtime, mtime))
+
+    changes = await manager.get_changes(snapshot_id)
+
+    assert [(str(c.path), c.status) for c in changes] == [("pkg/m7.py", FileStatus.MODIFIED)]
+    await manager.close()
+
+
+async def test_snapshots_are_stored_as_deltas_and_survive_base_deletion(repo):
+    manager = GitSnapshotManager(repo)
+    first = await manager.create_snapshot("first")
+    (repo / "pkg" / "m3.py").write_text("changed\n")
+    (repo / "pkg" / "m4.py").unlink()
+    (repo / "new.py").write_text("new\n")
+    _git(repo, "add", "new.py")
+    second = await manager.create_snapshot("second")
+
+    stored = json.loads((manager._snapshots_dir / f"{second}.json").read_text())
+    assert "file_hashes" not in stored
+    assert stored["base_id"] == first
+    assert set(stored["changes"]) == {"pkg/m3.py", "pkg/m4.py", "new.py"}
+    assert stored["changes"]["pkg/m4.py"] is None
+
+    full = (await manager.get_snapshot(second)).file_hashes
+    assert len(full) == 42 and "pkg/m4.py" not in full and "new.py" in full
+    assert [s.id for s in await GitSnapshotManager(repo).list_snapshots()] == [second, first]
+
+    assert await manager.delete_snapshot(first)
+    reloaded = GitSnapshotManager(repo)
+    assert (await reloaded.get_snapshot(second)).file_hashes == full
+    assert "file_hashes" in json.loads((manager._snapshots_dir / f"{second}.json").read_text())
+    await manager.close()
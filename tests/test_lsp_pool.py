@@ -0,0 +1,153 @@
+"""Shared language-server pool: leases, idle eviction, caps and restarts."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from superqode.lsp import LSPClient, LSPConfig, LSPServerPool
+
+FAKE = [sys.executable, str(Path(__file__).parent / "fixtures" / "fake_lsp_server.py")]
+
+
+def _config(command=FAKE):
+    return LSPConfig(servers={"python": list(command), "go": list(command) + ["--go"]})
+
+
+@pytest.fixture
+async def pool():
+    pool = LSPServerPool(max_servers=4, idle_seconds=60)
+    yield pool
+    await pool.aclose()
+
+
+async def test_clients_share_one_server_and_its_documents(tmp_path, pool):
+    (tmp_path / "main.py").write_text("ok = 1\nERROR\n")
+    first = LSPClient(tmp_path, _config(), pool=pool)
+    second = LSPClient(tmp_path, _config(), pool=pool)
+
+    (diagnostic,) = await first.wait_for_diagnostics("main.py", timeout=5)
+    # The second client's lease reuses the process and answers from its cache
+    assert await second.wait_for_diagnostics("main.py", timeout=0.01) == [diagnostic]
+    assert first._processes["python"].pid == second._processes["python"].pid
+    stats = pool.stats()
+    assert (stats["started"], stats["reused"], stats["servers"][0]["refs"]) == (1, 1, 2)
+
+    await first.shutdown()
+    server = second._servers["python"]
+    assert server.alive and len(server.documents) == 1  # Still open for the second client
+    await second.shutdown()
+    assert server.alive and server.documents == {}  # Idle and warm
+    assert pool.stats()["servers"][0]["refs"] == 0
+
+    third = LSPClient(tmp_path, _config(), pool=pool)
+    assert await third.start_server("python")
+    assert third._servers["python"] is server
+    await third.shutdown()
+
+    pool.idle_seconds = 0
+    assert await pool.evict_idle() == 1
+    assert not server.alive and pool.stats()["servers"] == []
+
+
+async def test_idle_servers_are_reaped_after_the_timeout(tmp_path, pool):
+    pool.idle_seconds = 0.05
+    client = LSPClient(tmp_path, _config(), pool=pool)
+    assert await client.start_server("python")
+    server = client._servers["python"]
+    await client.shutdown()
+
+    for _ in range(100):
+        if not pool.stats()["servers"]:
+            break
+        await asyncio.sleep(0.02)
+    assert pool.evicted_idle == 1 and not server.alive
+
+
+async def test_capacity_evicts_idle_servers_then_hands_out_private_ones(tmp_path, pool):
+    pool.max_servers = 1
+    python = LSPClient(tmp_path, _config(), pool=pool)
+    assert await python.start_server("python")
+    idle = python._servers["python"]
+    await python.shutdown()
+
+    go = LSPClient(tmp_path, _config(), pool=pool)
+    assert await go.start_server("go")  # Evicts the idle python server
+    assert not idle.alive and pool.evicted_capacity == 1
+
+    python = LSPClient(tmp_path, _config(), pool=pool)
+    assert await python.start_server("python")  # Pool full and leased: private server
+    private = python._servers["python"]
+    assert pool.unpooled == 1 and [s["language"] for s in pool.stats()["servers"]] == ["go"]
+    await python.shutdown()
+    assert not private.alive
+    await go.shutdown()
+
+
+async def test_memory_cap_stops_idle_servers(tmp_path, pool):
+    client = LSPClient(tmp_path, _config(), pool=pool)
+    assert await client.start_server("python")
+    idle = client._servers["python"]
+    await client.shutdown()
+
+    pool.max_memory_mb = 0.001
+    other = LSPClient(tmp_path, _config(), pool=pool)
+    assert await other.start_server("go")
+    assert not idle.alive and pool.evicted_memory == 1
+    assert other._servers["go"].alive  # Leased servers are never evicted
+    await other.shutdown()
+
+
+async def test_crashed_server_is_restarted_with_its_documents(tmp_path, pool):
+    (tmp_path / "main.py").write_text("ERROR\n")
+    client = LSPClient(tmp_path, _config(), pool=pool)
+    await client.wait_for_diagnostics("main.py", timeout=5)
+    server = client._servers["python"]
+    old_pid = server.pid
+
+    server.process.kill()
+    await server.process.wait()
+    for _ in range(100):
+        if not server.alive:
+            break
+        await asyncio.sleep(0.01)
+
+    assert await client.start_server("python")
+    assert server.pid != old_pid and server.restarts == 1
+    assert await client._send_request("python", "test/echo", "back") == "back"
+    assert list(server.documents) == [str(tmp_path / "main.py")]
+
+    (tmp_path / "main.py").write_text("fine\nERROR\n")
+    (diagnostic,) = await client.wait_for_diagnostics("main.py", timeout=5)
+    assert diagnostic.range.start.line == 1
+
+    stats = pool.stats()
+    assert stats["restarted"] == 1
+    assert any("restarts 1" in line for line in pool.report())
+    await client.shutdown()
+
+
+async def test_diagnostics_tool_releases_its_lease_when_the_request_fails(
+    tmp_path, pool, monkeypatch
+):
+    from superqode.lsp import client as lsp_client
+    from superqode.lsp import pool as lsp_pool
+    from superqode.tools.base import ToolContext
+    from superqode.tools.diagnostics import DiagnosticsTool
+
+    leased = []
+
+    async def fail(self, *args, **kwargs):
+        leased.append(pool.stats()["servers"][0]["refs"])
+        raise RuntimeError("server went away")
+
+    monkeypatch.setattr(lsp_pool, "get_lsp_pool", lambda: pool)
+    monkeypatch.setattr(lsp_client, "LSPConfig", _config)
+    monkeypatch.setattr(LSPClient, "wait_for_diagnostics", fail)
+    (tmp_path / "main.py").write_text("ok = 1\n")
+
+    ctx = ToolContext(session_id="t", working_directory=tmp_path)
+    assert await DiagnosticsTool()._try_lsp_diagnostics(tmp_path / "main.py", ctx) is None
+    assert leased == [1]
+    assert pool.stats()["servers"][0]["refs"] == 0
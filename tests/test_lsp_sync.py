@@ -0,0 +1,103 @@
+"""Incremental document sync and the diagnostics cache in ``LSPClient``."""
+
+import random
+
+from fixtures.fake_lsp_server import (
+    TEXT_DOCUMENT_SYNC_FULL,
+    TEXT_DOCUMENT_SYNC_INCREMENTAL,
+    FakeLanguageServer,
+    apply_change,
+    connect_in_process,
+)
+from superqode.lsp import LSPClient, LSPConfig
+from superqode.lsp.client import incremental_change
+
+
+def test_incremental_change_round_trips_through_the_server_side_apply():
+    rng = random.Random(7)
+    alphabet = ["a", "b", " ", "\n", "\r\n", "é", "😀", "ERROR"]
+    for _ in range(500):
+        old = "".join(rng.choice(alphabet) for _ in range(rng.randrange(0, 30)))
+        new = list(old)
+        for _ in range(rng.randrange(1, 4)):
+            at = rng.randrange(0, len(new) + 1)
+            new[at : at + rng.randrange(0, 3)] = rng.choice(alphabet)
+        new = "".join(new)
+
+        change = incremental_change(old, new)
+        if old == new:
+            assert change is None
+            continue
+        assert apply_change(old, change) == new, (old, new, change)
+
+    change = incremental_change(
+        "x = 1\n" * 10_000, "x = 1\n" * 5_000 + "y = 2\n" + "x = 1\n" * 4_999
+    )
+    assert change["range"]["start"]["line"] == 5_000 and change["text"] == "y = 2"
+
+
+async def _client(tmp_path, sync_kind):
+    server = FakeLanguageServer(sync_kind=sync_kind)
+    client = LSPClient(tmp_path, LSPConfig(timeout=5.0))
+    reader, writer, _task = await connect_in_process(server)
+    await client.attach_server("python", reader, writer)
+    return client, server
+
+
+def _changes(server):
+    return [params for method, params in server.notifications if method == "textDocument/didChange"]
+
+
+async def test_update_file_sends_ranged_changes_with_versions(tmp_path):
+    (tmp_path / "main.py").write_text("a = 1\nb = 2\nc = 3\n")
+    client, server = await _client(tmp_path, TEXT_DOCUMENT_SYNC_INCREMENTAL)
+    uri = f"file://{tmp_path / 'main.py'}"
+
+    await client.open_file("main.py")
+    await client.update_file("main.py", "a = 1\nb = 20\nc = 3\n")
+    await client.update_file("main.py", "a = 1\nb = 20\nc = 3\n")  # Unchanged: not sent
+    await client.update_file("main.py", "a = 1\nb = 20\n")
+    await client._send_request("python", "test/echo", None)  # Server has caught up
+
+    first, second = _changes(server)
+    assert first["textDocument"]["version"] == 2 and second["textDocument"]["version"] == 3
+    assert first["contentChanges"] == [
+        {
+            "range": {"start": {"line": 1, "character": 5}, "end": {"line": 1, "character": 5}},
+            "text": "0",
+        }
+    ]
+    assert server.documents[uri] == "a = 1\nb = 20\n" and server.versions[uri] == 3
+    await client.shutdown()
+
+    # A full-sync server still gets whole documents
+    client, server = await _client(tmp_path, TEXT_DOCUMENT_SYNC_FULL)
+    await client.open_file("main.py")
+    await client.update_file("main.py", "z = 0\n")
+    await client._send_request("python", "test/echo", None)
+    assert _changes(server)[0]["contentChanges"] == [{"text": "z = 0\n"}]
+    await client.shutdown()
+
+
+async def test_diagnostics_are_cached_per_version_and_content(tmp_path):
+    path = tmp_path / "main.py"
+    path.write_text("ok = 1\nERROR\n")
+    client, server = await _client(tmp_path, TEXT_DOCUMENT_SYNC_INCREMENTAL)
+
+    (diagnostic,) = await client.wait_for_diagnostics("main.py", timeout=5)
+    assert diagnostic.range.start.line == 1
+    sent = len(server.notifications)
+
+    # Unchanged on disk: answered from the cache, nothing sent to the server
+    assert await client.wait_for_diagnostics("main.py", timeout=0.01) == [diagnostic]
+    assert len(server.notifications) == sent
+
+    # Changed: waits for the publish for the new version
+    path.write_text("ok = 1\nfine\nERROR\n")
+    (diagnostic,) = await client.wait_for_diagnostics("main.py", timeout=5)
+    assert diagnostic.range.start.line == 2
+    assert client.cached_diagnostics("main.py") == [diagnostic]
+
+    await client.update_file("main.py", "ok = 2\n")
+    assert await client.wait_for_diagnostics("main.py", "ok = 2\n", timeout=5) == []
+    await client.shutdown()
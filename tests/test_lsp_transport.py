@@ -0,0 +1,97 @@
+"""asyncio LSP transport and ``LSPClient`` against the fake language server."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from fixtures.fake_lsp_server import FakeLanguageServer, connect_in_process
+from superqode.lsp import LSPClient, LSPConfig, LSPConnectionClosed, LSPTimeoutError
+from superqode.lsp.transport import LSPConnection
+
+FAKE_SERVER = Path(__file__).parent / "fixtures" / "fake_lsp_server.py"
+
+
+async def _connect(server, **kwargs):
+    reader, writer, task = await connect_in_process(server)
+    return LSPConnection(reader, writer, name="fake", **kwargs).start(), task
+
+
+async def test_pipelined_requests_resolve_on_the_loop():
+    server = FakeLanguageServer()
+    connection, _task = await _connect(server)
+
+    calls = [connection.request("test/echo", {"n": i, "text": "héllo 😀"}) for i in range(200)]
+    results = await asyncio.gather(*calls)
+    assert [r["n"] for r in results] == list(range(200))
+    assert results[0]["text"] == "héllo 😀"  # Content-Length counts UTF-8 bytes
+    assert connection.requests_sent == 200 and connection.in_flight == 0
+    await connection.close()
+
+
+async def test_timeout_cancels_the_request_on_the_server():
+    server = FakeLanguageServer()
+    connection, _task = await _connect(server)
+
+    with pytest.raises(LSPTimeoutError, match="test/sleep"):
+        await connection.request("test/sleep", {"seconds": 30}, timeout=0.1)
+    assert await connection.request("test/echo", "still usable") == "still usable"
+    assert server.cancelled == [1] and connection.requests_cancelled == 1
+
+    # A cancelled caller withdraws its request too
+    waiter = asyncio.ensure_future(connection.request("test/sleep", {"seconds": 30}))
+    await asyncio.sleep(0.05)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await connection.request("test/echo", None)
+    assert server.cancelled == [1, 3]
+    await connection.close()
+
+
+async def test_server_requests_are_answered_and_closing_fails_pending():
+    server = FakeLanguageServer(ask_configuration=True)
+    connection, task = await _connect(server)
+    await connection.request("initialize", {})
+    await connection.notify("initialized", {})
+    for _ in range(100):  # Answered from a task of its own
+        if server.configuration is not None:
+            break
+        await asyncio.sleep(0.01)
+    assert server.configuration == [None]
+
+    pending = asyncio.ensure_future(connection.request("test/sleep", {"seconds": 30}))
+    await asyncio.sleep(0.05)
+    await connection.notify("exit")
+    with pytest.raises(LSPConnectionClosed):
+        await pending
+    await task
+    with pytest.raises(LSPConnectionClosed):
+        await connection.request("test/echo", None)
+
+
+async def test_client_runs_a_subprocess_server(tmp_path):
+    (tmp_path / "main.py").write_text("ok = 1\nERROR here\n")
+    config = LSPConfig(servers={"python": [sys.executable, str(FAKE_SERVER)]})
+    client = LSPClient(tmp_path, config)
+    received = asyncio.Event()
+    client.on_diagnostics(lambda path, diagnostics: received.set())
+
+    assert await client.start_server("python")
+    process = client._processes["python"]
+    await client.open_file("main.py")
+    await asyncio.wait_for(received.wait(), 5)
+    (diagnostic,) = await client.get_diagnostics("main.py")
+    assert diagnostic.range.start.line == 1 and diagnostic.source == "fake"
+    assert await client._send_request("python", "test/echo", [1]) == [1]
+
+    await client.shutdown()
+    assert process.returncode is not None and client._connections == {}
+
+
+async def test_missing_server_binary_does_not_start(tmp_path):
+    client = LSPClient(tmp_path, LSPConfig(servers={"python": ["superqode-no-such-server"]}))
+    assert await client.start_server("python") is False
+    with pytest.raises(Exception, match="not running"):
+        await client._send_request("python", "test/echo", None)
@@ -0,0 +1,107 @@
+"""Concurrent MCP startup, call timeouts and per-server call limits."""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from superqode.mcp import MCPClientManager, MCPConnectionState, MCPServerConfig, MCPStdioConfig
+from superqode.mcp.config import load_mcp_config, save_mcp_config
+
+FAKE_SERVER = Path(__file__).parent / "fixtures" / "fake_mcp_server.py"
+
+
+def _server(server_id, *args, **options):
+    return MCPServerConfig(
+        id=server_id,
+        name=server_id,
+        config=MCPStdioConfig(command=sys.executable, args=[str(FAKE_SERVER), *args]),
+        **options,
+    )
+
+
+async def test_connect_all_does_not_wait_for_slow_servers(tmp_path):
+    go = tmp_path / "go"
+    async with MCPClientManager() as manager:
+        manager.add_server(_server("fast", startup_timeout=30))
+        manager.add_server(_server("slow", "--start-when", str(go), startup_timeout=0.2))
+        tools_changed = []
+        manager.on_tools_changed(tools_changed.append)
+
+        assert await manager.connect_all() == {"fast": True, "slow": False}
+        # Returned while the slow server cannot have answered yet
+        assert manager.get_connection_state("slow") == MCPConnectionState.CONNECTING
+
+        # A call to the slow server waits for its background connect
+        go.touch()
+        result = await manager.execute_tool("slow", "echo", {"text": "late"}, timeout=30)
+        assert not result.is_error and result.content == [{"type": "text", "text": "late"}]
+        assert tools_changed == ["slow"]
+        assert {tool.server_id for tool in manager.list_all_tools()} == {"fast", "slow"}
+
+
+async def test_call_timeout_cancels_the_request_on_the_server(tmp_path):
+    marker = tmp_path / "cancelled"
+    async with MCPClientManager() as manager:
+        manager.add_server(_server("fake", "--cancel-marker", str(marker), call_timeout=0.5))
+        assert await manager.connect("fake")
+
+        start = time.perf_counter()
+        result = await manager.execute_tool("fake", "sleep", {"seconds": 30})
+        assert time.perf_counter() - start < 5
+        assert result.is_error and "timed out after 0.5s" in result.error_message
+
+        for _ in range(100):
+            if marker.exists():
+                break
+            await asyncio.sleep(0.05)
+        assert marker.read_text() == "cancelled"
+
+        # The session survives the cancelled call
+        result = await manager.execute_tool("fake", "echo", {"text": "still here"}, timeout=10)
+        assert result.content == [{"type": "text", "text": "still here"}]
+
+
+async def test_concurrent_calls_are_limited_per_server():
+    async with MCPClientManager() as manager:
+        manager.add_server(_server("fake", max_concurrent_calls=2))
+        assert await manager.connect("fake")
+
+        results = await asyncio.gather(
+            *(manager.execute_tool("fake", "sleep", {"seconds": 0.1}) for _ in range(6))
+        )
+        assert not any(result.is_error for result in results)
+        peak = await manager.execute_tool("fake", "peak_calls", {})
+        assert peak.content == [{"type": "text", "text": "2"}]
+
+
+def test_timeouts_and_limits_round_trip_through_the_config_file(tmp_path):
+    path = tmp_path / "mcp.json"
+    save_mcp_config(
+        {"fake": _server("fake", startup_timeout=5, call_timeout=60, max_concurrent_calls=1)},
+        path,
+    )
+    saved = json.loads(path.read_text())["mcpServers"]["fake"]
+    assert saved["startupTimeout"] == 5 and saved["callTimeout"] == 60
+    assert saved["maxConcurrentCalls"] == 1
+
+    loaded = load_mcp_config(path)["fake"]
+    assert (loaded.startup_timeout, loaded.call_timeout, loaded.max_concurrent_calls) == (5, 60, 1)
+
+
+def test_config_numbers_are_coerced_and_validated(tmp_path):
+    path = tmp_path / "mcp.json"
+    servers = {
+        "strings": {"command": "x", "callTimeout": "90", "maxConcurrentCalls": "2"},
+        "defaults": {"command": "x"},
+        "bad": {"command": "x", "callTimeout": "soon"},
+        "zero": {"command": "x", "maxConcurrentCalls": 0},
+    }
+    path.write_text(json.dumps({"mcpServers": servers}))
+
+    loaded = load_mcp_config(path)
+    assert set(loaded) == {"strings", "defaults"}
+    assert (loaded["strings"].call_timeout, loaded["strings"].max_concurrent_calls) == (90.0, 2)
+    # No call timeout unless one is configured
+    assert loaded["defaults"].call_timeout is None
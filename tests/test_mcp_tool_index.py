@@ -0,0 +1,96 @@
+"""MCP tool index, incremental BM25 search and the read-only result cache."""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+from superqode.mcp import MCPClientManager, MCPServerConfig, MCPStdioConfig
+from superqode.mcp.search import BM25Search, MCPToolMatch
+
+FAKE_SERVER = Path(__file__).parent / "fixtures" / "fake_mcp_server.py"
+
+
+def _server(server_id, **options):
+    return MCPServerConfig(
+        id=server_id,
+        name=server_id,
+        config=MCPStdioConfig(command=sys.executable, args=[str(FAKE_SERVER)]),
+        **options,
+    )
+
+
+def test_incremental_index_ranks_like_a_fresh_one():
+    rng = random.Random(3)
+    words = ["read", "write", "file", "search", "web", "issue", "query", "list", "git"]
+
+    def tool(server, n):
+        description = " ".join(rng.choice(words) for _ in range(rng.randrange(1, 8)))
+        return MCPToolMatch(server, f"mcp_{server}_t{n}", description, {}, f"t{n}")
+
+    index = BM25Search()
+    live = {}
+    for step in range(300):
+        server = rng.choice(["a", "b", "c"])
+        if rng.random() < 0.3 and live:
+            key = rng.choice(sorted(live))
+            assert index.remove(*key)
+            del live[key]
+        elif rng.random() < 0.05:
+            index.remove_server(server)
+            live = {key: t for key, t in live.items() if key[0] != server}
+        else:
+            added = tool(server, rng.randrange(20))
+            index.add(added)
+            live[(added.server, added.name)] = added
+
+        query = " ".join(rng.sample(words, 2))
+        fresh = BM25Search.search(list(live.values()), query, limit=50)
+        got = index.query(query, limit=50)
+        assert [(t.server, t.name) for t in got] == [(t.server, t.name) for t in fresh]
+        assert [round(t.score, 9) for t in got] == [round(t.score, 9) for t in fresh]
+    assert len(index) == len(live)
+
+
+async def test_tool_index_follows_list_changed_notifications():
+    async with MCPClientManager() as manager:
+        manager.add_server(_server("fake"))
+        assert await manager.connect("fake")
+        changed = asyncio.Event()
+        manager.on_tools_changed(lambda server_id: changed.set())
+
+        assert manager.find_tool("echo")[0] == "fake"
+        assert manager.get_tool("fake", "weather_report") is None
+        assert not manager.search_tools("weather report")
+
+        await manager.execute_tool("fake", "add_tool", {"name": "weather_report"})
+        await asyncio.wait_for(changed.wait(), 10)
+        assert manager.get_tool("fake", "weather_report").description.startswith("Added")
+        (match,) = manager.search_tools("weather report")
+        assert (match.server, match.original_name) == ("fake", "weather_report")
+
+        await manager.disconnect("fake")
+        assert manager.find_tool("echo") is None and not manager.search_tools("echo")
+
+
+async def test_read_only_results_are_cached_when_enabled():
+    async with MCPClientManager() as manager:
+        manager.add_server(_server("cached", result_cache_ttl=60, result_cache_size=1))
+        manager.add_server(_server("uncached"))
+        assert await manager.connect_all() == {"cached": True, "uncached": True}
+
+        async def text(server_id, tool, **arguments):
+            result = await manager.execute_tool(server_id, tool, arguments)
+            return result.content[0]["text"]
+
+        assert await text("cached", "count_calls", label="a") == "a 1"
+        assert await text("cached", "count_calls", label="a") == "a 1"  # Hit
+        assert await text("cached", "count_calls", label="b") == "b 2"  # Evicts "a"
+        assert await text("cached", "count_calls", label="a") == "a 3"
+        assert await text("cached", "echo", text="x") == "x"  # Not annotated read-only
+        assert await text("uncached", "count_calls", label="a") == "a 1"
+        assert await text("uncached", "count_calls", label="a") == "a 2"
+
+        stats = manager.get_status_summary()["result_cache"]
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 1)
+        assert stats["servers"]["cached"]["evicted"] == 2
@@ -0,0 +1,110 @@
+"""Concurrent search across several memory providers."""
+
+import json
+import threading
+import time
+
+from click.testing import CliRunner
+
+from superqode.commands.memory import memory
+from superqode.memory import (
+    MemoryProviderConfig,
+    MemoryRecord,
+    MemorySearchResult,
+    enabled_memory_providers,
+    federated_search,
+)
+
+
+class StubProvider:
+    def __init__(self, name, scored, *, delay=0.0, error=None, config=None):
+        self.name = name
+        self.scored = scored
+        self.delay = delay
+        self.error = error
+        self.config = config
+        self.calls = []
+
+    def search(self, query, *, limit=8):
+        self.calls.append((query, limit, threading.current_thread().name))
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [
+            MemorySearchResult(
+                record=MemoryRecord(id=f"{self.name}-{n}", content=content),
+                score=score,
+                provider=self.name,
+            )
+            for n, (content, score) in enumerate(self.scored)
+        ]
+
+
+def test_federated_search_runs_providers_concurrently_with_deadlines():
+    local = StubProvider("local", [("Use pnpm", 0.5), ("Run make lint", 0.25)], delay=0.3)
+    hosted = StubProvider("mem0", [("use  PNPM", 0.9), ("Deploy on Fridays", 0.3)], delay=0.3)
+    stuck = StubProvider("cognee", [("never seen", 1.0)], delay=5)
+    broken = StubProvider("supermemory", [], error=RuntimeError("missing API key"))
+    configured = StubProvider(
+        "specmem",
+        [("late spec", 1.0)],
+        delay=0.6,
+        config=MemoryProviderConfig(name="specmem", settings={"search_timeout": 0.4}),
+    )
+
+    start = time.perf_counter()
+    found = federated_search(
+        [local, hosted, stuck, broken, configured],
+        "pnpm",
+        limit=3,
+        timeout=1.0,
+        timeouts={"cognee": 0.2},
+    )
+    assert time.perf_counter() - start < 1.5  # Not 0.3 + 0.3 + 5 + 0.6 sequentially
+    assert {call[2] for p in (local, hosted) for call in p.calls} == {
+        "memory-search-local",
+        "memory-search-mem0",
+    }
+
+    reports = {report.provider: report for report in found.providers}
+    assert [report.provider for report in found.providers] == [
+        "local",
+        "mem0",
+        "cognee",
+        "supermemory",
+        "specmem",
+    ]
+    assert reports["local"].status == "ok" and reports["local"].result_count == 2
+    assert reports["local"].elapsed_ms >= 300
+    assert reports["cognee"].status == "timeout" and reports["cognee"].elapsed_ms == 200
+    assert reports["specmem"].status == "timeout"
+    assert reports["supermemory"].status == "error"
+    assert reports["supermemory"].error == "missing API key"
+
+    # Scores are scaled per provider, and the duplicate is kept once
+    assert [(r.provider, r.record.content, r.score) for r in found.results] == [
+        ("local", "Use pnpm", 1.0),
+        ("local", "Run make lint", 0.5),
+        ("mem0", "Deploy on Fridays", 0.3 / 0.9),
+    ]
+    assert found.results[0].record.metadata == {"also_in": ["mem0"]}
+    json.dumps(found.to_dict())
+
+
+def test_memory_search_all_reports_each_enabled_provider(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    project = tmp_path / "project"
+    (project / ".specmem").mkdir(parents=True)
+    (project / ".specmem" / "agent_context.md").write_text("Checkout needs pnpm", encoding="utf-8")
+    (project / "superqode.yaml").write_text("memory:\n  specmem_enabled: true\n", encoding="utf-8")
+    monkeypatch.chdir(project)
+
+    assert [p.name for p in enabled_memory_providers(project)] == ["local", "specmem"]
+    enabled_memory_providers(project)[0].remember("Use pnpm in this repo")
+
+    result = CliRunner().invoke(memory, ["search", "pnpm", "--provider", "all", "--json"])
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)
+    assert [report["provider"] for report in payload["providers"]] == ["local", "specmem"]
+    assert {report["status"] for report in payload["providers"]} == {"ok"}
+    assert {item["provider"] for item in payload["results"]} == {"local", "specmem"}
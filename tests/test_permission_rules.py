@@ -0,0 +1,98 @@
+"""Compiled rule matching in superqode.permissions.PermissionManager."""
+
+import random
+from datetime import datetime, timedelta
+
+from superqode.permissions import (
+    PermissionAction,
+    PermissionDecision,
+    PermissionManager,
+    PermissionRequest,
+    PermissionRule,
+    PermissionScope,
+)
+
+SEGMENTS = ["src", "tests", ".git", "node_modules", "a.py", "b.js", ".env", "x[1]", "key.pem"]
+PATTERN_PARTS = ["src", "**", "*", "*.py", "?.js", ".env*", "[ab]*", "[!x]*", "x[1]", "key.pem"]
+SCOPES = [PermissionScope.FILE_READ, PermissionScope.FILE_WRITE, PermissionScope.SHELL_EXECUTE]
+
+
+def _reference(manager, request):
+    """The sequential walk check_permission used before rules were compiled."""
+    for source, rules in (("session_rule", manager._session_rules), ("rule", manager._rules)):
+        for rule in rules:
+            if rule.matches(request.path, request.scope):
+                return PermissionDecision(
+                    request_id=request.id,
+                    action=rule.action,
+                    decided_by=f"{source}:{rule.pattern}",
+                    rule_pattern=rule.pattern,
+                )
+    return PermissionDecision(
+        request_id=request.id, action=PermissionAction.ASK, decided_by="default"
+    )
+
+
+def _same(a, b):
+    return (a.action, a.decided_by, a.rule_pattern) == (b.action, b.decided_by, b.rule_pattern)
+
+
+def _path(rng):
+    return "/".join(rng.choice(SEGMENTS) for _ in range(rng.randint(1, 4)))
+
+
+def _rule(rng):
+    if rng.random() < 0.3:
+        pattern = _path(rng)  # exact path
+    else:
+        pattern = "/".join(rng.choice(PATTERN_PARTS) for _ in range(rng.randint(1, 3)))
+    expires_at = None
+    if rng.random() < 0.1:
+        expires_at = datetime.now() + timedelta(days=rng.choice([-1, 1]))
+    return PermissionRule(
+        pattern=pattern,
+        scope=rng.choice(SCOPES),
+        action=rng.choice(list(PermissionAction)),
+        priority=rng.choice([-100, 0, 0, 100, 200]),
+        expires_at=expires_at,
+    )
+
+
+def test_compiled_rules_decide_like_the_sequential_walk():
+    rng = random.Random(0)
+    for _ in range(200):
+        manager = PermissionManager(include_defaults=rng.random() < 0.5)
+        for _ in range(rng.randint(0, 40)):
+            manager.add_rule(_rule(rng), session_only=rng.random() < 0.3)
+        for n in range(60):
+            if n == 30 and manager.get_rules():
+                victim = rng.choice(manager.get_rules())
+                assert manager.remove_rule(victim.pattern, victim.scope)
+            request = PermissionRequest(id=f"req-{n}", scope=rng.choice(SCOPES), path=_path(rng))
+            for _ in range(2):  # The second check is served from the decision cache
+                decision = manager.check_permission(request)
+                assert _same(decision, _reference(manager, request)), (request, manager.get_rules())
+                assert decision.request_id == request.id
+
+
+def test_cached_decisions_follow_rule_changes_and_expiry():
+    manager = PermissionManager(include_defaults=False)
+    read = PermissionScope.FILE_READ
+    request = PermissionRequest(id="req-1", scope=read, path="src/app.py")
+
+    assert manager.check_permission(request).decided_by == "default"
+    manager.add_rule(PermissionRule("src/**", read, PermissionAction.ALLOW))
+    assert manager.check_permission(request).decided_by == "rule:src/**"
+
+    manager.allow_all("src/app.py", read)
+    assert manager.check_permission(request).decided_by == "session_rule:src/app.py"
+    manager.clear_session_rules()
+    assert manager.check_permission(request).action == PermissionAction.ALLOW
+
+    deny = PermissionRule(
+        "**/*.py", read, PermissionAction.DENY, 10, expires_at=datetime.now() + timedelta(hours=1)
+    )
+    manager.add_rule(deny)
+    assert manager.check_permission(request).action == PermissionAction.DENY
+    deny.expires_at = datetime.now() - timedelta(seconds=1)
+    assert manager.check_permission(request).decided_by == "rule:src/**"
@@ -0,0 +1,110 @@
+"""Incremental scanning and burst coalescing in ``PollingWatcher``."""
+
+import os
+import time
+
+from superqode.workspace.watcher import (
+    ChangeType,
+    IncrementalScanner,
+    PollingWatcher,
+)
+
+
+def _settle(root):
+    """Backdate every mtime so nothing under ``root`` is racily recent."""
+    past = time.time() - 60
+    for dirpath, _dirs, files in os.walk(root):
+        for name in files:
+            os.utime(os.path.join(dirpath, name), (past, past))
+        os.utime(dirpath, (past, past))
+
+
+def _tree(root):
+    for pkg in range(5):
+        for mod in range(4):
+            path = root / f"pkg{pkg}" / f"mod{mod}.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"# {pkg}.{mod}\n")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("x")
+    _settle(root)
+
+
+def _changes(changes):
+    return sorted((c.change_type.value, c.path.name) for c in changes)
+
+
+def test_scan_relists_only_changed_directories(tmp_path):
+    _tree(tmp_path)
+    scanner = IncrementalScanner(tmp_path, lambda p: os.path.basename(p) == "node_modules")
+
+    changes, stats = scanner.scan()
+    assert stats.full_sweep and len(changes) == 20 and stats.directories == 6
+
+    changes, stats = scanner.scan()
+    assert changes == [] and not stats.full_sweep
+    assert stats.directories_listed == 0 and stats.stat_calls == 6
+
+    (tmp_path / "pkg1" / "new.py").write_text("new\n")
+    (tmp_path / "pkg2" / "mod0.py").unlink()
+    changes, stats = scanner.scan()
+    assert _changes(changes) == [("created", "new.py"), ("deleted", "mod0.py")]
+    assert stats.directories_listed == 2
+
+    # The new file is hot, so in-place edits to it are seen right away
+    (tmp_path / "pkg1" / "new.py").write_text("edited\n")
+    assert _changes(scanner.scan()[0]) == [("modified", "new.py")]
+
+
+def test_in_place_edit_in_settled_directory_waits_for_full_sweep(tmp_path):
+    _tree(tmp_path)
+    scanner = IncrementalScanner(tmp_path, lambda p: False, full_sweep_interval=3600)
+    scanner.scan()
+
+    directory = os.stat(tmp_path / "pkg3")
+    (tmp_path / "pkg3" / "mod2.py").write_text("edited in place\n")
+    os.utime(tmp_path / "pkg3", ns=(directory.st_atime_ns, directory.st_mtime_ns))
+    assert scanner.scan()[0] == []
+
+    changes, stats = scanner.scan(full=True)
+    assert stats.full_sweep
+    assert _changes(changes) == [("modified", "mod2.py")]
+
+
+def test_removed_directory_reports_its_files(tmp_path):
+    _tree(tmp_path)
+    scanner = IncrementalScanner(tmp_path, lambda p: False)
+    scanner.scan()
+
+    for mod in range(4):
+        (tmp_path / "pkg4" / f"mod{mod}.py").unlink()
+    (tmp_path / "pkg4").rmdir()
+    changes, stats = scanner.scan()
+    assert _changes(changes) == [("deleted", f"mod{i}.py") for i in range(4)]
+    assert stats.directories == 6  # pkg0-3, node_modules and the root
+
+
+def test_polling_watcher_coalesces_a_burst_into_one_batch(tmp_path):
+    _tree(tmp_path)
+    watcher = PollingWatcher(tmp_path)
+    batches = []
+    singles = []
+    watcher.on_batch(batches.append)
+    watcher.on_change(singles.append)
+    watcher.poll()  # Baseline
+    batches.clear()
+    singles.clear()
+
+    (tmp_path / "pkg0" / "burst.py").write_text("1\n")
+    assert watcher.poll() == []
+    (tmp_path / "pkg0" / "burst.py").write_text("22\n")
+    (tmp_path / "pkg0" / "scratch.tmp").write_text("ignored\n")
+    (tmp_path / "pkg1" / "temp.py").write_text("short-lived\n")
+    assert watcher.poll() == []
+    (tmp_path / "pkg1" / "temp.py").unlink()
+    assert watcher.poll() == []
+
+    delivered = watcher.poll()  # Quiet poll ends the burst
+    assert [(c.change_type, c.path.name) for c in delivered] == [(ChangeType.CREATED, "burst.py")]
+    assert batches == [delivered] and singles == delivered
+    assert watcher.last_scan_stats.changes == 0
@@ -6,6 +6,7 @@ from types import SimpleNamespace
 
 import pytest
 
+from superqode.tools.base import ToolResult
 from superqode.tools.file_tools import WriteFileTool
 
 ruff_missing = shutil.which("ruff") is None
@@ -77,3 +78,69 @@ async def test_unsupported_extension_passes_through(tmp_path, monkeypatch):
     )
     assert res.success
     assert "issue(s) detected" not in res.output
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    """A fresh verifier on the syntax-only path, recording each checker batch."""
+    from superqode.tools import post_edit
+
+    monkeypatch.delenv("SUPERQODE_VERIFY_EDITS", raising=False)
+    monkeypatch.setattr(post_edit.shutil, "which", lambda name: None)
+    fresh = post_edit.PostEditVerifier()
+    monkeypatch.setattr(post_edit, "_verifier", fresh)
+    batches = []
+    request = post_edit._syntax_worker._request
+
+    def recording(cwd, files):
+        batches.append(sorted(files))
+        return request(cwd, files)
+
+    monkeypatch.setattr(post_edit._syntax_worker, "_request", recording)
+    fresh.batches = batches
+    return fresh
+
+
+@pytest.mark.asyncio
+async def test_multi_file_patch_is_checked_in_one_batch(tmp_path, verifier):
+    from superqode.tools.apply_patch import ApplyPatchTool
+
+    patch = "*** Begin Patch\n"
+    for name in ("a", "b", "c"):
+        body = "def f(:\n" if name == "b" else "x = 1\n"
+        patch += f"*** Add File: {name}.py\n+{body}"
+    patch += "*** End Patch\n"
+
+    res = await ApplyPatchTool().execute({"input": patch}, _ctx(tmp_path))
+    assert res.success
+    assert verifier.batches == [["a.py", "b.py", "c.py"]]
+    findings = res.output.split("issue(s) detected")[1]
+    assert 'File "b.py", line 1' in findings
+    assert "a.py" not in findings and "c.py" not in findings
+
+
+@pytest.mark.asyncio
+async def test_repeat_checks_are_coalesced_and_cached(tmp_path, verifier):
+    import asyncio
+
+    from superqode.tools.post_edit import verify_edit
+
+    path = tmp_path / "mod.py"
+    path.write_text("def f(:\n")
+
+    async def check():
+        res = await verify_edit(ToolResult(success=True, output="ok"), path, _ctx(tmp_path))
+        return res.metadata.get("post_edit_findings", 0)
+
+    # Edits landing together share one check of the latest content
+    first, second, third = await asyncio.gather(check(), check(), check())
+    assert first >= 1 and first == second == third
+    assert verifier.batches == [["mod.py"]]
+    assert verifier.counters["coalesced"] == 2
+
+    # Unchanged content is answered from the cache; new content is checked
+    assert await check() == first
+    assert verifier.batches == [["mod.py"]] and verifier.counters["cached"] == 1
+    path.write_text("def f():\n    pass\n")
+    assert await check() == 0
+    assert verifier.batches == [["mod.py"], ["mod.py"]]
@@ -0,0 +1,138 @@
+"""FTS5 session catalog shared by the agent and persisted session stores."""
+
+from superqode.agent.session_manager import SessionMessage, SessionStore as AgentSessionStore
+from superqode.session.catalog import CatalogMessage, CatalogSession, SessionCatalog, fts_query
+from superqode.session.persistence import MessageRole, Session, SessionStore
+
+
+def _agent_store(tmp_path, **kwargs) -> AgentSessionStore:
+    return AgentSessionStore(str(tmp_path / "sessions"), **kwargs)
+
+
+def test_agent_store_indexes_appends_and_ranks_hits(tmp_path):
+    store = _agent_store(tmp_path)
+    store.create_session("s1", model="m1")
+    store.append_message("s1", SessionMessage(role="user", content="fix the parser crash"))
+    store.append_message("s1", SessionMessage(role="assistant", content="parser parser fixed"))
+    store.create_session("s2", model="m2")
+    store.append_message("s2", SessionMessage(role="user", content="the parser is slow"))
+
+    hits = store.search("parser")
+    assert {hit.session.session_id for hit in hits} == {"s1", "s2"}
+    assert hits[0].score >= hits[1].score
+    assert "[parser]" in hits[0].snippet
+
+    assert [hit.session.session_id for hit in store.search("parser", model="m2")] == ["s2"]
+    assert [hit.session.session_id for hit in store.search("crash")] == ["s1"]
+    assert store.search("pars*", per_session=False, limit=10)
+    assert store.search("nothing-matches") == []
+
+
+def test_tool_output_is_only_searched_on_request(tmp_path):
+    store = _agent_store(tmp_path)
+    store.create_session("s1")
+    store.append_tool_result("s1", "bash", "segfault in libfoo")
+    assert store.search("segfault") == []
+    hits = store.search("segfault", include_tool_output=True)
+    assert [(hit.session.session_id, hit.role) for hit in hits] == [("s1", "tool")]
+
+
+def test_cli_search_with_tools_finds_tool_output(tmp_path, monkeypatch):
+    import json
+
+    from click.testing import CliRunner
+
+    from superqode.commands.sessions import sessions
+
+    monkeypatch.chdir(tmp_path)
+    store = _agent_store(tmp_path / ".superqode")
+    store.create_session("s1")
+    store.append_tool_result("s1", "bash", "segfault in libfoo")
+
+    result = CliRunner().invoke(sessions, ["search", "segfault", "--json"])
+    assert result.exit_code == 0 and json.loads(result.output) == []
+    result = CliRunner().invoke(sessions, ["search", "segfault", "--tools", "--json"])
+    assert result.exit_code == 0, result.output
+    assert [(hit["session_id"], hit["role"]) for hit in json.loads(result.output)] == [
+        ("s1", "tool")
+    ]
+
+
+def test_rewind_fork_and_delete_keep_catalog_in_step(tmp_path):
+    store = _agent_store(tmp_path)
+    store.create_session("s1")
+    for text in ("alpha question", "alpha answer", "beta question", "beta answer"):
+        role = "user" if "question" in text else "assistant"
+        store.append_message("s1", SessionMessage(role=role, content=text))
+
+    store.truncate_to_user_message("s1", 2)
+    assert store.search("beta") == []
+    store.fork_session("s1", "s2")
+    assert {hit.session.session_id for hit in store.search("alpha")} == {"s1", "s2"}
+    store.delete_session("s1")
+    assert [hit.session.session_id for hit in store.search("alpha")] == ["s2"]
+
+
+def test_existing_sessions_are_indexed_when_catalog_is_created(tmp_path):
+    legacy = _agent_store(tmp_path, catalog=False)
+    legacy.create_session("old", model="m")
+    legacy.append_message("old", SessionMessage(role="user", content="legacy transcript text"))
+    assert not (legacy.base_dir / "catalog.sqlite3").exists()
+
+    store = _agent_store(tmp_path)
+    assert [m.session_id for m in store.list_sessions()] == ["old"]
+    assert [hit.session.session_id for hit in store.search("legacy")] == ["old"]
+
+    # Files changed behind the catalog's back are picked up by reindex().
+    with open(store.base_dir / "old.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"role": "user", "content": "handwritten note"}\n')
+    assert store.search("handwritten") == []
+    assert store.reindex()
+    assert len(store.search("handwritten")) == 1
+
+
+def test_persisted_store_searches_content_incrementally(tmp_path):
+    store = SessionStore(tmp_path / "persisted")
+    session = Session(id="p1", title="Refactor", project_path="/repo")
+    session.add_message(MessageRole.USER, "rename the websocket module", agent_name="alice")
+    store.save(session)
+
+    assert [info["id"] for info in store.search("refactor")] == ["p1"]
+    hits = store.search("websocket")
+    assert hits[0]["id"] == "p1" and "[websocket]" in hits[0]["snippet"]
+    assert store.search("websocket", agent="bob") == []
+    assert store.search("websocket", project="/elsewhere") == []
+
+    session.add_message(MessageRole.ASSISTANT, "renamed to transport")
+    store.save(session)
+    assert store.search("transport")[0]["id"] == "p1"
+
+    session.messages = session.messages[:1]
+    store.save(session)
+    assert store.search("transport") == []
+
+    store.delete("p1")
+    assert store.search("websocket") == []
+
+
+def test_persisted_store_reindexes_existing_sessions(tmp_path):
+    legacy = SessionStore(tmp_path / "persisted", catalog=False)
+    session = Session(id="p1", title="Old")
+    session.add_message(MessageRole.USER, "kubernetes rollout")
+    legacy.save(session)
+
+    assert SessionStore(tmp_path / "persisted").search("kubernetes")[0]["id"] == "p1"
+
+
+def test_catalog_soft_fails_and_quotes_queries(tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    catalog = SessionCatalog(blocker / "catalog.sqlite3")
+    assert not catalog.upsert_session(CatalogSession(store="agent", session_id="s"))
+    assert catalog.search("anything") == []
+
+    catalog = SessionCatalog(tmp_path / "catalog.sqlite3")
+    catalog.upsert_session(CatalogSession(store="agent", session_id="s"))
+    catalog.add_messages("agent", "s", [CatalogMessage(0, "user", 'AND OR "NEAR(" -x')])
+    assert fts_query('a "b" c*') == '"a" "b" "c"*'
+    assert len(catalog.search("NEAR( AND")) == 1
@@ -0,0 +1,229 @@
+"""Incremental segment storage of ``persistence.SessionStore``."""
+
+import gzip
+import json
+
+import pytest
+
+from superqode.session.persistence import MessageRole, Session, SessionStore
+from superqode.session.segments import SessionSegments
+
+
+def _store(tmp_path, **kwargs) -> SessionStore:
+    kwargs.setdefault("catalog", False)
+    kwargs.setdefault("background_compaction", False)
+    return SessionStore(tmp_path / "sessions", **kwargs)
+
+
+def _segment_files(store: SessionStore, session_id: str) -> list:
+    return sorted(p.name for p in (store.storage_dir / f"{session_id}.session").glob("*.jsonl*"))
+
+
+def test_save_writes_only_new_entries(tmp_path):
+    store = _store(tmp_path, compact_after=100)
+    session = Session(id="s1", title="Long")
+    session.add_message(MessageRole.USER, "first")
+    store.save(session)
+    first = _segment_files(store, "s1")
+
+    session.add_message(MessageRole.ASSISTANT, "second")
+    session.add_tool_execution("bash", {"cmd": "ls"}, "ok", True)
+    store.save(session)
+    store.save(session)  # nothing new: no new segment
+
+    files = _segment_files(store, "s1")
+    assert set(first) < set(files)
+    assert len(files) == 3
+    loaded = store.load("s1")
+    assert [m.content for m in loaded.messages] == ["first", "second"]
+    assert loaded.tool_executions[0].tool_name == "bash"
+    assert store.list_sessions()[0]["message_count"] == 2
+
+
+def test_partial_loads_open_only_trailing_segments(tmp_path):
+    store = _store(tmp_path, compact_after=100)
+    session = Session(id="s1", title="Long")
+    for i in range(6):
+        session.add_message(MessageRole.USER, f"m{i}")
+        store.save(session)
+    # Corrupt the oldest segment: tail and metadata loads must not touch it.
+    (store.storage_dir / "s1.session" / _segment_files(store, "s1")[0]).write_bytes(b"junk")
+
+    tail = store.load("s1", last_messages=2)
+    assert tail.message_offset == 4
+    assert [m.content for m in tail.messages] == ["m4", "m5"]
+    meta = store.load("s1", metadata_only=True)
+    assert meta.title == "Long" and meta.messages == [] and meta.total_messages == 6
+
+
+def test_partially_loaded_session_appends_and_rewinds(tmp_path):
+    store = _store(tmp_path, compact_after=100)
+    session = Session(id="s1", title="Long")
+    for i in range(5):
+        session.add_message(MessageRole.USER, f"m{i}")
+    store.save(session)
+
+    tail = store.load("s1", last_messages=2)
+    tail.add_message(MessageRole.ASSISTANT, "m5")
+    store.save(tail)
+    assert [m.content for m in store.load("s1").messages] == [f"m{i}" for i in range(6)]
+
+    tail.messages = tail.messages[:1]
+    store.save(tail)
+    assert [m.content for m in store.load("s1").messages] == ["m0", "m1", "m2", "m3"]
+
+
+def test_fork_then_save_after_partial_load(tmp_path):
+    store = _store(tmp_path, compact_after=100)
+    session = Session(id="s1", title="Long")
+    for i in range(5):
+        session.add_message(MessageRole.USER, f"m{i}")
+        session.add_tool_execution("bash", {"cmd": f"c{i}"}, "ok", True)
+    store.save(session)
+
+    with pytest.raises(ValueError, match="load it in full before forking"):
+        store.load("s1", last_messages=2).fork("copy")
+
+    fork = store.load("s1").fork("copy")
+    fork.id = "s2"
+    fork.add_message(MessageRole.ASSISTANT, "m5")
+    store.save(fork)
+    loaded = store.load("s2")
+    assert [m.content for m in loaded.messages] == [f"m{i}" for i in range(6)]
+    assert len(loaded.tool_executions) == 5 and loaded.parent_session_id == "s1"
+
+
+def test_rewind_rewrites_from_divergence(tmp_path):
+    store = _store(tmp_path, compact_after=100)
+    session = Session(id="s1", title="t")
+    snap = None
+    for i in range(4):
+        session.add_message(MessageRole.USER, f"m{i}")
+        if i == 1:
+            snap = session.create_snapshot("two")
+        store.save(session)
+
+    session.revert_to_snapshot(snap.id)
+    session.add_message(MessageRole.USER, "other")
+    store.save(session)
+
+    assert [m.content for m in store.load("s1").messages] == ["m0", "m1", "other"]
+
+
+def test_compaction_merges_segments(tmp_path):
+    store = _store(tmp_path, compact_after=3, background_compaction=True)
+    session = Session(id="s1", title="t")
+    for i in range(3):
+        session.add_message(MessageRole.USER, f"m{i}")
+        store.save(session)
+    store.wait_for_compaction()
+
+    assert len(_segment_files(store, "s1")) == 1
+    assert [m.content for m in store.load("s1").messages] == ["m0", "m1", "m2"]
+    assert not store.compact("s1")
+
+
+def test_compaction_never_rewrites_full_segments(tmp_path):
+    store = _store(tmp_path, compact_after=2, segment_entries=4)
+    session = Session(id="s1", title="t")
+    for i in range(10):
+        session.add_message(MessageRole.USER, f"m{i}")
+    store.save(session)  # One large save is split into bounded segments
+    manifest = store._segments("s1").read_manifest()
+    assert [s["count"] for s in manifest["segments"]["messages"]] == [4, 4, 2]
+
+    full = set()
+    for i in range(10, 40):
+        session.add_message(MessageRole.USER, f"m{i}")
+        store.save(session)
+        segments = store._segments("s1").read_manifest()["segments"]["messages"]
+        assert full <= {s["file"] for s in segments}
+        full |= {s["file"] for s in segments if s["count"] == 4}
+
+    counts = [s["count"] for s in segments]
+    assert max(counts) == 4 and sum(counts) == 40 and len(counts) <= 11
+    # A tail load opens only the trailing segments
+    (store.storage_dir / "s1.session" / segments[0]["file"]).write_bytes(b"junk")
+    assert [m.content for m in store.load("s1", last_messages=3).messages] == [
+        "m37",
+        "m38",
+        "m39",
+    ]
+
+
+def _interrupt_merge(monkeypatch, action):
+    """Run ``action`` once, as if from another thread, while compaction reads a segment."""
+    read_segment = SessionSegments.read_segment
+    pending = [action]
+
+    def racing_read(self, segment):
+        if pending:
+            pending.pop()()
+        return read_segment(self, segment)
+
+    monkeypatch.setattr(SessionSegments, "read_segment", racing_read)
+
+
+def test_compaction_drops_merges_raced_by_a_rewind(tmp_path, monkeypatch):
+    store = _store(tmp_path, compact_after=100)
+    session = Session(id="s1", title="t")
+    for i in range(4):
+        session.add_message(MessageRole.USER, f"m{i}")
+        store.save(session)
+
+    def rewind():
+        session.messages = session.messages[:1]
+        session.add_message(MessageRole.USER, "other")
+        store.save(session)
+
+    _interrupt_merge(monkeypatch, rewind)
+    assert not store.compact("s1")
+    monkeypatch.undo()
+    assert [m.content for m in store.load("s1").messages] == ["m0", "other"]
+    manifest = store._segments("s1").read_manifest()
+    assert _segment_files(store, "s1") == [s["file"] for s in manifest["segments"]["messages"]]
+
+
+def test_compaction_drops_merges_raced_by_a_delete(tmp_path, monkeypatch):
+    store = _store(tmp_path, compact_after=100)
+    session = Session(id="s1", title="t")
+    for i in range(4):
+        session.add_message(MessageRole.USER, f"m{i}")
+        store.save(session)
+
+    _interrupt_merge(monkeypatch, lambda: store.delete("s1"))
+    assert not store.compact("s1")
+    assert store.load("s1") is None
+    assert not (store.storage_dir / "s1.session").exists()
+
+
+def test_legacy_single_file_sessions_migrate_on_save(tmp_path):
+    store = _store(tmp_path)
+    legacy = Session(id="old", title="Old")
+    legacy.add_message(MessageRole.USER, "hello")
+    legacy_path = store.storage_dir / "old.json.gz"
+    with gzip.open(legacy_path, "wt", encoding="utf-8") as f:
+        json.dump(legacy.to_dict(), f)
+
+    loaded = store.load("old")
+    assert [m.content for m in loaded.messages] == ["hello"]
+    assert store.load("old", last_messages=0).message_offset == 1
+
+    loaded.add_message(MessageRole.ASSISTANT, "hi")
+    store.save(loaded)
+    assert not legacy_path.exists()
+    assert [m.content for m in store.load("old").messages] == ["hello", "hi"]
+    assert store.delete("old")
+    assert not (store.storage_dir / "old.session").exists()
+
+
+def test_manifest_state_holds_every_field_but_the_entries(tmp_path):
+    store = _store(tmp_path)
+    session = Session(id="s1", title="t", tags=["x"], metadata={"model": "m"})
+    session.add_message(MessageRole.USER, "hello", agent_name="qe")
+    session.create_snapshot("start", "before edits")
+    store.save(session)
+
+    expected = session.to_dict()
+    del expected["messages"], expected["tool_executions"]
+    assert store._segments("s1").read_manifest()["state"] == expected
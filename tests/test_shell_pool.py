@@ -0,0 +1,100 @@
+"""Persistent shell workers behind ``BashTool(use_worker_pool=True)``."""
+
+import time
+
+import pytest
+
+from superqode.tools import output_spill, shell_pool
+from superqode.tools.base import ToolContext
+from superqode.tools.shell_pool import ShellWorkerPool
+from superqode.tools.shell_tools import BashTool
+
+
+@pytest.fixture
+async def _fresh_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv(output_spill.SPILL_DIR_ENV, str(tmp_path / "spill"))
+    pool = ShellWorkerPool()
+    monkeypatch.setattr(shell_pool, "_pool", pool)
+    yield pool
+    await pool.aclose()
+
+
+def _ctx(tmp_path) -> ToolContext:
+    return ToolContext(session_id="t", working_directory=tmp_path)
+
+
+async def _run(tmp_path, command, **args):
+    return await BashTool(use_worker_pool=True).execute(
+        {"command": command, **args}, _ctx(tmp_path)
+    )
+
+
+async def test_exit_codes_and_streams(tmp_path, _fresh_pool):
+    ok = await _run(tmp_path, "echo out; echo err >&2")
+    assert ok.success and ok.metadata["exit_code"] == 0
+    assert ok.output == "out\n\n[stderr]\nerr\n"
+
+    failed = await _run(tmp_path, "printf partial; exit 7")
+    assert not failed.success and failed.metadata["exit_code"] == 7
+    assert failed.output == "partial" and failed.error == "Exit code: 7"
+
+    # `exit` ends only the command, so one worker served all three
+    assert (await _run(tmp_path, "pwd")).output.strip() == str(tmp_path)
+    assert _fresh_pool.started == 1 and _fresh_pool.recycled == 0
+
+
+async def test_commands_do_not_leak_state(tmp_path, _fresh_pool):
+    (tmp_path / "sub").mkdir()
+    await _run(tmp_path, "cd sub && export LEAK=1 && shopt -s nullglob 2>/dev/null; true")
+    result = await _run(tmp_path, 'pwd; echo "[${LEAK:-unset}]"')
+    assert result.output == f"{tmp_path}\n[unset]\n"
+
+    sub = await _run(tmp_path, "pwd", working_dir="sub")
+    assert sub.output.strip() == str(tmp_path / "sub")
+    assert _fresh_pool.started == 2  # One worker per working directory
+
+
+async def test_timeout_kills_only_the_command(tmp_path, _fresh_pool):
+    start = time.monotonic()
+    result = await _run(tmp_path, "sleep 30", timeout=1)
+    assert result.metadata.get("timed_out") and time.monotonic() - start < 10
+
+    after = await _run(tmp_path, "echo still here")
+    assert after.success and after.output == "still here\n"
+    assert _fresh_pool.started == 1
+
+
+async def test_background_stragglers_are_killed_and_worker_recycled(tmp_path, _fresh_pool):
+    marker = tmp_path / "marker"
+    result = await _run(tmp_path, f"(sleep 1; touch {marker}) >/dev/null 2>&1 & echo started")
+    assert result.success and result.output == "started\n"
+    assert _fresh_pool.recycled == 1
+
+    time.sleep(1.5)
+    assert not marker.exists()
+
+
+async def test_worker_crash_fails_the_command_and_recycles(tmp_path, _fresh_pool):
+    # In the command's subshell, $$ is still the worker shell
+    crashed = await _run(tmp_path, "echo before; kill -9 $$; sleep 5")
+    assert not crashed.success and crashed.metadata["exit_code"] is None
+    assert "worker exited" in crashed.error
+
+    assert (await _run(tmp_path, "echo again")).output == "again\n"
+    assert _fresh_pool.started == 2
+
+
+async def test_environment_change_recycles_worker(tmp_path, _fresh_pool, monkeypatch):
+    await _run(tmp_path, "true")
+    monkeypatch.setenv("SUPERQODE_POOL_TEST_VALUE", "changed")
+    result = await _run(tmp_path, 'echo "$SUPERQODE_POOL_TEST_VALUE"')
+    assert result.output == "changed\n"
+    assert _fresh_pool.started == 2
+
+
+def test_pool_opt_in_from_environment(monkeypatch):
+    monkeypatch.delenv(shell_pool.POOL_ENV, raising=False)
+    assert not BashTool()._pool_enabled()
+    monkeypatch.setenv(shell_pool.POOL_ENV, "1")
+    assert BashTool()._pool_enabled()
+    assert not BashTool(use_worker_pool=False)._pool_enabled()
@@ -0,0 +1,100 @@
+"""Private-index checkpoints in ``UndoManager``."""
+
+import subprocess
+
+import pytest
+
+from superqode.undo_manager import UndoManager
+
+
+def _git(root, *args):
+    return subprocess.run(
+        ["git", "-C", str(root), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "t@example.com")
+    _git(root, "config", "user.name", "t")
+    (root / "a.py").write_text("a = 1\n")
+    (root / "b.py").write_text("b = 1\n")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-qm", "init")
+    return root
+
+
+def _state(root):
+    index = (root / ".git" / "index").read_bytes()
+    mtimes = {p.name: p.stat().st_mtime_ns for p in root.iterdir() if p.is_file()}
+    return index, mtimes, _git(root, "stash", "list"), _git(root, "status", "--porcelain")
+
+
+def test_checkpoint_leaves_index_worktree_and_stash_alone(repo):
+    (repo / "a.py").write_text("a = 2\n")
+    (repo / "new.py").write_text("new\n")
+    _git(repo, "add", "a.py")
+    before = _state(repo)
+
+    undo = UndoManager(repo)
+    checkpoint_id = undo.create_checkpoint("Before edit")
+
+    assert _state(repo) == before
+    assert len(checkpoint_id) == 40
+    assert _git(repo, "rev-parse", f"refs/superqode/checkpoints/{checkpoint_id}").strip() == (
+        checkpoint_id
+    )
+    assert sorted(undo.get_checkpoints()[0].files_changed) == ["a.py", "new.py"]
+    assert _git(repo, "show", f"{checkpoint_id}:new.py") == "new\n"
+    # The same working tree always yields the same checkpoint tree.
+    again = UndoManager(repo).create_checkpoint("again")
+    assert _git(repo, "rev-parse", f"{again}^{{tree}}") == _git(
+        repo, "rev-parse", f"{checkpoint_id}^{{tree}}"
+    )
+    # A working tree matching HEAD has nothing to checkpoint.
+    (repo / "a.py").write_text("a = 1\n")
+    (repo / "new.py").unlink()
+    assert UndoManager(repo).create_checkpoint("clean") is None
+
+
+def test_undo_restores_only_differing_files_and_redo_returns(repo):
+    undo = UndoManager(repo)
+    (repo / "a.py").write_text("a = 2\n")
+    checkpoint_id = undo.create_checkpoint("Before agent")
+    b_mtime = (repo / "b.py").stat().st_mtime_ns
+    index = (repo / ".git" / "index").read_bytes()
+
+    (repo / "a.py").write_text("a = 3\n")
+    (repo / "added.py").write_text("agent\n")
+
+    assert undo.undo().id == checkpoint_id
+    assert (repo / "a.py").read_text() == "a = 2\n"
+    assert not (repo / "added.py").exists()
+    assert (repo / "b.py").stat().st_mtime_ns == b_mtime
+    assert (repo / ".git" / "index").read_bytes() == index
+    assert undo.can_redo()
+
+    assert undo.redo() is not None
+    assert (repo / "a.py").read_text() == "a = 3\n"
+    assert (repo / "added.py").read_text() == "agent\n"
+    assert _git(repo, "for-each-ref", "refs/superqode/checkpoints/").count("\n") == 1
+
+
+def test_restore_file_and_clear_unpins(repo):
+    undo = UndoManager(repo)
+    (repo / "a.py").write_text("a = 2\n")
+    first = undo.create_checkpoint("one")
+    (repo / "a.py").write_text("a = 3\n")
+    (repo / "b.py").write_text("b = 3\n")
+    undo.create_checkpoint("two")
+
+    assert undo.restore_file(first, "a.py")
+    assert (repo / "a.py").read_text() == "a = 2\n"
+    assert (repo / "b.py").read_text() == "b = 3\n"
+    assert not undo.restore_file(first, "missing.py")
+
+    assert undo.clear_old_checkpoints(keep_count=1) == 1
+    assert _git(repo, "for-each-ref", "refs/superqode/checkpoints/").count("\n") == 1
@@ -0,0 +1,153 @@
+"""HTTP caching and conditional revalidation in ``web_fetch``."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from superqode.tools import web_tools
+from superqode.tools.base import ToolContext
+from superqode.tools.web_cache import WebCache, freshness
+from superqode.tools.web_tools import WebFetchTool
+
+PAGE = "<html><body><main><h1>Guide</h1><p>Install it.</p></main></body></html>"
+
+
+class _Site:
+    """Local HTTP stub: path -> response headers, with a request log."""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                headers = site.routes[self.path]
+                site.requests.append((self.path, dict(self.headers)))
+                etag = headers.get("ETag")
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                modified = headers.get("Last-Modified")
+                if modified and self.headers.get("If-Modified-Since") == modified:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = headers.get("body", PAGE).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    if name != "body":
+                        self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def conditional(self, index):
+        headers = self.requests[index][1]
+        return headers.get("If-None-Match"), headers.get("If-Modified-Since")
+
+
+@pytest.fixture
+def site():
+    site = _Site()
+    yield site
+    site.server.shutdown()
+    site.server.server_close()
+
+
+async def _fetch(url, **args):
+    ctx = ToolContext(session_id="t", working_directory=".")
+    return await WebFetchTool().execute({"url": url, **args}, ctx)
+
+
+async def test_fresh_response_is_served_without_a_request(site):
+    site.routes["/guide"] = {"Cache-Control": "max-age=600"}
+    first = await _fetch(site.base + "/guide")
+    second = await _fetch(site.base + "/guide")
+    assert first.metadata["cache"] == "miss" and second.metadata["cache"] == "hit"
+    assert second.output == first.output and "# Guide" in second.output
+    assert len(site.requests) == 1
+
+
+async def test_etag_revalidation_reuses_converted_output(site, monkeypatch):
+    site.routes["/etag"] = {"ETag": '"v1"', "Cache-Control": "no-cache"}
+    first = await _fetch(site.base + "/etag")
+
+    def fail(*_args):
+        raise AssertionError("converted output should come from the cache")
+
+    convert = WebFetchTool._process_content
+    monkeypatch.setattr(WebFetchTool, "_process_content", fail)
+    second = await _fetch(site.base + "/etag")
+    assert second.metadata["cache"] == "revalidated" and second.output == first.output
+    assert site.conditional(1) == ('"v1"', None)
+
+    # A new converter version converts the cached body again
+    monkeypatch.setattr(WebFetchTool, "_process_content", convert)
+    monkeypatch.setattr(web_tools, "CONVERTER_VERSION", web_tools.CONVERTER_VERSION + 1)
+    third = await _fetch(site.base + "/etag")
+    assert third.metadata["cache"] == "revalidated" and third.output == first.output
+
+
+async def test_last_modified_revalidation_and_changed_body(site):
+    modified = "Mon, 01 Jan 2024 00:00:00 GMT"
+    site.routes["/lm"] = {"Last-Modified": modified, "Cache-Control": "no-cache"}
+    await _fetch(site.base + "/lm")
+    again = await _fetch(site.base + "/lm")
+    assert again.metadata["cache"] == "revalidated"
+    assert site.conditional(1) == (None, modified)
+
+    newer = "Tue, 02 Jan 2024 00:00:00 GMT"
+    site.routes["/lm"] = {"Last-Modified": newer, "body": "changed"}
+    changed = await _fetch(site.base + "/lm", format="raw")
+    assert changed.metadata["cache"] == "miss" and changed.output == "changed"
+
+
+async def test_no_store_and_credential_headers_bypass_the_cache(site):
+    site.routes["/private"] = {"Cache-Control": "no-store", "ETag": '"x"'}
+    await _fetch(site.base + "/private")
+    again = await _fetch(site.base + "/private")
+    assert again.metadata["cache"] == "miss" and site.conditional(1) == (None, None)
+
+    site.routes["/auth"] = {"Cache-Control": "max-age=600"}
+    for _ in range(2):
+        result = await _fetch(site.base + "/auth", headers={"Authorization": "Bearer t"})
+        assert result.metadata["cache"] == "bypass"
+    assert [path for path, _ in site.requests].count("/auth") == 2
+
+
+def test_freshness_rules():
+    now = 1_700_000_000.0
+    assert freshness({"cache-control": "max-age=60", "age": "20"}, now) == (True, False, now + 40)
+    assert freshness({"cache-control": "no-store"}, now)[0] is False
+    assert freshness({}, now)[0] is False  # Nothing to revalidate with
+    assert freshness({"etag": '"a"', "cache-control": "no-cache"}, now) == (True, True, now)
+    expires = freshness(
+        {"date": "Tue, 14 Nov 2023 22:13:20 GMT", "expires": "Tue, 14 Nov 2023 22:23:20 GMT"},
+        now,
+    )
+    assert expires == (True, False, now + 600)
+
+
+def test_lru_eviction_keeps_recently_used_urls(tmp_path):
+    cache = WebCache(tmp_path, max_bytes=6_000)
+    headers = {"cache-control": "max-age=600"}
+    for name in ("a", "b", "c"):
+        cache.store(f"https://x/{name}", name * 1500, "text/plain", headers)
+    assert cache.lookup("https://x/a") is not None  # a is now the most recent
+
+    cache.store("https://x/d", "d" * 1500, "text/plain", headers)
+    kept = [name for name in "abcd" if cache.lookup(f"https://x/{name}") is not None]
+    assert kept == ["a", "c", "d"]
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 6_000
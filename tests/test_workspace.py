@@ -127,6 +127,61 @@ class TestSnapshotManager:
         assert test_file.read_text() == "original"
         assert "revert_result" in result
 
+    def test_large_file_goes_to_blob_store(self, tmp_path):
+        """Test large originals are stored compressed and restored from the blob store."""
+        big = tmp_path / "data.csv"
+        big.write_bytes(b"row,value\n" * 200_000)
+
+        snapshot = SnapshotManager(tmp_path)
+        snapshot.LARGE_FILE_THRESHOLD = 1024
+        snapshot.start_session()
+        file_snapshot = snapshot.capture_file(Path("data.csv"))
+
+        assert file_snapshot.stored
+        assert file_snapshot.original_content is None
+        assert file_snapshot.size == 2_000_000
+        assert snapshot.blob_store.disk_usage() < 100_000
+
+        big.write_text("truncated")
+        assert file_snapshot.content_changed(big.read_bytes())
+        assert snapshot.get_original_content(Path("data.csv")) == b"row,value\n" * 200_000
+        result = snapshot.end_session(revert=True)
+
+        assert big.read_bytes() == b"row,value\n" * 200_000
+        assert result["blobs_collected"] == 1
+        assert snapshot.blob_store.disk_usage() == 0
+
+    def test_memory_limit_spills_to_blob_store(self, tmp_path):
+        """Test originals beyond the memory budget are not kept in memory."""
+        for name in ("a.txt", "b.txt"):
+            (tmp_path / name).write_text("12345678")
+
+        snapshot = SnapshotManager(tmp_path, memory_limit=10)
+        snapshot.start_session()
+
+        assert not snapshot.capture_file(Path("a.txt")).stored
+        assert snapshot.capture_file(Path("b.txt")).stored
+        (tmp_path / "b.txt").write_text("changed")
+        assert snapshot.revert_file(Path("b.txt"))
+        assert (tmp_path / "b.txt").read_text() == "12345678"
+
+    def test_blobs_are_shared_across_sessions(self, tmp_path):
+        """Test identical content is stored once and kept while any session holds it."""
+        (tmp_path / "model.bin").write_bytes(bytes(range(256)) * 64)
+
+        first = SnapshotManager(tmp_path, memory_limit=0)
+        second = SnapshotManager(tmp_path, memory_limit=0)
+        first.start_session("one")
+        second.start_session("two")
+        first.capture_file(Path("model.bin"))
+        second.capture_file(Path("model.bin"))
+        objects = [p for p in first.blob_store.objects_dir.rglob("*") if p.is_file()]
+        assert len(objects) == 1
+
+        assert first.end_session(revert=False)["blobs_collected"] == 0
+        assert second.get_original_content(Path("model.bin")) == bytes(range(256)) * 64
+        assert second.end_session(revert=False)["blobs_collected"] == 1
+
 
 class TestGitGuard:
     """Tests for GitGuard."""
@@ -0,0 +1,116 @@
+"""Warm worktree pool in ``GitWorktreeManager``."""
+
+import os
+import subprocess
+
+import pytest
+
+from superqode.workspace.worktree import GitWorktreeManager, link_tree
+
+
+def _git(root, *args):
+    return subprocess.run(
+        ["git", "-C", str(root), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setenv("SUPERQODE_HOME", str(tmp_path / "state"))
+    root = tmp_path / "repo"
+    root.mkdir()
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "t@example.com")
+    _git(root, "config", "user.name", "t")
+    (root / ".gitignore").write_text("node_modules/\n")
+    (root / "app.py").write_text("v = 1\n")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-qm", "one")
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "node_modules" / "dep" / "index.js").write_text("module.exports = 1\n")
+    return root
+
+
+async def test_removed_worktree_is_recycled_at_the_requested_commit(repo):
+    manager = GitWorktreeManager(repo, pool_size=1)
+    first_commit = _git(repo, "rev-parse", "HEAD").strip()
+    first = await manager.create_qe_worktree("one", copy_uncommitted=False)
+    assert not first.from_pool
+    (first.path / "app.py").write_text("agent edit\n")
+    (first.path / "scratch.py").write_text("untracked\n")
+
+    await manager.remove_worktree(first, force=True)
+    assert not first.path.exists()
+    assert len(list(manager.pool_dir.iterdir())) == 1
+
+    (repo / "app.py").write_text("v = 2\n")
+    _git(repo, "commit", "-qam", "two")
+    second = await manager.create_qe_worktree("two", copy_uncommitted=False)
+    assert second.from_pool
+    assert second.base_commit != first_commit
+    assert (second.path / "app.py").read_text() == "v = 2\n"
+    assert not (second.path / "scratch.py").exists()
+    assert list(manager.pool_dir.iterdir()) == []
+    assert _git(second.path, "status", "--porcelain") == ""
+
+    # The pool is full only once; a second parked worktree is removed for real
+    third = await manager.create_qe_worktree("three", copy_uncommitted=False)
+    await manager.remove_worktree(second, force=True)
+    await manager.remove_worktree(third, force=True)
+    assert len(list(manager.pool_dir.iterdir())) == 1
+    assert _git(repo, "worktree", "list").count("\n") == 2
+
+
+async def test_dirty_worktree_is_not_recycled_without_force(repo):
+    manager = GitWorktreeManager(repo, pool_size=2)
+    info = await manager.create_qe_worktree("dirty", copy_uncommitted=False)
+    (info.path / "app.py").write_text("unsaved\n")
+    with pytest.raises(RuntimeError):
+        await manager.remove_worktree(info)
+    assert (info.path / "app.py").read_text() == "unsaved\n"
+    assert not manager.pool_dir.exists() or not list(manager.pool_dir.iterdir())
+
+
+async def test_warm_pool_seeds_dependencies(repo):
+    manager = GitWorktreeManager(repo, pool_size=2)
+    assert await manager.warm_pool() == 2
+    assert await manager.warm_pool() == 0
+
+    info = await manager.create_qe_worktree("warm", copy_uncommitted=False)
+    assert info.from_pool
+    seeded = info.path / "node_modules" / "dep" / "index.js"
+    assert seeded.read_text() == "module.exports = 1\n"
+    assert _git(info.path, "status", "--porcelain") == ""
+
+
+async def test_warm_pool_does_not_seed_virtualenvs(repo):
+    # A venv's scripts point at its own path, so a copy would still run the source venv
+    (repo / ".venv" / "bin").mkdir(parents=True)
+    (repo / ".venv" / "bin" / "pip").write_text(f"#!{repo}/.venv/bin/python\n")
+    (repo / ".gitignore").write_text("node_modules/\n.venv/\n")
+    manager = GitWorktreeManager(repo, pool_size=1)
+    assert await manager.warm_pool() == 1
+
+    info = await manager.create_qe_worktree("warm", copy_uncommitted=False)
+    assert info.from_pool
+    assert (info.path / "node_modules").is_dir()
+    assert not (info.path / ".venv").exists()
+
+
+async def test_no_pool_keeps_remove_semantics(repo):
+    manager = GitWorktreeManager(repo, pool_size=0)
+    info = await manager.create_qe_worktree("plain", copy_uncommitted=False)
+    await manager.remove_worktree(info, force=True)
+    assert not info.path.exists()
+    assert not manager.pool_dir.exists()
+
+
+def test_link_tree_copies_independent_files_or_links(tmp_path):
+    src = tmp_path / "src"
+    (src / "pkg").mkdir(parents=True)
+    (src / "pkg" / "mod.js").write_text("x\n")
+    (src / "link").symlink_to("pkg")
+    method = link_tree(src, tmp_path / "dest")
+    assert method in ("reflink", "hardlink", "copy")
+    assert (tmp_path / "dest" / "pkg" / "mod.js").read_text() == "x\n"
+    assert os.readlink(tmp_path / "dest" / "link") == "pkg"